@@ -99,7 +99,10 @@ def _get_project_root() -> Path:
 
 _PROJECT_ROOT = _get_project_root()
 
-# Database path (container uses /data volume)
+# Runtime data directory for the database and import state (container uses /data volume)
+DATA_DIR = "/data" if _IS_DOCKER_MODE else (_PROJECT_ROOT / "data").as_posix()
+
+# Database path
 if _IS_DOCKER_MODE:
     _DEFAULT_DB_PATH = "/data/student_management.db"
     # SQLite absolute path requires 4 slashes: sqlite:/// (scheme) + /path (absolute)
@@ -162,6 +165,20 @@ class Settings(BaseSettings):
     POSTGRES_SSLMODE: Literal["disable", "allow", "prefer", "require", "verify-ca", "verify-full"] = "prefer"
     POSTGRES_OPTIONS: str | None = None
     DATABASE_URL: str = ""
+    # Optional read replica for analytics/search/exports/reports (see db/read_replica.py)
+    DATABASE_READ_URL: str = ""
+    DATABASE_READ_MAX_STALENESS_SECONDS: float = 5.0
+    # Connection pooling (see db_pool.py); PostgreSQL and the SQLite "queue" strategy
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 3600
+    DATABASE_SQLITE_POOL: Literal["queue", "singleton", "null"] = "queue"
+    DATABASE_SQLITE_POOL_SIZE: int = 5
+    # Per-connection SQLite PRAGMAs
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_MB: int = 256
 
     # API Pagination
     DEFAULT_PAGE_SIZE: int = 100
@@ -222,8 +239,23 @@ class Settings(BaseSettings):
     AUTH_LOGIN_MAX_ATTEMPTS: int = 5
     AUTH_LOGIN_LOCKOUT_SECONDS: int = 300
     AUTH_LOGIN_TRACKING_WINDOW_SECONDS: int = 300
+    # Share throttle state across workers via the rate limit SQLite store;
+    # otherwise each process keeps a bounded in-memory table
+    AUTH_LOGIN_THROTTLE_SHARED: bool = True
+    AUTH_LOGIN_THROTTLE_MAX_ENTRIES: int = 10000
     AUTH_LOGIN_EXEMPT_EMAILS: str = ""
     AUTH_LOGIN_EXEMPT_DOMAINS: str = ""
+    # Verified-token and user snapshot caches used by get_current_user (0 disables)
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAXSIZE: int = 4096
+
+    # Password hashing: bcrypt cost (older hashes are upgraded at login) and the
+    # bounded thread pool that keeps hashing off the event loop
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_LEGACY_HASH_MIGRATION: bool = True
 
     # NOTE: DEV_EASE is intentionally not handled here. DEV_EASE is reserved for
     # pre-commit convenience in COMMIT_READY.ps1 only and must not alter runtime
@@ -260,6 +292,9 @@ class Settings(BaseSettings):
     RESPONSE_CACHE_REQUIRE_OPT_IN: bool = True
     RESPONSE_CACHE_OPT_IN_HEADER: str = "x-cache-allow"
 
+    # PDF rendering: worker processes for table/report PDFs (0 renders in-process)
+    PDF_RENDER_WORKERS: int = 2
+
     # Monitoring services (Grafana, Prometheus, Loki)
     # Defaults adapt to execution mode so the API inside a container can reach host-published ports.
     GRAFANA_URL: str = os.environ.get("GRAFANA_URL", f"http://{_DEFAULT_MONITORING_HOST}:3000")
@@ -463,6 +498,48 @@ class Settings(BaseSettings):
             raise ValueError("AUTH_LOGIN_TRACKING_WINDOW_SECONDS must be >= 1")
         return v
 
+    @field_validator("AUTH_LOGIN_THROTTLE_MAX_ENTRIES")
+    @classmethod
+    def validate_auth_login_throttle_max_entries(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("AUTH_LOGIN_THROTTLE_MAX_ENTRIES must be >= 1")
+        return v
+
+    @field_validator("AUTH_TOKEN_CACHE_TTL_SECONDS", "AUTH_USER_CACHE_TTL_SECONDS")
+    @classmethod
+    def validate_auth_cache_ttl(cls, v: int) -> int:
+        if v < 0:
+            raise ValueError("Auth cache TTLs must be >= 0")
+        return v
+
+    @field_validator("AUTH_CACHE_MAXSIZE")
+    @classmethod
+    def validate_auth_cache_maxsize(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("AUTH_CACHE_MAXSIZE must be >= 1")
+        return v
+
+    @field_validator("PASSWORD_BCRYPT_ROUNDS")
+    @classmethod
+    def validate_password_bcrypt_rounds(cls, v: int) -> int:
+        if not 10 <= v <= 16:
+            raise ValueError("PASSWORD_BCRYPT_ROUNDS must be between 10 and 16")
+        return v
+
+    @field_validator("PASSWORD_HASH_WORKERS")
+    @classmethod
+    def validate_password_hash_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("PASSWORD_HASH_WORKERS must be >= 1")
+        return v
+
+    @field_validator("PASSWORD_HASH_QUEUE_SIZE")
+    @classmethod
+    def validate_password_hash_queue_size(cls, v: int) -> int:
+        if v < 0:
+            raise ValueError("PASSWORD_HASH_QUEUE_SIZE must be >= 0")
+        return v
+
     @model_validator(mode="after")
     def check_secret_key(self) -> "Settings":
         """
@@ -643,6 +720,26 @@ class Settings(BaseSettings):
             raise ValueError("DEFAULT_ADMIN_PASSWORD must be at least 8 characters long")
         return value
 
+    @field_validator("DATABASE_POOL_SIZE", "DATABASE_SQLITE_POOL_SIZE")
+    @classmethod
+    def validate_pool_size(cls, v: int, info: ValidationInfo) -> int:
+        if v < 1:
+            raise ValueError(f"{info.field_name} must be >= 1")
+        return v
+
+    @field_validator(
+        "DATABASE_MAX_OVERFLOW",
+        "DATABASE_POOL_TIMEOUT",
+        "SQLITE_BUSY_TIMEOUT_MS",
+        "SQLITE_CACHE_SIZE_KB",
+        "SQLITE_MMAP_SIZE_MB",
+    )
+    @classmethod
+    def validate_non_negative_pool_option(cls, v: float, info: ValidationInfo) -> float:
+        if v < 0:
+            raise ValueError(f"{info.field_name} must be >= 0")
+        return v
+
     @field_validator("SQLALCHEMY_SLOW_QUERY_THRESHOLD_MS")
     @classmethod
     def validate_slow_query_threshold(cls, v: int) -> int:
@@ -678,6 +775,13 @@ class Settings(BaseSettings):
             raise ValueError("RESPONSE_CACHE_MAXSIZE must be >= 1")
         return v
 
+    @field_validator("PDF_RENDER_WORKERS")
+    @classmethod
+    def validate_pdf_render_workers(cls, v: int) -> int:
+        if v < 0:
+            raise ValueError("PDF_RENDER_WORKERS must be >= 0")
+        return v
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
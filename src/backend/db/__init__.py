@@ -11,17 +11,24 @@ This module provides:
 
 Public API exports:
 - Connection: engine, SessionLocal, get_session, ensure_schema
+- Read replica: get_read_session, read_session_scope, ReadSessionLocal, read_router
+- Data versions: get_data_version, bump_data_versions (per-table write counters for cache keys)
 - Utilities: transaction, get_active_query, get_active, get_by_id, get_by_id_or_404
              exists, paginate, soft_delete, restore, validate_date_range,
              validate_unique_constraint, bulk_create, bulk_update, PaginatedResult
 """
 
 from backend.db.connection import (
+    ReadSessionLocal,
     SessionLocal,
     engine,
     ensure_schema,
+    get_read_session,
     get_session,
+    read_router,
+    read_session_scope,
 )
+from backend.db.data_version import bump_data_versions, get_data_version
 from backend.db.utils import (
     PaginatedResult,
     bulk_create,
@@ -45,6 +52,14 @@ __all__ = [
     "SessionLocal",
     "get_session",
     "ensure_schema",
+    # Read replica
+    "ReadSessionLocal",
+    "get_read_session",
+    "read_router",
+    "read_session_scope",
+    # Data versions
+    "get_data_version",
+    "bump_data_versions",
     # Utilities
     "transaction",
     "get_active_query",
@@ -5,7 +5,9 @@ Manages SQLAlchemy engine, session factory, and core database connectivity.
 
 from __future__ import annotations
 
-from typing import Generator
+import logging
+from contextlib import contextmanager
+from typing import Generator, Iterator
 
 import sqlalchemy as sa
 from sqlalchemy import create_engine, event, text
@@ -16,6 +18,9 @@ from backend.import_resolver import import_from_possible_locations
 
 # Prefer explicit package-qualified import to avoid shadowing by root-level 'config' directory
 from backend import config as config_mod
+from backend.db.read_replica import ReadReplicaRouter
+
+logger = logging.getLogger(__name__)
 
 settings = config_mod.settings
 models = import_from_possible_locations("models")
@@ -29,6 +34,24 @@ except Exception:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
+# Optional read replica for heavy read endpoints (see db/read_replica.py)
+read_engine = None
+if getattr(settings, "DATABASE_READ_URL", ""):
+    try:
+        read_engine = models.init_db(settings.DATABASE_READ_URL, pool_name="replica")
+    except Exception:
+        # Reads fall back to the primary; a bad replica URL must not stop the app
+        logger.exception("Read replica engine unavailable; reading from primary")
+
+read_router = ReadReplicaRouter(
+    engine,
+    read_engine,
+    max_staleness_seconds=getattr(settings, "DATABASE_READ_MAX_STALENESS_SECONDS", 5.0),
+)
+
+# Read sessions are bound per session to the primary or the replica by read_router
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
 
 # ---------------------------------------------------------------------------
 # Soft-delete auto-filtering (global)
@@ -41,7 +64,6 @@ try:
 
     if SoftDeleteMixin is not None:
 
-        @event.listens_for(SessionLocal, "do_orm_execute")
         def _add_soft_delete_filter(execute_state):
             if not execute_state.is_select:
                 return
@@ -52,11 +74,20 @@ try:
             execute_state.statement = execute_state.statement.options(
                 with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
             )
+
+        event.listen(SessionLocal, "do_orm_execute", _add_soft_delete_filter)
+        event.listen(ReadSessionLocal, "do_orm_execute", _add_soft_delete_filter)
 except Exception:
     # Best-effort: do not block app startup if filter registration fails
     pass
 
 
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_read_session_writes(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("Read sessions are read-only; use get_session for writes")
+
+
 def get_session(_: object | None = None) -> Generator[Session, None, None]:
     """
     FastAPI dependency for database session.
@@ -74,6 +105,45 @@ def get_session(_: object | None = None) -> Generator[Session, None, None]:
         db.close()
 
 
+def _new_read_session() -> Session:
+    bind = read_router.bind()
+    db = ReadSessionLocal(bind=bind)
+    if bind is read_router.replica:
+        db.info["read_replica"] = True
+        db.info["replica_lag_seconds"] = read_router.last_lag_seconds
+    return db
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    """
+    FastAPI dependency for read-only database sessions.
+
+    Bound to the read replica when ``DATABASE_READ_URL`` is configured and the
+    replica is within the staleness budget, otherwise to the primary. Writes
+    through the session are rejected.
+
+    Usage:
+        @app.get("/reports")
+        async def list_rows(db: Session = Depends(get_read_session)):
+            return db.query(Item).all()
+    """
+    db = _new_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def read_session_scope() -> Iterator[Session]:
+    """Context-manager form of :func:`get_read_session` for background tasks."""
+    db = _new_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def _ensure_column(engine, table: str, column: str, coltype_sql: str, default_sql: str | None = None) -> None:
     """Ensure a column exists; if missing, add it with optional DEFAULT.
     Works on SQLite and other SQL dialects best-effort without Alembic.
@@ -108,5 +178,10 @@ def _ensure_column(engine, table: str, column: str, coltype_sql: str, default_sq
 def ensure_schema(engine) -> None:
     """Best-effort schema guard for runtime safety.
     - Adds courses.absence_penalty FLOAT DEFAULT 0.0 if missing.
+    - Creates the student/course full-text search index if missing.
     """
     _ensure_column(engine, "courses", "absence_penalty", "FLOAT", "0.0")
+
+    from backend.services.search_backends import ensure_search_index
+
+    ensure_search_index(engine)
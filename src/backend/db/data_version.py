@@ -0,0 +1,238 @@
+"""
+Per-table data versions for cache keys.
+
+Caches of derived data (e.g. generated report files) need to know whether
+the rows they were built from changed. Source tables have no ``updated_at``
+column, so the ``data_versions`` table keeps a write counter per tracked
+table. Session hooks collect the tables a transaction wrote and bump their
+counters in a separate short transaction once it has committed, so every
+process sees the same versions, rolled-back writes never bump them, and
+concurrent writers only contend on the counter rows for that one UPDATE
+instead of for their whole transaction. A version can trail freshly
+committed rows for that moment, which only means a reader may cache new
+data under the previous key.
+
+Rows that belong to one course (the course itself, its enrollments, grades,
+attendance and daily performance) also bump a per-course counter
+(``course:<id>``), so caches of one course's data are not invalidated by writes
+to another. Writes that cannot be attributed to a course (bulk ``Query``
+updates/deletes) bump ``course:*`` instead, which per-course caches include in
+their key as the fallback.
+
+Writes that bypass the ORM session (raw SQL, restores) must call
+``bump_data_versions`` themselves; course-scoped tables named there without a
+course version count as touching every course.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Set
+
+from sqlalchemy import event, inspect as sa_inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.models import Attendance, Course, CourseEnrollment, DailyPerformance, DataVersion, Grade, Student
+
+logger = logging.getLogger(__name__)
+
+TRACKED_MODELS = (Student, Course, CourseEnrollment, Grade, Attendance, DailyPerformance)
+TRACKED_TABLES = frozenset(model.__tablename__ for model in TRACKED_MODELS)
+
+# Models whose rows belong to a single course (via ``course_id``)
+COURSE_SCOPED_MODELS = (CourseEnrollment, Grade, Attendance, DailyPerformance)
+COURSE_SCOPED_TABLES = frozenset(model.__tablename__ for model in (Course, *COURSE_SCOPED_MODELS))
+
+COURSE_VERSION_PREFIX = "course:"
+
+_PENDING_KEY = "data_version_tables"
+_BIND_KEY = "data_version_bind"
+_table_available: Dict[int, bool] = {}
+_availability_lock = threading.Lock()
+
+
+def _versions_table_available(connection: Any) -> bool:
+    """Whether ``data_versions`` exists (databases not yet migrated skip bumping)."""
+    key = id(connection.engine)
+    cached = _table_available.get(key)
+    if cached is not None:
+        return cached
+    with _availability_lock:
+        try:
+            available = sa_inspect(connection).has_table(DataVersion.__tablename__)
+        except Exception:
+            available = False
+        _table_available[key] = available
+    return available
+
+
+def course_version_name(course_id: Any) -> str:
+    """Name of the per-course counter, e.g. ``"course:12"``."""
+    return f"{COURSE_VERSION_PREFIX}{course_id}"
+
+
+# Bumped by writes that touch course data but cannot be attributed to a course
+ALL_COURSES_VERSION = course_version_name("*")
+
+
+def reset_data_version_cache() -> None:
+    """Forget which engines have the ``data_versions`` table (used by tests)."""
+    _table_available.clear()
+
+
+def bump_data_versions(connection: Any, tables: Iterable[str]) -> None:
+    """Increment the counters for ``tables`` on ``connection``'s current transaction.
+
+    ``tables`` may also name course versions (:func:`course_version_name`).
+    Course-scoped tables listed without one bump :data:`ALL_COURSES_VERSION`.
+    """
+    names = set(tables)
+    if names & COURSE_SCOPED_TABLES and not any(name.startswith(COURSE_VERSION_PREFIX) for name in names):
+        names.add(ALL_COURSES_VERSION)
+    _bump(connection, names)
+
+
+def _bump(connection: Any, versions: Iterable[str]) -> None:
+    names = sorted(name for name in set(versions) if name in TRACKED_TABLES or name.startswith(COURSE_VERSION_PREFIX))
+    if not names or not _versions_table_available(connection):
+        return
+
+    now = datetime.now(timezone.utc)
+    result = connection.execute(
+        update(DataVersion)
+        .where(DataVersion.table_name.in_(names))
+        .values(version=DataVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount == len(names):
+        return
+
+    existing = set(
+        connection.execute(select(DataVersion.table_name).where(DataVersion.table_name.in_(names))).scalars()
+    )
+    missing = [name for name in names if name not in existing]
+    if missing:
+        connection.execute(
+            DataVersion.__table__.insert(),
+            [{"table_name": name, "version": 1, "updated_at": now} for name in missing],
+        )
+
+
+def get_data_version(db: Session, tables: Iterable[str]) -> str:
+    """Return a stable version string such as ``"grades:12,students:4"``."""
+    names = sorted(set(tables))
+    if not names:
+        return ""
+    versions = {name: 0 for name in names}
+    if _versions_table_available(db.connection()):
+        for name, version in db.execute(
+            select(DataVersion.table_name, DataVersion.version).where(DataVersion.table_name.in_(names))
+        ):
+            versions[name] = int(version or 0)
+    return ",".join(f"{name}:{versions[name]}" for name in names)
+
+
+def _course_ids_of(obj: Any) -> Set[Any]:
+    if isinstance(obj, Course):
+        return {obj.id}
+    # A row moved to another course changes the old course too
+    return {obj.course_id, *sa_inspect(obj).attrs.course_id.history.deleted}
+
+
+def _versions_of(objects: Iterable[Any]) -> Set[str]:
+    versions: Set[str] = set()
+    for obj in objects:
+        table_name = getattr(type(obj), "__tablename__", None)
+        if table_name not in TRACKED_TABLES:
+            continue
+        versions.add(table_name)
+        if isinstance(obj, (Course, *COURSE_SCOPED_MODELS)):
+            # Rows not flushed yet have no ids; the flush that assigns them records the course
+            versions.update(course_version_name(cid) for cid in _course_ids_of(obj) if cid is not None)
+    return versions
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    changed = _versions_of((*session.new, *session.dirty, *session.deleted))
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+def _after_bulk_write(context: Any) -> None:
+    mapper = getattr(context, "mapper", None)
+    table_name = getattr(getattr(mapper, "class_", None), "__tablename__", None)
+    if table_name in TRACKED_TABLES:
+        pending = context.session.info.setdefault(_PENDING_KEY, set())
+        pending.add(table_name)
+        if table_name in COURSE_SCOPED_TABLES:
+            pending.add(ALL_COURSES_VERSION)
+
+
+def _before_commit(session: Session) -> None:
+    # Objects still pending here are flushed by commit after this hook runs.
+    changed = _versions_of((*session.new, *session.dirty, *session.deleted))
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+    if session.info.get(_PENDING_KEY) and _BIND_KEY not in session.info:
+        # A session bound to an external Connection commits inside the caller's
+        # transaction; bump there. Otherwise bump on a fresh engine connection.
+        bind = session.bind if isinstance(session.bind, Connection) else session.connection().engine
+        session.info[_BIND_KEY] = bind
+
+
+def _after_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        # Releasing a savepoint; the enclosing transaction has not committed yet
+        return
+    changed = session.info.pop(_PENDING_KEY, None)
+    bind = session.info.pop(_BIND_KEY, None)
+    if not changed or bind is None:
+        return
+    try:
+        if isinstance(bind, Connection):
+            _bump(bind, changed)
+        else:
+            with bind.begin() as connection:
+                _bump(connection, changed)
+    except Exception as exc:
+        # The write itself is committed; caches keyed on these versions stay stale until the next bump
+        logger.warning("Could not bump data versions for %s: %s", sorted(changed), exc)
+
+
+def _clear_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_BIND_KEY, None)
+
+
+_hooks_registered = False
+
+
+def register_data_version_hooks() -> None:
+    """Attach the session listeners (idempotent)."""
+    global _hooks_registered
+    if _hooks_registered:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_bulk_update", _after_bulk_write)
+    event.listen(Session, "after_bulk_delete", _after_bulk_write)
+    event.listen(Session, "before_commit", _before_commit)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _clear_pending)
+    _hooks_registered = True
+
+
+register_data_version_hooks()
+
+
+__all__ = [
+    "ALL_COURSES_VERSION",
+    "COURSE_SCOPED_TABLES",
+    "TRACKED_TABLES",
+    "bump_data_versions",
+    "course_version_name",
+    "get_data_version",
+    "register_data_version_hooks",
+    "reset_data_version_cache",
+]
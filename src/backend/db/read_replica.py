@@ -0,0 +1,145 @@
+"""
+Read-replica routing for heavy read endpoints.
+
+When ``DATABASE_READ_URL`` is set, analytics, search, facets, metrics, exports
+and report generation read through ``get_read_session`` and are served by the
+replica, keeping that traffic off the primary's write path. A replica that
+falls further behind than ``DATABASE_READ_MAX_STALENESS_SECONDS`` (or cannot be
+reached) is skipped and reads go to the primary until it catches up.
+
+Lag is measured the same way on every backend: the ``data_versions`` table is
+touched right after every tracked write commits (see ``db/data_version.py``).
+A replica whose newest ``updated_at`` matches the primary's is caught up; one
+that is behind has been missing the primary's newest write for at least as long
+as that write's age, so the lag is the larger of the gap between the two and
+the time since the replica's newest write. A stalled replica therefore ages out
+of the budget instead of being served indefinitely. The check costs one tiny
+query per database and is cached for ``LAG_CHECK_INTERVAL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from backend.models import DataVersion
+
+logger = logging.getLogger(__name__)
+
+LAG_CHECK_INTERVAL_SECONDS = 1.0
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is not None:
+        return value
+    # SQLite returns naive datetimes for values written as UTC
+    return value.replace(tzinfo=timezone.utc)
+
+
+class ReadReplicaRouter:
+    """Pick the engine read sessions bind to: the replica while it is fresh enough, else the primary."""
+
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Optional[Engine] = None,
+        *,
+        max_staleness_seconds: float = 5.0,
+        check_interval_seconds: float = LAG_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.max_staleness_seconds = max(0.0, float(max_staleness_seconds))
+        self.check_interval_seconds = max(0.0, float(check_interval_seconds))
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._use_replica = False
+        self._last_lag: Optional[float] = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica is not None
+
+    @property
+    def last_lag_seconds(self) -> Optional[float]:
+        """Replica lag measured by the most recent check."""
+        return self._last_lag
+
+    @staticmethod
+    def _newest_write(engine: Engine) -> Optional[datetime]:
+        with engine.connect() as conn:
+            return _as_utc(conn.execute(select(func.max(DataVersion.updated_at))).scalar())
+
+    def replica_lag_seconds(self) -> Optional[float]:
+        """Seconds the replica is behind the primary, or ``None`` if it cannot be measured."""
+        if self.replica is None:
+            return None
+        try:
+            primary_newest = self._newest_write(self.primary)
+            replica_newest = self._newest_write(self.replica)
+        except Exception as exc:
+            logger.warning("Read replica lag check failed; reading from primary: %s", exc)
+            return None
+        if primary_newest is None or (replica_newest is not None and replica_newest >= primary_newest):
+            return 0.0
+        if replica_newest is None:
+            return float("inf")
+        # Measured from the replica's side so a replica that stopped applying changes keeps falling behind
+        behind = max(primary_newest, datetime.now(timezone.utc)) - replica_newest
+        return behind.total_seconds()
+
+    def use_replica(self) -> bool:
+        """Whether read sessions should currently go to the replica."""
+        if self.replica is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval_seconds:
+                return self._use_replica
+            lag = self.replica_lag_seconds()
+            use_replica = lag is not None and lag <= self.max_staleness_seconds
+            if use_replica != self._use_replica and self._checked_at is not None:
+                logger.info(
+                    "Read traffic moved to %s (replica lag %s, budget %ss)",
+                    "replica" if use_replica else "primary",
+                    "unknown" if lag is None else f"{lag:.3f}s",
+                    self.max_staleness_seconds,
+                )
+            self._checked_at = now
+            self._use_replica = use_replica
+            self._last_lag = lag
+            return use_replica
+
+    def bind(self) -> Engine:
+        """Engine for the next read session."""
+        if self.use_replica():
+            self.replica_reads += 1
+            return self.replica  # type: ignore[return-value]
+        self.primary_reads += 1
+        return self.primary
+
+    def invalidate(self) -> None:
+        """Force the next :meth:`use_replica` call to re-measure lag."""
+        with self._lock:
+            self._checked_at = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "using_replica": self._use_replica,
+            "replica_lag_seconds": self._last_lag,
+            "max_staleness_seconds": self.max_staleness_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+__all__ = ["LAG_CHECK_INTERVAL_SECONDS", "ReadReplicaRouter"]
@@ -0,0 +1,219 @@
+"""
+Connection pool configuration and telemetry for the SQLAlchemy engine.
+
+``models.init_db`` builds its engine options here:
+
+* PostgreSQL uses a ``QueuePool`` sized from ``DATABASE_POOL_SIZE`` /
+  ``DATABASE_MAX_OVERFLOW`` / ``DATABASE_POOL_TIMEOUT`` / ``DATABASE_POOL_RECYCLE``.
+* SQLite follows ``DATABASE_SQLITE_POOL``: ``queue`` (default) keeps a small
+  pool of connections that is safe to share across worker threads under WAL,
+  ``singleton`` keeps one connection per thread, and ``null`` opens a new
+  connection for every checkout (the previous behaviour). In-memory databases
+  always use ``singleton`` so every session sees the same database.
+
+Every SQLite connection gets the tuned PRAGMAs when it is opened, not just the
+first one. Pool checkout wait, checkout timeouts, checked-out and overflow
+connections and connection age are exported to Prometheus, labelled with the
+pool name.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool, SingletonThreadPool
+
+logger = logging.getLogger(__name__)
+
+SQLITE_POOL_STRATEGIES = ("queue", "singleton", "null")
+
+_metrics_module: Any = None
+_metrics_lock = threading.Lock()
+
+
+def _metrics() -> Any:
+    """Return the Prometheus metrics module, or ``False`` when it cannot be imported."""
+    global _metrics_module
+    if _metrics_module is None:
+        with _metrics_lock:
+            if _metrics_module is None:
+                try:
+                    from backend.middleware import prometheus_metrics
+
+                    _metrics_module = prometheus_metrics
+                except Exception as exc:  # pragma: no cover - metrics are best effort
+                    logger.debug("Pool metrics disabled: %s", exc)
+                    _metrics_module = False
+    return _metrics_module
+
+
+class _InstrumentedPoolMixin:
+    """Time every checkout (queue wait, new connections and pre-ping) and count timeouts."""
+
+    pool_name = "primary"
+
+    def connect(self):  # type: ignore[no-untyped-def]
+        start = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            metrics = _metrics()
+            if metrics:
+                metrics.track_db_pool_timeout(self.pool_name)
+            raise
+        finally:
+            metrics = _metrics()
+            if metrics:
+                metrics.observe_db_pool_checkout(self.pool_name, time.perf_counter() - start)
+
+    def recreate(self):  # type: ignore[no-untyped-def]
+        pool = super().recreate()  # type: ignore[misc]
+        pool.pool_name = self.pool_name
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedSingletonThreadPool(_InstrumentedPoolMixin, SingletonThreadPool):
+    pass
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    pass
+
+
+def _is_memory_sqlite(db_url: str) -> bool:
+    return db_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in db_url
+
+
+def build_engine_options(db_url: str, settings: Any = None) -> Dict[str, Any]:
+    """Return ``create_engine`` keyword arguments (pool class and sizing) for ``db_url``."""
+    options: Dict[str, Any] = {}
+    if db_url.startswith("postgresql"):
+        options.update(
+            {
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": int(getattr(settings, "DATABASE_POOL_SIZE", 20)),
+                "max_overflow": int(getattr(settings, "DATABASE_MAX_OVERFLOW", 10)),
+                "pool_timeout": float(getattr(settings, "DATABASE_POOL_TIMEOUT", 30)),
+                "pool_recycle": int(getattr(settings, "DATABASE_POOL_RECYCLE", 3600)),
+                "pool_pre_ping": True,  # Test connections before use (detect stale connections)
+            }
+        )
+    elif db_url.startswith("sqlite"):
+        strategy = str(getattr(settings, "DATABASE_SQLITE_POOL", "queue")).lower()
+        if _is_memory_sqlite(db_url):
+            strategy = "singleton"
+        # Connections are handed between threadpool workers, so thread checks must be off
+        options["connect_args"] = {"check_same_thread": False}
+        pool_size = int(getattr(settings, "DATABASE_SQLITE_POOL_SIZE", 5))
+        if strategy == "null":
+            options["poolclass"] = InstrumentedNullPool
+        elif strategy == "singleton":
+            options.update({"poolclass": InstrumentedSingletonThreadPool, "pool_size": pool_size})
+        else:
+            options.update(
+                {
+                    "poolclass": InstrumentedQueuePool,
+                    "pool_size": pool_size,
+                    "max_overflow": int(getattr(settings, "DATABASE_MAX_OVERFLOW", 10)),
+                    "pool_timeout": float(getattr(settings, "DATABASE_POOL_TIMEOUT", 30)),
+                }
+            )
+    return options
+
+
+def sqlite_pragmas(db_url: str, settings: Any = None) -> Dict[str, Any]:
+    """PRAGMAs applied to every new SQLite connection, in order."""
+    pragmas: Dict[str, Any] = {}
+    if not _is_memory_sqlite(db_url):
+        # Readers do not block the writer (and vice versa)
+        pragmas["journal_mode"] = "WAL"
+    pragmas.update(
+        {
+            # Reasonable durability without being too slow under WAL
+            "synchronous": "NORMAL",
+            "foreign_keys": "ON",
+            "busy_timeout": int(getattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 5000)),
+            # Negative cache_size is in KiB rather than pages
+            "cache_size": -int(getattr(settings, "SQLITE_CACHE_SIZE_KB", 65536)),
+            "mmap_size": int(getattr(settings, "SQLITE_MMAP_SIZE_MB", 256)) * 1024 * 1024,
+            "temp_store": "MEMORY",
+        }
+    )
+    return pragmas
+
+
+def register_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """Apply ``pragmas`` on every connection the engine opens."""
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                try:
+                    cursor.execute(f"PRAGMA {name}={value}")
+                except Exception as exc:  # pragma: no cover - best effort per pragma
+                    logger.debug("PRAGMA %s=%s not applied: %s", name, value, exc)
+        finally:
+            cursor.close()
+
+
+def register_pool_metrics(engine: Engine, pool_name: str = "primary") -> None:
+    """Export checked-out/overflow connections and connection age for the engine's pool."""
+    engine.pool.pool_name = pool_name  # type: ignore[attr-defined]
+
+    def _publish(pool: Any, returning: int = 0) -> None:
+        metrics = _metrics()
+        if not metrics:
+            return
+        checked_out = pool.checkedout() - returning if hasattr(pool, "checkedout") else None
+        overflow = pool.overflow() if hasattr(pool, "overflow") else None
+        size = pool.size() if callable(getattr(pool, "size", None)) else getattr(pool, "size", None)
+        metrics.update_db_pool_metrics(pool_name, size=size, checked_out=checked_out, overflow=overflow)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _publish(engine.pool)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics = _metrics()
+        if metrics and connection_record is not None:
+            metrics.observe_db_pool_connection_age(pool_name, time.time() - connection_record.starttime)
+        # "checkin" fires before the pool takes the connection back
+        _publish(engine.pool, returning=1)
+
+
+def pool_status(engine: Engine) -> Dict[str, Optional[Any]]:
+    """Snapshot of the engine's pool for diagnostics."""
+    pool = engine.pool
+    return {
+        "pool": getattr(pool, "pool_name", "primary"),
+        "class": type(pool).__name__,
+        "size": pool.size() if callable(getattr(pool, "size", None)) else None,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+        "status": pool.status(),
+    }
+
+
+__all__ = [
+    "InstrumentedNullPool",
+    "InstrumentedQueuePool",
+    "InstrumentedSingletonThreadPool",
+    "SQLITE_POOL_STRATEGIES",
+    "build_engine_options",
+    "pool_status",
+    "register_pool_metrics",
+    "register_sqlite_pragmas",
+    "sqlite_pragmas",
+]
@@ -80,6 +80,7 @@ class ErrorCode(str, Enum):
     AUTH_CANNOT_DELETE_SELF = "AUTH_CANNOT_DELETE_SELF"
     AUTH_LAST_ADMIN = "AUTH_LAST_ADMIN"
     AUTH_ACCOUNT_LOCKED = "AUTH_ACCOUNT_LOCKED"
+    AUTH_SERVICE_BUSY = "AUTH_SERVICE_BUSY"
 
 
 def build_error_detail(
@@ -136,6 +136,48 @@ def get_lifespan():
         except Exception as e:
             logging.getLogger(__name__).warning(f"⚠️  Scheduler startup not available: {e}")
 
+        # Build the in-memory search suggestion index off the event loop
+        if not (disable_startup or is_pytest_run):
+            try:
+                import threading
+
+                from backend.services.suggestion_index import build_suggestion_index, register_orm_hooks
+
+                register_orm_hooks()
+                threading.Thread(
+                    target=build_suggestion_index,
+                    args=(SessionLocal,),
+                    name="suggestion-index-build",
+                    daemon=True,
+                ).start()
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"⚠️  Suggestion index not started: {e}")
+
+        # Rebuild course analytics snapshots in the background after grade/attendance writes
+        if not (disable_startup or is_pytest_run):
+            try:
+                from backend.services.course_analytics_snapshot import start_course_snapshot_refresher
+
+                start_course_snapshot_refresher(SessionLocal)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"⚠️  Course analytics snapshot refresher not started: {e}")
+
+        # Wrap remaining PBKDF2 password hashes in bcrypt off the event loop
+        if not (disable_startup or is_pytest_run) and getattr(settings, "PASSWORD_LEGACY_HASH_MIGRATION", True):
+            try:
+                import threading
+
+                from backend.services.password_hash_migration import migrate_legacy_password_hashes
+
+                threading.Thread(
+                    target=migrate_legacy_password_hashes,
+                    args=(SessionLocal,),
+                    name="password-hash-migration",
+                    daemon=True,
+                ).start()
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"⚠️  Password hash migration not started: {e}")
+
         # Start WebSocket background tasks
         try:
             await start_background_tasks()
@@ -158,6 +200,38 @@ def get_lifespan():
         except Exception as e:
             logging.getLogger(__name__).warning(f"⚠️  Error stopping schedulers: {e}")
 
+        # Release pooled control-panel connections to managed database instances
+        try:
+            from backend.services.database_manager import close_instance_pools
+
+            close_instance_pools()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️  Error closing database instance pools: {e}")
+
+        # Stop PDF render worker processes
+        try:
+            from backend.pdf_rendering import shutdown_pdf_renderer
+
+            shutdown_pdf_renderer()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️  Error stopping PDF render workers: {e}")
+
+        # Stop the course analytics snapshot refresher
+        try:
+            from backend.services.course_analytics_snapshot import stop_course_snapshot_refresher
+
+            stop_course_snapshot_refresher()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️  Error stopping course analytics snapshot refresher: {e}")
+
+        # Stop password hashing workers
+        try:
+            from backend.security.password_hash import shutdown_password_hasher
+
+            shutdown_password_hasher()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️  Error stopping password hashing workers: {e}")
+
         # Stop WebSocket background tasks on shutdown
         try:
             await stop_background_tasks()
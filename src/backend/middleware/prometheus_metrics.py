@@ -84,6 +84,44 @@ db_errors_total = Counter(
     ["error_type"],
 )
 
+db_pool_checkout_wait_seconds = Histogram(
+    "sms_db_pool_checkout_wait_seconds",
+    "Time spent checking a connection out of the pool (queue wait, connect, pre-ping)",
+    ["pool"],  # primary, replica
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+
+db_pool_timeouts_total = Counter(
+    "sms_db_pool_timeouts_total",
+    "Pool checkouts that timed out waiting for a connection",
+    ["pool"],
+)
+
+db_pool_size = Gauge(
+    "sms_db_pool_size",
+    "Configured number of pooled connections",
+    ["pool"],
+)
+
+db_pool_checked_out = Gauge(
+    "sms_db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+)
+
+db_pool_overflow = Gauge(
+    "sms_db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool is not yet full)",
+    ["pool"],
+)
+
+db_pool_connection_age_seconds = Histogram(
+    "sms_db_pool_connection_age_seconds",
+    "Age of pooled connections when they are returned to the pool",
+    ["pool"],
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400),
+)
+
 # API Performance Metrics
 api_response_size_bytes = Histogram(
     "sms_api_response_size_bytes",
@@ -118,6 +156,36 @@ cache_misses_total = Counter(
     ["cache_type"],
 )
 
+# Password Hashing Metrics
+password_hash_queue_wait_seconds = Histogram(
+    "sms_password_hash_queue_wait_seconds",
+    "Time password hashing work waits for a hashing worker",
+    ["operation"],  # hash, verify
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+password_hash_rejected_total = Counter(
+    "sms_password_hash_rejected_total",
+    "Password hashing requests rejected because the hashing queue was full",
+    ["operation"],
+)
+
+# Search Suggestion Index Metrics
+suggestion_index_entries = Gauge(
+    "sms_suggestion_index_entries",
+    "Students and courses held in the in-memory suggestion index",
+)
+
+suggestion_index_postings = Gauge(
+    "sms_suggestion_index_postings",
+    "Prefix keys held in the in-memory suggestion index",
+)
+
+suggestion_index_memory_bytes = Gauge(
+    "sms_suggestion_index_memory_bytes",
+    "Approximate memory used by the in-memory suggestion index",
+)
+
 # Error Metrics
 errors_total = Counter(
     "sms_errors_total",
@@ -434,6 +502,93 @@ def track_cache_miss(cache_type: str) -> None:
     cache_misses_total.labels(cache_type=cache_type).inc()
 
 
+def observe_password_hash_wait(operation: str, seconds: float) -> None:
+    """
+    Record how long a hashing operation queued before a worker picked it up.
+
+    Args:
+        operation: Hashing operation (hash, verify)
+        seconds: Queue wait in seconds
+    """
+    password_hash_queue_wait_seconds.labels(operation=operation).observe(seconds)
+
+
+def track_password_hash_rejected(operation: str) -> None:
+    """
+    Track a hashing request rejected because the queue was full.
+
+    Args:
+        operation: Hashing operation (hash, verify)
+    """
+    password_hash_rejected_total.labels(operation=operation).inc()
+
+
+def update_suggestion_index_metrics(entries: int, postings: int, memory_bytes: int) -> None:
+    """
+    Publish size of the in-memory search suggestion index.
+
+    Args:
+        entries: Number of indexed students and courses
+        postings: Number of prefix keys
+        memory_bytes: Approximate memory footprint
+    """
+    suggestion_index_entries.set(entries)
+    suggestion_index_postings.set(postings)
+    suggestion_index_memory_bytes.set(memory_bytes)
+
+
+def observe_db_pool_checkout(pool: str, seconds: float) -> None:
+    """
+    Record how long a connection checkout took.
+
+    Args:
+        pool: Pool name (primary, replica)
+        seconds: Checkout duration in seconds
+    """
+    db_pool_checkout_wait_seconds.labels(pool=pool).observe(seconds)
+
+
+def track_db_pool_timeout(pool: str) -> None:
+    """
+    Track a checkout that timed out waiting for a pooled connection.
+
+    Args:
+        pool: Pool name (primary, replica)
+    """
+    db_pool_timeouts_total.labels(pool=pool).inc()
+
+
+def update_db_pool_metrics(
+    pool: str, size: int | None = None, checked_out: int | None = None, overflow: int | None = None
+) -> None:
+    """
+    Publish current pool occupancy; values the pool class cannot report are skipped.
+
+    Args:
+        pool: Pool name (primary, replica)
+        size: Configured pool size
+        checked_out: Connections currently in use
+        overflow: Connections beyond the pool size
+    """
+    if size is not None:
+        db_pool_size.labels(pool=pool).set(size)
+    if checked_out is not None:
+        db_pool_checked_out.labels(pool=pool).set(checked_out)
+    if overflow is not None:
+        db_pool_overflow.labels(pool=pool).set(overflow)
+
+
+def observe_db_pool_connection_age(pool: str, seconds: float) -> None:
+    """
+    Record the age of a connection as it is returned to the pool.
+
+    Args:
+        pool: Pool name (primary, replica)
+        seconds: Seconds since the underlying DBAPI connection was opened
+    """
+    db_pool_connection_age_seconds.labels(pool=pool).observe(seconds)
+
+
 def track_error(error_type: str, endpoint: str) -> None:
     """
     Track application error.
@@ -0,0 +1,124 @@
+"""Add full-text search index for students and courses.
+
+Revision ID: f130_add_search_index
+Revises: 9c9a5ba0bf0b
+Create Date: 2026-10-19 09:00:00.000000
+
+PostgreSQL: ``search_vector`` tsvector generated columns with GIN indexes on
+students and courses, plus pg_trgm GIN indexes on the lower-cased searchable
+columns so substring (``LIKE '%q%'``) matches can use an index.
+
+SQLite: FTS5 external-content tables ``students_fts`` and ``courses_fts``
+(trigram tokenizer) kept in sync with their base tables by triggers.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = "f130_add_search_index"
+down_revision = "9c9a5ba0bf0b"
+branch_labels = None
+depends_on = None
+
+
+_SQLITE_FTS_TABLES = {
+    "students_fts": ("students", ["first_name", "last_name", "email", "student_id"]),
+    "courses_fts": ("courses", ["course_name", "course_code", "description"]),
+}
+
+_POSTGRES_TRGM_INDEXES = {
+    "idx_students_first_name_trgm": ("students", "first_name"),
+    "idx_students_last_name_trgm": ("students", "last_name"),
+    "idx_students_email_trgm": ("students", "email"),
+    "idx_students_student_id_trgm": ("students", "student_id"),
+    "idx_courses_course_name_trgm": ("courses", "course_name"),
+    "idx_courses_course_code_trgm": ("courses", "course_code"),
+}
+
+
+def _sqlite_upgrade(bind) -> None:
+    for fts_table, (base_table, columns) in _SQLITE_FTS_TABLES.items():
+        cols = ", ".join(columns)
+        new_values = ", ".join(f"new.{col}" for col in columns)
+        old_values = ", ".join(f"old.{col}" for col in columns)
+        bind.execute(
+            sa.text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+                f"{cols}, content='{base_table}', content_rowid='id', tokenize='trigram')"
+            )
+        )
+        bind.execute(
+            sa.text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {base_table} BEGIN "
+                f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+            )
+        )
+        bind.execute(
+            sa.text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {base_table} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END"
+            )
+        )
+        bind.execute(
+            sa.text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {base_table} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+            )
+        )
+        bind.execute(sa.text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+
+
+def _postgres_upgrade(bind) -> None:
+    bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    bind.execute(
+        sa.text(
+            "ALTER TABLE students ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') "
+            "|| setweight(to_tsvector('simple', coalesce(student_id, '')), 'B') "
+            "|| setweight(to_tsvector('simple', coalesce(email, '')), 'C')) STORED"
+        )
+    )
+    bind.execute(
+        sa.text(
+            "ALTER TABLE courses ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(course_name, '') || ' ' || coalesce(course_code, '')), 'A') "
+            "|| setweight(to_tsvector('simple', coalesce(description, '')), 'C')) STORED"
+        )
+    )
+    bind.execute(sa.text("CREATE INDEX IF NOT EXISTS idx_students_search_vector ON students USING gin (search_vector)"))
+    bind.execute(sa.text("CREATE INDEX IF NOT EXISTS idx_courses_search_vector ON courses USING gin (search_vector)"))
+    for index_name, (table, column) in _POSTGRES_TRGM_INDEXES.items():
+        bind.execute(
+            sa.text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin (lower({column}) gin_trgm_ops)")
+        )
+
+
+def upgrade() -> None:
+    """Create search index objects for the current dialect."""
+    bind = op.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+    if dialect_name == "sqlite":
+        _sqlite_upgrade(bind)
+    elif dialect_name == "postgresql":
+        _postgres_upgrade(bind)
+
+
+def downgrade() -> None:
+    """Drop search index objects."""
+    bind = op.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+    if dialect_name == "sqlite":
+        for fts_table in _SQLITE_FTS_TABLES:
+            for suffix in ("ai", "ad", "au"):
+                bind.execute(sa.text(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}"))
+            bind.execute(sa.text(f"DROP TABLE IF EXISTS {fts_table}"))
+    elif dialect_name == "postgresql":
+        for index_name in _POSTGRES_TRGM_INDEXES:
+            bind.execute(sa.text(f"DROP INDEX IF EXISTS {index_name}"))
+        bind.execute(sa.text("DROP INDEX IF EXISTS idx_students_search_vector"))
+        bind.execute(sa.text("DROP INDEX IF EXISTS idx_courses_search_vector"))
+        bind.execute(sa.text("ALTER TABLE students DROP COLUMN IF EXISTS search_vector"))
+        bind.execute(sa.text("ALTER TABLE courses DROP COLUMN IF EXISTS search_vector"))
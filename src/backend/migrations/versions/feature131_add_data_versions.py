@@ -0,0 +1,59 @@
+"""Add data version counters and generated report cache keys.
+
+Revision ID: f131_add_data_versions
+Revises: f130_add_search_index
+Create Date: 2026-10-19 12:00:00.000000
+
+``data_versions`` holds one write counter per tracked source table; the
+counters are bumped in the writing transaction and let generated reports be
+reused while their source data is unchanged. ``generated_reports.cache_key``
+stores the hash that a cached artifact was produced for.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = "f131_add_data_versions"
+down_revision = "f130_add_search_index"
+branch_labels = None
+depends_on = None
+
+
+_TRACKED_TABLES = (
+    "students",
+    "courses",
+    "course_enrollments",
+    "grades",
+    "attendances",
+    "daily_performances",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "data_versions" not in inspector.get_table_names():
+        data_versions = op.create_table(
+            "data_versions",
+            sa.Column("table_name", sa.String(length=64), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("table_name"),
+        )
+        op.bulk_insert(data_versions, [{"table_name": name, "version": 0} for name in _TRACKED_TABLES])
+
+    columns = {column["name"] for column in inspector.get_columns("generated_reports")}
+    if "cache_key" not in columns:
+        with op.batch_alter_table("generated_reports") as batch_op:
+            batch_op.add_column(sa.Column("cache_key", sa.String(length=64), nullable=True))
+            batch_op.create_index("ix_generated_reports_cache_key", ["cache_key"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("generated_reports") as batch_op:
+        batch_op.drop_index("ix_generated_reports_cache_key")
+        batch_op.drop_column("cache_key")
+    op.drop_table("data_versions")
@@ -25,7 +25,6 @@ from sqlalchemy import (
     String,
     Text,
     create_engine,
-    text,
 )
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
@@ -949,6 +948,9 @@ class GeneratedReport(Base):
     email_sent_at = Column(DateTime(timezone=True), nullable=True)
     email_error = Column(Text, nullable=True)
 
+    # Result cache: hash of the normalized definition plus source data version
+    cache_key = Column(String(64), nullable=True)
+
     # Metadata
     generated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     expires_at = Column(DateTime(timezone=True), nullable=True)  # Automatic cleanup date
@@ -963,6 +965,7 @@ class GeneratedReport(Base):
         Index("ix_generated_reports_status", "status"),
         Index("ix_generated_reports_generated_at", "generated_at"),
         Index("ix_generated_reports_expires_at", "expires_at"),
+        Index("ix_generated_reports_cache_key", "cache_key"),
     )
 
     def __repr__(self):
@@ -971,7 +974,7 @@ class GeneratedReport(Base):
         )
 
 
-def init_db(db_url: str = "sqlite:///student_management.db"):
+def init_db(db_url: str = "sqlite:///student_management.db", pool_name: str = "primary"):
     """
     Initialize the database engine with performance optimizations.
 
@@ -982,6 +985,7 @@ def init_db(db_url: str = "sqlite:///student_management.db"):
 
     Args:
         db_url: Database connection string (default: SQLite)
+        pool_name: Label for the pool's Prometheus metrics (e.g. "replica")
 
     Returns:
         engine: SQLAlchemy engine instance
@@ -1022,57 +1026,52 @@ def init_db(db_url: str = "sqlite:///student_management.db"):
                 "   ➜ Consider PostgreSQL for production use (see docs/development/ARCHITECTURE.md)"
             )
 
-        # Configure connection pooling (primarily for PostgreSQL, but applies to all)
+        try:
+            from backend.config import settings as app_settings
+        except Exception:  # pragma: no cover - fall back to pool defaults
+            app_settings = None
+
+        from backend.db_pool import (
+            build_engine_options,
+            register_pool_metrics,
+            register_sqlite_pragmas,
+            sqlite_pragmas,
+        )
+
+        # Pool class and sizing come from settings (DATABASE_POOL_* / DATABASE_SQLITE_POOL)
         engine_kwargs: dict[str, Any] = {
             "echo": False,
+            **build_engine_options(db_url, app_settings),
         }
-
+        pool_class = engine_kwargs.get("poolclass")
         if is_postgresql:
-            # PostgreSQL-specific pooling configuration
-            engine_kwargs.update(
-                {
-                    "pool_size": 20,  # Connections in pool (default: 5)
-                    "max_overflow": 10,  # Extra connections beyond pool_size (default: 10)
-                    "pool_pre_ping": True,  # Test connections before use (detect stale connections)
-                    "pool_recycle": 3600,  # Recycle connections after 1 hour (prevent stale connections)
-                }
-            )
             logger.info(
-                "PostgreSQL connection pooling configured: "
-                "pool_size=20, max_overflow=10, pool_pre_ping=True, pool_recycle=3600s"
+                "PostgreSQL connection pooling configured: pool_size=%s, max_overflow=%s, pool_timeout=%ss, "
+                "pool_pre_ping=True, pool_recycle=%ss",
+                engine_kwargs.get("pool_size"),
+                engine_kwargs.get("max_overflow"),
+                engine_kwargs.get("pool_timeout"),
+                engine_kwargs.get("pool_recycle"),
             )
         elif is_sqlite:
-            # SQLite-specific configuration
-            # Use NullPool for SQLite to avoid "database is locked" errors in multi-threaded scenarios
-            # Also disable thread checks so dependency entry/exit across threadpool workers doesn't error.
-            from sqlalchemy.pool import NullPool
-
-            engine_kwargs["poolclass"] = NullPool
-            engine_kwargs.setdefault("connect_args", {})
-            # Allow connections to be used across threads (safe for tests and small apps)
-            engine_kwargs["connect_args"].update({"check_same_thread": False})
-            logger.info("SQLite configured: NullPool + check_same_thread=False")
+            logger.info(
+                "SQLite configured: %s(pool_size=%s) + check_same_thread=False",
+                pool_class.__name__ if pool_class else "default pool",
+                engine_kwargs.get("pool_size", "-"),
+            )
 
         engine = create_engine(db_url, **engine_kwargs)
 
-        # Apply SQLite performance/safety pragmas (WAL, foreign_keys)
-        try:
-            if engine.dialect.name == "sqlite":
-                # Use a transaction context so PRAGMAs are applied consistently
-                with engine.begin() as conn:
-                    # Enable write-ahead logging for better concurrency
-                    conn.execute(text("PRAGMA journal_mode=WAL"))
-                    # Reasonable durability without being too slow for dev
-                    conn.execute(text("PRAGMA synchronous=NORMAL"))
-                    # Ensure foreign keys constraints are enforced
-                    conn.execute(text("PRAGMA foreign_keys=ON"))
-        except Exception:
-            # Best-effort; do not fail initialization on pragma errors
-            pass
+        # Apply SQLite performance/safety pragmas (WAL, foreign_keys, cache, mmap, busy timeout)
+        # on every new connection, not just the first one
+        if engine.dialect.name == "sqlite":
+            register_sqlite_pragmas(engine, sqlite_pragmas(db_url, app_settings))
+
+        # Export pool checkout wait, occupancy and connection age to Prometheus
+        register_pool_metrics(engine, pool_name)
 
         # Attach slow query monitoring if configured
         try:
-            from backend.config import settings as app_settings
             from backend.performance_monitor import setup_sqlalchemy_query_monitoring
 
             setup_sqlalchemy_query_monitoring(engine, app_settings)
@@ -1126,6 +1125,22 @@ class CustomDashboard(Base):
     )
 
 
+class DataVersion(Base):
+    """Per-table write counter used to key caches of derived data.
+
+    Bumped by the session hooks in ``backend.db.data_version`` in a separate
+    short transaction right after a write to a tracked table commits, so a
+    version may briefly trail the committed rows it describes.
+    Rows named ``course:<id>`` (and ``course:*``) count writes to one course's data.
+    """
+
+    __tablename__ = "data_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+
 # Update User relationship to include custom_dashboards
 # This will be handled by sqlalchemy after both models are defined
 
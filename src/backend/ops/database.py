@@ -4,15 +4,22 @@ Database operations including migrations, backup, and restore.
 This module provides:
 - Database migration execution
 - Backup creation (Docker volume or native file)
+- Online SQLite backups through the sqlite3 backup API
+- Incremental backups into a deduplicating chunk store
 - Backup restoration
 - Backup management (list, delete, cleanup)
 """
 
+import hashlib
+import json
+import os
 import shutil
+import sqlite3
 import subprocess
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 
 from .base import (
     BackupInfo,
@@ -24,6 +31,94 @@ from .base import (
     get_python_executable,
 )
 
+# ============================================================================
+#  ONLINE BACKUP AND CHUNK STORE
+# ============================================================================
+
+# Pages copied per backup step; the source is unlocked between steps so
+# writers are never blocked for more than one step
+ONLINE_BACKUP_PAGES_PER_STEP = 1024
+ONLINE_BACKUP_STEP_SLEEP = 0.005
+
+# Pages per stored chunk (1 MiB with the default 4 KiB page size)
+CHUNK_PAGES = 256
+
+MANIFEST_FORMAT = "sms-chunked-backup-v1"
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def online_backup(
+    source_path: Path,
+    target_path: Path,
+    pages_per_step: int = ONLINE_BACKUP_PAGES_PER_STEP,
+    step_sleep: float = ONLINE_BACKUP_STEP_SLEEP,
+) -> None:
+    """Copy a live SQLite database into ``target_path`` as one consistent snapshot.
+
+    Uses the sqlite3 backup API, which restarts automatically if the source
+    changes mid-copy, so WAL-mode databases never yield a torn file. The copy
+    is written next to the target and renamed into place when complete.
+    """
+    partial_path = target_path.with_name(f"{target_path.name}.partial")
+    partial_path.unlink(missing_ok=True)
+    source = sqlite3.connect(f"{source_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        target = sqlite3.connect(partial_path)
+        try:
+            source.backup(target, pages=pages_per_step, sleep=step_sleep)
+        finally:
+            target.close()
+        os.replace(partial_path, target_path)
+    finally:
+        source.close()
+        partial_path.unlink(missing_ok=True)
+
+
+class ChunkStore:
+    """Content-addressed, zlib-compressed chunks shared by incremental backups.
+
+    Chunks are page-aligned ranges of a database snapshot named by their
+    SHA-256, so pages unchanged since an earlier backup are stored once.
+    SQLite never shifts pages when rows change, which makes page-aligned
+    boundaries as stable as rolling-hash ones at a fraction of the cost.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.z"
+
+    def put(self, data: bytes) -> Tuple[str, bool]:
+        """Store ``data``; returns ``(digest, newly_written)``."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if path.exists():
+            return digest, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_name(f"{path.name}.partial")
+        partial_path.write_bytes(zlib.compress(data, 6))
+        os.replace(partial_path, path)
+        return digest, True
+
+    def get(self, digest: str) -> bytes:
+        data = zlib.decompress(self.path_for(digest).read_bytes())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    def prune(self, referenced: Set[str]) -> int:
+        """Delete chunks not in ``referenced``; returns the number removed."""
+        removed = 0
+        if not self.root.exists():
+            return removed
+        for path in self.root.glob("*/*.z"):
+            if path.name[: -len(".z")] not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+
 # ============================================================================
 #  DATABASE OPERATIONS
 # ============================================================================
@@ -37,6 +132,7 @@ class DatabaseOperations(Operation):
         self.backend_dir = self.root_dir / "backend"
         self.data_dir = self.root_dir / "data"
         self.backup_dir = self.root_dir / "backups"
+        self.chunk_store = ChunkStore(self.backup_dir / "chunks")
         self.db_name = "student_management.db"
 
     def get_python_path(self) -> str:
@@ -55,12 +151,18 @@ class DatabaseOperations(Operation):
         runner = MigrationRunner(self.root_dir)
         return runner.execute()
 
-    def backup_database_native(self, version: str = "unknown") -> OperationResult:
+    def backup_database_native(
+        self, version: str = "unknown", pages_per_step: int = ONLINE_BACKUP_PAGES_PER_STEP
+    ) -> OperationResult:
         """
         Backup database from native file system.
 
+        The copy is taken online with the sqlite3 backup API, so it is a
+        consistent snapshot even while the application is writing.
+
         Args:
             version: Version tag for backup filename
+            pages_per_step: Pages copied before the source is released to writers
 
         Returns:
             OperationResult with backup information
@@ -79,9 +181,9 @@ class DatabaseOperations(Operation):
             backup_filename = f"sms_backup_v{version}_{timestamp}.db"
             backup_path = self.backup_dir / backup_filename
 
-            # Copy database file
+            # Copy database pages online
             self.log_info(f"Creating backup: {backup_filename}")
-            shutil.copy2(db_path, backup_path)
+            online_backup(db_path, backup_path, pages_per_step=pages_per_step)
 
             # Get backup info
             size_bytes = backup_path.stat().st_size
@@ -102,6 +204,92 @@ class DatabaseOperations(Operation):
         except Exception as e:
             return OperationResult.failure_result("Failed to create backup", e)
 
+    def backup_database_incremental(
+        self, version: str = "unknown", pages_per_step: int = ONLINE_BACKUP_PAGES_PER_STEP
+    ) -> OperationResult:
+        """
+        Create an incremental backup in the chunk store.
+
+        An online snapshot is split into page-range chunks; chunks already in
+        the store are referenced rather than written again, and a manifest
+        lists the chunks needed to rebuild this backup.
+
+        Args:
+            version: Version tag for the manifest filename
+            pages_per_step: Pages copied before the source is released to writers
+
+        Returns:
+            OperationResult with the manifest path and chunk statistics
+        """
+        db_path = self.data_dir / self.db_name
+
+        if not db_path.exists():
+            return OperationResult.failure_result("Database file not found")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        manifest_path = self.backup_dir / f"sms_backup_v{version}_{timestamp}{MANIFEST_SUFFIX}"
+        snapshot_path = self.backup_dir / f".snapshot_{timestamp}.db"
+
+        try:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            self.log_info(f"Creating incremental backup: {manifest_path.name}")
+            online_backup(db_path, snapshot_path, pages_per_step=pages_per_step)
+
+            connection = sqlite3.connect(snapshot_path)
+            try:
+                page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                connection.close()
+
+            chunk_size = page_size * CHUNK_PAGES
+            chunks: List[str] = []
+            new_chunks = 0
+            stored_bytes = 0
+            file_hash = hashlib.sha256()
+            with open(snapshot_path, "rb") as snapshot:
+                while data := snapshot.read(chunk_size):
+                    file_hash.update(data)
+                    digest, written = self.chunk_store.put(data)
+                    chunks.append(digest)
+                    if written:
+                        new_chunks += 1
+                        stored_bytes += self.chunk_store.path_for(digest).stat().st_size
+
+            manifest = {
+                "format": MANIFEST_FORMAT,
+                "version": version,
+                "created_at": datetime.now().isoformat(),
+                "source": self.db_name,
+                "page_size": page_size,
+                "chunk_size": chunk_size,
+                "size_bytes": snapshot_path.stat().st_size,
+                "sha256": file_hash.hexdigest(),
+                "chunks": chunks,
+            }
+            partial_manifest = manifest_path.with_name(f"{manifest_path.name}.partial")
+            partial_manifest.write_text(json.dumps(manifest, indent=2))
+            os.replace(partial_manifest, manifest_path)
+
+            self.log_success(
+                f"Incremental backup created: {manifest_path.name} "
+                f"({new_chunks}/{len(chunks)} new chunks, {format_size(stored_bytes)} written)"
+            )
+            return OperationResult.success_result(
+                "Incremental backup created successfully",
+                data={
+                    "path": str(manifest_path),
+                    "size_bytes": manifest["size_bytes"],
+                    "total_chunks": len(chunks),
+                    "new_chunks": new_chunks,
+                    "stored_bytes": stored_bytes,
+                },
+            )
+
+        except Exception as e:
+            return OperationResult.failure_result("Failed to create incremental backup", e)
+        finally:
+            snapshot_path.unlink(missing_ok=True)
+
     def backup_database_docker(self, volume_name: str, version: str = "unknown") -> OperationResult:
         """
         Backup database from Docker volume.
@@ -214,6 +402,58 @@ class DatabaseOperations(Operation):
         except Exception as e:
             return OperationResult.failure_result("Failed to restore database", e)
 
+    def restore_database_incremental(self, manifest_path: Path) -> OperationResult:
+        """
+        Rebuild the database from an incremental backup manifest.
+
+        The file is reassembled from the chunk store next to the database,
+        checked against the manifest's SHA-256 and only then swapped in.
+
+        Args:
+            manifest_path: Path to the backup manifest
+
+        Returns:
+            OperationResult indicating success or failure
+        """
+        if not manifest_path.exists():
+            return OperationResult.failure_result(f"Backup manifest not found: {manifest_path}")
+
+        db_path = self.data_dir / self.db_name
+        partial_path = db_path.with_name(f"{db_path.name}.restoring")
+
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            if manifest.get("format") != MANIFEST_FORMAT:
+                return OperationResult.failure_result(f"Unsupported backup manifest: {manifest_path.name}")
+
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self.log_info(f"Restoring from: {manifest_path.name}")
+            file_hash = hashlib.sha256()
+            with open(partial_path, "wb") as target:
+                for digest in manifest["chunks"]:
+                    data = self.chunk_store.get(digest)
+                    file_hash.update(data)
+                    target.write(data)
+
+            if file_hash.hexdigest() != manifest["sha256"]:
+                return OperationResult.failure_result("Restored database does not match the backup checksum")
+
+            # A WAL left by the previous database must not be replayed onto the restored file
+            for suffix in ("-wal", "-shm"):
+                db_path.with_name(f"{db_path.name}{suffix}").unlink(missing_ok=True)
+            os.replace(partial_path, db_path)
+
+            self.log_success("Database restored successfully")
+            return OperationResult.success_result(
+                "Database restored",
+                data={"backup": str(manifest_path), "target": str(db_path)},
+            )
+
+        except Exception as e:
+            return OperationResult.failure_result("Failed to restore database", e)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
     def restore_database_docker(self, backup_path: Path, volume_name: str) -> OperationResult:
         """
         Restore database to Docker volume.
@@ -420,6 +660,65 @@ class DatabaseOperations(Operation):
                 f"Deleted {deleted_count} old backup(s), kept {keep_count} most recent"
             )
 
+    def list_incremental_backups(self) -> List[BackupInfo]:
+        """
+        List incremental backup manifests, newest first.
+
+        ``size_bytes`` is the size of the database each manifest restores.
+        """
+        if not self.backup_dir.exists():
+            return []
+
+        backups = []
+        for manifest_path in self.backup_dir.glob(f"*{MANIFEST_SUFFIX}"):
+            try:
+                manifest = json.loads(manifest_path.read_text())
+                backups.append(
+                    BackupInfo(
+                        filename=manifest_path.name,
+                        path=manifest_path,
+                        size_bytes=int(manifest.get("size_bytes", 0)),
+                        created_at=datetime.fromisoformat(manifest["created_at"]),
+                        version=str(manifest.get("version", "unknown")),
+                    )
+                )
+            except Exception as e:
+                self.log_warning(f"Could not parse backup manifest: {manifest_path.name}: {e}")
+
+        backups.sort(key=lambda b: b.created_at, reverse=True)
+        return backups
+
+    def clean_old_incremental_backups(self, keep_count: int = 24) -> OperationResult:
+        """
+        Delete old incremental manifests and the chunks only they referenced.
+
+        Args:
+            keep_count: Number of recent manifests to keep (must be >= 1)
+
+        Returns:
+            OperationResult with cleanup information
+        """
+        if keep_count < 1:
+            return OperationResult.failure_result(f"keep_count must be at least 1 (got: {keep_count})")
+
+        backups = self.list_incremental_backups()
+        try:
+            for backup in backups[keep_count:]:
+                backup.path.unlink()
+
+            referenced: Set[str] = set()
+            for backup in backups[:keep_count]:
+                referenced.update(json.loads(backup.path.read_text())["chunks"])
+            removed_chunks = self.chunk_store.prune(referenced)
+        except Exception as e:
+            return OperationResult.failure_result("Failed to clean incremental backups", e)
+
+        deleted = max(0, len(backups) - keep_count)
+        return OperationResult.success_result(
+            f"Deleted {deleted} old incremental backup(s) and {removed_chunks} unreferenced chunk(s)",
+            data={"deleted_backups": deleted, "removed_chunks": removed_chunks},
+        )
+
     def get_database_size(self) -> Optional[int]:
         """
         Get size of database in bytes.
@@ -503,14 +802,20 @@ class DatabaseOperations(Operation):
             )
         elif operation == "backup_native":
             return self.backup_database_native(**kwargs)
+        elif operation == "backup_incremental":
+            return self.backup_database_incremental(**kwargs)
         elif operation == "backup_docker":
             return self.backup_database_docker(**kwargs)
         elif operation == "restore_native":
             return self.restore_database_native(**kwargs)
+        elif operation == "restore_incremental":
+            return self.restore_database_incremental(**kwargs)
         elif operation == "restore_docker":
             return self.restore_database_docker(**kwargs)
         elif operation == "clean_old":
             return self.clean_old_backups(**kwargs)
+        elif operation == "clean_old_incremental":
+            return self.clean_old_incremental_backups(**kwargs)
         elif operation == "schema_version":
             return self.check_schema_version()
         elif operation == "initialize":
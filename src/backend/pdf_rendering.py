@@ -0,0 +1,543 @@
+"""
+Shared PDF table rendering.
+
+Fonts and paragraph styles are registered once per process, long tables are
+split into page-sized chunks, cells that fit their column are emitted as plain
+strings instead of Paragraphs, and documents are rendered in a process pool so
+large exports neither hold the GIL nor block the event loop.
+
+This module deliberately depends only on ReportLab and the standard library:
+spawned render workers import it without loading settings, models or the
+services package.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+from xml.sax.saxutils import escape
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    REPORTLAB_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional/runtime dependency
+    REPORTLAB_AVAILABLE = False
+    Flowable = Any  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bytes per chunk when streaming a rendered document back to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Lower bound on rows per table chunk; tiny chunks only add flowable overhead
+MIN_ROWS_PER_CHUNK = 10
+
+
+@dataclass(frozen=True)
+class PdfTableLayout:
+    """Visual settings for a single-table document. Sizes are in points."""
+
+    title_color: str = "#4F46E5"
+    title_size: float = 20
+    title_space_after: float = 20
+    title_bold: bool = False
+    header_bg: str = "#4F46E5"
+    header_bold: bool = False
+    header_font_size: Optional[float] = 9.5
+    # None picks a size from the column count (10pt, shrinking to 7pt for wide tables)
+    body_font_size: Optional[float] = 9
+    align: str = "CENTER"
+    valign: str = "MIDDLE"
+    row_backgrounds: Tuple[str, ...] = ("#F5F5DC",)
+    group_bg: str = "#DBEAFE"
+    group_color: str = "#1E40AF"
+    cell_padding: Tuple[float, float, float, float] = (6, 6, 3, 3)  # left, right, top, bottom
+    header_bottom_padding: float = 8
+    margins: Tuple[float, float, float, float] = (43.2, 43.2, 72, 72)  # left, right, top, bottom
+    landscape_above_columns: Optional[int] = None
+    # "compact" caps columns at their content width; "fill" stretches them across the page
+    width_mode: str = "compact"
+
+
+# Tabular exports served from /api/v1/export/*/pdf
+EXPORT_TABLE_LAYOUT = PdfTableLayout()
+
+# Custom report artifacts produced by CustomReportGenerationService
+CUSTOM_REPORT_LAYOUT = PdfTableLayout(
+    title_color="#1f77b4",
+    title_size=16,
+    title_space_after=12,
+    title_bold=True,
+    header_bg="#1f77b4",
+    header_bold=True,
+    header_font_size=None,
+    body_font_size=None,
+    align="LEFT",
+    valign="TOP",
+    row_backgrounds=("#FFFFFF", "#F3F4F6"),
+    cell_padding=(6, 6, 6, 6),
+    margins=(36, 36, 36, 36),
+    landscape_above_columns=8,
+    width_mode="fill",
+)
+
+
+@dataclass(frozen=True)
+class PdfTableDocument:
+    """Picklable description of a titled table document; cells are pre-rendered strings."""
+
+    title: str
+    headers: Sequence[str]
+    rows: Sequence[Sequence[str]]
+    layout: PdfTableLayout = field(default_factory=PdfTableLayout)
+    group_by_col_index: Optional[int] = None
+
+
+@lru_cache(maxsize=1)
+def register_report_fonts() -> tuple[str, str]:
+    """Register Unicode-capable fonts for PDF rendering and return (regular, bold) names.
+
+    The TTF files are parsed once per process; later calls return the cached names.
+    """
+    font_regular = "DejaVuSans"
+    font_bold = "DejaVuSans-Bold"
+    fonts_dir = Path(__file__).resolve().parent / "fonts"
+    regular_path = fonts_dir / "DejaVuSans.ttf"
+    bold_path = fonts_dir / "DejaVuSans-Bold.ttf"
+
+    if regular_path.exists() and bold_path.exists():
+        registered = set(pdfmetrics.getRegisteredFontNames())
+        if font_regular not in registered:
+            pdfmetrics.registerFont(TTFont(font_regular, str(regular_path)))
+        if font_bold not in registered:
+            pdfmetrics.registerFont(TTFont(font_bold, str(bold_path)))
+        return font_regular, font_bold
+
+    return "Helvetica", "Helvetica-Bold"
+
+
+def _require_reportlab() -> None:
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError("ReportLab is required for PDF generation. Install with: pip install reportlab")
+
+
+@lru_cache(maxsize=1)
+def _sample_styles() -> Any:
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=128)
+def paragraph_style(
+    name: str,
+    parent: str,
+    font_name: str,
+    font_size: float,
+    *,
+    leading: Optional[float] = None,
+    text_color: Optional[str] = None,
+    alignment: int = 0,
+    space_after: float = 0,
+) -> Any:
+    """Return a cached ParagraphStyle; styles are immutable once built and safe to share."""
+    _require_reportlab()
+    kwargs: dict[str, Any] = {
+        "parent": _sample_styles()[parent],
+        "fontName": font_name,
+        "fontSize": font_size,
+        "leading": leading if leading is not None else font_size * 1.2,
+        "alignment": alignment,
+    }
+    if text_color:
+        kwargs["textColor"] = colors.white if text_color == "white" else colors.HexColor(text_color)
+    if space_after:
+        kwargs["spaceAfter"] = space_after
+    return ParagraphStyle(name, **kwargs)
+
+
+def table_cell(text: Any, width: float, font_name: str, font_size: float, style: Any, padding: float) -> Any:
+    """Plain string when the text fits on one line of the column, otherwise a wrapping Paragraph."""
+    value = "" if text is None else str(text)
+    if "\n" not in value and stringWidth(value, font_name, font_size) <= width - padding:
+        return value
+    return Paragraph(escape(value).replace("\n", "<br/>"), style)
+
+
+def fit_compact_column_widths(rows: Sequence[Sequence[Any]], available_width: float) -> List[float]:
+    """Size columns by their longest value, clamped to 0.8in..2.6in and scaled to fit the frame."""
+    if not rows:
+        return []
+    column_count = max(len(row) for row in rows)
+    max_lengths = [0] * column_count
+    for row in rows:
+        for idx, value in enumerate(row):
+            length = len(str(value or ""))
+            if length > max_lengths[idx]:
+                max_lengths[idx] = length
+
+    char_width = 5.2
+    min_width = 0.8 * inch
+    max_width = 2.6 * inch
+    widths = [min(max_width, max(min_width, length * char_width)) for length in max_lengths]
+
+    total = sum(widths)
+    if total > available_width and total > 0:
+        scale = available_width / total
+        widths = [max(min_width, width * scale) for width in widths]
+        total = sum(widths)
+        if total > available_width:
+            overflow = total - available_width
+            widths[-1] = max(min_width, widths[-1] - overflow)
+
+    return widths
+
+
+def fit_fill_column_widths(
+    headers: Sequence[str], rows: Sequence[Sequence[Any]], available_width: float, font_size: float
+) -> List[float]:
+    """Estimate widths from content, shrink to the frame if needed, then spread spare width evenly."""
+    col_count = max(len(headers), 1)
+    max_lengths = [max(len(str(headers[idx])) if idx < len(headers) else 0, 6) for idx in range(col_count)]
+    for row in rows:
+        for idx, value in enumerate(row[:col_count]):
+            length = len(str(value))
+            if length > max_lengths[idx]:
+                max_lengths[idx] = length
+
+    font_factor = font_size * 0.62
+    estimated = [max(72.0, length * font_factor + 12) for length in max_lengths]
+    total_estimated = sum(estimated) or available_width
+    scale = min(1.0, available_width / total_estimated)
+
+    min_col_width = 20.0
+    widths = [max(min_col_width, width * scale) for width in estimated]
+    total = sum(widths)
+    if total > available_width and total > 0:
+        rescale = available_width / total
+        widths = [max(min_col_width, width * rescale) for width in widths]
+        total = sum(widths)
+    if total < available_width:
+        extra = (available_width - total) / col_count
+        widths = [width + extra for width in widths]
+    return widths
+
+
+def _body_font_size(layout: PdfTableLayout, column_count: int) -> float:
+    if layout.body_font_size is not None:
+        return layout.body_font_size
+    if column_count > 10:
+        return 7
+    if column_count > 8:
+        return 8
+    if column_count > 6:
+        return 9
+    return 10
+
+
+class _TableChunkBuilder:
+    """Builds page-sized Table flowables that share column widths and row striping."""
+
+    def __init__(self, document: PdfTableDocument, frame_width: float, frame_height: float) -> None:
+        layout = document.layout
+        self.document = document
+        self.layout = layout
+        self.headers = [str(header) for header in document.headers]
+        self.col_count = max(len(self.headers), 1)
+
+        self.font, self.font_bold = register_report_fonts()
+        self.body_size = _body_font_size(layout, len(self.headers))
+        self.header_size = layout.header_font_size or self.body_size
+        self.header_font = self.font_bold if layout.header_bold else self.font
+        alignment = TA_CENTER if layout.align == "CENTER" else TA_LEFT
+        self.cell_style = paragraph_style(
+            "PdfTableCell", "BodyText", self.font, self.body_size, leading=self.body_size + 2, alignment=alignment
+        )
+        self.header_style = paragraph_style(
+            "PdfTableHeader",
+            "BodyText",
+            self.header_font,
+            self.header_size,
+            leading=self.header_size + 2,
+            text_color="white",
+            alignment=TA_CENTER,
+        )
+        self.group_style = paragraph_style(
+            "PdfTableGroup",
+            "BodyText",
+            self.font_bold,
+            self.body_size,
+            leading=self.body_size + 2,
+            text_color=layout.group_color,
+        )
+
+        if layout.width_mode == "fill":
+            self.col_widths = fit_fill_column_widths(self.headers, document.rows, frame_width, self.body_size)
+        else:
+            self.col_widths = fit_compact_column_widths([self.headers, *document.rows], frame_width)
+        self.total_width = sum(self.col_widths)
+        self.h_padding = layout.cell_padding[0] + layout.cell_padding[1]
+
+        row_height = self.body_size + 2 + layout.cell_padding[2] + layout.cell_padding[3]
+        self.rows_per_chunk = max(MIN_ROWS_PER_CHUNK, int(frame_height // row_height) - 1)
+        self.header_row = [
+            table_cell(header, width, self.header_font, self.header_size, self.header_style, self.h_padding)
+            for header, width in zip(self.headers, self.col_widths)
+        ]
+        self.data_rows_emitted = 0
+
+    def _base_commands(self) -> List[Tuple[Any, ...]]:
+        layout = self.layout
+        left, right, top, bottom = layout.cell_padding
+        return [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(layout.header_bg)),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+            ("ALIGN", (0, 1), (-1, -1), layout.align),
+            ("VALIGN", (0, 0), (-1, -1), layout.valign),
+            ("FONTNAME", (0, 0), (-1, 0), self.header_font),
+            ("FONTNAME", (0, 1), (-1, -1), self.font),
+            ("FONTSIZE", (0, 0), (-1, 0), self.header_size),
+            ("LEADING", (0, 0), (-1, 0), self.header_size + 2),
+            ("FONTSIZE", (0, 1), (-1, -1), self.body_size),
+            ("LEADING", (0, 1), (-1, -1), self.body_size + 2),
+            ("LEFTPADDING", (0, 0), (-1, -1), left),
+            ("RIGHTPADDING", (0, 0), (-1, -1), right),
+            ("TOPPADDING", (0, 0), (-1, -1), top),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), layout.header_bottom_padding),
+            ("BOTTOMPADDING", (0, 1), (-1, -1), bottom),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ]
+
+    def _cell(self, value: str, width: float) -> Any:
+        return table_cell(value, width, self.font, self.body_size, self.cell_style, self.h_padding)
+
+    def chunks(self) -> Iterator[Any]:
+        document = self.document
+        group_index = document.group_by_col_index
+        backgrounds = [colors.HexColor(color) for color in self.layout.row_backgrounds] or [colors.white]
+        group_bg = colors.HexColor(self.layout.group_bg)
+        current_group: Optional[str] = None
+
+        data: List[List[Any]] = [self.header_row]
+        commands = self._base_commands()
+
+        def flush() -> Any:
+            table = Table(data, repeatRows=1, colWidths=self.col_widths)
+            table.setStyle(TableStyle(commands))
+            return table
+
+        for row in document.rows:
+            if group_index is not None and group_index < len(row):
+                group_val = str(row[group_index])
+                if group_val != current_group:
+                    current_group = group_val
+                    label = f"{self.headers[group_index]}: {group_val}"
+                    group_at = len(data)
+                    label_cell = table_cell(
+                        label, self.total_width, self.font_bold, self.body_size, self.group_style, self.h_padding
+                    )
+                    data.append([label_cell] + [""] * (self.col_count - 1))
+                    commands.extend(
+                        [
+                            ("BACKGROUND", (0, group_at), (-1, group_at), group_bg),
+                            ("SPAN", (0, group_at), (-1, group_at)),
+                            ("FONTNAME", (0, group_at), (-1, group_at), self.font_bold),
+                            ("TEXTCOLOR", (0, group_at), (-1, group_at), colors.HexColor(self.layout.group_color)),
+                        ]
+                    )
+
+            row_at = len(data)
+            data.append([self._cell(value, width) for value, width in zip(row, self.col_widths)])
+            background = backgrounds[self.data_rows_emitted % len(backgrounds)]
+            commands.append(("BACKGROUND", (0, row_at), (-1, row_at), background))
+            self.data_rows_emitted += 1
+
+            if len(data) > self.rows_per_chunk:
+                yield flush()
+                data = [self.header_row]
+                commands = self._base_commands()
+
+        if len(data) > 1 or self.data_rows_emitted == 0:
+            yield flush()
+
+
+def render_table_pdf(document: PdfTableDocument, target: Union[str, BinaryIO]) -> None:
+    """Render a titled table document to a path or binary file object."""
+    _require_reportlab()
+    layout = document.layout
+    page_size = letter
+    if layout.landscape_above_columns is not None and len(document.headers) > layout.landscape_above_columns:
+        page_size = landscape(letter)
+
+    left, right, top, bottom = layout.margins
+    doc = SimpleDocTemplate(
+        target, pagesize=page_size, leftMargin=left, rightMargin=right, topMargin=top, bottomMargin=bottom
+    )
+    font, font_bold = register_report_fonts()
+    title_style = paragraph_style(
+        "PdfTableTitle",
+        "Heading1",
+        font_bold if layout.title_bold else font,
+        layout.title_size,
+        leading=layout.title_size * 1.2,
+        text_color=layout.title_color,
+        alignment=TA_CENTER,
+        space_after=layout.title_space_after,
+    )
+    elements: List[Flowable] = [Paragraph(escape(document.title), title_style), Spacer(1, 0.2 * inch)]
+    elements.extend(_TableChunkBuilder(document, doc.width, doc.height).chunks())
+    doc.build(elements)
+
+
+def _warm_worker() -> None:
+    """Process pool initializer: pay font parsing and style setup once per worker."""
+    if REPORTLAB_AVAILABLE:
+        register_report_fonts()
+        _sample_styles()
+
+
+def _default_workers() -> int:
+    try:
+        from backend.config import settings
+
+        return int(getattr(settings, "PDF_RENDER_WORKERS", 2))
+    except Exception:  # pragma: no cover - settings unavailable in stripped-down environments
+        return 2
+
+
+class PdfRenderingService:
+    """Runs PDF rendering callables in a lazily started process pool.
+
+    With ``max_workers`` set to 0, or inside a frozen executable where spawning
+    helper processes is unreliable, work runs in-process instead.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = _default_workers() if max_workers is None else max_workers
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def uses_processes(self) -> bool:
+        return self.max_workers > 0 and not getattr(sys, "frozen", False)
+
+    def _get_executor(self) -> Optional[Executor]:
+        if not self.uses_processes:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` in the pool and block the calling thread until it finishes."""
+        executor = self._get_executor()
+        if executor is None:
+            return fn(*args, **kwargs)
+        try:
+            return executor.submit(fn, *args, **kwargs).result()
+        except BrokenProcessPool:
+            logger.warning("PDF render pool died; rendering in-process", exc_info=True)
+            self._reset_executor()
+            return fn(*args, **kwargs)
+
+    async def run_async(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await ``fn`` without blocking the event loop."""
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wrap_future(executor.submit(fn, *args, **kwargs), loop=loop)
+        except BrokenProcessPool:
+            logger.warning("PDF render pool died; rendering in a thread", exc_info=True)
+            self._reset_executor()
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def render_table_to_file(self, document: PdfTableDocument, file_path: str) -> None:
+        self.run(render_table_pdf, document, file_path)
+
+    async def render_table_to_temp_file(self, document: PdfTableDocument) -> str:
+        """Render into a temporary file and return its path; the caller removes it."""
+        handle, path = tempfile.mkstemp(prefix="sms_export_", suffix=".pdf")
+        os.close(handle)
+        try:
+            await self.run_async(render_table_pdf, document, path)
+        except BaseException:
+            _remove_quietly(path)
+            raise
+        return path
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def iter_file_and_remove(path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Stream a temporary file in chunks and delete it once fully sent or abandoned."""
+    try:
+        with open(path, "rb") as handle:
+            while chunk := handle.read(chunk_size):
+                yield chunk
+    finally:
+        _remove_quietly(path)
+
+
+_renderer: Optional[PdfRenderingService] = None
+_renderer_lock = threading.Lock()
+
+
+def get_pdf_renderer() -> PdfRenderingService:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = PdfRenderingService()
+        return _renderer
+
+
+def shutdown_pdf_renderer() -> None:
+    global _renderer
+    with _renderer_lock:
+        renderer, _renderer = _renderer, None
+    if renderer is not None:
+        renderer.shutdown()
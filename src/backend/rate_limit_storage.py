@@ -0,0 +1,363 @@
+"""
+Shared rate limit and login throttle storage.
+
+slowapi's ``memory://`` storage lives inside one process, so with several
+uvicorn workers each worker enforces its own counters and the effective limit
+becomes N times looser. This module registers a ``sqlite://`` storage scheme
+with the ``limits`` library: a single SQLite file in WAL mode (memory-mapped
+reads, one upsert per hit) that every worker of this install shares. The same
+file also holds login throttle state, so it lives under the app's data
+directory and is created readable by its owner only; a world-writable location
+such as the system temp directory would let any local user reset lockouts.
+Redis remains available as a remote backend through the standard ``redis://``
+URI.
+
+Configuration (environment):
+    RATE_LIMIT_STORAGE_URI=sqlite:////var/lib/sms/rate_limits.sqlite3
+    RATE_LIMIT_STORAGE_URI=redis://redis:6379/1
+    RATE_LIMIT_STORAGE_URI=memory://   (per-process, previous behaviour)
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from math import floor
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+STORAGE_URI_ENV = "RATE_LIMIT_STORAGE_URI"
+DEFAULT_SQLITE_DIRNAME = "rate_limits"
+DEFAULT_SQLITE_FILENAME = "sms_rate_limits.sqlite3"
+SQLITE_SCHEME = "sqlite://"
+
+# Expired rows are swept after this many writes rather than on every hit
+PURGE_INTERVAL = 1000
+
+_BUSY_TIMEOUT_MS = 5000
+_MMAP_SIZE = 16 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit_counters (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_rate_limit_counters_expires_at ON rate_limit_counters (expires_at);
+CREATE TABLE IF NOT EXISTS login_throttle (
+    key TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    window_start REAL NOT NULL,
+    lockout_until REAL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_login_throttle_expires_at ON login_throttle (expires_at);
+"""
+
+# Insert a fresh counter or add to a live one; an expired counter restarts.
+_INCR_SQL = """
+INSERT INTO rate_limit_counters (key, value, expires_at) VALUES (?1, ?2, ?3)
+ON CONFLICT (key) DO UPDATE SET
+    value = CASE WHEN rate_limit_counters.expires_at <= ?4
+        THEN excluded.value ELSE rate_limit_counters.value + excluded.value END,
+    expires_at = CASE WHEN rate_limit_counters.expires_at <= ?4
+        THEN excluded.expires_at ELSE rate_limit_counters.expires_at END
+RETURNING value
+"""
+
+# (attempts, window_start, lockout_until) as epoch seconds
+ThrottleRecord = Tuple[int, float, Optional[float]]
+
+
+def running_under_pytest() -> bool:
+    return "PYTEST_CURRENT_TEST" in os.environ or "pytest" in sys.modules
+
+
+def default_storage_uri() -> str:
+    """SQLite file under ``DATA_DIR``, shared by all local workers of this install."""
+    from backend.config import DATA_DIR  # deferred so explicit URIs work without app settings
+
+    path = Path(DATA_DIR) / DEFAULT_SQLITE_DIRNAME / DEFAULT_SQLITE_FILENAME
+    return f"{SQLITE_SCHEME}/{path.as_posix()}"
+
+
+def resolve_storage_uri() -> str:
+    """Storage URI from ``RATE_LIMIT_STORAGE_URI``; tests default to memory."""
+    uri = os.environ.get(STORAGE_URI_ENV, "").strip()
+    if uri:
+        return uri
+    if running_under_pytest():
+        return "memory://"
+    return default_storage_uri()
+
+
+def sqlite_path_from_uri(uri: str) -> Optional[str]:
+    """Return the database path of a ``sqlite:///<path>`` URI, else ``None``."""
+    if not uri.startswith(SQLITE_SCHEME + "/"):
+        return None
+    path = uri[len(SQLITE_SCHEME) + 1 :]
+    if not path:
+        raise ValueError(f"SQLite rate limit storage URI has no path: {uri!r}")
+    return path
+
+
+def _create_private_file(path: str) -> None:
+    """Create ``path`` (and its directory) accessible to the owner only, if missing."""
+    Path(path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except FileExistsError:
+        return
+    os.close(fd)
+
+
+class SQLiteDatabase:
+    """Per-thread autocommit connections to one WAL-mode SQLite file.
+
+    The file is created owner-only before SQLite opens it; its WAL and shared
+    memory files inherit those permissions. Connections are reopened after a
+    fork so pre-forked workers never share a handle inherited from the parent.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        _create_private_file(path)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self) -> sqlite3.Connection:
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None and local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(
+            self.path,
+            timeout=_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+        conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+        if not self._schema_ready:
+            with self._schema_lock:
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+        local.conn = conn
+        local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the database write lock for a read-modify-write sequence."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+_databases: Dict[str, SQLiteDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_sqlite_database(path: str) -> SQLiteDatabase:
+    key = os.path.abspath(path)
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = SQLiteDatabase(path)
+        return database
+
+
+class SQLiteRateLimitStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """``limits`` storage for fixed-window and sliding-window-counter strategies.
+
+    Each hit is a single ``INSERT .. ON CONFLICT .. RETURNING`` statement, and
+    the sliding-window check runs inside one ``BEGIN IMMEDIATE`` transaction,
+    so concurrent workers never over-admit. Moving-window limits are not
+    supported; use Redis for those.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options: Any) -> None:
+        path = sqlite_path_from_uri(uri)
+        if path is None:
+            raise ValueError(f"Not a SQLite storage URI: {uri!r}")
+        self._db = get_sqlite_database(path)
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return sqlite3.Error
+
+    def _increment(self, conn: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        value = conn.execute(_INCR_SQL, (key, amount, now + expiry, now)).fetchall()[0][0]
+        self._writes += 1
+        if self._writes % PURGE_INTERVAL == 0:
+            conn.execute("DELETE FROM rate_limit_counters WHERE expires_at <= ?", (now,))
+        return int(value)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._increment(self._db.connection(), key, expiry, amount, time.time())
+
+    def get(self, key: str) -> int:
+        row = (
+            self._db.connection()
+            .execute(
+                "SELECT value FROM rate_limit_counters WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return int(row[0]) if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = (
+            self._db.connection()
+            .execute(
+                "SELECT expires_at FROM rate_limit_counters WHERE key = ? AND expires_at > ?",
+                (key, now),
+            )
+            .fetchone()
+        )
+        return float(row[0]) if row else now
+
+    def check(self) -> bool:
+        try:
+            self._db.connection().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        cursor = self._db.connection().execute("DELETE FROM rate_limit_counters")
+        return cursor.rowcount
+
+    def clear(self, key: str) -> None:
+        self._db.connection().execute("DELETE FROM rate_limit_counters WHERE key = ?", (key,))
+
+    def _sliding_window_info(
+        self, conn: sqlite3.Connection, previous_key: str, current_key: str, expiry: int, now: float
+    ) -> tuple[int, float, int, float]:
+        rows = dict(
+            conn.execute(
+                "SELECT key, value FROM rate_limit_counters WHERE key IN (?, ?) AND expires_at > ?",
+                (previous_key, current_key, now),
+            ).fetchall()
+        )
+        previous_count = int(rows.get(previous_key, 0))
+        current_count = int(rows.get(current_key, 0))
+        previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._db.transaction() as conn:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+                conn, previous_key, current_key, expiry, now
+            )
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            # A new counter lives for two windows so it can serve as the next "previous" one
+            self._increment(conn, current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window_info(self._db.connection(), previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self._db.connection().execute(
+            "DELETE FROM rate_limit_counters WHERE key IN (?, ?)",
+            (previous_key, current_key),
+        )
+
+
+class SQLiteThrottleStore:
+    """Login throttle records shared by all workers through the SQLite file."""
+
+    def __init__(self, path: str) -> None:
+        self._db = get_sqlite_database(path)
+        self._writes = 0
+        self._conn: threading.local = threading.local()
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self._db.transaction() as conn:
+            self._conn.active = conn
+            try:
+                yield
+            finally:
+                self._conn.active = None
+
+    def _connection(self) -> sqlite3.Connection:
+        return getattr(self._conn, "active", None) or self._db.connection()
+
+    def get(self, key: str, now: float) -> Optional[ThrottleRecord]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT attempts, window_start, lockout_until FROM login_throttle WHERE key = ? AND expires_at > ?",
+                (key, now),
+            )
+            .fetchone()
+        )
+        return (int(row[0]), float(row[1]), row[2]) if row else None
+
+    def set(self, key: str, record: ThrottleRecord, expires_at: float) -> None:
+        conn = self._connection()
+        attempts, window_start, lockout_until = record
+        conn.execute(
+            "INSERT OR REPLACE INTO login_throttle (key, attempts, window_start, lockout_until, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, attempts, window_start, lockout_until, expires_at),
+        )
+        self._writes += 1
+        if self._writes % PURGE_INTERVAL == 0:
+            conn.execute("DELETE FROM login_throttle WHERE expires_at <= ?", (time.time(),))
+
+    def pop(self, key: str) -> None:
+        self._connection().execute("DELETE FROM login_throttle WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM login_throttle")
+
+    def __len__(self) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM login_throttle WHERE expires_at > ?", (time.time(),))
+        return int(row.fetchone()[0])
+
+
+__all__ = [
+    "STORAGE_URI_ENV",
+    "SQLiteDatabase",
+    "SQLiteRateLimitStorage",
+    "SQLiteThrottleStore",
+    "ThrottleRecord",
+    "default_storage_uri",
+    "get_sqlite_database",
+    "resolve_storage_uri",
+    "running_under_pytest",
+    "sqlite_path_from_uri",
+]
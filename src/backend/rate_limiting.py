@@ -9,6 +9,8 @@ import os
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from backend.rate_limit_storage import resolve_storage_uri
+
 # Initialize limiter without loading .env file (avoids encoding issues on Windows)
 # Explicitly disable reading .env at import time by passing config with ENV_FILE=None.
 # The limiter will be attached to app.state in main.py
@@ -16,7 +18,20 @@ from slowapi.util import get_remote_address
 # flakiness and artificial 429s in unit tests.
 _testing = bool(os.environ.get("PYTEST_CURRENT_TEST"))
 
-limiter = Limiter(key_func=get_remote_address, enabled=(not _testing), storage_uri="memory://")
+#
+# Counters live in a storage shared by every worker on the host (SQLite in WAL
+# mode by default, Redis when RATE_LIMIT_STORAGE_URI points at one). If the
+# shared storage becomes unreachable, slowapi falls back to per-process memory.
+RATE_LIMIT_STORAGE_URI = resolve_storage_uri()
+RATE_LIMIT_STRATEGY = os.environ.get("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+
+limiter = Limiter(
+    key_func=get_remote_address,
+    enabled=(not _testing),
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=not RATE_LIMIT_STORAGE_URI.startswith("memory://"),
+)
 
 
 def _get_dynamic_limits():
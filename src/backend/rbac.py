@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 
 from backend.db import get_session as get_db
 from backend.models import Permission, RolePermission, User, UserPermission, UserRole
+from backend.security.auth_cache import PermissionProfile, auth_cache
 from backend.security.current_user import get_current_user
 
 
@@ -254,8 +255,47 @@ def has_permission(user: User, permission_key: str, db: Session) -> bool:
     except Exception:
         auth_mode = "disabled"
 
+    profile = _permission_profile(user, db)
+
+    # Evaluate matches
+    if any(_permission_matches(g, required_key) for g in profile.granted):
+        return True
+
+    # Defensive legacy/admin fallback (narrow scope):
+    # Some migrated environments can temporarily miss RBAC permission links
+    # for import operations, while legacy admin role is still authoritative.
+    # Keep this limited to imports:* so we don't broaden unrelated checks.
+    #
+    # NOTE:
+    # We intentionally do NOT require `granted` to be empty here. In mixed
+    # migration states an admin may have partial role/direct grants loaded,
+    # but still miss imports:* links specifically, which would otherwise
+    # return 403 for /imports/upload.
+    user_role = (getattr(user, "role", "") or "").strip().lower()
+    if user_role == "admin" and required_key.startswith("imports:"):
+        return True
+
+    # Use fallback role permissions for legacy users and for stale role drift
+    # where User.role and user_roles disagree. Direct user permission rows still
+    # suppress defaults because those are explicit grants/restrictions.
+    if profile.use_role_defaults:
+        default_perms = _default_role_permissions(getattr(user, "role", None))
+        if any(_permission_matches(g, required_key) for g in default_perms):
+            return True
+
+    return False
+
+
+def _permission_profile(user: User, db: Session) -> PermissionProfile:
+    """Resolve the user's grants, reusing the cached profile for user snapshots."""
+
+    cached = auth_cache.get_permissions(user)
+    if cached is not None:
+        return cached
+
     # Collect granted permissions
     granted: set[str] = set()
+    valid_until: Optional[float] = None
 
     # Direct user permissions (respect expiration)
     try:
@@ -278,6 +318,9 @@ def has_permission(user: User, permission_key: str, db: Session) -> bool:
                     expires_at = expires_at.replace(tzinfo=timezone.utc)
                 if now > expires_at:
                     continue
+                # The profile must not outlive the grant
+                if valid_until is None or expires_at.timestamp() < valid_until:
+                    valid_until = expires_at.timestamp()
             granted.add(_normalize_permission_key(perm.key))
     except Exception:
         # If anything goes wrong with direct permissions, fall back to role mapping
@@ -299,24 +342,6 @@ def has_permission(user: User, permission_key: str, db: Session) -> bool:
         _safe_rollback(db)
         pass
 
-    # Evaluate matches
-    if any(_permission_matches(g, required_key) for g in granted):
-        return True
-
-    # Defensive legacy/admin fallback (narrow scope):
-    # Some migrated environments can temporarily miss RBAC permission links
-    # for import operations, while legacy admin role is still authoritative.
-    # Keep this limited to imports:* so we don't broaden unrelated checks.
-    #
-    # NOTE:
-    # We intentionally do NOT require `granted` to be empty here. In mixed
-    # migration states an admin may have partial role/direct grants loaded,
-    # but still miss imports:* links specifically, which would otherwise
-    # return 403 for /imports/upload.
-    user_role = (getattr(user, "role", "") or "").strip().lower()
-    if user_role == "admin" and required_key.startswith("imports:"):
-        return True
-
     # Check if user has any direct permission assignments (even if expired)
     try:
         has_user_permissions = (
@@ -326,15 +351,14 @@ def has_permission(user: User, permission_key: str, db: Session) -> bool:
         _safe_rollback(db)
         has_user_permissions = False
 
-    # Use fallback role permissions for legacy users and for stale role drift
-    # where User.role and user_roles disagree. Direct user permission rows still
-    # suppress defaults because those are explicit grants/restrictions.
-    if _should_use_legacy_role_defaults(user, db, has_user_permissions):
-        default_perms = _default_role_permissions(getattr(user, "role", None))
-        if any(_permission_matches(g, required_key) for g in default_perms):
-            return True
-
-    return False
+    profile = PermissionProfile(
+        granted=frozenset(granted),
+        has_user_permissions=has_user_permissions,
+        use_role_defaults=_should_use_legacy_role_defaults(user, db, has_user_permissions),
+        valid_until=valid_until,
+    )
+    auth_cache.store_permissions(user, profile)
+    return profile
 
 
 def _is_self_access(
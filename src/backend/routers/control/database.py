@@ -19,6 +19,7 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 
 from backend.control_auth import require_control_admin
+from backend.routers.control.base import _cache_get, _cache_set
 from backend.services.database_manager import (
     _validate_backup_filename,
     _find_instance,
@@ -35,6 +36,10 @@ from backend.services.database_manager import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Estimated stats are cheap catalog reads; exact counts scan every table.
+_STATS_CACHE_TTL_SECONDS = 30
+_EXACT_STATS_CACHE_TTL_SECONDS = 300
+
 
 def _coerce_credential_value(value: Any) -> str | None:
     if value is None:
@@ -154,6 +159,7 @@ class RestoreResult(BaseModel):
 
 class DatabaseStats(BaseModel):
     name: str
+    rows_exact: bool = False
     table_count: Optional[int] = None
     tables: Optional[List[Dict[str, Any]]] = None
     active_connections: Optional[int] = None
@@ -236,12 +242,21 @@ async def get_instance_status(
 async def get_database_stats(
     name: str,
     request: Request,
+    exact: bool = Query(False, description="Run count(*) per table instead of using planner estimates"),
+    refresh: bool = Query(False, description="Bypass the short-lived stats cache"),
     _auth=Depends(require_control_admin),
 ):
     """Get detailed statistics for a database instance."""
+    cache_key = f"database_stats:{name}:{'exact' if exact else 'estimate'}"
+    ttl = _EXACT_STATS_CACHE_TTL_SECONDS if exact else _STATS_CACHE_TTL_SECONDS
     try:
+        cached = None if refresh else _cache_get(cache_key, ttl_seconds=ttl)
+        if cached is not None:
+            return DatabaseStats(**cached)
         inst = _find_instance(name)
-        stats = get_instance_stats(inst)
+        stats = get_instance_stats(inst, exact_counts=exact)
+        if not stats.get("error"):
+            _cache_set(cache_key, stats)
         return DatabaseStats(**stats)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
@@ -1125,9 +1125,12 @@ async def restore_database(request: Request, backup_filename: str, _auth=Depends
                 pass
 
             # Reinitialize db_module.engine using models.init_db() which properly configures
-            # SQLite with NullPool, WAL mode, and other critical settings
+            # the SQLite pool strategy, per-connection PRAGMAs (WAL etc.) and pool metrics
             db_module.engine = models.init_db(settings.DATABASE_URL)
             db_module.SessionLocal.configure(bind=db_module.engine)
+            db_module.ReadSessionLocal.configure(bind=db_module.engine)
+            db_module.read_router.primary = db_module.engine
+            db_module.read_router.invalidate()
             logger.info("Database engine reinitialized for restored database")
         except Exception as e:
             logger.error(f"Failed to reinitialize database engine after restore: {e}", exc_info=True)
@@ -11,14 +11,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from backend.db import get_read_session
 from backend.db import get_session as get_db
 from backend.errors import internal_server_error
 from backend.rate_limiting import RATE_LIMIT_READ, limiter
 from backend.models import Course, CourseEnrollment, Grade, Student
 from backend.rbac import require_permission
 from backend.schemas.analytics import AnalyticsLookupsResponse
-from backend.schemas.courses import CourseResponse
-from backend.schemas.students import StudentResponse
 from backend.services import AnalyticsService
 from backend.services.analytics_export_service import AnalyticsExportService
 
@@ -31,7 +30,7 @@ router = APIRouter(
 )
 
 
-def get_analytics_service(db: Session = Depends(get_db)) -> AnalyticsService:
+def get_analytics_service(db: Session = Depends(get_read_session)) -> AnalyticsService:
     return AnalyticsService(db)
 
 
@@ -54,6 +53,24 @@ def calculate_final_grade(
         raise internal_server_error("Final grade calculation failed", request)
 
 
+@router.get("/course/{course_id}/final-grades")
+@limiter.limit(RATE_LIMIT_READ)
+@require_permission("reports:generate")
+def calculate_course_final_grades(
+    request: Request,
+    course_id: int,
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    """Calculate final grades for every enrolled student of a course in one pass."""
+    try:
+        return service.calculate_course_final_grades(course_id)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.error("Course final grade calculation failed: %s", exc, exc_info=True)
+        raise internal_server_error("Course final grade calculation failed", request)
+
+
 @router.get("/student/{student_id}/all-courses-summary")
 @limiter.limit(RATE_LIMIT_READ)
 @require_permission("reports:generate")
@@ -108,152 +125,15 @@ def get_dashboard(
 @router.get("/lookups", response_model=AnalyticsLookupsResponse)
 @limiter.limit(RATE_LIMIT_READ)
 @require_permission("reports:generate")
-def get_analytics_lookups(request: Request, db: Session = Depends(get_db)):
+def get_analytics_lookups(request: Request, service: AnalyticsService = Depends(get_analytics_service)):
     """Return student/course lists for analytics selectors.
 
-    OPTIMIZED: Uses database aggregations instead of loading all records into memory.
-    This prevents N+1 queries and memory exhaustion with large datasets.
+    Class and division averages are grouped in SQL and only the selector
+    columns are loaded; the payload is cached until the underlying students,
+    courses, enrollments or grades change.
     """
     try:
-        from sqlalchemy import func
-
-        # Step 1: Load students and courses (small set, needed for responses)
-        students_query = db.query(Student).order_by(Student.last_name.asc(), Student.first_name.asc())
-        if hasattr(Student, "deleted_at"):
-            students_query = students_query.filter(Student.deleted_at.is_(None))
-        students = students_query.all()
-
-        courses_query = db.query(Course).order_by(Course.course_name.asc())
-        if hasattr(Course, "deleted_at"):
-            courses_query = courses_query.filter(Course.deleted_at.is_(None))
-        courses = courses_query.all()
-
-        # Build lookup maps for joining with aggregation results
-        student_by_id = {student.id: student for student in students}
-        course_by_id = {course.id: course for course in courses}
-
-        def _class_label(student: Student) -> str:
-            if getattr(student, "academic_year", None):
-                return str(student.academic_year)
-            if student.study_year in (1, 2):
-                return "A" if student.study_year == 1 else "B"
-            if student.study_year:
-                return f"Year {student.study_year}"
-            return "Unknown Class"
-
-        # Step 2: Compute class/division counts from loaded students (small set)
-        class_counts: dict[str, int] = {}
-        division_counts: dict[str, int] = {}
-        for student in students:
-            label = _class_label(student)
-            class_counts[label] = class_counts.get(label, 0) + 1
-            division_label = student.class_division or "Unassigned Division"
-            division_counts[division_label] = division_counts.get(division_label, 0) + 1
-
-        # Step 3: Use database aggregation for grades (critical optimization)
-        # This prevents loading potentially tens of thousands of grade records
-        grade_filter = Grade.deleted_at.is_(None) if hasattr(Grade, "deleted_at") else True
-        valid_grade_filter = (Grade.max_grade.isnot(None)) & (Grade.max_grade > 0)
-
-        # Build percentage computation for SQL
-        grade_percentage = (Grade.grade / Grade.max_grade) * 100
-
-        # Get enrollment counts by course
-        enrollment_query = db.query(CourseEnrollment.course_id, func.count(CourseEnrollment.id).label("count"))
-        if hasattr(CourseEnrollment, "deleted_at"):
-            enrollment_query = enrollment_query.filter(CourseEnrollment.deleted_at.is_(None))
-        enrollment_counts_raw = enrollment_query.group_by(CourseEnrollment.course_id).all()
-        enrollment_counts = {cid: count for cid, count in enrollment_counts_raw}
-
-        # Get grade statistics aggregated at database level
-        grade_stats_by_course = {}
-        course_grade_query = (
-            db.query(Grade.course_id, func.count(Grade.id).label("count"), func.avg(grade_percentage).label("avg_pct"))
-            .filter(grade_filter, valid_grade_filter)
-            .group_by(Grade.course_id)
-            .all()
-        )
-
-        for course_id, count, avg_pct in course_grade_query:
-            grade_stats_by_course[course_id] = {"count": count or 0, "average": float(avg_pct or 0.0)}
-
-        # Step 4: Build aggregates for class and division
-        # Note: We need student-grade mapping which requires JOIN - do this efficiently
-        class_grade_totals: dict[str, dict[str, float]] = {}
-        division_grade_totals: dict[str, dict[str, float]] = {}
-
-        # Only join Student and Grade tables - minimal data transfer
-        student_grade_query = (
-            db.query(Student.id, Grade.grade, Grade.max_grade)
-            .join(Grade, Student.id == Grade.student_id)
-            .filter(
-                (Student.deleted_at.is_(None) if hasattr(Student, "deleted_at") else True),
-                (Grade.deleted_at.is_(None) if hasattr(Grade, "deleted_at") else True),
-                valid_grade_filter,
-            )
-            .all()
-        )
-
-        for student_id, grade_value, max_grade in student_grade_query:
-            if not max_grade or max_grade <= 0:
-                continue
-            percentage = (grade_value / max_grade) * 100
-            student = student_by_id.get(student_id)
-            if student:
-                label = _class_label(student)
-                stats = class_grade_totals.setdefault(label, {"count": 0.0, "total": 0.0})
-                stats["count"] += 1
-                stats["total"] += percentage
-
-                division_label = student.class_division or "Unassigned Division"
-                division_stats = division_grade_totals.setdefault(division_label, {"count": 0.0, "total": 0.0})
-                division_stats["count"] += 1
-                division_stats["total"] += percentage
-
-        # Step 5: Format results
-        class_averages = []
-        for label, count in class_counts.items():
-            stats = class_grade_totals.get(label, {"count": 0.0, "total": 0.0})
-            class_averages.append(
-                {
-                    "label": label,
-                    "count": count,
-                    "average": (stats["total"] / stats["count"]) if stats["count"] else 0,
-                }
-            )
-        class_averages.sort(key=lambda item: item["count"], reverse=True)  # type: ignore[arg-type,return-value]
-
-        division_averages = []
-        for label, count in division_counts.items():
-            stats = division_grade_totals.get(label, {"count": 0.0, "total": 0.0})
-            division_averages.append(
-                {
-                    "label": label,
-                    "count": count,
-                    "average": (stats["total"] / stats["count"]) if stats["count"] else 0,
-                }
-            )
-        division_averages.sort(key=lambda item: item["count"], reverse=True)  # type: ignore[arg-type,return-value]
-
-        course_averages = []
-        for course_id, course in course_by_id.items():
-            stats = grade_stats_by_course.get(course_id, {"count": 0, "average": 0.0})
-            course_averages.append(
-                {
-                    "label": course.course_name,
-                    "count": enrollment_counts.get(course_id, 0),
-                    "average": stats["average"],
-                }
-            )
-        course_averages.sort(key=lambda item: item["count"], reverse=True)
-
-        return {
-            "students": [StudentResponse.model_validate(s) for s in students],
-            "courses": [CourseResponse.model_validate(c) for c in courses],
-            "class_averages": class_averages,
-            "course_averages": course_averages,
-            "division_averages": division_averages,
-        }
+        return service.get_analytics_lookups()
     except Exception as exc:
         logger.error("Analytics lookups failed: %s", exc, exc_info=True)
         raise internal_server_error("Analytics lookups failed", request)
@@ -573,7 +453,7 @@ async def export_dashboard_excel(
     request: Request,
     language: Optional[str] = Query(None),
     timezone: Optional[str] = Query("Europe/Athens"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> StreamingResponse:
     """
     Export dashboard analytics data to Excel format.
@@ -622,7 +502,7 @@ async def export_dashboard_pdf(
     request: Request,
     language: Optional[str] = Query(None),
     timezone: Optional[str] = Query("Europe/Athens"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> StreamingResponse:
     """
     Export dashboard analytics data to PDF format.
@@ -680,7 +560,7 @@ def get_student_predictive_analytics(
     include_attendance: bool = True,
     include_risk_assessment: bool = True,
     include_final_grade: bool = True,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ):
     """
     Get predictive analytics for a student including grade trends and risk assessment.
@@ -730,7 +610,7 @@ def get_student_predictive_analytics(
 def get_class_risk_assessment(
     request: Request,
     class_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ):
     """
     Get risk assessment for all students in a class.
@@ -764,7 +644,7 @@ def get_at_risk_students(
     request: Request,
     class_id: int,
     risk_threshold: int = 60,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ):
     """
     Get list of at-risk students in a class.
@@ -805,7 +685,7 @@ def get_at_risk_students(
 def get_course_predictive_analytics(
     request: Request,
     course_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ):
     """
     Get predictive analytics for a course including trends and risk metrics.
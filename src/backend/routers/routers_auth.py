@@ -31,9 +31,12 @@ from backend.security import login_throttle
 from backend.security.csrf import clear_csrf_cookie, issue_csrf_cookie
 from backend.security.current_user import decode_token, get_current_user
 from backend.security.password_hash import (
-    get_password_hash,
+    PasswordHashingBusy,
+    get_password_hash,  # noqa: F401 - re-exported for existing importers
+    get_password_hash_async,
     needs_rehash,
-    verify_password,
+    verify_password,  # noqa: F401 - re-exported for existing importers
+    verify_password_async,
 )
 
 router = APIRouter()
@@ -85,6 +88,16 @@ def _build_lockout_exception(request: Request, lockout_until: datetime) -> HTTPE
     )
 
 
+def _hashing_busy_exception(request: Request) -> HTTPException:
+    return http_error(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        ErrorCode.AUTH_SERVICE_BUSY,
+        "Authentication service is busy. Please try again shortly.",
+        request,
+        headers={"Retry-After": "1"},
+    )
+
+
 def _is_lockout_exempt_email(email: Optional[str]) -> bool:
     normalized = (email or "").strip().lower()
     if not normalized:
@@ -514,7 +527,7 @@ async def register_user(request: Request, payload: UserCreate = Body(...), db: S
             email=payload.email.lower().strip(),
             full_name=(payload.full_name or "").strip() or None,
             role=assigned_role,
-            hashed_password=get_password_hash(payload.password),
+            hashed_password=await get_password_hash_async(payload.password),
             is_active=True,
         )
         db.add(user)
@@ -524,6 +537,8 @@ async def register_user(request: Request, payload: UserCreate = Body(...), db: S
         return user
     except HTTPException:
         raise
+    except PasswordHashingBusy:
+        raise _hashing_busy_exception(request)
     except Exception as exc:
         db.rollback()
         raise internal_server_error("Registration failed", request) from exc
@@ -559,8 +574,11 @@ async def login(
             else:
                 _enforce_user_lockout(user, request, db)
 
+        # Throttle and lockout checks above reject before any hashing work is queued
         try:
-            password_valid = bool(user and verify_password(payload.password, hashed_pw))
+            password_valid = bool(user and await verify_password_async(payload.password, hashed_pw))
+        except PasswordHashingBusy:
+            raise _hashing_busy_exception(request)
         except Exception as exc:
             logger.exception("Password verification error")
             raise internal_server_error("Password verification failed", request) from exc
@@ -584,13 +602,16 @@ async def login(
         _reset_throttle_entries(throttle_keys)
         logger.info("Login successful", extra={"user_id": user.id})
 
-        # Auto-rehash password if using legacy PBKDF2-SHA256 scheme
+        # Auto-rehash password if using a legacy scheme or an outdated bcrypt cost
         try:
             if needs_rehash(hashed_pw):
-                user.hashed_password = get_password_hash(payload.password)
+                user.hashed_password = await get_password_hash_async(payload.password)
                 db.add(user)
                 db.commit()
                 logger.info("Password auto-rehashed from deprecated scheme")
+        except PasswordHashingBusy:
+            # Non-critical: the upgrade is retried at the next login
+            logger.info("Password rehash skipped; hashing pool is busy")
         except Exception:
             # Non-critical: log and continue with login even if rehash fails
             db.rollback()
@@ -901,11 +922,16 @@ async def admin_create_user(
 
     role_name = payload.role or "teacher"
 
+    try:
+        hashed_password = await get_password_hash_async(payload.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy_exception(request)
+
     user = User(
         email=normalized_email,
         full_name=(payload.full_name or "").strip() or None,
         role=role_name,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=hashed_password,
         is_active=True,
     )
 
@@ -1061,7 +1087,7 @@ async def admin_reset_password(
         )
 
     try:
-        user.hashed_password = get_password_hash(payload.new_password)
+        user.hashed_password = await get_password_hash_async(payload.new_password)
         user.failed_login_attempts = 0
         user.lockout_until = None
         user.last_failed_login_at = None
@@ -1069,6 +1095,8 @@ async def admin_reset_password(
         db.add(user)
         db.commit()
         return {"status": "password_reset"}
+    except PasswordHashingBusy:
+        raise _hashing_busy_exception(request)
     except Exception as exc:
         db.rollback()
         raise internal_server_error("Unable to reset password", request) from exc
@@ -1139,7 +1167,7 @@ async def change_password(
             )
 
         # Verify current password
-        if not verify_password(payload.current_password, getattr(user, "hashed_password", "")):
+        if not await verify_password_async(payload.current_password, getattr(user, "hashed_password", "")):
             raise http_error(
                 status.HTTP_400_BAD_REQUEST,
                 ErrorCode.AUTH_INVALID_CREDENTIALS,
@@ -1148,7 +1176,7 @@ async def change_password(
             )
 
         # Prevent reusing the same password hash (avoid meaningless change)
-        if verify_password(payload.new_password, getattr(user, "hashed_password", "")):
+        if await verify_password_async(payload.new_password, getattr(user, "hashed_password", "")):
             raise http_error(
                 status.HTTP_400_BAD_REQUEST,
                 ErrorCode.VALIDATION_FAILED,
@@ -1157,7 +1185,7 @@ async def change_password(
             )
 
         # Update password & reset lockout state
-        user.hashed_password = get_password_hash(payload.new_password)
+        user.hashed_password = await get_password_hash_async(payload.new_password)
         user.password_change_required = False
         user.failed_login_attempts = 0
         user.lockout_until = None
@@ -1175,6 +1203,8 @@ async def change_password(
         }
     except HTTPException:
         raise
+    except PasswordHashingBusy:
+        raise _hashing_busy_exception(request)
     except Exception as exc:
         db.rollback()
         raise internal_server_error("Unable to change password", request) from exc
@@ -335,6 +335,27 @@ async def get_all_courses(
         raise internal_server_error(request=request)
 
 
+@router.post("/activation-sweep")
+@limiter.limit(RATE_LIMIT_WRITE)
+@require_permission("courses:edit")
+async def run_activation_sweep(
+    request: Request,
+    dry_run: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Sync course activation with semester dates now; by default only reports what would change."""
+    try:
+        from backend.services.course_activation_scheduler import run_course_activation_sweep
+
+        report = run_course_activation_sweep(db, dry_run=dry_run)
+        return report.to_dict()
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.exception("Error running course activation sweep: %s", exc)
+        raise internal_server_error(request=request)
+
+
 @router.get("/{course_id}", response_model=CourseResponse)
 @limiter.limit(RATE_LIMIT_READ)
 @require_permission("courses:view")
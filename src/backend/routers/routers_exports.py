@@ -1,8 +1,7 @@
-import os
 import csv
 import zipfile
 import re
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
 
@@ -11,8 +10,6 @@ try:
     from reportlab.lib.pagesizes import letter
     from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
     from reportlab.lib.units import inch
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
     from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
     REPORTLAB_AVAILABLE = True
@@ -25,8 +22,6 @@ except Exception as exc:  # pragma: no cover - optional/runtime dependency
     ParagraphStyle = None  # type: ignore[assignment]
     getSampleStyleSheet = None  # type: ignore[assignment]
     inch = None  # type: ignore[assignment]
-    pdfmetrics = None  # type: ignore[assignment]
-    TTFont = None  # type: ignore[assignment]
     Flowable = Any  # type: ignore[assignment]
     Paragraph = None  # type: ignore[assignment]
     SimpleDocTemplate = None  # type: ignore[assignment]
@@ -505,14 +500,20 @@ import logging
 from datetime import datetime, date
 from io import BytesIO, StringIO
 
-import openpyxl
 from fastapi.responses import StreamingResponse
-from openpyxl.styles import Alignment, Font, PatternFill
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.worksheet import Worksheet
 from sqlalchemy.orm import Session
 
-HEADER_FILL = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
+from backend.pdf_rendering import (
+    EXPORT_TABLE_LAYOUT,
+    PdfTableDocument,
+    fit_compact_column_widths,
+    get_pdf_renderer,
+    iter_file_and_remove,
+    paragraph_style,
+    register_report_fonts,
+    table_cell,
+)
+from backend.xlsx_writer import CENTER, CENTER_MIDDLE, XLSX_MEDIA_TYPE, StreamingXlsxWriter, iter_spooled_file
 
 
 def _init_status_counts():
@@ -528,26 +529,12 @@ def _normalize_status(status: str | None) -> str:
     return normalized or "Present"
 
 
-def _apply_table_header(ws: Worksheet, headers, row: int = 1):
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=row, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = HEADER_FILL
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-
-
-def _auto_fit_columns(ws: Any):
-    for column_cells in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            try:
-                cell_length = len(str(cell.value)) if cell.value is not None else 0
-            except Exception:
-                cell_length = 0
-            if cell_length > max_length:
-                max_length = cell_length
-        ws.column_dimensions[column_letter].width = min(max(max_length + 2, 12), 45)
+def _xlsx_response(output: IO[bytes], filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        iter_spooled_file(output),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 def _dominant_status(counts: dict[str, int]) -> str:
@@ -575,103 +562,31 @@ def _csv_response(headers: list[str], rows: list[list[Any]], filename: str) -> S
     )
 
 
-def _pdf_table_response(title: str, headers: list[str], rows: list[list[Any]], filename: str) -> StreamingResponse:
+async def _pdf_table_response(
+    title: str, headers: list[str], rows: list[list[Any]], filename: str
+) -> StreamingResponse:
     if not REPORTLAB_AVAILABLE:
         raise HTTPException(
             status_code=503,
             detail=f"PDF export is temporarily unavailable: {REPORTLAB_IMPORT_ERROR}",
         )
 
-    font_path = os.path.join(os.path.dirname(__file__), "../fonts/DejaVuSans.ttf")
-    pdfmetrics.registerFont(TTFont("DejaVuSans", font_path))
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=0.6 * inch, rightMargin=0.6 * inch)
-    elements: list[Flowable] = []
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "CustomTitle",
-        parent=styles["Heading1"],
-        fontName="DejaVuSans",
-        fontSize=20,
-        textColor=colors.HexColor("#4F46E5"),
-        spaceAfter=20,
-        alignment=1,
-    )
-    header_style = ParagraphStyle(
-        "TableHeader",
-        parent=styles["Normal"],
-        fontName="DejaVuSans",
-        fontSize=9.5,
-        leading=11,
-        textColor=colors.white,
-        alignment=1,
+    document = PdfTableDocument(
+        title=title,
+        headers=[str(h) for h in headers],
+        rows=[[str(cell or "") for cell in row] for row in rows],
+        layout=EXPORT_TABLE_LAYOUT,
     )
-    cell_style = ParagraphStyle(
-        "TableCell",
-        parent=styles["Normal"],
-        fontName="DejaVuSans",
-        fontSize=9,
-        leading=11,
-        alignment=1,
-    )
-    elements.append(Paragraph(title, title_style))
-    elements.append(Spacer(1, 0.2 * inch))
-    wrapped_headers = [Paragraph(str(h), header_style) for h in headers]
-    wrapped_rows = [[Paragraph(str(cell or ""), cell_style) for cell in row] for row in rows]
-    data = [wrapped_headers] + wrapped_rows
-    col_widths = _fit_pdf_column_widths([headers] + rows, doc.width)
-    table = Table(data, repeatRows=1, colWidths=col_widths)
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#4F46E5")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, -1), "DejaVuSans"),
-                ("FONTSIZE", (0, 0), (-1, 0), 10),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ]
-        )
-    )
-    elements.append(table)
-    doc.build(elements)
-    buffer.seek(0)
+    path = await get_pdf_renderer().render_table_to_temp_file(document)
     return StreamingResponse(
-        buffer,
+        iter_file_and_remove(path),
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
 def _fit_pdf_column_widths(rows: list[list[Any]], available_width: float) -> list[float]:
-    if not rows:
-        return []
-    column_count = max(len(row) for row in rows)
-    max_lengths = [0] * column_count
-    for row in rows:
-        for idx in range(column_count):
-            value = row[idx] if idx < len(row) else ""
-            text = str(value or "")
-            max_lengths[idx] = max(max_lengths[idx], len(text))
-
-    char_width = 5.2
-    min_width = 0.8 * inch
-    max_width = 2.6 * inch
-    widths = [min(max_width, max(min_width, length * char_width)) for length in max_lengths]
-
-    total = sum(widths)
-    if total > available_width and total > 0:
-        scale = available_width / total
-        widths = [max(min_width, width * scale) for width in widths]
-        total = sum(widths)
-        if total > available_width:
-            overflow = total - available_width
-            widths[-1] = max(min_width, widths[-1] - overflow)
-
-    return widths
+    return fit_compact_column_widths(rows, available_width)
 
 
 def _build_wrapped_table(
@@ -699,34 +614,47 @@ def _build_wrapped_table(
     if grid_color is None:
         grid_color = colors.grey
 
-    styles = getSampleStyleSheet()
-    header_style = ParagraphStyle(
+    font_name, _ = register_report_fonts()
+    header_style = paragraph_style(
         "TableHeader",
-        parent=styles["Normal"],
-        fontName="DejaVuSans",
-        fontSize=header_font_size,
+        "Normal",
+        font_name,
+        header_font_size,
         leading=header_font_size + 2,
-        textColor=colors.white,
+        text_color="white",
         alignment=1,
     )
-    cell_style = ParagraphStyle(
+    cell_style = paragraph_style(
         "TableCell",
-        parent=styles["Normal"],
-        fontName="DejaVuSans",
-        fontSize=cell_font_size,
+        "Normal",
+        font_name,
+        cell_font_size,
         leading=cell_font_size + 2,
         alignment=1 if align == "CENTER" else 0,
     )
-    wrapped_headers = [Paragraph(str(h), header_style) for h in headers]
-    wrapped_rows = [[Paragraph(str(cell or ""), cell_style) for cell in row] for row in rows]
-    data = [wrapped_headers] + wrapped_rows
     col_widths = _fit_pdf_column_widths([headers] + rows, available_width)
+    # Cells that fit on one line stay plain strings; only long values pay for a Paragraph.
+    wrapped_headers = [
+        table_cell(h, width, font_name, header_font_size, header_style, 12) for h, width in zip(headers, col_widths)
+    ]
+    wrapped_rows = [
+        [
+            table_cell(cell or "", width, font_name, cell_font_size, cell_style, 12)
+            for cell, width in zip(row, col_widths)
+        ]
+        for row in rows
+    ]
+    data = [wrapped_headers] + wrapped_rows
     table = Table(data, repeatRows=1, colWidths=col_widths)
     style_commands: list[tuple[Any, ...]] = [
         ("BACKGROUND", (0, 0), (-1, 0), header_bg),
         ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
         ("ALIGN", (0, 0), (-1, -1), align),
-        ("FONTNAME", (0, 0), (-1, -1), "DejaVuSans"),
+        ("FONTNAME", (0, 0), (-1, -1), font_name),
+        ("FONTSIZE", (0, 0), (-1, 0), header_font_size),
+        ("FONTSIZE", (0, 1), (-1, -1), cell_font_size),
+        ("LEADING", (0, 0), (-1, 0), header_font_size + 2),
+        ("LEADING", (0, 1), (-1, -1), cell_font_size + 2),
         ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
         ("BACKGROUND", (0, 1), (-1, -1), body_bg),
         ("GRID", (0, 0), (-1, -1), 0.5, grid_color),
@@ -956,6 +884,7 @@ router = APIRouter(
 )
 
 
+from backend.db import get_read_session
 from backend.db import get_session as get_db
 from backend.errors import ErrorCode, http_error
 from backend.import_resolver import import_names
@@ -966,7 +895,7 @@ from backend.services.audit_service import AuditLogger
 
 @router.get("/all/zip")
 @require_permission("exports:generate")
-async def export_all_zip(request: Request, db: Session = Depends(get_db)):
+async def export_all_zip(request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)):
     """Export all data as a single ZIP (CSV files)."""
     audit = AuditLogger(db)
     try:
@@ -987,7 +916,7 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
         with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
             # Students
             students = (
-                db.query(Student)
+                read_db.query(Student)
                 .filter(Student.deleted_at.is_(None))
                 .order_by(Student.last_name, Student.first_name)
                 .all()
@@ -1008,7 +937,7 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
             zf.writestr("students.csv", _csv_content(student_headers, student_rows))
 
             # Courses
-            courses = db.query(Course).filter(Course.deleted_at.is_(None)).all()
+            courses = read_db.query(Course).filter(Course.deleted_at.is_(None)).all()
             course_headers = get_header_row("courses", lang)
             course_rows = [
                 [
@@ -1026,7 +955,7 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
             zf.writestr("courses.csv", _csv_content(course_headers, course_rows))
 
             # Attendance
-            attendance = db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
+            attendance = read_db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
             attendance_headers = get_header_row("attendance", lang)
             attendance_rows = [
                 [
@@ -1044,7 +973,7 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
 
             # Attendance analytics (summary)
             analytics_rows = (
-                db.query(
+                read_db.query(
                     Attendance.id,
                     Attendance.date,
                     Attendance.status,
@@ -1067,12 +996,14 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
             zf.writestr("attendance_analytics.csv", _csv_content(analytics_headers, analytics_csv_rows))
 
             # Enrollments
-            enrollments = db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
+            enrollments = read_db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
             enrollment_headers = get_header_row("enrollments", lang)
             enrollment_rows = []
             for e in enrollments:
-                student = db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
-                course = db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
+                student = (
+                    read_db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
+                )
+                course = read_db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
                 enrollment_rows.append(
                     [
                         e.id,
@@ -1087,12 +1018,14 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
             zf.writestr("enrollments.csv", _csv_content(enrollment_headers, enrollment_rows))
 
             # All grades
-            grades = db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
+            grades = read_db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
             grade_headers = get_header_row("all_grades", lang)
             grade_rows = []
             for g in grades:
-                student = db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
-                course = db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
+                student = (
+                    read_db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
+                )
+                course = read_db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
                 pct = (g.grade / g.max_grade) * 100 if g.max_grade else 0
                 grade_rows.append(
                     [
@@ -1113,12 +1046,14 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
             zf.writestr("all_grades.csv", _csv_content(grade_headers, grade_rows))
 
             # Daily performance
-            performances = db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
+            performances = read_db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
             performance_headers = get_header_row("daily_performance", lang)
             performance_rows = []
             for p in performances:
-                student = db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
-                course = db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
+                student = (
+                    read_db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
+                )
+                course = read_db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
                 performance_rows.append(
                     [
                         p.id,
@@ -1137,11 +1072,13 @@ async def export_all_zip(request: Request, db: Session = Depends(get_db)):
             zf.writestr("daily_performance.csv", _csv_content(performance_headers, performance_rows))
 
             # Highlights
-            highlights = db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
+            highlights = read_db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
             highlight_headers = get_header_row("highlights", lang)
             highlight_rows = []
             for h in highlights:
-                student = db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
+                student = (
+                    read_db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
+                )
                 highlight_rows.append(
                     [
                         h.id,
@@ -1189,6 +1126,7 @@ async def export_students_excel(
     request: Request,
     limit: int = Query(100, ge=1, le=10000, description="Max records to export (default 100, max 10000)"),
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_session),
 ):
     audit = AuditLogger(db)
     try:
@@ -1197,35 +1135,32 @@ async def export_students_excel(
 
         # Query with pagination to reduce memory overhead
         students = (
-            db.query(Student)
+            read_db.query(Student)
             .filter(Student.deleted_at.is_(None))
             .order_by(Student.last_name, Student.first_name)
             .limit(limit)
             .all()
         )
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_students", lang)
-        headers = get_header_row("students", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-        for row, s in enumerate(students, 2):
-            ws.cell(row=row, column=1, value=s.id)
-            ws.cell(row=row, column=2, value=s.first_name)
-            ws.cell(row=row, column=3, value=s.last_name)
-            ws.cell(row=row, column=4, value=s.email)
-            ws.cell(row=row, column=5, value=s.student_id)
-            ws.cell(row=row, column=6, value=format_date_value(s.enrollment_date, lang))
-            ws.cell(row=row, column=7, value=t("status_active", lang) if s.is_active else t("status_inactive", lang))
-        for col in range(1, len(headers) + 1):
-            ws.column_dimensions[get_column_letter(col)].width = 18
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        writer = StreamingXlsxWriter()
+        writer.table_sheet(
+            t("sheet_students", lang),
+            get_header_row("students", lang),
+            (
+                [
+                    s.id,
+                    s.first_name,
+                    s.last_name,
+                    s.email,
+                    s.student_id,
+                    format_date_value(s.enrollment_date, lang),
+                    t("status_active", lang) if s.is_active else t("status_inactive", lang),
+                ]
+                for s in students
+            ),
+            widths=18,
+        )
+        output = writer.to_spooled_file()
         filename = f"students_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         # Log successful export
         audit.log_from_request(
@@ -1235,11 +1170,7 @@ async def export_students_excel(
             details={"count": len(students), "requested_limit": limit, "format": "excel", "filename": filename},
             success=True,
         )
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export students excel failed: %s", exc, exc_info=True)
         # Log failed export
@@ -1259,13 +1190,14 @@ async def export_students_csv(
     request: Request,
     limit: int = Query(100, ge=1, le=10000, description="Max records to export (default 100, max 10000)"),
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_session),
 ):
     audit = AuditLogger(db)
     try:
         (Student,) = import_names("models", "Student")
         lang = get_lang(request)
         students = (
-            db.query(Student)
+            read_db.query(Student)
             .filter(Student.deleted_at.is_(None))
             .order_by(Student.last_name, Student.first_name)
             .limit(limit)
@@ -1307,12 +1239,14 @@ async def export_students_csv(
 
 @router.get("/grades/excel/{student_id}")
 @require_permission("exports:generate")
-async def export_student_grades_excel(student_id: int, request: Request, db: Session = Depends(get_db)):
+async def export_student_grades_excel(
+    student_id: int, request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Student, Grade = import_names("models", "Student", "Grade")
         lang = get_lang(request)
 
-        student = db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
+        student = read_db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
         if not student:
             raise http_error(
                 404,
@@ -1321,49 +1255,30 @@ async def export_student_grades_excel(student_id: int, request: Request, db: Ses
                 request,
                 context={"student_id": student_id},
             )
-        grades = db.query(Grade).filter(Grade.student_id == student_id, Grade.deleted_at.is_(None)).all()
+        grades = read_db.query(Grade).filter(Grade.student_id == student_id, Grade.deleted_at.is_(None)).all()
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_grades", lang)
-        ws.merge_cells("A1:H1")
-        title = ws["A1"]
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_grades", lang), widths=[18] * 8)
         student_name = f"{student.first_name} {student.last_name}".strip()
-        title.value = grade_report_heading(student_name, student.student_id, lang)
-        title.font = Font(size=16, bold=True)
-        title.alignment = Alignment(horizontal="center")
-        headers = get_header_row("student_grades", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-        total_percentage = 0
-        for row, g in enumerate(grades, 4):
+        ws.title_row(grade_report_heading(student_name, student.student_id, lang), span=8, alignment=CENTER)
+        ws.blank()
+        ws.header(get_header_row("student_grades", lang), alignment=None)
+        for g in grades:
             pct = (g.grade / g.max_grade) * 100 if g.max_grade else 0
-            total_percentage += pct
-            ws.cell(row=row, column=1, value=translate_assignment_name(g.assignment_name, lang))
-            ws.cell(row=row, column=2, value=translate_grade_category(g.category or not_available(lang), lang))
-            ws.cell(row=row, column=3, value=g.grade)
-            ws.cell(row=row, column=4, value=g.max_grade)
-            ws.cell(row=row, column=5, value=f"{pct:.2f}%")
-            ws.cell(row=row, column=6, value=g.weight)
-            ws.cell(row=row, column=7, value=_letter_grade(pct))
-            ws.cell(
-                row=row,
-                column=8,
-                value=format_date_value(g.date_submitted, lang) if g.date_submitted else not_available(lang),
+            ws.append(
+                [
+                    translate_assignment_name(g.assignment_name, lang),
+                    translate_grade_category(g.category or not_available(lang), lang),
+                    g.grade,
+                    g.max_grade,
+                    f"{pct:.2f}%",
+                    g.weight,
+                    _letter_grade(pct),
+                    format_date_value(g.date_submitted, lang) if g.date_submitted else not_available(lang),
+                ]
             )
-        for col in range(1, 9):
-            ws.column_dimensions[get_column_letter(col)].width = 18
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
         filename = f"grades_{student.student_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(writer.to_spooled_file(), filename)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1379,12 +1294,14 @@ async def export_student_grades_excel(student_id: int, request: Request, db: Ses
 
 @router.get("/attendance/excel/{student_id}")
 @require_permission("exports:generate")
-async def export_student_attendance_excel(student_id: int, request: Request, db: Session = Depends(get_db)):
+async def export_student_attendance_excel(
+    student_id: int, request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Student, Attendance = import_names("models", "Student", "Attendance")
         lang = get_lang(request)
 
-        student = db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
+        student = read_db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
         if not student:
             raise http_error(
                 404,
@@ -1395,33 +1312,29 @@ async def export_student_attendance_excel(student_id: int, request: Request, db:
             )
 
         records = (
-            db.query(Attendance).filter(Attendance.student_id == student_id, Attendance.deleted_at.is_(None)).all()
+            read_db.query(Attendance).filter(Attendance.student_id == student_id, Attendance.deleted_at.is_(None)).all()
         )
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_attendance", lang)
-        headers = get_header_row("attendance", lang)
-        _apply_table_header(ws, headers)
-        for row, r in enumerate(records, 2):
-            ws.cell(row=row, column=1, value=r.id)
-            ws.cell(row=row, column=2, value=r.student_id)
-            ws.cell(row=row, column=3, value=r.course_id)
-            ws.cell(row=row, column=4, value=format_date_value(r.date, lang))
-            ws.cell(row=row, column=5, value=translate_status_value(r.status, lang))
-            ws.cell(row=row, column=6, value=r.period_number)
-            ws.cell(row=row, column=7, value=r.notes or "")
-        _auto_fit_columns(ws)
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        filename = f"attendance_{student.student_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        writer = StreamingXlsxWriter()
+        writer.table_sheet(
+            t("sheet_attendance", lang),
+            get_header_row("attendance", lang),
+            (
+                [
+                    r.id,
+                    r.student_id,
+                    r.course_id,
+                    format_date_value(r.date, lang),
+                    translate_status_value(r.status, lang),
+                    r.period_number,
+                    r.notes or "",
+                ]
+                for r in records
+            ),
+            header_alignment=CENTER_MIDDLE,
         )
+        filename = f"attendance_{student.student_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        return _xlsx_response(writer.to_spooled_file(), filename)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1437,13 +1350,15 @@ async def export_student_attendance_excel(student_id: int, request: Request, db:
 
 @router.get("/performance/excel/{student_id}")
 @require_permission("exports:generate")
-async def export_student_performance_excel(student_id: int, request: Request, db: Session = Depends(get_db)):
+async def export_student_performance_excel(
+    student_id: int, request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Student, Course, DailyPerformance = import_names("models", "Student", "Course", "DailyPerformance")
         lang = get_lang(request)
         na_value = not_available(lang)
 
-        student = db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
+        student = read_db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
         if not student:
             raise http_error(
                 404,
@@ -1454,43 +1369,36 @@ async def export_student_performance_excel(student_id: int, request: Request, db
             )
 
         records = (
-            db.query(DailyPerformance)
+            read_db.query(DailyPerformance)
             .filter(DailyPerformance.student_id == student_id, DailyPerformance.deleted_at.is_(None))
             .all()
         )
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_daily_performance", lang)
-        headers = get_header_row("daily_performance", lang)
-        _apply_table_header(ws, headers)
-        for row, r in enumerate(records, 2):
-            course = db.query(Course).filter(Course.id == r.course_id, Course.deleted_at.is_(None)).first()
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_daily_performance", lang))
+        ws.header(get_header_row("daily_performance", lang), alignment=CENTER_MIDDLE)
+        for r in records:
+            course = read_db.query(Course).filter(Course.id == r.course_id, Course.deleted_at.is_(None)).first()
             percentage = r.percentage
             if percentage is None:
                 percentage = (r.score / r.max_score) * 100 if r.max_score else 0
-            ws.cell(row=row, column=1, value=r.id)
-            ws.cell(row=row, column=2, value=r.student_id)
-            ws.cell(row=row, column=3, value=f"{student.first_name} {student.last_name}" if student else na_value)
-            ws.cell(row=row, column=4, value=r.course_id)
-            ws.cell(row=row, column=5, value=course.course_name if course else na_value)
-            ws.cell(row=row, column=6, value=format_date_value(r.date, lang))
-            ws.cell(row=row, column=7, value=translate_grade_category(r.category or na_value, lang))
-            ws.cell(row=row, column=8, value=r.score)
-            ws.cell(row=row, column=9, value=r.max_score)
-            ws.cell(row=row, column=10, value=f"{percentage:.2f}%")
-            ws.cell(row=row, column=11, value=r.notes or "")
-        _auto_fit_columns(ws)
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+            ws.append(
+                [
+                    r.id,
+                    r.student_id,
+                    f"{student.first_name} {student.last_name}" if student else na_value,
+                    r.course_id,
+                    course.course_name if course else na_value,
+                    format_date_value(r.date, lang),
+                    translate_grade_category(r.category or na_value, lang),
+                    r.score,
+                    r.max_score,
+                    f"{percentage:.2f}%",
+                    r.notes or "",
+                ]
+            )
         filename = f"performance_{student.student_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(writer.to_spooled_file(), filename)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1506,13 +1414,15 @@ async def export_student_performance_excel(student_id: int, request: Request, db
 
 @router.get("/highlights/excel/{student_id}")
 @require_permission("exports:generate")
-async def export_student_highlights_excel(student_id: int, request: Request, db: Session = Depends(get_db)):
+async def export_student_highlights_excel(
+    student_id: int, request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Student, Highlight = import_names("models", "Student", "Highlight")
         lang = get_lang(request)
         na_value = not_available(lang)
 
-        student = db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
+        student = read_db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
         if not student:
             raise http_error(
                 404,
@@ -1522,34 +1432,33 @@ async def export_student_highlights_excel(student_id: int, request: Request, db:
                 context={"student_id": student_id},
             )
 
-        records = db.query(Highlight).filter(Highlight.student_id == student_id, Highlight.deleted_at.is_(None)).all()
+        records = (
+            read_db.query(Highlight).filter(Highlight.student_id == student_id, Highlight.deleted_at.is_(None)).all()
+        )
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_highlights", lang)
-        headers = get_header_row("highlights", lang)
-        _apply_table_header(ws, headers)
-        for row, h in enumerate(records, 2):
-            ws.cell(row=row, column=1, value=h.id)
-            ws.cell(row=row, column=2, value=h.student_id)
-            ws.cell(row=row, column=3, value=f"{student.first_name} {student.last_name}" if student else na_value)
-            ws.cell(row=row, column=4, value=h.semester)
-            ws.cell(row=row, column=5, value=translate_grade_category(h.category or na_value, lang))
-            ws.cell(row=row, column=6, value=h.rating or na_value)
-            ws.cell(row=row, column=7, value=h.highlight_text)
-            ws.cell(row=row, column=8, value=format_date_value(h.date_created, lang))
-            ws.cell(row=row, column=9, value=yes_no(bool(h.is_positive), lang))
-        _auto_fit_columns(ws)
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        filename = f"highlights_{student.student_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        writer = StreamingXlsxWriter()
+        student_label = f"{student.first_name} {student.last_name}" if student else na_value
+        writer.table_sheet(
+            t("sheet_highlights", lang),
+            get_header_row("highlights", lang),
+            (
+                [
+                    h.id,
+                    h.student_id,
+                    student_label,
+                    h.semester,
+                    translate_grade_category(h.category or na_value, lang),
+                    h.rating or na_value,
+                    h.highlight_text,
+                    format_date_value(h.date_created, lang),
+                    yes_no(bool(h.is_positive), lang),
+                ]
+                for h in records
+            ),
+            header_alignment=CENTER_MIDDLE,
         )
+        filename = f"highlights_{student.student_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        return _xlsx_response(writer.to_spooled_file(), filename)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1565,13 +1474,15 @@ async def export_student_highlights_excel(student_id: int, request: Request, db:
 
 @router.get("/enrollments/excel/{student_id}")
 @require_permission("exports:generate")
-async def export_student_enrollments_excel(student_id: int, request: Request, db: Session = Depends(get_db)):
+async def export_student_enrollments_excel(
+    student_id: int, request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Student, Course, CourseEnrollment = import_names("models", "Student", "Course", "CourseEnrollment")
         lang = get_lang(request)
         na_value = not_available(lang)
 
-        student = db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
+        student = read_db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
         if not student:
             raise http_error(
                 404,
@@ -1582,36 +1493,29 @@ async def export_student_enrollments_excel(student_id: int, request: Request, db
             )
 
         enrollments = (
-            db.query(CourseEnrollment)
+            read_db.query(CourseEnrollment)
             .filter(CourseEnrollment.student_id == student_id, CourseEnrollment.deleted_at.is_(None))
             .all()
         )
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_enrollments", lang)
-        headers = get_header_row("enrollments", lang)
-        _apply_table_header(ws, headers)
-        for row, e in enumerate(enrollments, 2):
-            course = db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
-            ws.cell(row=row, column=1, value=e.id)
-            ws.cell(row=row, column=2, value=e.student_id)
-            ws.cell(row=row, column=3, value=f"{student.first_name} {student.last_name}" if student else na_value)
-            ws.cell(row=row, column=4, value=e.course_id)
-            ws.cell(row=row, column=5, value=course.course_code if course else na_value)
-            ws.cell(row=row, column=6, value=course.course_name if course else na_value)
-            ws.cell(row=row, column=7, value=format_date_value(e.enrolled_at, lang))
-        _auto_fit_columns(ws)
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_enrollments", lang))
+        ws.header(get_header_row("enrollments", lang), alignment=CENTER_MIDDLE)
+        for e in enrollments:
+            course = read_db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
+            ws.append(
+                [
+                    e.id,
+                    e.student_id,
+                    f"{student.first_name} {student.last_name}" if student else na_value,
+                    e.course_id,
+                    course.course_code if course else na_value,
+                    course.course_name if course else na_value,
+                    format_date_value(e.enrolled_at, lang),
+                ]
+            )
         filename = f"enrollments_{student.student_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(writer.to_spooled_file(), filename)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1659,11 +1563,13 @@ def _letter_grade(percentage: float) -> str:
 
 @router.get("/students/pdf")
 @require_permission("exports:generate")
-async def export_students_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_students_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         (Student,) = import_names("models", "Student")
         lang = get_lang(request)
-        students = db.query(Student).filter(Student.deleted_at.is_(None)).all()
+        students = read_db.query(Student).filter(Student.deleted_at.is_(None)).all()
         headers = [
             t("header_id", lang),
             t("label_student_name", lang),
@@ -1684,7 +1590,7 @@ async def export_students_pdf(request: Request, db: Session = Depends(get_db)):
             for s in students
         ]
         filename = f"students_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        return _pdf_table_response(t("student_directory_title", lang), headers, rows, filename)
+        return await _pdf_table_response(t("student_directory_title", lang), headers, rows, filename)
     except Exception as exc:
         logger.error("Export students pdf failed: %s", exc, exc_info=True)
         raise http_error(
@@ -1698,34 +1604,35 @@ async def export_students_pdf(request: Request, db: Session = Depends(get_db)):
 
 @router.get("/attendance/excel")
 @require_permission("exports:generate")
-async def export_attendance_excel(request: Request, db: Session = Depends(get_db)):
+async def export_attendance_excel(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         (Attendance,) = import_names("models", "Attendance")
         lang = get_lang(request)
 
-        records = db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_attendance", lang)
-        headers = get_header_row("attendance", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-        for row, r in enumerate(records, 2):
-            ws.cell(row=row, column=1, value=r.id)
-            ws.cell(row=row, column=2, value=r.student_id)
-            ws.cell(row=row, column=3, value=r.course_id)
-            ws.cell(row=row, column=4, value=format_date_value(r.date, lang))
-            ws.cell(row=row, column=5, value=translate_status_value(r.status, lang))
-            ws.cell(row=row, column=6, value=r.period_number)
-            ws.cell(row=row, column=7, value=r.notes or "")
-        for col in range(1, 8):
-            ws.column_dimensions[get_column_letter(col)].width = 15
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        records = read_db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
+        writer = StreamingXlsxWriter()
+        writer.table_sheet(
+            t("sheet_attendance", lang),
+            get_header_row("attendance", lang),
+            (
+                [
+                    r.id,
+                    r.student_id,
+                    r.course_id,
+                    format_date_value(r.date, lang),
+                    translate_status_value(r.status, lang),
+                    r.period_number,
+                    r.notes or "",
+                ]
+                for r in records
+            ),
+            header_alignment=None,
+            widths=[15] * 7,
+        )
+        output = writer.to_spooled_file()
         filename = f"attendance_{datetime.now().strftime('%Y%m%d')}.xlsx"
         # Log successful export
         audit.log_from_request(
@@ -1735,11 +1642,7 @@ async def export_attendance_excel(request: Request, db: Session = Depends(get_db
             details={"count": len(records), "format": "excel", "filename": filename},
             success=True,
         )
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export attendance excel failed: %s", exc, exc_info=True)
         # Log failed export
@@ -1761,12 +1664,14 @@ async def export_attendance_excel(request: Request, db: Session = Depends(get_db
 
 @router.get("/attendance/csv")
 @require_permission("exports:generate")
-async def export_attendance_csv(request: Request, db: Session = Depends(get_db)):
+async def export_attendance_csv(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         (Attendance,) = import_names("models", "Attendance")
         lang = get_lang(request)
-        records = db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
+        records = read_db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
         headers = get_header_row("attendance", lang)
         rows = [
             [
@@ -1803,12 +1708,14 @@ async def export_attendance_csv(request: Request, db: Session = Depends(get_db))
 
 @router.get("/attendance/pdf")
 @require_permission("exports:generate")
-async def export_attendance_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_attendance_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         (Attendance,) = import_names("models", "Attendance")
         lang = get_lang(request)
-        records = db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
+        records = read_db.query(Attendance).filter(Attendance.deleted_at.is_(None)).all()
         headers = get_header_row("attendance", lang)
         rows = [
             [
@@ -1830,7 +1737,7 @@ async def export_attendance_pdf(request: Request, db: Session = Depends(get_db))
             details={"count": len(records), "format": "pdf", "filename": filename},
             success=True,
         )
-        return _pdf_table_response(t("sheet_attendance", lang), headers, rows, filename)
+        return await _pdf_table_response(t("sheet_attendance", lang), headers, rows, filename)
     except Exception as exc:
         logger.error("Export attendance pdf failed: %s", exc, exc_info=True)
         audit.log_from_request(
@@ -1845,14 +1752,16 @@ async def export_attendance_pdf(request: Request, db: Session = Depends(get_db))
 
 @router.get("/attendance/analytics/excel")
 @require_permission("exports:generate")
-async def export_attendance_analytics_excel(request: Request, db: Session = Depends(get_db)):
+async def export_attendance_analytics_excel(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Attendance, Student, Course = import_names("models", "Attendance", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
 
         rows = (
-            db.query(
+            read_db.query(
                 Attendance.id,
                 Attendance.date,
                 Attendance.status,
@@ -1957,11 +1866,9 @@ async def export_attendance_analytics_excel(request: Request, db: Session = Depe
             sorted_dates = sorted(date_values)
             date_range = f"{format_date_value(sorted_dates[0], lang)} → {format_date_value(sorted_dates[-1], lang)}"
 
-        wb = openpyxl.Workbook()
-        overview_ws: Any = wb.active
-        overview_ws.title = t("sheet_overview", lang)
-        overview_ws["A1"] = t("title_attendance_export", lang)
-        overview_ws["A1"].font = Font(size=16, bold=True)
+        writer = StreamingXlsxWriter()
+        overview_ws = writer.add_sheet(t("sheet_overview", lang))
+        overview_ws.title_row(t("title_attendance_export", lang))
         overview_ws.append(get_header_row("overview", lang))
         overview_ws.append([t("label_total_records", lang), total_records])
         overview_ws.append([t("label_unique_students", lang), len(unique_students)])
@@ -1971,132 +1878,135 @@ async def export_attendance_analytics_excel(request: Request, db: Session = Depe
         overview_ws.append(
             [t("label_generated_on_table", lang), format_date_value(datetime.now(), lang, include_time=True)]
         )
-        overview_ws.append([])
+        overview_ws.blank()
         overview_ws.append(get_header_row("status_counts", lang))
         for status in ATTENDANCE_STATUSES:
             overview_ws.append([t(status.lower(), lang), overall_counts[status]])
         if total_records == 0:
-            overview_ws.append([])
+            overview_ws.blank()
             overview_ws.append([t("label_notice", lang), t("label_no_attendance", lang)])
-        _auto_fit_columns(overview_ws)
 
-        course_ws = wb.create_sheet(t("sheet_course_summary", lang))
-        course_headers = get_header_row("course_summary", lang)
-        _apply_table_header(course_ws, course_headers)
-        for row_idx, data in enumerate(sorted(course_summary.values(), key=lambda item: item["course_code"]), start=2):
+        course_rows = []
+        for data in sorted(course_summary.values(), key=lambda item: item["course_code"]):
             counts = data["counts"]
             total = data["total"]
             rate = (counts["Present"] / total * 100) if total else 0
-            values = [
-                data["course_code"],
-                data["course_name"],
-                total,
-                counts["Present"],
-                counts["Absent"],
-                counts["Late"],
-                counts["Excused"],
-                f"{rate:.1f}%",
-            ]
-            for col, value in enumerate(values, 1):
-                course_ws.cell(row=row_idx, column=col, value=value)
-        _auto_fit_columns(course_ws)
-
-        period_ws = wb.create_sheet(t("sheet_period_summary", lang))
-        period_headers = get_header_row("period_summary", lang)
-        _apply_table_header(period_ws, period_headers)
-        for row_idx, period in enumerate(sorted(period_summary.keys()), start=2):
+            course_rows.append(
+                [
+                    data["course_code"],
+                    data["course_name"],
+                    total,
+                    counts["Present"],
+                    counts["Absent"],
+                    counts["Late"],
+                    counts["Excused"],
+                    f"{rate:.1f}%",
+                ]
+            )
+        writer.table_sheet(
+            t("sheet_course_summary", lang),
+            get_header_row("course_summary", lang),
+            course_rows,
+            header_alignment=CENTER_MIDDLE,
+        )
+
+        period_rows = []
+        for period in sorted(period_summary.keys()):
             counts = period_summary[period]["counts"]
             total = period_summary[period]["total"]
             rate = (counts["Present"] / total * 100) if total else 0
-            values = [
-                period,
-                total,
-                counts["Present"],
-                counts["Absent"],
-                counts["Late"],
-                counts["Excused"],
-                f"{rate:.1f}%",
-            ]
-            for col, value in enumerate(values, 1):
-                period_ws.cell(row=row_idx, column=col, value=value)
-        _auto_fit_columns(period_ws)
-
-        course_period_ws = wb.create_sheet(t("sheet_course_periods", lang))
-        course_period_headers = get_header_row("course_periods", lang)
-        _apply_table_header(course_period_ws, course_period_headers)
-        for row_idx, key in enumerate(
-            sorted(
-                course_period_summary.keys(), key=lambda item: (course_period_summary[item]["course_code"], item[1])
-            ),
-            start=2,
+            period_rows.append(
+                [
+                    period,
+                    total,
+                    counts["Present"],
+                    counts["Absent"],
+                    counts["Late"],
+                    counts["Excused"],
+                    f"{rate:.1f}%",
+                ]
+            )
+        writer.table_sheet(
+            t("sheet_period_summary", lang),
+            get_header_row("period_summary", lang),
+            period_rows,
+            header_alignment=CENTER_MIDDLE,
+        )
+
+        course_period_rows = []
+        for key in sorted(
+            course_period_summary.keys(), key=lambda item: (course_period_summary[item]["course_code"], item[1])
         ):
             data = course_period_summary[key]
             counts = data["counts"]
             total = data["total"]
             rate = (counts["Present"] / total * 100) if total else 0
-            values = [
-                data["course_code"],
-                data["course_name"],
-                data["period"],
-                total,
-                counts["Present"],
-                counts["Absent"],
-                counts["Late"],
-                counts["Excused"],
-                f"{rate:.1f}%",
-            ]
-            for col, value in enumerate(values, 1):
-                course_period_ws.cell(row=row_idx, column=col, value=value)
-        _auto_fit_columns(course_period_ws)
-
-        student_ws = wb.create_sheet(t("sheet_student_summary", lang))
-        student_headers = get_header_row("student_summary", lang)
-        _apply_table_header(student_ws, student_headers)
-        for row_idx, data in enumerate(
-            sorted(student_summary.values(), key=lambda item: item["student_name"]), start=2
-        ):
+            course_period_rows.append(
+                [
+                    data["course_code"],
+                    data["course_name"],
+                    data["period"],
+                    total,
+                    counts["Present"],
+                    counts["Absent"],
+                    counts["Late"],
+                    counts["Excused"],
+                    f"{rate:.1f}%",
+                ]
+            )
+        writer.table_sheet(
+            t("sheet_course_periods", lang),
+            get_header_row("course_periods", lang),
+            course_period_rows,
+            header_alignment=CENTER_MIDDLE,
+        )
+
+        student_rows = []
+        for data in sorted(student_summary.values(), key=lambda item: item["student_name"]):
             counts = data["counts"]
             most_common = _dominant_status(counts)
-            values = [
-                data["student_code"],
-                data["student_name"],
-                data["total"],
-                counts["Present"],
-                counts["Absent"],
-                counts["Late"],
-                counts["Excused"],
-                translate_status_value(most_common, lang),
-            ]
-            for col, value in enumerate(values, 1):
-                student_ws.cell(row=row_idx, column=col, value=value)
-        _auto_fit_columns(student_ws)
-
-        daily_ws = wb.create_sheet(t("sheet_daily_overview", lang))
-        daily_headers = get_header_row("daily_overview", lang)
-        _apply_table_header(daily_ws, daily_headers)
-        for row_idx, day in enumerate(sorted(daily_summary.keys()), start=2):
+            student_rows.append(
+                [
+                    data["student_code"],
+                    data["student_name"],
+                    data["total"],
+                    counts["Present"],
+                    counts["Absent"],
+                    counts["Late"],
+                    counts["Excused"],
+                    translate_status_value(most_common, lang),
+                ]
+            )
+        writer.table_sheet(
+            t("sheet_student_summary", lang),
+            get_header_row("student_summary", lang),
+            student_rows,
+            header_alignment=CENTER_MIDDLE,
+        )
+
+        daily_rows = []
+        for day in sorted(daily_summary.keys()):
             counts = daily_summary[day]["counts"]
-            values = [
-                format_date_value(day, lang),
-                daily_summary[day]["total"],
-                counts["Present"],
-                counts["Absent"],
-                counts["Late"],
-                counts["Excused"],
-            ]
-            for col, value in enumerate(values, 1):
-                daily_ws.cell(row=row_idx, column=col, value=value)
-        _auto_fit_columns(daily_ws)
+            daily_rows.append(
+                [
+                    format_date_value(day, lang),
+                    daily_summary[day]["total"],
+                    counts["Present"],
+                    counts["Absent"],
+                    counts["Late"],
+                    counts["Excused"],
+                ]
+            )
+        writer.table_sheet(
+            t("sheet_daily_overview", lang),
+            get_header_row("daily_overview", lang),
+            daily_rows,
+            header_alignment=CENTER_MIDDLE,
+        )
 
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        output = writer.to_spooled_file()
         filename = f"attendance_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export attendance analytics excel failed: %s", exc, exc_info=True)
         raise http_error(
@@ -2110,14 +2020,16 @@ async def export_attendance_analytics_excel(request: Request, db: Session = Depe
 
 @router.get("/attendance/analytics/csv")
 @require_permission("exports:generate")
-async def export_attendance_analytics_csv(request: Request, db: Session = Depends(get_db)):
+async def export_attendance_analytics_csv(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Attendance, Student, Course = import_names("models", "Attendance", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
 
         rows = (
-            db.query(
+            read_db.query(
                 Attendance.id,
                 Attendance.date,
                 Attendance.status,
@@ -2149,14 +2061,16 @@ async def export_attendance_analytics_csv(request: Request, db: Session = Depend
 
 @router.get("/attendance/analytics/pdf")
 @require_permission("exports:generate")
-async def export_attendance_analytics_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_attendance_analytics_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     try:
         Attendance, Student, Course = import_names("models", "Attendance", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
 
         rows = (
-            db.query(
+            read_db.query(
                 Attendance.id,
                 Attendance.date,
                 Attendance.status,
@@ -2216,7 +2130,7 @@ async def export_attendance_analytics_pdf(request: Request, db: Session = Depend
             [t("label_present_share", lang), f"{present_share:.1f}%"],
         ]
         filename = f"attendance_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        return _pdf_table_response(t("title_attendance_export", lang), headers, rows_data, filename)
+        return await _pdf_table_response(t("title_attendance_export", lang), headers, rows_data, filename)
     except Exception as exc:
         logger.error("Export attendance analytics pdf failed: %s", exc, exc_info=True)
         raise http_error(500, ErrorCode.EXPORT_FAILED, "Export failed", request, context={"error": str(exc)})
@@ -2224,41 +2138,36 @@ async def export_attendance_analytics_pdf(request: Request, db: Session = Depend
 
 @router.get("/courses/excel")
 @require_permission("exports:generate")
-async def export_courses_excel(request: Request, db: Session = Depends(get_db)):
+async def export_courses_excel(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Export all courses to Excel"""
     audit = AuditLogger(db)
     try:
         (Course,) = import_names("models", "Course")
         lang = get_lang(request)
 
-        courses = db.query(Course).filter(Course.deleted_at.is_(None)).all()
+        courses = read_db.query(Course).filter(Course.deleted_at.is_(None)).all()
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_courses", lang)
-        headers = get_header_row("courses", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row, c in enumerate(courses, 2):
-            ws.cell(row=row, column=1, value=c.id)
-            ws.cell(row=row, column=2, value=c.course_code)
-            ws.cell(row=row, column=3, value=c.course_name)
-            ws.cell(row=row, column=4, value=c.semester)
-            ws.cell(row=row, column=5, value=c.credits)
-            ws.cell(row=row, column=6, value=c.hours_per_week)
-            ws.cell(row=row, column=7, value=c.periods_per_week)
-            ws.cell(row=row, column=8, value=c.description or "")
-
-        for col in range(1, 9):
-            ws.column_dimensions[get_column_letter(col)].width = 20
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_courses", lang), widths=[20] * 8)
+        ws.header(get_header_row("courses", lang))
+
+        for c in courses:
+            ws.append(
+                [
+                    c.id,
+                    c.course_code,
+                    c.course_name,
+                    c.semester,
+                    c.credits,
+                    c.hours_per_week,
+                    c.periods_per_week,
+                    c.description or "",
+                ]
+            )
+
+        output = writer.to_spooled_file()
         filename = f"courses_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         # Log successful export
         audit.log_from_request(
@@ -2268,11 +2177,7 @@ async def export_courses_excel(request: Request, db: Session = Depends(get_db)):
             details={"count": len(courses), "format": "excel", "filename": filename},
             success=True,
         )
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export courses excel failed: %s", exc, exc_info=True)
         # Log failed export
@@ -2294,12 +2199,14 @@ async def export_courses_excel(request: Request, db: Session = Depends(get_db)):
 
 @router.get("/courses/csv")
 @require_permission("exports:generate")
-async def export_courses_csv(request: Request, db: Session = Depends(get_db)):
+async def export_courses_csv(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         (Course,) = import_names("models", "Course")
         lang = get_lang(request)
-        courses = db.query(Course).filter(Course.deleted_at.is_(None)).all()
+        courses = read_db.query(Course).filter(Course.deleted_at.is_(None)).all()
         headers = get_header_row("courses", lang)
         rows = [
             [
@@ -2337,7 +2244,9 @@ async def export_courses_csv(request: Request, db: Session = Depends(get_db)):
 
 @router.get("/enrollments/excel")
 @require_permission("exports:generate")
-async def export_enrollments_excel(request: Request, db: Session = Depends(get_db)):
+async def export_enrollments_excel(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Export all course enrollments to Excel"""
     audit = AuditLogger(db)
     try:
@@ -2345,36 +2254,29 @@ async def export_enrollments_excel(request: Request, db: Session = Depends(get_d
         lang = get_lang(request)
         na_value = not_available(lang)
 
-        enrollments = db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
+        enrollments = read_db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_enrollments", lang)
-        headers = get_header_row("enrollments", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row, e in enumerate(enrollments, 2):
-            student = db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
-
-            ws.cell(row=row, column=1, value=e.id)
-            ws.cell(row=row, column=2, value=e.student_id)
-            ws.cell(row=row, column=3, value=f"{student.first_name} {student.last_name}" if student else na_value)
-            ws.cell(row=row, column=4, value=e.course_id)
-            ws.cell(row=row, column=5, value=course.course_code if course else na_value)
-            ws.cell(row=row, column=6, value=course.course_name if course else na_value)
-            ws.cell(row=row, column=7, value=format_date_value(e.enrolled_at, lang))
-
-        for col in range(1, 8):
-            ws.column_dimensions[get_column_letter(col)].width = 18
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_enrollments", lang), widths=[18] * 7)
+        ws.header(get_header_row("enrollments", lang))
+
+        for e in enrollments:
+            student = read_db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
+
+            ws.append(
+                [
+                    e.id,
+                    e.student_id,
+                    f"{student.first_name} {student.last_name}" if student else na_value,
+                    e.course_id,
+                    course.course_code if course else na_value,
+                    course.course_name if course else na_value,
+                    format_date_value(e.enrolled_at, lang),
+                ]
+            )
+
+        output = writer.to_spooled_file()
         filename = f"enrollments_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         # Log successful export
         audit.log_from_request(
@@ -2384,11 +2286,7 @@ async def export_enrollments_excel(request: Request, db: Session = Depends(get_d
             details={"count": len(enrollments), "format": "excel", "filename": filename},
             success=True,
         )
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export enrollments excel failed: %s", exc, exc_info=True)
         # Log failed export
@@ -2410,18 +2308,20 @@ async def export_enrollments_excel(request: Request, db: Session = Depends(get_d
 
 @router.get("/enrollments/csv")
 @require_permission("exports:generate")
-async def export_enrollments_csv(request: Request, db: Session = Depends(get_db)):
+async def export_enrollments_csv(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         CourseEnrollment, Student, Course = import_names("models", "CourseEnrollment", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
-        enrollments = db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
+        enrollments = read_db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
         headers = get_header_row("enrollments", lang)
         rows = []
         for e in enrollments:
-            student = db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
             rows.append(
                 [
                     e.id,
@@ -2456,18 +2356,20 @@ async def export_enrollments_csv(request: Request, db: Session = Depends(get_db)
 
 @router.get("/enrollments/pdf")
 @require_permission("exports:generate")
-async def export_enrollments_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_enrollments_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         CourseEnrollment, Student, Course = import_names("models", "CourseEnrollment", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
-        enrollments = db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
+        enrollments = read_db.query(CourseEnrollment).filter(CourseEnrollment.deleted_at.is_(None)).all()
         headers = get_header_row("enrollments", lang)
         rows = []
         for e in enrollments:
-            student = db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == e.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == e.course_id, Course.deleted_at.is_(None)).first()
             rows.append(
                 [
                     str(e.id),
@@ -2487,7 +2389,7 @@ async def export_enrollments_pdf(request: Request, db: Session = Depends(get_db)
             details={"count": len(enrollments), "format": "pdf", "filename": filename},
             success=True,
         )
-        return _pdf_table_response(t("sheet_enrollments", lang), headers, rows, filename)
+        return await _pdf_table_response(t("sheet_enrollments", lang), headers, rows, filename)
     except Exception as exc:
         logger.error("Export enrollments pdf failed: %s", exc, exc_info=True)
         audit.log_from_request(
@@ -2502,7 +2404,9 @@ async def export_enrollments_pdf(request: Request, db: Session = Depends(get_db)
 
 @router.get("/grades/excel")
 @require_permission("exports:generate")
-async def export_all_grades_excel(request: Request, db: Session = Depends(get_db)):
+async def export_all_grades_excel(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Export all grades to Excel"""
     audit = AuditLogger(db)
     try:
@@ -2510,46 +2414,35 @@ async def export_all_grades_excel(request: Request, db: Session = Depends(get_db
         lang = get_lang(request)
         na_value = not_available(lang)
 
-        grades = db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
+        grades = read_db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_all_grades", lang)
-        headers = get_header_row("all_grades", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row, g in enumerate(grades, 2):
-            student = db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_all_grades", lang), widths=[15] * 12)
+        ws.header(get_header_row("all_grades", lang))
+
+        for g in grades:
+            student = read_db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
             pct = (g.grade / g.max_grade) * 100 if g.max_grade else 0
 
-            ws.cell(row=row, column=1, value=g.id)
-            ws.cell(row=row, column=2, value=g.student_id)
-            ws.cell(row=row, column=3, value=f"{student.first_name} {student.last_name}" if student else na_value)
-            ws.cell(row=row, column=4, value=g.course_id)
-            ws.cell(row=row, column=5, value=course.course_name if course else na_value)
-            ws.cell(row=row, column=6, value=translate_assignment_name(g.assignment_name, lang))
-            ws.cell(row=row, column=7, value=translate_grade_category(g.category or na_value, lang))
-            ws.cell(row=row, column=8, value=g.grade)
-            ws.cell(row=row, column=9, value=g.max_grade)
-            ws.cell(row=row, column=10, value=f"{pct:.2f}%")
-            ws.cell(row=row, column=11, value=g.weight)
-            ws.cell(
-                row=row,
-                column=12,
-                value=format_date_value(g.date_submitted, lang) if g.date_submitted else na_value,
+            ws.append(
+                [
+                    g.id,
+                    g.student_id,
+                    f"{student.first_name} {student.last_name}" if student else na_value,
+                    g.course_id,
+                    course.course_name if course else na_value,
+                    translate_assignment_name(g.assignment_name, lang),
+                    translate_grade_category(g.category or na_value, lang),
+                    g.grade,
+                    g.max_grade,
+                    f"{pct:.2f}%",
+                    g.weight,
+                    format_date_value(g.date_submitted, lang) if g.date_submitted else na_value,
+                ]
             )
 
-        for col in range(1, 13):
-            ws.column_dimensions[get_column_letter(col)].width = 15
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        output = writer.to_spooled_file()
         filename = f"all_grades_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         # Log successful export
         audit.log_from_request(
@@ -2559,11 +2452,7 @@ async def export_all_grades_excel(request: Request, db: Session = Depends(get_db
             details={"count": len(grades), "format": "excel", "filename": filename},
             success=True,
         )
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export all grades excel failed: %s", exc, exc_info=True)
         # Log failed export
@@ -2585,18 +2474,20 @@ async def export_all_grades_excel(request: Request, db: Session = Depends(get_db
 
 @router.get("/grades/csv")
 @require_permission("exports:generate")
-async def export_all_grades_csv(request: Request, db: Session = Depends(get_db)):
+async def export_all_grades_csv(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         Grade, Student, Course = import_names("models", "Grade", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
-        grades = db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
+        grades = read_db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
         headers = get_header_row("all_grades", lang)
         rows = []
         for g in grades:
-            student = db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
             pct = (g.grade / g.max_grade) * 100 if g.max_grade else 0
             rows.append(
                 [
@@ -2637,18 +2528,20 @@ async def export_all_grades_csv(request: Request, db: Session = Depends(get_db))
 
 @router.get("/grades/pdf")
 @require_permission("exports:generate")
-async def export_all_grades_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_all_grades_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         Grade, Student, Course = import_names("models", "Grade", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
-        grades = db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
+        grades = read_db.query(Grade).filter(Grade.deleted_at.is_(None)).all()
         headers = get_header_row("all_grades", lang)
         rows = []
         for g in grades:
-            student = db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == g.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == g.course_id, Course.deleted_at.is_(None)).first()
             pct = (g.grade / g.max_grade) * 100 if g.max_grade else 0
             rows.append(
                 [
@@ -2674,7 +2567,7 @@ async def export_all_grades_pdf(request: Request, db: Session = Depends(get_db))
             details={"count": len(grades), "format": "pdf", "filename": filename},
             success=True,
         )
-        return _pdf_table_response(t("sheet_all_grades", lang), headers, rows, filename)
+        return await _pdf_table_response(t("sheet_all_grades", lang), headers, rows, filename)
     except Exception as exc:
         logger.error("Export all grades pdf failed: %s", exc, exc_info=True)
         audit.log_from_request(
@@ -2689,7 +2582,9 @@ async def export_all_grades_pdf(request: Request, db: Session = Depends(get_db))
 
 @router.get("/performance/excel")
 @require_permission("exports:generate")
-async def export_daily_performance_excel(request: Request, db: Session = Depends(get_db)):
+async def export_daily_performance_excel(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Export all daily performance records to Excel"""
     audit = AuditLogger(db)
     try:
@@ -2697,40 +2592,33 @@ async def export_daily_performance_excel(request: Request, db: Session = Depends
         lang = get_lang(request)
         na_value = not_available(lang)
 
-        performances = db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
+        performances = read_db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_daily_performance", lang)
-        headers = get_header_row("daily_performance", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row, p in enumerate(performances, 2):
-            student = db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
-
-            ws.cell(row=row, column=1, value=p.id)
-            ws.cell(row=row, column=2, value=p.student_id)
-            ws.cell(row=row, column=3, value=f"{student.first_name} {student.last_name}" if student else na_value)
-            ws.cell(row=row, column=4, value=p.course_id)
-            ws.cell(row=row, column=5, value=course.course_name if course else na_value)
-            ws.cell(row=row, column=6, value=format_date_value(p.date, lang))
-            ws.cell(row=row, column=7, value=translate_grade_category(p.category or na_value, lang))
-            ws.cell(row=row, column=8, value=p.score)
-            ws.cell(row=row, column=9, value=p.max_score)
-            ws.cell(row=row, column=10, value=f"{p.percentage:.2f}%")
-            ws.cell(row=row, column=11, value=p.notes or "")
-
-        for col in range(1, 12):
-            ws.column_dimensions[get_column_letter(col)].width = 15
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_daily_performance", lang), widths=[15] * 11)
+        ws.header(get_header_row("daily_performance", lang))
+
+        for p in performances:
+            student = read_db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
+
+            ws.append(
+                [
+                    p.id,
+                    p.student_id,
+                    f"{student.first_name} {student.last_name}" if student else na_value,
+                    p.course_id,
+                    course.course_name if course else na_value,
+                    format_date_value(p.date, lang),
+                    translate_grade_category(p.category or na_value, lang),
+                    p.score,
+                    p.max_score,
+                    f"{p.percentage:.2f}%",
+                    p.notes or "",
+                ]
+            )
+
+        output = writer.to_spooled_file()
         filename = f"daily_performance_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         # Log successful export
         audit.log_from_request(
@@ -2740,11 +2628,7 @@ async def export_daily_performance_excel(request: Request, db: Session = Depends
             details={"count": len(performances), "format": "excel", "filename": filename},
             success=True,
         )
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export daily performance excel failed: %s", exc, exc_info=True)
         # Log failed export
@@ -2766,18 +2650,20 @@ async def export_daily_performance_excel(request: Request, db: Session = Depends
 
 @router.get("/performance/csv")
 @require_permission("exports:generate")
-async def export_daily_performance_csv(request: Request, db: Session = Depends(get_db)):
+async def export_daily_performance_csv(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         DailyPerformance, Student, Course = import_names("models", "DailyPerformance", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
-        performances = db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
+        performances = read_db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
         headers = get_header_row("daily_performance", lang)
         rows = []
         for p in performances:
-            student = db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
             rows.append(
                 [
                     p.id,
@@ -2816,18 +2702,20 @@ async def export_daily_performance_csv(request: Request, db: Session = Depends(g
 
 @router.get("/performance/pdf")
 @require_permission("exports:generate")
-async def export_daily_performance_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_daily_performance_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         DailyPerformance, Student, Course = import_names("models", "DailyPerformance", "Student", "Course")
         lang = get_lang(request)
         na_value = not_available(lang)
-        performances = db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
+        performances = read_db.query(DailyPerformance).filter(DailyPerformance.deleted_at.is_(None)).all()
         headers = get_header_row("daily_performance", lang)
         rows = []
         for p in performances:
-            student = db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
-            course = db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == p.student_id, Student.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == p.course_id, Course.deleted_at.is_(None)).first()
             rows.append(
                 [
                     str(p.id),
@@ -2851,7 +2739,7 @@ async def export_daily_performance_pdf(request: Request, db: Session = Depends(g
             details={"count": len(performances), "format": "pdf", "filename": filename},
             success=True,
         )
-        return _pdf_table_response(t("sheet_daily_performance", lang), headers, rows, filename)
+        return await _pdf_table_response(t("sheet_daily_performance", lang), headers, rows, filename)
     except Exception as exc:
         logger.error("Export daily performance pdf failed: %s", exc, exc_info=True)
         audit.log_from_request(
@@ -2866,7 +2754,9 @@ async def export_daily_performance_pdf(request: Request, db: Session = Depends(g
 
 @router.get("/highlights/excel")
 @require_permission("exports:generate")
-async def export_highlights_excel(request: Request, db: Session = Depends(get_db)):
+async def export_highlights_excel(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Export all student highlights to Excel"""
     audit = AuditLogger(db)
     try:
@@ -2874,37 +2764,30 @@ async def export_highlights_excel(request: Request, db: Session = Depends(get_db
         lang = get_lang(request)
         na_value = not_available(lang)
 
-        highlights = db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
+        highlights = read_db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
 
-        wb = openpyxl.Workbook()
-        ws: Any = wb.active
-        ws.title = t("sheet_highlights", lang)
-        headers = get_header_row("highlights", lang)
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row, h in enumerate(highlights, 2):
-            student = db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
-
-            ws.cell(row=row, column=1, value=h.id)
-            ws.cell(row=row, column=2, value=h.student_id)
-            ws.cell(row=row, column=3, value=f"{student.first_name} {student.last_name}" if student else na_value)
-            ws.cell(row=row, column=4, value=h.semester)
-            ws.cell(row=row, column=5, value=translate_grade_category(h.category or na_value, lang))
-            ws.cell(row=row, column=6, value=h.rating or na_value)
-            ws.cell(row=row, column=7, value=h.highlight_text)
-            ws.cell(row=row, column=8, value=format_date_value(h.date_created, lang))
-            ws.cell(row=row, column=9, value=yes_no(bool(h.is_positive), lang))
-
-        for col in range(1, 10):
-            ws.column_dimensions[get_column_letter(col)].width = 18
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet(t("sheet_highlights", lang), widths=[18] * 9)
+        ws.header(get_header_row("highlights", lang))
+
+        for h in highlights:
+            student = read_db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
+
+            ws.append(
+                [
+                    h.id,
+                    h.student_id,
+                    f"{student.first_name} {student.last_name}" if student else na_value,
+                    h.semester,
+                    translate_grade_category(h.category or na_value, lang),
+                    h.rating or na_value,
+                    h.highlight_text,
+                    format_date_value(h.date_created, lang),
+                    yes_no(bool(h.is_positive), lang),
+                ]
+            )
+
+        output = writer.to_spooled_file()
         filename = f"highlights_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         # Log successful export
         audit.log_from_request(
@@ -2914,11 +2797,7 @@ async def export_highlights_excel(request: Request, db: Session = Depends(get_db
             details={"count": len(highlights), "format": "excel", "filename": filename},
             success=True,
         )
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(output, filename)
     except Exception as exc:
         logger.error("Export highlights excel failed: %s", exc, exc_info=True)
         # Log failed export
@@ -2940,17 +2819,19 @@ async def export_highlights_excel(request: Request, db: Session = Depends(get_db
 
 @router.get("/highlights/csv")
 @require_permission("exports:generate")
-async def export_highlights_csv(request: Request, db: Session = Depends(get_db)):
+async def export_highlights_csv(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         Highlight, Student = import_names("models", "Highlight", "Student")
         lang = get_lang(request)
         na_value = not_available(lang)
-        highlights = db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
+        highlights = read_db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
         headers = get_header_row("highlights", lang)
         rows = []
         for h in highlights:
-            student = db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
             rows.append(
                 [
                     h.id,
@@ -2987,17 +2868,19 @@ async def export_highlights_csv(request: Request, db: Session = Depends(get_db))
 
 @router.get("/highlights/pdf")
 @require_permission("exports:generate")
-async def export_highlights_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_highlights_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     audit = AuditLogger(db)
     try:
         Highlight, Student = import_names("models", "Highlight", "Student")
         lang = get_lang(request)
         na_value = not_available(lang)
-        highlights = db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
+        highlights = read_db.query(Highlight).filter(Highlight.deleted_at.is_(None)).all()
         headers = get_header_row("highlights", lang)
         rows = []
         for h in highlights:
-            student = db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
+            student = read_db.query(Student).filter(Student.id == h.student_id, Student.deleted_at.is_(None)).first()
             rows.append(
                 [
                     str(h.id),
@@ -3019,7 +2902,7 @@ async def export_highlights_pdf(request: Request, db: Session = Depends(get_db))
             details={"count": len(highlights), "format": "pdf", "filename": filename},
             success=True,
         )
-        return _pdf_table_response(t("sheet_highlights", lang), headers, rows, filename)
+        return await _pdf_table_response(t("sheet_highlights", lang), headers, rows, filename)
     except Exception as exc:
         logger.error("Export highlights pdf failed: %s", exc, exc_info=True)
         audit.log_from_request(
@@ -3034,7 +2917,9 @@ async def export_highlights_pdf(request: Request, db: Session = Depends(get_db))
 
 @router.get("/student-report/pdf/{student_id}")
 @require_permission("exports:generate")
-async def export_student_report_pdf(student_id: int, request: Request, db: Session = Depends(get_db)):
+async def export_student_report_pdf(
+    student_id: int, request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Generate comprehensive student report PDF with grades, attendance, and analytics"""
     try:
         if not REPORTLAB_AVAILABLE:
@@ -3051,8 +2936,7 @@ async def export_student_report_pdf(student_id: int, request: Request, db: Sessi
         )
         lang = get_lang(request)
         # Register DejaVu Sans font for Unicode/Greek support
-        font_path = os.path.join(os.path.dirname(__file__), "../fonts/DejaVuSans.ttf")
-        pdfmetrics.registerFont(TTFont("DejaVuSans", font_path))
+        register_report_fonts()
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5 * inch, bottomMargin=0.5 * inch)
         elements: list[Flowable] = []
@@ -3067,7 +2951,7 @@ async def export_student_report_pdf(student_id: int, request: Request, db: Sessi
             spaceAfter=10,
             alignment=1,
         )
-        student = db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
+        student = read_db.query(Student).filter(Student.id == student_id, Student.deleted_at.is_(None)).first()
         if not student:
             raise http_error(
                 404,
@@ -3104,7 +2988,7 @@ async def export_student_report_pdf(student_id: int, request: Request, db: Sessi
         )
         elements.append(Paragraph(t("attendance_summary", lang), subtitle_style))
         attendance_records = (
-            db.query(Attendance).filter(Attendance.student_id == student_id, Attendance.deleted_at.is_(None)).all()
+            read_db.query(Attendance).filter(Attendance.student_id == student_id, Attendance.deleted_at.is_(None)).all()
         )
         total_att = len(attendance_records)
         present = len([a for a in attendance_records if a.status == "Present"])
@@ -3126,14 +3010,14 @@ async def export_student_report_pdf(student_id: int, request: Request, db: Sessi
         elements.append(Spacer(1, 0.3 * inch))
         # Grades by Course
         elements.append(Paragraph(t("grades_by_course", lang), subtitle_style))
-        grades = db.query(Grade).filter(Grade.student_id == student_id, Grade.deleted_at.is_(None)).all()
+        grades = read_db.query(Grade).filter(Grade.student_id == student_id, Grade.deleted_at.is_(None)).all()
         course_grades: Dict[Any, List[Any]] = {}
         for g in grades:
             if g.course_id not in course_grades:
                 course_grades[g.course_id] = []
             course_grades[g.course_id].append(g)
         for course_id, course_grade_list in course_grades.items():
-            course = db.query(Course).filter(Course.id == course_id, Course.deleted_at.is_(None)).first()
+            course = read_db.query(Course).filter(Course.id == course_id, Course.deleted_at.is_(None)).first()
             if not course:
                 continue
             elements.append(
@@ -3179,7 +3063,7 @@ async def export_student_report_pdf(student_id: int, request: Request, db: Sessi
             elements.append(Spacer(1, 0.2 * inch))
         # Daily Performance Summary
         daily_perf = (
-            db.query(DailyPerformance)
+            read_db.query(DailyPerformance)
             .filter(
                 DailyPerformance.student_id == student_id,
                 DailyPerformance.deleted_at.is_(None),
@@ -3235,12 +3119,14 @@ async def export_student_report_pdf(student_id: int, request: Request, db: Sessi
 
 @router.get("/courses/pdf")
 @require_permission("exports:generate")
-async def export_courses_pdf(request: Request, db: Session = Depends(get_db)):
+async def export_courses_pdf(
+    request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Export all courses to PDF"""
     try:
         (Course,) = import_names("models", "Course")
         lang = get_lang(request)
-        courses = db.query(Course).filter(Course.deleted_at.is_(None)).all()
+        courses = read_db.query(Course).filter(Course.deleted_at.is_(None)).all()
         filename = f"courses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         headers = [
             t("label_course_code", lang),
@@ -3261,7 +3147,7 @@ async def export_courses_pdf(request: Request, db: Session = Depends(get_db)):
             ]
             for c in courses
         ]
-        return _pdf_table_response(t("title_course_catalog", lang), headers, rows, filename)
+        return await _pdf_table_response(t("title_course_catalog", lang), headers, rows, filename)
     except Exception as exc:
         logger.error("Export courses pdf failed: %s", exc, exc_info=True)
         raise http_error(
@@ -3275,7 +3161,9 @@ async def export_courses_pdf(request: Request, db: Session = Depends(get_db)):
 
 @router.get("/analytics/course/{course_id}/pdf")
 @require_permission("exports:generate")
-async def export_course_analytics_pdf(course_id: int, request: Request, db: Session = Depends(get_db)):
+async def export_course_analytics_pdf(
+    course_id: int, request: Request, db: Session = Depends(get_db), read_db: Session = Depends(get_read_session)
+):
     """Export course analytics report to PDF"""
     try:
         if not REPORTLAB_AVAILABLE:
@@ -3289,10 +3177,9 @@ async def export_course_analytics_pdf(course_id: int, request: Request, db: Sess
 
         Course, Grade, CourseEnrollment = import_names("models", "Course", "Grade", "CourseEnrollment")
         lang = get_lang(request)
-        font_path = os.path.join(os.path.dirname(__file__), "../fonts/DejaVuSans.ttf")
-        pdfmetrics.registerFont(TTFont("DejaVuSans", font_path))
+        register_report_fonts()
 
-        course = db.query(Course).filter(Course.id == course_id, Course.deleted_at.is_(None)).first()
+        course = read_db.query(Course).filter(Course.id == course_id, Course.deleted_at.is_(None)).first()
         if not course:
             raise http_error(
                 404,
@@ -3338,7 +3225,7 @@ async def export_course_analytics_pdf(course_id: int, request: Request, db: Sess
 
         # Get enrollments
         enrollments = (
-            db.query(CourseEnrollment)
+            read_db.query(CourseEnrollment)
             .filter(
                 CourseEnrollment.course_id == course_id,
                 CourseEnrollment.deleted_at.is_(None),
@@ -3347,7 +3234,7 @@ async def export_course_analytics_pdf(course_id: int, request: Request, db: Sess
         )
 
         # Get all grades for this course
-        grades = db.query(Grade).filter(Grade.course_id == course_id, Grade.deleted_at.is_(None)).all()
+        grades = read_db.query(Grade).filter(Grade.course_id == course_id, Grade.deleted_at.is_(None)).all()
 
         # Calculate statistics
         student_ids = set([e.student_id for e in enrollments])
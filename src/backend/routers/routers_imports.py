@@ -6,15 +6,16 @@ Bulk-import courses and students from JSON files in templates directories.
 """
 
 import csv
-import io
+import itertools
 import json
 import logging
 import os
 import re
 import unicodedata
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from sqlalchemy.orm import Session
@@ -25,7 +26,16 @@ from backend.schemas.audit import AuditAction, AuditResource
 from backend.security.api_keys import verify_api_key_optional
 from backend.rbac import require_permission
 from backend.services.audit_service import AuditLogger
+from backend.services.course_template_import import CourseTemplateImporter
 from backend.services.import_service import ImportService
+from backend.services.upload_ingestion import (
+    SpooledUpload,
+    UploadTooLargeError,
+    batched,
+    iter_json_batches,
+    sniff_encoding,
+    spool_upload,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,15 +73,21 @@ from backend.schemas import (
 
 
 # --- File Upload Validation ---
-async def validate_uploaded_file(request: Request, file: UploadFile) -> bytes:
+async def spool_uploaded_file(request: Request, file: UploadFile, validate_json: bool = True) -> SpooledUpload:
     """
-    Validate uploaded file for security constraints.
+    Validate an uploaded file while streaming it to a temporary spool.
+
+    The size limit is enforced chunk by chunk, so oversized uploads are rejected
+    without buffering the whole body in memory.
 
     Args:
         file: The uploaded file to validate
+        validate_json: Parse JSON uploads to check their syntax. Callers that
+            parse the spool themselves can skip this and get the same errors
+            from ``_iter_json_upload``.
 
     Returns:
-        File contents as bytes
+        The spooled upload; callers must close it
 
     Raises:
         HTTPException: If file fails validation (size, type, extension)
@@ -100,15 +116,11 @@ async def validate_uploaded_file(request: Request, file: UploadFile) -> bytes:
             context={"content_type": content_type, "allowed_types": sorted(ALLOWED_MIME_TYPES)},
         )
 
-    # Read file content and check size
-    content = await file.read()
-    content_size = len(content)
-
-    if content_size == 0:
-        raise http_error(400, ErrorCode.IMPORT_EMPTY_FILE, "Uploaded file is empty", request)
-
-    if content_size > MAX_FILE_SIZE:
-        size_mb = content_size / (1024 * 1024)
+    # Stream file content to the spool and check size as it arrives
+    try:
+        upload = await spool_upload(file, MAX_FILE_SIZE)
+    except UploadTooLargeError as exc:
+        size_mb = exc.size / (1024 * 1024)
         max_mb = MAX_FILE_SIZE / (1024 * 1024)
         raise http_error(
             413,
@@ -118,32 +130,75 @@ async def validate_uploaded_file(request: Request, file: UploadFile) -> bytes:
             context={"size_mb": round(size_mb, 2), "max_mb": round(max_mb, 2)},
         )
 
+    if upload.size == 0:
+        upload.close()
+        raise http_error(400, ErrorCode.IMPORT_EMPTY_FILE, "Uploaded file is empty", request)
+
     # For JSON files, validate that content is valid JSON
-    if file.filename and file.filename.lower().endswith(".json"):
+    if validate_json and upload.filename.lower().endswith(".json"):
         try:
-            json.loads(content.decode("utf-8"))
-        except json.JSONDecodeError as exc:
-            raise http_error(
-                400,
-                ErrorCode.IMPORT_INVALID_JSON,
-                "Invalid JSON format",
-                request,
-                context={"error": str(exc)},
-            )
-        except UnicodeDecodeError:
-            raise http_error(
-                400,
-                ErrorCode.IMPORT_INVALID_ENCODING,
-                "Invalid file encoding. JSON files must be UTF-8 encoded",
-                request,
-            )
+            for _batch in _iter_json_upload(request, upload):
+                pass
+        except HTTPException:
+            upload.close()
+            raise
 
     # Avoid reserved LogRecord attribute keys like 'filename'
     logger.info(
         "File validation passed",
-        extra={"file_name": file.filename, "size_bytes": content_size},
+        extra={"file_name": file.filename, "size_bytes": upload.size},
     )
-    return content
+    return upload
+
+
+async def validate_uploaded_file(request: Request, file: UploadFile) -> bytes:
+    """
+    Validate uploaded file for security constraints.
+
+    Args:
+        file: The uploaded file to validate
+
+    Returns:
+        File contents as bytes
+
+    Raises:
+        HTTPException: If file fails validation (size, type, extension)
+    """
+    with await spool_uploaded_file(request, file) as upload:
+        return upload.read_bytes()
+
+
+def _iter_json_upload(request: Request, upload: SpooledUpload) -> Iterator[list]:
+    """Yield batches of records from a spooled JSON upload.
+
+    Raises:
+        HTTPException: If a ``.json`` upload is not UTF-8 or not valid JSON.
+            Uploads with other extensions raise the underlying decode error.
+    """
+    is_json = upload.filename.lower().endswith(".json")
+    try:
+        encoding = sniff_encoding(upload.prefix, fallback=None)
+        with upload.open_text(encoding) as stream:
+            yield from iter_json_batches(stream)
+    except json.JSONDecodeError as exc:
+        if not is_json:
+            raise
+        raise http_error(
+            400,
+            ErrorCode.IMPORT_INVALID_JSON,
+            "Invalid JSON format",
+            request,
+            context={"error": str(exc)},
+        )
+    except UnicodeDecodeError:
+        if not is_json:
+            raise
+        raise http_error(
+            400,
+            ErrorCode.IMPORT_INVALID_ENCODING,
+            "Invalid file encoding. JSON files must be UTF-8 encoded",
+            request,
+        )
 
 
 # --- Helpers: normalize/translate evaluation rule categories ---
@@ -220,6 +275,40 @@ def _valid_email(s: str) -> bool:
     return 0 < dot_idx < len(domain) - 1 and " " not in s and "\t" not in s
 
 
+_CATEGORY_SEPARATOR_RE = re.compile(r"[·•:\-–—]")
+# Accent-free keyword fragments, checked in order; the first match wins
+_CATEGORY_KEYWORDS: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("συμμετοχ",), "Class Participation"),
+    (("συνεχη", "διαρκ"), "Continuous Assessment"),
+    (("εργαστηρι",), "Lab Work"),
+    (("ασκησ",), "Exercises"),
+    (("εργασι",), "Assignments"),
+    (("εργασιων στο σπιτι", "στο σπιτι"), "Homework"),
+    (("ενδιαμεση", "προοδος"), "Midterm Exam"),
+    (("τελικ", "τελικη εξεταση"), "Final Exam"),
+    (("εξεταση",), "Exam"),
+    (("παρουσιασ",), "Presentation"),
+    (("project", "εργο"), "Project"),
+    (("quiz", "τεστ"), "Quiz"),
+    (("report", "εκθεση"), "Report"),
+)
+_ENGLISH_CATEGORIES = {
+    "class participation": "Class Participation",
+    "continuous assessment": "Continuous Assessment",
+    "lab assessment": "Lab Work",
+    "lab work": "Lab Work",
+    "assignments": "Assignments",
+    "homework": "Homework",
+    "midterm exam": "Midterm Exam",
+    "final exam": "Final Exam",
+    "exam": "Exam",
+    "presentation": "Presentation",
+    "project": "Project",
+    "quiz": "Quiz",
+    "report": "Report",
+}
+
+
 def _strip_accents(s: str) -> str:
     """
     Remove accent marks from Unicode characters.
@@ -250,9 +339,8 @@ def _clean_cat(s: str) -> str:
     """
     s = s.strip()
     s = s.rstrip(") \t\r\n")  # drop trailing )/spaces without regex backtracking
-    s = re.sub(r"[·•:\-–—]", " ", s)  # collapse separators (surrounding spaces handled by strip and next sub)
-    s = re.sub(r" +", " ", s)  # collapse internal spaces (avoid \s+ backtracking on uncontrolled input)
-    return s.strip()
+    s = _CATEGORY_SEPARATOR_RE.sub(" ", s)  # collapse separators (surrounding spaces handled by the join)
+    return " ".join(s.split())  # collapse internal whitespace without regex backtracking
 
 
 def _ends_with_num(s: str) -> bool:
@@ -261,47 +349,21 @@ def _ends_with_num(s: str) -> bool:
     return bool(tail) and tail[-1].isdigit()
 
 
-def _map_category(raw: str) -> str:
-    base = _clean_cat(str(raw))
+def _map_category(raw: Any) -> str:
+    """Map a raw evaluation-rule category (Greek or English) to its canonical English label."""
+    return _map_category_text(str(raw))
+
+
+@lru_cache(maxsize=2048)
+def _map_category_text(raw: str) -> str:
+    # Templates repeat the same handful of categories, so each distinct string is cleaned once
+    base = _clean_cat(raw)
     base_noacc = _strip_accents(base).lower()
-    mapping = [
-        (["συμμετοχ"], "Class Participation"),
-        (["συνεχη", "διαρκ"], "Continuous Assessment"),
-        (["εργαστηρι"], "Lab Work"),
-        (["ασκησ"], "Exercises"),
-        (["εργασι"], "Assignments"),
-        (["εργασιων στο σπιτι", "στο σπιτι"], "Homework"),
-        (["ενδιαμεση", "προοδος"], "Midterm Exam"),
-        (["τελικ", "τελικη εξεταση"], "Final Exam"),
-        (["εξεταση"], "Exam"),
-        (["παρουσιασ"], "Presentation"),
-        (["project", "εργο"], "Project"),
-        (["quiz", "τεστ"], "Quiz"),
-        (["report", "εκθεση"], "Report"),
-    ]
-    for keys, label in mapping:
+    for keys, label in _CATEGORY_KEYWORDS:
         for k in keys:
             if k in base_noacc:
                 return label
-    english_known = {
-        "class participation": "Class Participation",
-        "continuous assessment": "Continuous Assessment",
-        "lab assessment": "Lab Work",
-        "lab work": "Lab Work",
-        "assignments": "Assignments",
-        "homework": "Homework",
-        "midterm exam": "Midterm Exam",
-        "final exam": "Final Exam",
-        "exam": "Exam",
-        "presentation": "Presentation",
-        "project": "Project",
-        "quiz": "Quiz",
-        "report": "Report",
-    }
-    low = base.lower()
-    if low in english_known:
-        return english_known[low]
-    return base
+    return _ENGLISH_CATEGORIES.get(base.lower(), base)
 
 
 def _translate_rules(rules: list[dict]) -> list[dict]:
@@ -321,36 +383,50 @@ def _translate_rules(rules: list[dict]) -> list[dict]:
     return out
 
 
-def _parse_csv_students(content: bytes, filename: str) -> tuple[list[dict], list[str]]:
+def _csv_encoding(upload: SpooledUpload) -> str:
     """
-    Parse CSV content into student objects.
+    Pick the text encoding of a spooled CSV upload.
+
+    The encoding is sniffed from the upload prefix (UTF-8 with or without BOM,
+    else latin-1). If a later part of the file turns out not to be UTF-8 the
+    file is read as latin-1. The check decodes the spool chunk by chunk, so the
+    rows themselves are parsed only once.
+    """
+    encoding = sniff_encoding(upload.prefix)
+    if encoding != "latin-1" and not upload.decodes_as(encoding):
+        return "latin-1"
+    return encoding
+
+
+def _iter_csv_students(upload: SpooledUpload, filename: str, errors: list[str]) -> Iterator[list[dict]]:
+    """
+    Yield batches of student objects parsed from a spooled CSV upload.
+
+    Args:
+        upload: Spooled CSV upload
+        filename: Original filename for error messages
+        errors: Row errors are appended here as rows are read
+    """
+    with upload.open_text(_csv_encoding(upload)) as stream:
+        yield from batched(_iter_csv_rows(stream, filename, errors))
+
+
+def _iter_csv_rows(lines: Iterable[str], filename: str, errors: list[str]) -> Iterator[dict]:
+    """
+    Yield student objects parsed from CSV text.
 
     Supports Greek column names from the AUT registration CSV format and headerless
     CSVs with positional columns:
     student_id; first_name; last_name; email; study_year; [optional fields]
 
     Args:
-        content: Raw CSV file bytes
+        lines: CSV text lines, read lazily
         filename: Original filename for error messages
+        errors: Row errors are appended here
     """
-    students: list[dict] = []
-    errors: list[str] = []
-
     try:
-        # Try UTF-8 with BOM first, then UTF-8, then latin-1
-        text = None
-        for encoding in ["utf-8-sig", "utf-8", "latin-1"]:
-            try:
-                text = content.decode(encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-        if text is None:
-            errors.append(f"{filename}: Could not decode CSV with any supported encoding")
-            return students, errors
-
         # DictReader path (Greek headers)
-        dict_reader = csv.DictReader(io.StringIO(text), delimiter=";")
+        dict_reader = csv.DictReader(lines, delimiter=";")
         column_map = {
             "Επώνυμο:": "last_name",
             "Όνομα:": "first_name",
@@ -365,20 +441,20 @@ def _parse_csv_students(content: bytes, filename: str) -> tuple[list[dict], list
         has_known_headers = any(name in fieldnames for name in column_map.keys())
 
         # Helper to process and validate a student record
-        def _process(student: Dict[str, Any], row_no: int):
+        def _process(student: Dict[str, Any], row_no: int) -> Dict[str, Any] | None:
             fn = student.get("first_name")
             ln = student.get("last_name")
             email = student.get("email")
             sid = student.get("student_id")
             if not fn or not ln:
                 errors.append(f"{filename} row {row_no}: Missing first_name or last_name")
-                return
+                return None
             if not email:
                 errors.append(f"{filename} row {row_no}: Missing email")
-                return
+                return None
             if not sid:
                 errors.append(f"{filename} row {row_no}: Missing student ID")
-                return
+                return None
             if not str(sid).startswith("S"):
                 student["student_id"] = f"S{sid}"
             # Study year conversion
@@ -396,7 +472,7 @@ def _parse_csv_students(content: bytes, filename: str) -> tuple[list[dict], list
             # Defaults
             student["is_active"] = True
             student["enrollment_date"] = datetime.now().date()
-            students.append(student)
+            return student
 
         if has_known_headers:
             row_no = 1
@@ -416,13 +492,16 @@ def _parse_csv_students(content: bytes, filename: str) -> tuple[list[dict], list
                             student[model_field] = val
                     if health_col and str(row.get(health_col, "")).strip():
                         student["health_issue"] = str(row.get(health_col)).strip()
-                    _process(student, row_no)
+                    parsed = _process(student, row_no)
                 except Exception as exc:
                     errors.append(f"{filename} row {row_no}: {exc!s}")
                     continue
+                if parsed is not None:
+                    yield parsed
         else:
-            # Headerless path: positional columns
-            raw_reader = csv.reader(io.StringIO(text), delimiter=";")
+            # Headerless path: positional columns. The first row was consumed as
+            # fieldnames, so replay it before the rest of the reader.
+            raw_reader = itertools.chain([fieldnames] if fieldnames else [], dict_reader.reader)
             row_no = 0
             for row_list in raw_reader:
                 row_no += 1
@@ -444,19 +523,235 @@ def _parse_csv_students(content: bytes, filename: str) -> tuple[list[dict], list
                         student["mobile_phone"] = str(row_list[5]).strip()
                     if len(row_list) >= 7 and str(row_list[6]).strip():
                         student["phone"] = str(row_list[6]).strip()
-                    _process(student, row_no)
+                    parsed = _process(student, row_no)
                 except Exception as exc:
                     errors.append(f"{filename} row {row_no}: {exc!s}")
                     continue
+                if parsed is not None:
+                    yield parsed
     except Exception as exc:
         errors.append(f"{filename}: CSV parsing failed - {exc!s}")
 
-    return students, errors
 
+# Header lines copied from course outlines that are not evaluation rules
+_RULE_METADATA_LINES = frozenset(
+    {
+        "Γλώσσα",
+        "Ελληνική",
+        "Αγγλική",
+        "Κωδικός",
+        "Μαθήματος",
+        "Τίτλος Μαθήματος",
+        "Κωδικός Μαθήματος",
+        "Τύπος Μαθήματος",
+        "Υποχρεωτικό",
+        "Επίπεδο",
+        "Έτος/Εξάμηνο",
+        "Φοίτησης",
+        "Όνομα Διδάσκοντα",
+        "Επίπεδο 5 του Εθνικού Πλαισίου Προσόντων",
+        "2o Έτος/Α΄ Εξάμηνο",
+    }
+)
+_TRAILING_WEIGHT_RE = re.compile(r"\d+%?\s*$")
+# Negated character class instead of .+? to prevent backtracking (CWE-1333)
+_RULE_ENTRY_RE = re.compile(r"^(?P<cat>[^:,\-]+)\s*[\s:,-]*\s*(?P<w>\d+(?:[\.,]\d+)?)%?$")
+
+
+def _normalize_course_template(obj: dict, name: str, errors: list[str]) -> dict | None:
+    """
+    Coerce one course object from a template file in place.
+
+    Problems are appended to ``errors`` prefixed with the file ``name``.
 
+    Returns:
+        The normalized object, or None when it has no course_code
+    """
+    code = obj.get("course_code")
+    if not code:
+        errors.append(f"Missing course_code in {name}")
+        return None
+    # Coerce common fields
+    if "credits" in obj:
+        try:
+            obj["credits"] = int(obj["credits"])
+        except Exception:
+            errors.append(f"{name}: invalid credits '{obj.get('credits')}', using default")
+            obj.pop("credits", None)
+    if "periods_per_week" in obj:
+        try:
+            obj["periods_per_week"] = int(float(obj["periods_per_week"]))
+        except Exception:
+            errors.append(f"{name}: invalid periods_per_week '{obj.get('periods_per_week')}', using default")
+            obj.pop("periods_per_week", None)
+        else:
+            if "hours_per_week" not in obj or obj.get("hours_per_week") in (None, ""):
+                obj["hours_per_week"] = float(obj["periods_per_week"])
+    if "hours_per_week" in obj:
+        try:
+            obj["hours_per_week"] = float(obj["hours_per_week"])
+        except Exception:
+            errors.append(f"{name}: invalid hours_per_week '{obj.get('hours_per_week')}', using default")
+            obj.pop("hours_per_week", None)
+    # Normalize simple string fields
+    if "course_code" in obj and isinstance(obj["course_code"], list):
+        obj["course_code"] = " ".join([str(x).strip() for x in obj["course_code"] if str(x).strip()])
+    if "course_name" in obj and isinstance(obj["course_name"], list):
+        obj["course_name"] = " ".join([str(x).strip() for x in obj["course_name"] if str(x).strip()])
+    if "semester" in obj and isinstance(obj["semester"], list):
+        obj["semester"] = " ".join([str(x).strip() for x in obj["semester"] if str(x).strip()])
+    # Set default semester if empty
+    if "semester" in obj and not obj["semester"]:
+        obj["semester"] = "Α' Εξάμηνο"  # Default to 1st semester
+    # Normalize description: must be a string
+    if "description" in obj and isinstance(obj["description"], list):
+        try:
+            obj["description"] = "\n".join(map(lambda x: str(x), obj["description"]))
+        except Exception:
+            obj["description"] = str(obj["description"])
+    if "evaluation_rules" in obj:
+        er = obj["evaluation_rules"]
+        rules = []  # Initialize rules variable at the start
+        if isinstance(er, str):
+            try:
+                obj["evaluation_rules"] = json.loads(er)
+            except Exception:
+                errors.append(f"{name}: evaluation_rules JSON parse failed, dropping field")
+                obj.pop("evaluation_rules", None)
+        elif isinstance(er, list):
+            if all(isinstance(x, dict) for x in er):
+                # Keep as-is, will translate below
+                rules = er
+            else:
+                # First, join consecutive strings that might be part of a multi-line entry
+                # A line ending with ':' followed by lines not containing ':' should be joined
+                joined_entries = []
+                current_entry = ""
+                for x in er:
+                    if not isinstance(x, str):
+                        continue
+                    x_stripped = x.strip()
+                    if not x_stripped:
+                        continue
+                    # Skip metadata entries like "Γλώσσα", "Ελληνική", "Αγγλική", etc.
+                    if x_stripped in _RULE_METADATA_LINES:
+                        continue
+                    # If we have a current entry and this line has a percentage, it's a continuation
+                    if current_entry and _TRAILING_WEIGHT_RE.search(x_stripped):
+                        current_entry += " " + x_stripped
+                        joined_entries.append(current_entry)
+                        current_entry = ""
+                    # If current entry exists and this doesn't look like a continuation, save current and start new
+                    elif current_entry and ":" in x_stripped:
+                        joined_entries.append(current_entry)
+                        current_entry = x_stripped
+                    # If no current entry and this has a colon but no percentage, it's the start of a multi-line
+                    elif not current_entry and ":" in x_stripped and not _TRAILING_WEIGHT_RE.search(x_stripped):
+                        current_entry = x_stripped
+                    # If it has both colon and percentage, it's a complete entry
+                    elif ":" in x_stripped and _TRAILING_WEIGHT_RE.search(x_stripped):
+                        joined_entries.append(x_stripped)
+                    # Otherwise, it's a continuation of current entry
+                    elif current_entry:
+                        current_entry += " " + x_stripped
+
+                # Don't forget the last entry if any
+                if current_entry:
+                    joined_entries.append(current_entry)
+
+                # Now use joined_entries instead of er for parsing
+                er = joined_entries  # type: ignore
+                rules = []
+                buf = []
+                # Pairing of consecutive primitives (category, weight)
+                for x in er:
+                    if isinstance(x, (str, int, float)):
+                        buf.append(x)
+                        if len(buf) == 2:
+                            cat = str(buf[0]).strip()
+                            w_raw = buf[1]
+                            if isinstance(w_raw, str):
+                                w_s = w_raw.replace("%", "").strip().replace(",", ".")
+                                try:
+                                    weight = float(w_s)
+                                except Exception:
+                                    weight = 0.0
+                            else:
+                                try:
+                                    weight = float(w_raw)
+                                except Exception:
+                                    weight = 0.0
+                            rules.append({"category": cat, "weight": weight})
+                            buf = []
+                if not rules:
+                    # Try parsing single-string entries like "Name: 10%" or "Name - 10%"
+                    for x in er:
+                        if isinstance(x, str):
+                            m = _RULE_ENTRY_RE.match(x.strip())
+                            if m:
+                                cat = m.group("cat").strip()
+                                w_s = m.group("w").replace(",", ".")
+                                try:
+                                    weight = float(w_s)
+                                except Exception:
+                                    weight = 0.0
+                                rules.append({"category": cat, "weight": weight})
+                # Only use parsed rules that have valid percentages, ignore metadata entries
+                obj["evaluation_rules"] = rules if rules else []
+            # Translate/localize categories if we have rules
+            if isinstance(obj.get("evaluation_rules"), list):
+                # Keep empty list silently; translate when non-empty
+                if obj["evaluation_rules"]:
+                    obj["evaluation_rules"] = _translate_rules(obj["evaluation_rules"])
+            elif isinstance(er, dict):
+                obj["evaluation_rules"] = _translate_rules([er])
+            else:
+                # Only report/drop if the original payload wasn't a list either
+                if not isinstance(er, list):
+                    errors.append(f"{name}: evaluation_rules unsupported type {type(er)}, dropping field")
+                obj.pop("evaluation_rules", None)
+    # Normalize teaching_schedule (JSON column): accept dict or JSON string (or empty list)
+    if "teaching_schedule" in obj:
+        ts = obj["teaching_schedule"]
+        if isinstance(ts, str):
+            try:
+                obj["teaching_schedule"] = json.loads(ts)
+            except Exception:
+                errors.append(f"{name}: teaching_schedule JSON parse failed, dropping field")
+                obj.pop("teaching_schedule", None)
+        elif isinstance(ts, dict):
+            pass
+        elif isinstance(ts, list) and len(ts) == 0:
+            # allow empty schedule
+            obj["teaching_schedule"] = []
+        else:
+            errors.append(f"{name}: teaching_schedule unsupported type {type(ts)}, dropping field")
+            obj.pop("teaching_schedule", None)
+    return obj
+
+
+def _parse_course_template(name: str, data: bytes) -> tuple[list[dict], list[str]]:
+    """Parse and normalize the courses in one template file (safe to run in worker threads)."""
+    errors: list[str] = []
+    courses: list[dict] = []
+    try:
+        parsed = json.loads(data.decode("utf-8"))
+        for obj in parsed if isinstance(parsed, list) else [parsed]:
+            course = _normalize_course_template(obj, name, errors)
+            if course is not None:
+                courses.append(course)
+    except Exception as exc:
+        logger.error("Failed to import course", extra={"name": name, "error_type": type(exc).__name__})
+        errors.append(f"{name}: {exc}")
+    return courses, errors
+
+
+@router.post("/courses")
 @limiter.limit(RATE_LIMIT_TEACHER_IMPORT)
+@require_permission("imports:create")
 def import_courses(
     request: Request,
+    force: bool = False,
     db: Session = Depends(get_db),
     api_key: str | None = Depends(verify_api_key_optional),
 ):
@@ -464,6 +759,10 @@ def import_courses(
 
     **Rate limit:** 83 requests per minute (teacher import operation, loosened to avoid throttling bulk uploads)
 
+    Files unchanged since the last successful import (same mtime and size, or
+    same content hash) are skipped as long as their courses still exist. Pass
+    ``force=true`` to re-apply every file.
+
     JSON schema example:
     {
       "course_code": "CS101",
@@ -478,8 +777,6 @@ def import_courses(
     """
     audit = AuditLogger(db)
     try:
-        (Course,) = import_names("models", "Course")
-
         if not os.path.isdir(COURSES_DIR):
             raise http_error(
                 404,
@@ -488,303 +785,28 @@ def import_courses(
                 request,
                 context={"path": COURSES_DIR},
             )
-        created = 0
-        updated = 0
-        errors: List[str] = []
         logger.info("Importing courses from directory", extra={"directory": COURSES_DIR})
 
-        # --- Helper: normalize/translate evaluation rule categories ---
-        def _strip_accents(s: str) -> str:
-            try:
-                return "".join(ch for ch in unicodedata.normalize("NFD", s) if unicodedata.category(ch) != "Mn")
-            except Exception:
-                return s
-
-        def _clean_cat(s: str) -> str:
-            s = s.strip()
-            s = re.sub(r"[\)\s]+$", "", s)  # drop trailing )/spaces
-            s = re.sub(r"\s*[·•:\-–—]\s*", " ", s)  # collapse separators
-            s = re.sub(r"\s+", " ", s)
-            return s.strip()
-
-        def _map_category(raw: str) -> str:
-            base = _clean_cat(str(raw))
-            base_noacc = _strip_accents(base).lower()
-            mapping = [
-                (["συμμετοχ"], "Class Participation"),
-                (["συνεχη", "διαρκ"], "Continuous Assessment"),
-                (["εργαστηρι"], "Lab Work"),
-                (["ασκησ"], "Exercises"),
-                (["εργασι"], "Assignments"),
-                (["εργασιων στο σπιτι", "στο σπιτι"], "Homework"),
-                (["ενδιαμεση", "προοδος"], "Midterm Exam"),
-                (["τελικ", "τελικη εξεταση"], "Final Exam"),
-                (["εξεταση"], "Exam"),
-                (["παρουσιασ"], "Presentation"),
-                (["project", "εργο"], "Project"),
-                (["quiz", "τεστ"], "Quiz"),
-                (["report", "εκθεση"], "Report"),
-            ]
-            for keys, label in mapping:
-                for k in keys:
-                    if k in base_noacc:
-                        return label
-            english_known = {
-                "class participation": "Class Participation",
-                "continuous assessment": "Continuous Assessment",
-                "lab assessment": "Lab Work",
-                "lab work": "Lab Work",
-                "assignments": "Assignments",
-                "homework": "Homework",
-                "midterm exam": "Midterm Exam",
-                "final exam": "Final Exam",
-                "exam": "Exam",
-                "presentation": "Presentation",
-                "project": "Project",
-                "quiz": "Quiz",
-                "report": "Report",
-            }
-            low = base.lower()
-            if low in english_known:
-                return english_known[low]
-            return base
-
-        def _translate_rules(rules: list[dict]) -> list[dict]:
-            out: list[dict] = []
-            seen: dict[str, float] = {}
-            for r in rules or []:
-                if not isinstance(r, dict):
-                    continue
-                cat = _map_category(r.get("category", ""))
-                try:
-                    w = float(str(r.get("weight", 0)).replace("%", "").replace(",", "."))
-                except Exception:
-                    w = 0.0
-                seen[cat] = w  # last one wins
-            for k, v in seen.items():
-                out.append({"category": k, "weight": v})
-            return out
-
-        for name in os.listdir(COURSES_DIR):
-            if not name.lower().endswith((".json")):
-                continue
-            path = os.path.join(COURSES_DIR, name)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                items = data if isinstance(data, list) else [data]
-                for obj in items:
-                    code = obj.get("course_code")
-                    if not code:
-                        errors.append(f"Missing course_code in {name}")
-                        continue
-                    # Coerce common fields
-                    if "credits" in obj:
-                        try:
-                            obj["credits"] = int(obj["credits"])
-                        except Exception:
-                            errors.append(f"{name}: invalid credits '{obj.get('credits')}', using default")
-                            obj.pop("credits", None)
-                    if "periods_per_week" in obj:
-                        try:
-                            obj["periods_per_week"] = int(float(obj["periods_per_week"]))
-                        except Exception:
-                            errors.append(
-                                f"{name}: invalid periods_per_week '{obj.get('periods_per_week')}', using default"
-                            )
-                            obj.pop("periods_per_week", None)
-                        else:
-                            if "hours_per_week" not in obj or obj.get("hours_per_week") in (None, ""):
-                                obj["hours_per_week"] = float(obj["periods_per_week"])
-                    if "hours_per_week" in obj:
-                        try:
-                            obj["hours_per_week"] = float(obj["hours_per_week"])
-                        except Exception:
-                            errors.append(
-                                f"{name}: invalid hours_per_week '{obj.get('hours_per_week')}', using default"
-                            )
-                            obj.pop("hours_per_week", None)
-                    # Normalize simple string fields
-                    if "course_code" in obj and isinstance(obj["course_code"], list):
-                        obj["course_code"] = " ".join([str(x).strip() for x in obj["course_code"] if str(x).strip()])
-                    if "course_name" in obj and isinstance(obj["course_name"], list):
-                        obj["course_name"] = " ".join([str(x).strip() for x in obj["course_name"] if str(x).strip()])
-                    if "semester" in obj and isinstance(obj["semester"], list):
-                        obj["semester"] = " ".join([str(x).strip() for x in obj["semester"] if str(x).strip()])
-                    # Set default semester if empty
-                    if "semester" in obj and not obj["semester"]:
-                        obj["semester"] = "Α' Εξάμηνο"  # Default to 1st semester
-                    # Normalize description: must be a string
-                    if "description" in obj and isinstance(obj["description"], list):
-                        try:
-                            obj["description"] = "\n".join(map(lambda x: str(x), obj["description"]))
-                        except Exception:
-                            obj["description"] = str(obj["description"])
-                    if "evaluation_rules" in obj:
-                        er = obj["evaluation_rules"]
-                        rules = []  # Initialize rules variable at the start
-                        if isinstance(er, str):
-                            try:
-                                obj["evaluation_rules"] = json.loads(er)
-                            except Exception:
-                                errors.append(f"{name}: evaluation_rules JSON parse failed, dropping field")
-                                obj.pop("evaluation_rules", None)
-                        elif isinstance(er, list):
-                            if all(isinstance(x, dict) for x in er):
-                                # Keep as-is, will translate below
-                                rules = er
-                            else:
-                                # First, join consecutive strings that might be part of a multi-line entry
-                                # A line ending with ':' followed by lines not containing ':' should be joined
-                                joined_entries = []
-                                current_entry = ""
-                                for x in er:
-                                    if not isinstance(x, str):
-                                        continue
-                                    x_stripped = x.strip()
-                                    if not x_stripped:
-                                        continue
-                                    # Skip metadata entries like "Γλώσσα", "Ελληνική", "Αγγλική", etc.
-                                    if x_stripped in [
-                                        "Γλώσσα",
-                                        "Ελληνική",
-                                        "Αγγλική",
-                                        "Κωδικός",
-                                        "Μαθήματος",
-                                        "Τίτλος Μαθήματος",
-                                        "Κωδικός Μαθήματος",
-                                        "Τύπος Μαθήματος",
-                                        "Υποχρεωτικό",
-                                        "Επίπεδο",
-                                        "Έτος/Εξάμηνο",
-                                        "Φοίτησης",
-                                        "Όνομα Διδάσκοντα",
-                                        "Τίτλος Μαθήματος",
-                                        "Επίπεδο 5 του Εθνικού Πλαισίου Προσόντων",
-                                        "2o Έτος/Α΄ Εξάμηνο",
-                                    ]:
-                                        continue
-                                    # If we have a current entry and this line has a percentage, it's a continuation
-                                    if current_entry and re.search(r"\d+%?\s*$", x_stripped):
-                                        current_entry += " " + x_stripped
-                                        joined_entries.append(current_entry)
-                                        current_entry = ""
-                                    # If current entry exists and this doesn't look like a continuation, save current and start new
-                                    elif current_entry and ":" in x_stripped:
-                                        joined_entries.append(current_entry)
-                                        current_entry = x_stripped
-                                    # If no current entry and this has a colon but no percentage, it's the start of a multi-line
-                                    elif (
-                                        not current_entry
-                                        and ":" in x_stripped
-                                        and not re.search(r"\d+%?\s*$", x_stripped)
-                                    ):
-                                        current_entry = x_stripped
-                                    # If it has both colon and percentage, it's a complete entry
-                                    elif ":" in x_stripped and re.search(r"\d+%?\s*$", x_stripped):
-                                        joined_entries.append(x_stripped)
-                                    # Otherwise, it's a continuation of current entry
-                                    elif current_entry:
-                                        current_entry += " " + x_stripped
-
-                                # Don't forget the last entry if any
-                                if current_entry:
-                                    joined_entries.append(current_entry)
-
-                                # Now use joined_entries instead of er for parsing
-                                er = joined_entries  # type: ignore
-                                rules = []
-                                buf = []
-                                # Pairing of consecutive primitives (category, weight)
-                                for x in er:
-                                    if isinstance(x, (str, int, float)):
-                                        buf.append(x)
-                                        if len(buf) == 2:
-                                            cat = str(buf[0]).strip()
-                                            w_raw = buf[1]
-                                            if isinstance(w_raw, str):
-                                                w_s = w_raw.replace("%", "").strip().replace(",", ".")
-                                                try:
-                                                    weight = float(w_s)
-                                                except Exception:
-                                                    weight = 0.0
-                                            else:
-                                                try:
-                                                    weight = float(w_raw)
-                                                except Exception:
-                                                    weight = 0.0
-                                            rules.append({"category": cat, "weight": weight})
-                                            buf = []
-                                if not rules:
-                                    # Try parsing single-string entries like "Name: 10%" or "Name - 10%"
-                                    # Avoid polynomial redos: use negated character class instead of .+? to prevent backtracking (CWE-1333)
-                                    pattern = re.compile(r"^(?P<cat>[^:,\-]+)\s*[\s:,-]*\s*(?P<w>\d+(?:[\.,]\d+)?)%?$")
-                                    for x in er:
-                                        if isinstance(x, str):
-                                            m = pattern.match(x.strip())
-                                            if m:
-                                                cat = m.group("cat").strip()
-                                                w_s = m.group("w").replace(",", ".")
-                                                try:
-                                                    weight = float(w_s)
-                                                except Exception:
-                                                    weight = 0.0
-                                                rules.append({"category": cat, "weight": weight})
-                                # Only use parsed rules that have valid percentages, ignore metadata entries
-                                obj["evaluation_rules"] = rules if rules else []
-                            # Translate/localize categories if we have rules
-                            if isinstance(obj.get("evaluation_rules"), list):
-                                # Keep empty list silently; translate when non-empty
-                                if obj["evaluation_rules"]:
-                                    obj["evaluation_rules"] = _translate_rules(obj["evaluation_rules"])
-                            elif isinstance(er, dict):
-                                obj["evaluation_rules"] = _translate_rules([er])
-                            else:
-                                # Only report/drop if the original payload wasn't a list either
-                                if not isinstance(er, list):
-                                    errors.append(
-                                        f"{name}: evaluation_rules unsupported type {type(er)}, dropping field"
-                                    )
-                                obj.pop("evaluation_rules", None)
-                    # Normalize teaching_schedule (JSON column): accept dict or JSON string (or empty list)
-                    if "teaching_schedule" in obj:
-                        ts = obj["teaching_schedule"]
-                        if isinstance(ts, str):
-                            try:
-                                obj["teaching_schedule"] = json.loads(ts)
-                            except Exception:
-                                errors.append(f"{name}: teaching_schedule JSON parse failed, dropping field")
-                                obj.pop("teaching_schedule", None)
-                        elif isinstance(ts, dict):
-                            pass
-                        elif isinstance(ts, list) and len(ts) == 0:
-                            # allow empty schedule
-                            obj["teaching_schedule"] = []
-                        else:
-                            errors.append(f"{name}: teaching_schedule unsupported type {type(ts)}, dropping field")
-                            obj.pop("teaching_schedule", None)
-                    # Use service to create/update
-                    was_created, err = ImportService.create_or_update_course(
-                        db, obj, translate_rules_fn=_translate_rules
-                    )
-                    if err:
-                        errors.append(f"{name}: {err}")
-                        continue
-                    if was_created:
-                        created += 1
-                    else:
-                        updated += 1
-            except Exception as e:
-                logger.error("Failed to import course", extra={"name": name, "error_type": type(e).__name__})
-                errors.append(f"{name}: {e}")
+        importer = CourseTemplateImporter(COURSES_DIR, _parse_course_template)
+        result = importer.run(db, force=force)
+        created = result.created
+        updated = result.updated
+        errors: List[str] = result.errors
         try:
             db.commit()
+            importer.save_manifest()
             # Log successful bulk import
             audit.log_from_request(
                 request=request,
                 action=AuditAction.BULK_IMPORT,
                 resource=AuditResource.COURSE,
-                details={"created": created, "updated": updated, "source": "directory", "path": COURSES_DIR},
+                details={
+                    "created": created,
+                    "updated": updated,
+                    "unchanged_files": result.unchanged_files,
+                    "source": "directory",
+                    "path": COURSES_DIR,
+                },
                 success=True,
             )
         except Exception as exc:
@@ -807,7 +829,7 @@ def import_courses(
                 request,
                 context={"errors": errors},
             )
-        return {"created": created, "updated": updated, "errors": errors}
+        return {"created": created, "updated": updated, "unchanged_files": result.unchanged_files, "errors": errors}
     except HTTPException:
         # bubbled up commit error with details
         raise
@@ -852,6 +874,20 @@ async def import_from_upload(
     - files: one or more .json files
     """
     audit = AuditLogger(db)
+    # Files that failed mid-import; each audit entry commits the session, so they are logged afterwards
+    failed_files: list[tuple[str | None, str]] = []
+
+    def audit_failed_files() -> None:
+        for file_name, message in failed_files:
+            audit.log_from_request(
+                request=request,
+                action=AuditAction.BULK_IMPORT,
+                resource=AuditResource.COURSE if norm == "courses" else AuditResource.STUDENT,
+                details={"source": "upload", "file": file_name, "type": norm},
+                success=False,
+                error_message=message,
+            )
+
     try:
         norm = (import_type or "").strip().lower()
         if norm in ("course", "courses"):
@@ -880,7 +916,6 @@ async def import_from_upload(
         uploads: List[UploadFile] = []
         if files:
             uploads.extend(files)
-        data_batches: List[List[dict]] = []
         # Prefer files when provided; otherwise allow 'json' text payload for convenience
         if not uploads and not json_text:
             raise http_error(
@@ -892,52 +927,9 @@ async def import_from_upload(
         created = 0
         updated = 0
         errors: list[str] = []
-        # Process file uploads first with validation
-        for up in uploads:
-            try:
-                content = await validate_uploaded_file(request, up)
-
-                # Check file extension to determine format
-                filename = up.filename or ""
-                if filename.lower().endswith(".csv"):
-                    # Handle CSV files (only for students)
-                    if norm != "students":
-                        errors.append(f"{filename}: CSV import only supported for students")
-                        continue
-                    csv_students, csv_errors = _parse_csv_students(content, filename)
-                    if csv_errors:
-                        errors.extend(csv_errors)
-                    if csv_students:
-                        data_batches.append(csv_students)
-                else:
-                    # Handle JSON files
-                    data = json.loads(content.decode("utf-8"))
-                    data_batches.append(data if isinstance(data, list) else [data])
-            except HTTPException as http_exc:
-                # Re-raise validation errors with proper status codes
-                # Log the failed import attempt with request context
-                audit.log_from_request(
-                    request=request,
-                    action=AuditAction.BULK_IMPORT,
-                    resource=AuditResource.COURSE if norm == "courses" else AuditResource.STUDENT,
-                    details={"source": "upload", "file": getattr(up, "filename", None), "type": norm},
-                    success=False,
-                    error_message=str(http_exc),
-                )
-                raise
-            except Exception as exc:
-                errors.append(f"{up.filename}: {exc}")
-                # Log the failed import attempt with request context
-                audit.log_from_request(
-                    request=request,
-                    action=AuditAction.BULK_IMPORT,
-                    resource=AuditResource.COURSE if norm == "courses" else AuditResource.STUDENT,
-                    details={"source": "upload", "file": getattr(up, "filename", None), "type": norm},
-                    success=False,
-                    error_message=str(exc),
-                )
 
-        # Process optional raw JSON text from form field
+        # Validate optional raw JSON text from form field before anything is imported
+        json_text_batch: list | None = None
         if json_text:
             try:
                 # Validate size of raw JSON text
@@ -954,7 +946,7 @@ async def import_from_upload(
                     )
 
                 parsed = json.loads(json_text)
-                data_batches.append(parsed if isinstance(parsed, list) else [parsed])
+                json_text_batch = parsed if isinstance(parsed, list) else [parsed]
                 logger.info("Raw JSON text validated and parsed", extra={"size_bytes": text_size})
             except json.JSONDecodeError as exc:
                 # Log the failed import attempt with request context
@@ -994,14 +986,54 @@ async def import_from_upload(
                     error_message=str(exc),
                 )
 
+        async def iter_batches():
+            """Yield record batches while the uploads are read, so one batch is decoded at a time."""
+            for up in uploads:
+                try:
+                    with await spool_uploaded_file(request, up, validate_json=False) as upload:
+                        # Check file extension to determine format
+                        filename = up.filename or ""
+                        if filename.lower().endswith(".csv"):
+                            # Handle CSV files (only for students)
+                            if norm != "students":
+                                errors.append(f"{filename}: CSV import only supported for students")
+                                continue
+                            batches = _iter_csv_students(upload, filename, errors)
+                        else:
+                            # Handle JSON files, decoding arrays element by element
+                            batches = _iter_json_upload(request, upload)
+                        for batch in batches:
+                            yield batch
+                except HTTPException as http_exc:
+                    # Discard records imported from earlier batches; the audit entry commits the session
+                    db.rollback()
+                    audit_failed_files()
+                    # Re-raise validation errors with proper status codes
+                    # Log the failed import attempt with request context
+                    audit.log_from_request(
+                        request=request,
+                        action=AuditAction.BULK_IMPORT,
+                        resource=AuditResource.COURSE if norm == "courses" else AuditResource.STUDENT,
+                        details={"source": "upload", "file": getattr(up, "filename", None), "type": norm},
+                        success=False,
+                        error_message=str(http_exc),
+                    )
+                    raise
+                except Exception as exc:
+                    errors.append(f"{up.filename}: {exc}")
+                    # Audited once the import is committed (or rolled back)
+                    failed_files.append((getattr(up, "filename", None), str(exc)))
+            if json_text_batch is not None:
+                yield json_text_batch
+
         # Flatten batches into items for processing
-        def iter_items():
-            for batch in data_batches:
+        async def iter_items():
+            async for batch in iter_batches():
                 for item in batch:
                     yield item
 
         # Start main import logic
-        for obj in iter_items():
+        async for obj in iter_items():
             if norm == "courses":
                 code = obj.get("course_code") if isinstance(obj, dict) else None
                 if not code:
@@ -1245,6 +1277,7 @@ async def import_from_upload(
 
         try:
             db.commit()
+            audit_failed_files()
             # Log successful upload import
             audit.log_from_request(
                 request=request,
@@ -1262,6 +1295,7 @@ async def import_from_upload(
         except Exception as exc:
             db.rollback()
             errors.append(f"commit: {exc}")
+            audit_failed_files()
             # Log failed upload import
             audit.log_from_request(
                 request=request,
@@ -1284,6 +1318,7 @@ async def import_from_upload(
     except Exception as exc:
         db.rollback()
         logger.error("Upload import failed: %s", exc, exc_info=True)
+        audit_failed_files()
         # Log import failure
         audit.log_from_request(
             request=request,
@@ -1342,7 +1377,6 @@ async def import_preview(
         uploads: List[UploadFile] = []
         if files:
             uploads.extend(files)
-        data_batches: List[List[dict]] = []
 
         if not uploads and not json_text:
             raise http_error(
@@ -1352,30 +1386,9 @@ async def import_preview(
                 request,
             )
 
-        # Parse uploaded files
+        # Parse optional raw JSON text up front so it is rejected before any file is read
         parse_errors: list[str] = []
-        for up in uploads:
-            try:
-                content = await validate_uploaded_file(request, up)
-                filename = up.filename or ""
-                if filename.lower().endswith(".csv"):
-                    if norm != "students":
-                        parse_errors.append(f"{filename}: CSV import only supported for students")
-                        continue
-                    csv_students, csv_errs = _parse_csv_students(content, filename)
-                    if csv_errs:
-                        parse_errors.extend(csv_errs)
-                    if csv_students:
-                        data_batches.append(csv_students)
-                else:
-                    data = json.loads(content.decode("utf-8"))
-                    data_batches.append(data if isinstance(data, list) else [data])
-            except HTTPException:
-                raise
-            except Exception as exc:
-                parse_errors.append(f"{up.filename}: {exc}")
-
-        # Parse optional raw JSON text
+        json_text_batch: list | None = None
         if json_text:
             try:
                 text_size = len(json_text.encode("utf-8"))
@@ -1390,7 +1403,7 @@ async def import_preview(
                         context={"size_mb": round(size_mb, 2), "max_mb": round(max_mb, 2)},
                     )
                 parsed = json.loads(json_text)
-                data_batches.append(parsed if isinstance(parsed, list) else [parsed])
+                json_text_batch = parsed if isinstance(parsed, list) else [parsed]
             except json.JSONDecodeError as exc:
                 raise http_error(
                     400,
@@ -1404,6 +1417,28 @@ async def import_preview(
             except Exception as exc:
                 parse_errors.append(f"json: {exc}")
 
+        # Parse uploaded files batch by batch as the preview consumes them
+        async def iter_batches():
+            for up in uploads:
+                try:
+                    with await spool_uploaded_file(request, up, validate_json=False) as upload:
+                        filename = up.filename or ""
+                        if filename.lower().endswith(".csv"):
+                            if norm != "students":
+                                parse_errors.append(f"{filename}: CSV import only supported for students")
+                                continue
+                            batches = _iter_csv_students(upload, filename, parse_errors)
+                        else:
+                            batches = _iter_json_upload(request, upload)
+                        for batch in batches:
+                            yield batch
+                except HTTPException:
+                    raise
+                except Exception as exc:
+                    parse_errors.append(f"{up.filename}: {exc}")
+            if json_text_batch is not None:
+                yield json_text_batch
+
         # Flatten items
         items: list[ImportPreviewItem] = []
         seen_keys: set[str] = set()
@@ -1448,7 +1483,7 @@ async def import_preview(
             )
 
         # Iterate over all batches
-        for batch in data_batches:
+        async for batch in iter_batches():
             for obj in batch:
                 if not isinstance(obj, dict):
                     add_item("skip", {"raw": obj}, ["item: not an object"])
@@ -1788,11 +1823,11 @@ async def import_execute(
             )
 
         # Validate files before creating job
-        upload_contents: dict[str, bytes] = {}
+        upload_sizes: dict[str, int] = {}
         for up in uploads:
             try:
-                content = await validate_uploaded_file(request, up)
-                upload_contents[up.filename or "file"] = content
+                with await spool_uploaded_file(request, up) as upload:
+                    upload_sizes[up.filename or "file"] = upload.size
             except HTTPException:
                 raise
             except Exception as exc:
@@ -1846,6 +1881,7 @@ async def import_execute(
                 "allow_updates": allow_updates,
                 "skip_duplicates": skip_duplicates,
                 "file_count": len(uploads),
+                "upload_size_bytes": sum(upload_sizes.values()),
                 "has_json_data": bool(json_text),
                 # Note: file contents and json_text are NOT stored in job params
                 # They should be handled via a separate storage mechanism or passed through
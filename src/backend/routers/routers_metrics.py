@@ -13,7 +13,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
-from backend.db import get_session
+from backend.db import get_read_session
 from backend.rate_limiting import RATE_LIMIT_READ, limiter
 from backend.rbac import require_permission
 from backend.schemas.metrics import (
@@ -55,7 +55,7 @@ async def get_student_metrics(
     request: Request,
     response: Response,
     semester: Optional[str] = None,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ) -> StudentMetrics:
     """
     Get student population and enrollment metrics.
@@ -98,7 +98,7 @@ async def get_student_metrics(
 async def get_course_metrics(
     request: Request,
     response: Response,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ) -> CourseMetrics:
     """
     Get course enrollment and completion metrics.
@@ -139,7 +139,7 @@ async def get_course_metrics(
 async def get_grade_metrics(
     request: Request,
     response: Response,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ) -> GradeMetrics:
     """
     Get grade distribution and performance metrics.
@@ -187,7 +187,7 @@ async def get_grade_metrics(
 async def get_attendance_metrics(
     request: Request,
     response: Response,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ) -> AttendanceMetrics:
     """
     Get attendance tracking and compliance metrics.
@@ -229,7 +229,7 @@ async def get_attendance_metrics(
 async def get_dashboard_metrics(
     request: Request,
     response: Response,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ) -> DashboardMetrics:
     """
     Get comprehensive dashboard metrics for executive overview.
@@ -23,7 +23,7 @@ from backend.schemas import (
 )
 from backend.dependencies import get_notification_service
 from backend.services.notification_service import NotificationPreferenceService, NotificationService
-from backend.services.websocket_manager import broadcast_notification, manager
+from backend.services.websocket_manager import broadcast_notification, broadcast_unread_count, manager
 from backend.security.current_user import decode_token
 
 logger = logging.getLogger(__name__)
@@ -52,6 +52,16 @@ def _get_user_role(current_user) -> str | None:
     return getattr(current_user, "role", None)
 
 
+async def _push_unread_count(service: NotificationService, user_id: int) -> None:
+    """Push the user's unread count to their open notification sockets (best effort)."""
+    if not manager.get_connection_count(user_id):
+        return
+    try:
+        await broadcast_unread_count(user_id, service.get_unread_count(user_id))
+    except Exception as e:
+        logger.warning(f"Failed to push unread count to user {user_id}: {e}")
+
+
 # ==================== Notification WebSocket ====================
 
 
@@ -184,6 +194,8 @@ async def mark_all_as_read(
 
     user_id = _get_user_id(current_user)
     count = service.mark_all_as_read(user_id)
+    if count:
+        await _push_unread_count(service, user_id)
 
     return {"marked_count": count}
 
@@ -244,15 +256,20 @@ async def get_notifications(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     unread_only: bool = Query(False),
+    cursor: str | None = Query(None, max_length=200),
     current_user: dict = Depends(get_current_user),
     service: NotificationService = Depends(get_notification_service),
 ):
-    """Get notifications for current user.
+    """Get notifications for current user, newest first.
+
+    Pages are keyset-paginated: pass the previous page's ``next_cursor`` to
+    get the next one. ``total`` is only computed for the first page.
 
     Query Parameters:
-        skip: Number of records to skip (default: 0)
+        skip: Number of records to skip (deprecated offset paging; ignored with a cursor)
         limit: Maximum records to return (default: 50, max: 100)
         unread_only: Only return unread notifications (default: false)
+        cursor: Cursor from the previous page's ``next_cursor``
 
     Returns:
         NotificationListResponse with paginated notifications
@@ -261,15 +278,39 @@ async def get_notifications(
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     user_id = _get_user_id(current_user)
+    unread_count = service.get_unread_count(user_id)
 
-    notifications, total = service.get_notifications(user_id=user_id, skip=skip, limit=limit, unread_only=unread_only)
+    if skip and not cursor:
+        notifications, total = service.get_notifications(
+            user_id=user_id, skip=skip, limit=limit, unread_only=unread_only
+        )
+        return NotificationListResponse(
+            total=total,
+            unread_count=unread_count,
+            items=[NotificationResponse.model_validate(n) for n in notifications],
+        )
 
-    unread_count = service.get_unread_count(user_id)
+    try:
+        notifications, next_cursor = service.get_notifications_page(
+            user_id=user_id, limit=limit, cursor=cursor, unread_only=unread_only
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    total = None
+    if not cursor:
+        if unread_only:
+            total = unread_count
+        elif next_cursor is None:
+            total = len(notifications)
+        else:
+            total = service.count_notifications(user_id)
 
     return NotificationListResponse(
         total=total,
         unread_count=unread_count,
         items=[NotificationResponse.model_validate(n) for n in notifications],
+        next_cursor=next_cursor,
     )
 
 
@@ -295,19 +336,18 @@ async def update_notification(
 
     user_id = _get_user_id(current_user)
 
-    if update.is_read:
-        notification = service.mark_as_read(notification_id, user_id)
-    else:
-        # For now, we only support marking as read
-        from backend.models import Notification
-
-        notification = service.db.query(Notification).filter(Notification.id == notification_id).first()
+    try:
+        if update.is_read:
+            notification = service.mark_as_read(notification_id, user_id)
+        else:
+            notification = service.mark_as_unread(notification_id, user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
 
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    if notification.user_id != user_id:
-        raise HTTPException(status_code=403, detail="Cannot update notification belonging to another user")
+    await _push_unread_count(service, user_id)
 
     return NotificationResponse.model_validate(notification)
 
@@ -333,10 +373,15 @@ async def mark_as_read(
 
     user_id = _get_user_id(current_user)
 
-    notification = service.mark_as_read(notification_id, user_id)
+    try:
+        notification = service.mark_as_read(notification_id, user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
 
+    await _push_unread_count(service, user_id)
+
     return NotificationResponse.model_validate(notification)
 
 
@@ -361,10 +406,15 @@ async def delete_notification(
 
     user_id = _get_user_id(current_user)
 
-    success = service.delete_notification(notification_id, user_id)
+    try:
+        success = service.delete_notification(notification_id, user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
     if not success:
         raise HTTPException(status_code=404, detail="Notification not found")
 
+    await _push_unread_count(service, user_id)
+
     return {"detail": "Notification deleted successfully"}
 
 
@@ -419,6 +469,7 @@ async def broadcast_notification_endpoint(
                 message=broadcast.message,
                 data=broadcast.data,
             )
+            await _push_unread_count(service, user_id)
 
             sent_count += 1
         except Exception as e:
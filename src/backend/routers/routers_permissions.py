@@ -28,6 +28,7 @@ from backend.schemas.permissions import (
     UserPermissionRevoke,
     UserPermissionsResponse,
 )
+from backend.security.auth_cache import mark_permissions_changed
 from backend.security.current_user import get_current_user
 
 router = APIRouter(prefix="/permissions", tags=["Permissions Management"])
@@ -405,6 +406,7 @@ async def grant_role_permission(
         ),
         {"role_id": role.id, "perm_id": permission.id, "created_at": now},
     )
+    mark_permissions_changed(db)
     db.commit()
 
     return {"status": "granted", "role_name": grant.role_name, "permission_key": grant.permission_key}
@@ -442,6 +444,7 @@ async def revoke_role_permission(
     if result.rowcount == 0:  # type: ignore[attr-defined]
         raise HTTPException(status_code=404, detail="Role permission assignment not found")
 
+    mark_permissions_changed(db)
     db.commit()
 
     return {"status": "revoked", "role_name": revoke.role_name, "permission_key": revoke.permission_key}
@@ -7,6 +7,7 @@ Provides endpoints for:
 - Report download
 """
 
+import asyncio
 import csv
 import io
 import logging
@@ -19,7 +20,7 @@ from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from backend.cache import CacheConfig, cache_key, redis_cache
-from backend.db import get_session
+from backend.db import get_read_session, get_session
 from backend.error_messages import ErrorCode, get_error_message
 from backend.models import Attendance, Course, DailyPerformance, Grade, Highlight, Student
 from backend.rate_limiting import RATE_LIMIT_WRITE, limiter
@@ -427,7 +428,7 @@ def _build_student_report(
 async def generate_student_performance_report(
     request: Request,
     report_request: PerformanceReportRequest,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ):
     """
     Generate comprehensive performance report for a student.
@@ -510,7 +511,7 @@ async def get_available_periods(request: Request):
 async def download_student_performance_report(
     request: Request,
     report_request: PerformanceReportRequest,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ):
     """
     Generate and download student performance report in requested format.
@@ -550,7 +551,10 @@ async def download_student_performance_report(
 
     if report_request.format == ReportFormat.PDF:
         try:
-            pdf_bytes = generate_pdf_report(report_data, report_request.language, course_notes=course_notes)
+            # Single-student document: render on a worker thread to keep the event loop free
+            pdf_bytes = await asyncio.to_thread(
+                generate_pdf_report, report_data, report_request.language, course_notes=course_notes
+            )
             filename = f"student_performance_{student.id}_{start_date}_{end_date}.pdf"
             return Response(
                 content=pdf_bytes,
@@ -582,7 +586,7 @@ async def download_student_performance_report(
 async def generate_bulk_student_reports(
     request: Request,
     bulk_request: BulkReportRequest,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
 ):
     """
     Generate performance reports for multiple students at once.
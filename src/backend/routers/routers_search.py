@@ -18,11 +18,13 @@ from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 import logging
 
+from backend.db import get_read_session
 from backend.dependencies import get_db
 from backend.security.permissions import optional_require_permission
 from backend.security.current_user import get_current_user, require_auth_even_if_disabled
 from backend.models import User
 from backend.services.search_service import SearchService
+from backend.services.suggestion_index import get_suggestion_index
 from backend.schemas.response import APIResponse, success_response, error_response
 from backend.schemas.search import (
     FullTextSearchRequest,
@@ -63,7 +65,7 @@ async def search_students(
     q: str = Query(..., min_length=1, max_length=255, description="Search query"),
     limit: int = Query(20, ge=1, le=100, description="Results limit"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> APIResponse[List[Dict[str, Any]]]:
     """
     Search for students by name, email, or enrollment number.
@@ -105,7 +107,7 @@ async def search_courses(
     q: str = Query(..., min_length=1, max_length=255, description="Search query"),
     limit: int = Query(20, ge=1, le=100, description="Results limit"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> APIResponse[List[Dict[str, Any]]]:
     """
     Search for courses by name, code, or description.
@@ -153,7 +155,7 @@ async def search_grades(
     date_to: Optional[str] = Query(None, description="Filter by grade date (YYYY-MM-DD) to"),
     limit: int = Query(20, ge=1, le=100, description="Results limit"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> APIResponse[List[Dict[str, Any]]]:
     """
     Search for grades with optional text query and filtering.
@@ -209,7 +211,7 @@ async def advanced_search(
     body: Dict[str, Any],
     limit: int = Query(20, ge=1, le=100, description="Results limit"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> APIResponse[Dict[str, Any]]:
     """
     Perform advanced search with complex filter combinations.
@@ -329,7 +331,7 @@ async def get_suggestions(
     request: Request,
     q: str = Query(..., min_length=1, max_length=255, description="Partial query"),
     limit: int = Query(5, ge=1, le=20, description="Maximum suggestions"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
     current_user: Optional[User] = Depends(optional_require_permission(None)),
 ) -> APIResponse[List[Dict[str, Any]]]:
     """
@@ -374,6 +376,58 @@ async def get_suggestions(
         )
 
 
+@router.get(
+    "/suggestions/index/stats",
+    response_model=APIResponse[Dict[str, Any]],
+    summary="Get suggestion index statistics",
+    description="Size, memory usage and lookup timings of the in-memory suggestion index",
+)
+async def get_suggestion_index_stats(
+    request: Request,
+    current_user: Optional[User] = Depends(optional_require_permission(None)),
+) -> APIResponse[Dict[str, Any]]:
+    """
+    Get statistics of the in-memory suggestion index.
+
+    `ready` is false until the startup build finishes; suggestions fall back
+    to database queries meanwhile.
+
+    **Permissions:**
+    - Public - No authentication required
+    """
+    return success_response(get_suggestion_index().stats(), request_id=request.state.request_id)
+
+
+@router.post(
+    "/suggestions/index/rebuild",
+    response_model=APIResponse[Dict[str, Any]],
+    summary="Rebuild suggestion index",
+    description="Reload the in-memory suggestion index from the database",
+)
+async def rebuild_suggestion_index(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(optional_require_permission("system:import")),
+) -> APIResponse[Dict[str, Any]]:
+    """
+    Rebuild the in-memory suggestion index.
+
+    Needed only after writes that bypass the ORM (raw SQL, restores); regular
+    student/course changes are applied incrementally.
+
+    **Permissions:**
+    - Requires `system:import`
+    """
+    try:
+        stats = get_suggestion_index().build(db)
+        return success_response(stats, request_id=request.state.request_id)
+    except Exception as e:
+        logger.error(f"Error rebuilding suggestion index: {str(e)}")
+        return error_response(
+            code="SUGGESTION_INDEX_ERROR", message="Failed to rebuild suggestion index", details={"error": str(e)}
+        )
+
+
 # ============================================================================
 # UTILITY ENDPOINT
 # ============================================================================
@@ -387,7 +441,7 @@ async def get_suggestions(
 )
 async def get_statistics(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
     current_user: Optional[User] = Depends(optional_require_permission(None)),
 ) -> APIResponse[Dict[str, int]]:
     """
@@ -784,6 +838,19 @@ async def toggle_saved_search_favorite(
 # ============================================================================
 
 
+def _student_search_result(student: Any, score: float) -> StudentFullTextSearchResult:
+    """Build a full-text search result; students carry ``is_active`` rather than a status column."""
+    return StudentFullTextSearchResult(
+        id=student.id,
+        first_name=student.first_name,
+        last_name=student.last_name,
+        email=student.email,
+        status="active" if student.is_active else "inactive",
+        relevance_score=score,
+        enrollment_date=student.enrollment_date,
+    )
+
+
 @router.post(
     "/students/full-text",
     response_model=APIResponse[Dict[str, Any]],
@@ -793,7 +860,7 @@ async def toggle_saved_search_favorite(
 async def full_text_search_students(
     request: Request,
     search_request: "FullTextSearchRequest",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
     current_user: Optional[User] = Depends(optional_require_permission("students:view")),
 ) -> APIResponse[Dict[str, Any]]:
     """
@@ -824,19 +891,7 @@ async def full_text_search_students(
         )
 
         # Convert to response schema
-        result_items = [
-            StudentFullTextSearchResult(
-                id=student.id,
-                first_name=student.first_name,
-                last_name=student.last_name,
-                email=student.email,
-                status=student.status,
-                relevance_score=0.85,  # Default score, can be enhanced
-                created_at=student.created_at,
-                updated_at=student.updated_at,
-            )
-            for student in results
-        ]
+        result_items = [_student_search_result(student, score) for student, score in results]
 
         response_data = FullTextSearchResponse(
             results=result_items,
@@ -866,7 +921,7 @@ async def full_text_search_students(
 async def advanced_search_students(
     request: Request,
     search_request: "AdvancedSearchRequest",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
     current_user: Optional[User] = Depends(optional_require_permission("students:view")),
 ) -> APIResponse[Dict[str, Any]]:
     """
@@ -928,19 +983,7 @@ async def advanced_search_students(
         query_time_ms = (time.time() - start_time) * 1000
 
         # Convert to response schema
-        result_items = [
-            StudentFullTextSearchResult(
-                id=student.id,
-                first_name=student.first_name,
-                last_name=student.last_name,
-                email=student.email,
-                status=student.status,
-                relevance_score=score,
-                created_at=student.created_at,
-                updated_at=student.updated_at,
-            )
-            for student, score in scored_results
-        ]
+        result_items = [_student_search_result(student, score) for student, score in scored_results]
 
         response_data = AdvancedSearchResponse(
             results=result_items,
@@ -977,7 +1020,7 @@ async def advanced_search_students(
 async def get_student_facets(
     request: Request,
     q: Optional[str] = Query(None, max_length=255, description="Optional search query"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> APIResponse[Dict[str, Any]]:
     """
     Get faceted navigation data for student search.
@@ -1027,7 +1070,7 @@ async def get_student_facets(
 async def get_course_facets(
     request: Request,
     q: Optional[str] = Query(None, max_length=255, description="Optional search query"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ) -> APIResponse[Dict[str, Any]]:
     """
     Get faceted navigation data for course search.
@@ -18,7 +18,7 @@ from backend.db import get_session as get_db
 from backend.rate_limiting import RATE_LIMIT_READ, RATE_LIMIT_WRITE, limiter
 from backend.rbac import require_permission
 from backend.schemas.common import PaginatedResponse
-from backend.schemas.students import StudentCreate, StudentResponse, StudentUpdate
+from backend.schemas.students import StudentBulkStatusUpdate, StudentCreate, StudentResponse, StudentUpdate
 from backend.services import StudentService
 
 # Setup logging
@@ -188,3 +188,26 @@ def bulk_autofill_academic_year(
     service = StudentService(db, request)
     result = service.bulk_autofill_academic_year()
     return result
+
+
+@router.post("/bulk/status")
+@limiter.limit(RATE_LIMIT_WRITE)
+@require_permission("students:edit")
+def bulk_set_student_status(
+    request: Request,
+    payload: StudentBulkStatusUpdate,
+    db: Session = Depends(get_db),
+):
+    """
+    Activate or deactivate many students in one transaction.
+
+    Deactivation unenrolls the students from all courses; reactivation can
+    restore their previous enrollments with ``re_enroll_previous``.
+    """
+    service = StudentService(db, request)
+    result = service.bulk_set_active(payload)
+    # Invalidate cache
+    invalidate_cache("get_all_students")
+    for student_id in result["student_ids"]:
+        invalidate_cache("get_student", student_id)
+    return result
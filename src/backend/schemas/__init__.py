@@ -320,6 +320,7 @@ from .search import (
 from .search import (
     CourseFacetsResponse as CourseFacetsResponse,
 )
+from .students import StudentBulkStatusUpdate as StudentBulkStatusUpdate
 from .students import StudentCreate as StudentCreate
 from .students import StudentResponse as StudentResponse
 from .students import StudentUpdate as StudentUpdate
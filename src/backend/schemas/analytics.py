@@ -1,10 +1,7 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
-from backend.schemas.courses import CourseResponse
-from backend.schemas.students import StudentResponse
-
 
 class AnalyticsAggregate(BaseModel):
     label: str
@@ -14,9 +11,34 @@ class AnalyticsAggregate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class StudentLookup(BaseModel):
+    """Student fields used by the analytics selectors and class/division filters."""
+
+    id: int
+    student_id: str
+    first_name: str
+    last_name: str
+    is_active: Optional[bool] = True
+    study_year: Optional[int] = None
+    academic_year: Optional[str] = None
+    class_division: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CourseLookup(BaseModel):
+    id: int
+    course_code: str
+    course_name: str
+    semester: Optional[str] = None
+    is_active: Optional[bool] = True
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class AnalyticsLookupsResponse(BaseModel):
-    students: List[StudentResponse]
-    courses: List[CourseResponse]
+    students: List[StudentLookup]
+    courses: List[CourseLookup]
     class_averages: List[AnalyticsAggregate] = []
     course_averages: List[AnalyticsAggregate] = []
     division_averages: List[AnalyticsAggregate] = []
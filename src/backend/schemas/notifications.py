@@ -117,9 +117,12 @@ class NotificationPreferenceResponse(NotificationPreferenceBase):
 class NotificationListResponse(BaseModel):
     """List notifications response with pagination."""
 
-    total: int = Field(..., ge=0, description="Total number of notifications")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of notifications (first page only; null on cursor pages)"
+    )
     unread_count: int = Field(..., ge=0, description="Number of unread notifications")
     items: list[NotificationResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, or null on the last page")
 
 
 class BroadcastNotificationCreate(BaseModel):
@@ -13,7 +13,7 @@ Version: 1.0.0
 
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
+from datetime import date, datetime
 
 
 # ============================================================================
@@ -296,10 +296,9 @@ class StudentFullTextSearchResult(BaseModel):
     first_name: str = Field(..., description="First name")
     last_name: str = Field(..., description="Last name")
     email: str = Field(..., description="Email address")
-    status: str = Field(..., description="Student status")
+    status: str = Field(..., description="Student status (active or inactive)")
     relevance_score: Optional[float] = Field(None, ge=0, le=1, description="Search relevance score (0-1)")
-    created_at: datetime = Field(..., description="Creation timestamp")
-    updated_at: datetime = Field(..., description="Last update timestamp")
+    enrollment_date: Optional[date] = Field(None, description="Enrollment date")
 
 
 class FullTextSearchResponse(BaseModel):
@@ -1,6 +1,6 @@
 import re
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import (
     BaseModel,
@@ -226,6 +226,22 @@ class StudentUpdate(BaseModel):
         return v
 
 
+class StudentBulkStatusUpdate(BaseModel):
+    """Activate or deactivate many students at once, e.g. a graduating year."""
+
+    is_active: bool
+    student_ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000)
+    study_year: Optional[int] = None
+    academic_year: Optional[str] = None
+    re_enroll_previous: bool = False
+
+    @model_validator(mode="after")
+    def _require_selection(self):
+        if self.student_ids is None and self.study_year is None and self.academic_year is None:
+            raise ValueError("Provide student_ids, study_year or academic_year to select students")
+        return self
+
+
 class StudentResponse(BaseModel):
     id: int
     first_name: str
@@ -0,0 +1,111 @@
+"""Microbenchmark for rate limit and login throttle storage.
+
+Measures the per-check overhead of each limiter backend so the cost of moving
+from per-process ``memory://`` counters to a shared store is visible. Every
+check is one ``limiter.hit()`` against a limit that is never exhausted, spread
+over ``--keys`` distinct client keys. The login throttle is measured as the
+locked read-modify-write plus read that back ``register_failure`` and
+``get_lockout_until``.
+
+Typical usage::
+
+    python -m backend.scripts.benchmark_rate_limit_storage
+    python -m backend.scripts.benchmark_rate_limit_storage --iterations 50000 \
+        --storage redis://localhost:6379/15
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+from backend.rate_limit_storage import SQLiteThrottleStore
+
+
+def _parse_arguments(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark rate limit storage backends")
+    parser.add_argument("--iterations", type=int, default=20000, help="Checks per run (default: %(default)s)")
+    parser.add_argument("--keys", type=int, default=500, help="Distinct client keys (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions; the median is reported")
+    parser.add_argument(
+        "--storage",
+        action="append",
+        default=None,
+        help="Extra storage URI to include, e.g. redis://localhost:6379/15 (repeatable)",
+    )
+    return parser.parse_args(argv)
+
+
+def _time_per_op(operation: Callable[[int], object], iterations: int, runs: int) -> float:
+    """Median microseconds per call of ``operation`` over ``runs`` runs."""
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for i in range(iterations):
+            operation(i)
+        samples.append((time.perf_counter() - start) / iterations * 1_000_000)
+    return statistics.median(samples)
+
+
+def _bench_limiter(uri: str, strategy: str, args: argparse.Namespace) -> float:
+    storage = storage_from_string(uri)
+    limiter = STRATEGIES[strategy](storage)
+    limit = parse(f"{args.iterations * args.runs + 1}/minute")
+    keys = [f"10.0.{i // 256}.{i % 256}" for i in range(args.keys)]
+    try:
+        return _time_per_op(lambda i: limiter.hit(limit, keys[i % len(keys)]), args.iterations, args.runs)
+    finally:
+        storage.reset()
+
+
+def _bench_throttle(path: str, args: argparse.Namespace) -> float:
+    store = SQLiteThrottleStore(path)
+    keys = [f"user{i}@example.com" for i in range(args.keys)]
+
+    def failure_and_check(i: int) -> None:
+        key = keys[i % len(keys)]
+        now = time.time()
+        with store.locked():
+            record = store.get(key, now)
+            attempts = record[0] + 1 if record else 1
+            store.set(key, (attempts, now, None), now + 300)
+        store.get(key, now)
+
+    try:
+        return _time_per_op(failure_and_check, args.iterations, args.runs)
+    finally:
+        store.clear()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_arguments(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_uri = f"sqlite:///{(Path(tmp) / 'bench.sqlite3').as_posix()}"
+        cases = [
+            ("memory://", "fixed-window"),
+            ("memory://", "sliding-window-counter"),
+            (sqlite_uri, "fixed-window"),
+            (sqlite_uri, "sliding-window-counter"),
+        ]
+        for extra in args.storage or []:
+            cases.extend([(extra, "fixed-window"), (extra, "sliding-window-counter")])
+
+        print(f"{'storage':<12} {'strategy':<24} {'us/check':>10}")
+        for uri, strategy in cases:
+            label = uri.split("://", 1)[0]
+            print(f"{label:<12} {strategy:<24} {_bench_limiter(uri, strategy, args):>10.1f}")
+        throttle = _bench_throttle(str(Path(tmp) / "throttle.sqlite3"), args)
+        print(f"{'sqlite':<12} {'login throttle':<24} {throttle:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -22,16 +22,30 @@ Typical usage::
 If ``--postgres-url`` is omitted the script falls back to ``DATABASE_URL`` from
 the environment. When that URL already points to PostgreSQL, running the script
 without extra arguments is enough.
+
+For large databases pass ``--mode copy`` to use the high-throughput path: rows
+are streamed through psycopg ``COPY ... FROM STDIN``, independent tables are
+loaded by ``--workers`` parallel workers in foreign-key order, secondary indexes
+and foreign keys are dropped before the load and recreated afterwards, and
+per-table progress is recorded in ``--state-file`` so an interrupted run can be
+continued with ``--resume``.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import logging
 import os
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Sequence
+from typing import Any, Callable, Iterable, Mapping, Sequence
 
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -46,6 +60,8 @@ from backend.run_migrations import run_migrations
 LOGGER = logging.getLogger("sqlite_to_postgres")
 DEFAULT_SQLITE_PATH = Path(__file__).resolve().parents[1] / "data" / "student_management.db"
 POSTGRES_PREFIXES = ("postgresql://", "postgresql+psycopg://", "postgresql+asyncpg://")
+MIGRATION_MODES = ("insert", "copy")
+STATE_FILE_VERSION = 1
 
 
 def _quote_ident(name: str) -> str:
@@ -92,6 +108,32 @@ def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:
         action="store_true",
         help="Assume PostgreSQL already has the latest schema (skip Alembic runner)",
     )
+    parser.add_argument(
+        "--mode",
+        dest="mode",
+        default="insert",
+        choices=MIGRATION_MODES,
+        help="'insert' uses batched INSERT statements; 'copy' streams rows with COPY FROM STDIN (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        default=4,
+        help="Parallel table workers for --mode copy (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--state-file",
+        dest="state_file",
+        default=None,
+        help="Per-table progress file for --mode copy (default: a file in the system temp directory)",
+    )
+    parser.add_argument(
+        "--resume",
+        dest="resume",
+        action="store_true",
+        help="With --mode copy, skip tables already completed according to --state-file",
+    )
     parser.add_argument(
         "--dry-run",
         dest="dry_run",
@@ -267,6 +309,508 @@ def _copy_table(
     LOGGER.info("%s: migration complete (%s rows)", table.name, migrated)
 
 
+# ---------------------------------------------------------------------------
+# COPY fast path (--mode copy)
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class TableCopyStats:
+    """Outcome of loading one table through the COPY fast path."""
+
+    table: str
+    rows: int
+    seconds: float
+    skipped: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+class MigrationStateError(RuntimeError):
+    """The state file cannot be trusted, so deferred DDL could be lost."""
+
+
+class MigrationState:
+    """Per-table progress for resumable COPY migrations.
+
+    The state file records which tables finished loading and the DDL that was
+    dropped before the load, so an interrupted run can skip completed tables and
+    still recreate every deferred index and foreign key. Table progress only
+    carries over with ``--resume`` and an unchanged source, but dropped DDL is
+    kept until it has been recreated, whatever the next run looks like.
+    """
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.completed: dict[str, dict[str, Any]] = {}
+        self.deferred_ddl: list[dict[str, str]] | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str, resume: bool = True) -> "MigrationState":
+        """Load ``path``; completed tables are kept only when resuming the same source/target pair.
+
+        Raises:
+            MigrationStateError: If the file exists but cannot be read, since it may
+                hold the only copy of dropped index/foreign-key definitions
+        """
+        state = cls(path, fingerprint)
+        if not path.exists():
+            return state
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise MigrationStateError(f"State file {path} is unreadable: {exc}") from exc
+        if payload.get("version") != STATE_FILE_VERSION:
+            raise MigrationStateError(f"State file {path} has unsupported version {payload.get('version')!r}")
+        state.deferred_ddl = payload.get("deferred_ddl")
+        if resume and payload.get("fingerprint") == fingerprint:
+            state.completed = dict(payload.get("completed") or {})
+        elif payload.get("completed"):
+            LOGGER.warning("State file %s: not resuming, all tables will be loaded again", path)
+        if state.deferred_ddl:
+            LOGGER.warning(
+                "State file %s: %s index/foreign-key definition(s) from an earlier run are still pending "
+                "and will be recreated after the load",
+                path,
+                len(state.deferred_ddl),
+            )
+        return state
+
+    def is_completed(self, table_name: str) -> bool:
+        return table_name in self.completed
+
+    def mark_completed(self, stats: TableCopyStats) -> None:
+        with self._lock:
+            self.completed[stats.table] = {"rows": stats.rows, "seconds": round(stats.seconds, 3)}
+            self._write()
+
+    def set_deferred_ddl(self, ddl: list[dict[str, str]] | None) -> None:
+        with self._lock:
+            self.deferred_ddl = ddl
+            self._write()
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def _write(self) -> None:
+        payload = {
+            "version": STATE_FILE_VERSION,
+            "fingerprint": self.fingerprint,
+            "completed": self.completed,
+            "deferred_ddl": self.deferred_ddl,
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def _migration_fingerprint(sqlite_path: Path, postgres_url: str) -> str:
+    stat = sqlite_path.stat()
+    target = sa.engine.make_url(postgres_url)
+    raw = f"{sqlite_path}|{stat.st_size}|{int(stat.st_mtime)}|{target.host}|{target.port}|{target.database}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _target_fingerprint(postgres_url: str) -> str:
+    target = sa.engine.make_url(postgres_url)
+    raw = f"{target.host}|{target.port}|{target.database}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _default_state_path(postgres_url: str) -> Path:
+    # Keyed on the target only: dropped DDL belongs to the target database and must
+    # be found again even if the source file changed since the interrupted run.
+    return Path(tempfile.gettempdir()) / f"sms_pg_copy_{_target_fingerprint(postgres_url)}.json"
+
+
+def _copy_engine_url(postgres_url: str) -> sa.engine.URL:
+    """Return the target URL bound to psycopg 3, which provides the COPY API."""
+    return sa.engine.make_url(postgres_url).set(drivername="postgresql+psycopg")
+
+
+def _table_dependencies(tables: Sequence[Table]) -> dict[str, set[str]]:
+    """Map each table name to the selected tables it references through foreign keys."""
+    selected = {table.name for table in tables}
+    dependencies: dict[str, set[str]] = {}
+    for table in tables:
+        parents = {fk.column.table.name for fk in table.foreign_keys}
+        dependencies[table.name] = {name for name in parents if name in selected and name != table.name}
+    return dependencies
+
+
+def _run_in_dependency_order(
+    dependencies: Mapping[str, set[str]],
+    worker: Callable[[str], TableCopyStats],
+    max_workers: int,
+) -> tuple[list[TableCopyStats], dict[str, BaseException]]:
+    """Run ``worker`` for every table, starting a table once all its parents finished.
+
+    Independent tables run concurrently on up to ``max_workers`` threads. When a
+    table fails, tables that depend on it (directly or transitively) are not
+    started and are reported as failed as well.
+    """
+    pending = {name: set(parents) for name, parents in dependencies.items()}
+    running: dict[Future[TableCopyStats], str] = {}
+    results: list[TableCopyStats] = []
+    failures: dict[str, BaseException] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="pg-copy") as executor:
+        while pending or running:
+            ready = sorted(name for name, parents in pending.items() if not parents)
+            for name in ready:
+                del pending[name]
+                running[executor.submit(worker, name)] = name
+
+            if not running:
+                # Everything left waits on a failed parent (or a cycle).
+                for name in sorted(pending):
+                    failures[name] = RuntimeError("not started: a referenced table failed to load")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    failures[name] = exc
+                    continue
+                results.append(future.result())
+                for parents in pending.values():
+                    parents.discard(name)
+
+    return results, failures
+
+
+def _capture_deferrable_ddl(conn: Connection, table_names: Sequence[str]) -> list[dict[str, str]]:
+    """Collect foreign keys and non-unique secondary indexes of ``table_names``.
+
+    Primary keys and unique indexes stay in place: they guard correctness of the
+    load and back the ``ON CONFLICT`` clause used in append mode.
+    """
+    if not table_names:
+        return []
+    params = {"tables": list(table_names)}
+    foreign_keys = conn.execute(
+        text(
+            "SELECT c.conrelid::regclass::text AS table_name, c.conname AS name, "
+            "pg_get_constraintdef(c.oid) AS definition "
+            "FROM pg_constraint c JOIN pg_class t ON t.oid = c.conrelid "
+            "JOIN pg_namespace n ON n.oid = t.relnamespace "
+            "WHERE c.contype = 'f' AND n.nspname = 'public' AND t.relname = ANY(:tables) "
+            "ORDER BY t.relname, c.conname"
+        ),
+        params,
+    ).mappings()
+    indexes = conn.execute(
+        text(
+            "SELECT i.tablename AS table_name, i.indexname AS name, i.indexdef AS definition "
+            "FROM pg_indexes i JOIN pg_class ic ON ic.relname = i.indexname "
+            "JOIN pg_index ix ON ix.indexrelid = ic.oid "
+            "WHERE i.schemaname = 'public' AND i.tablename = ANY(:tables) "
+            "AND NOT ix.indisunique AND NOT ix.indisprimary "
+            "ORDER BY i.tablename, i.indexname"
+        ),
+        params,
+    ).mappings()
+
+    ddl = [{"kind": "index", **dict(row)} for row in indexes]
+    ddl.extend({"kind": "foreign_key", **dict(row)} for row in foreign_keys)
+    return ddl
+
+
+def _merge_deferred_ddl(
+    pending: Sequence[Mapping[str, str]], captured: Sequence[Mapping[str, str]]
+) -> list[dict[str, str]]:
+    """Definitions still pending from earlier runs, plus newly captured ones not already listed."""
+    merged = [dict(item) for item in pending]
+    seen = {(item["kind"], item["table_name"], item["name"]) for item in merged}
+    for item in captured:
+        key = (item["kind"], item["table_name"], item["name"])
+        if key not in seen:
+            seen.add(key)
+            merged.append(dict(item))
+    return merged
+
+
+def _drop_deferred_ddl(conn: Connection, ddl: Sequence[Mapping[str, str]]) -> None:
+    for item in ddl:
+        if item["kind"] == "foreign_key":
+            conn.execute(
+                text(
+                    f"ALTER TABLE {_quote_ident(item['table_name'])} "
+                    f"DROP CONSTRAINT IF EXISTS {_quote_ident(item['name'])}"
+                )
+            )
+        else:
+            conn.execute(text(f"DROP INDEX IF EXISTS {_quote_ident(item['name'])}"))
+    LOGGER.info("Deferred %s index/foreign-key definition(s) until after the load", len(ddl))
+
+
+def _recreate_deferred_ddl(engine: Engine, ddl: Sequence[Mapping[str, str]]) -> list[str]:
+    """Recreate deferred indexes first, then foreign keys. Returns names that failed."""
+    failed: list[str] = []
+    ordered = [item for item in ddl if item["kind"] == "index"] + [
+        item for item in ddl if item["kind"] == "foreign_key"
+    ]
+    for item in ordered:
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                if item["kind"] == "index":
+                    conn.execute(text(item["definition"].replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1)))
+                else:
+                    exists = conn.execute(
+                        text(
+                            "SELECT 1 FROM pg_constraint WHERE conname = :name AND conrelid = CAST(:table AS regclass)"
+                        ),
+                        {"name": item["name"], "table": item["table_name"]},
+                    ).first()
+                    if exists is None:
+                        conn.execute(
+                            text(
+                                f"ALTER TABLE {_quote_ident(item['table_name'])} "
+                                f"ADD CONSTRAINT {_quote_ident(item['name'])} {item['definition']}"
+                            )
+                        )
+        except sa.exc.SQLAlchemyError as exc:
+            LOGGER.error("%s: failed to recreate %s %s: %s", item["table_name"], item["kind"], item["name"], exc)
+            failed.append(item["name"])
+            continue
+        LOGGER.debug(
+            "%s: recreated %s %s in %.2fs",
+            item["table_name"],
+            item["kind"],
+            item["name"],
+            time.perf_counter() - started,
+        )
+    return failed
+
+
+def _copy_row_adapters(columns: Sequence[sa.Column[Any]]) -> list[Callable[[Any], Any] | None]:
+    """Return per-column converters for values psycopg cannot COPY as-is."""
+    from psycopg.types.json import Json
+
+    adapters: list[Callable[[Any], Any] | None] = []
+    for column in columns:
+        if isinstance(column.type, sa.JSON):
+            adapters.append(lambda value: None if value is None else Json(value))
+        else:
+            adapters.append(None)
+    return adapters
+
+
+def _reset_identity_sequences(conn: Connection, table: Table) -> None:
+    """Move serial sequences past the copied ids so later inserts do not collide."""
+    for column in table.primary_key.columns:
+        if not isinstance(column.type, sa.Integer):
+            continue
+        conn.execute(
+            text(
+                "SELECT setval(seq, COALESCE((SELECT MAX({col}) FROM {tbl}), 0) + 1, false) "
+                "FROM pg_get_serial_sequence(:table, :column) AS seq WHERE seq IS NOT NULL".format(
+                    col=_quote_ident(column.name), tbl=_quote_ident(table.name)
+                )
+            ),
+            {"table": _quote_ident(table.name), "column": column.name},
+        )
+
+
+def _copy_table_fast(
+    table: Table,
+    source_conn: Connection,
+    dest_conn: Connection,
+    batch_size: int,
+    selected_columns: Sequence[sa.Column[Any]],
+    append_safe: bool,
+) -> int:
+    """Stream ``table`` from SQLite into PostgreSQL with ``COPY ... FROM STDIN``.
+
+    In append mode rows are copied into a temporary staging table and merged with
+    ``INSERT ... ON CONFLICT DO NOTHING`` so duplicates are skipped, matching the
+    semantics of the INSERT path.
+    """
+    from psycopg import sql
+
+    column_list = sql.SQL(", ").join(sql.Identifier(col.name) for col in selected_columns)
+    target = sql.Identifier(table.name)
+    copy_target = target
+    cursor = dest_conn.connection.driver_connection.cursor()
+    try:
+        if append_safe:
+            copy_target = sql.Identifier(f"_sms_stage_{table.name}")
+            cursor.execute(
+                sql.SQL("CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP").format(copy_target, target)
+            )
+
+        adapters = _copy_row_adapters(selected_columns)
+        needs_adapting = any(adapters)
+        result = source_conn.execution_options(stream_results=True).execute(
+            sa.select(*selected_columns).select_from(table)
+        )
+        copied = 0
+        try:
+            with cursor.copy(sql.SQL("COPY {} ({}) FROM STDIN").format(copy_target, column_list)) as copy:
+                while True:
+                    rows = result.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        if needs_adapting:
+                            row = [adapt(value) if adapt else value for adapt, value in zip(adapters, row)]
+                        copy.write_row(row)
+                    copied += len(rows)
+        finally:
+            result.close()
+
+        if append_safe:
+            cursor.execute(
+                sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT DO NOTHING").format(
+                    target, column_list, column_list, copy_target
+                )
+            )
+    finally:
+        cursor.close()
+    return copied
+
+
+def _run_copy_migration(
+    args: argparse.Namespace,
+    tables: Sequence[Table],
+    sqlite_path: Path,
+    postgres_url: str,
+) -> int:
+    """Load ``tables`` with COPY, in parallel and FK order, with deferred DDL and resume support."""
+    fingerprint = _migration_fingerprint(sqlite_path, postgres_url)
+    state_path = Path(args.state_file) if args.state_file else _default_state_path(postgres_url)
+    try:
+        state = MigrationState.load(state_path, fingerprint, resume=args.resume)
+    except MigrationStateError as exc:
+        LOGGER.error("%s. Restore or remove it after recreating any indexes/foreign keys it lists.", exc)
+        return 4
+    if args.resume and state.completed:
+        LOGGER.info("Resuming from %s (%s table(s) already loaded)", state_path, len(state.completed))
+
+    workers = max(1, args.workers)
+    sqlite_engine = _create_sqlite_source_engine(sqlite_path)
+    postgres_engine = create_engine(_copy_engine_url(postgres_url), pool_size=workers + 1, max_overflow=0)
+
+    with sqlite_engine.connect() as source_conn, postgres_engine.connect() as dest_conn:
+        tables_for_source, missing_source = _filter_existing_source_tables(source_conn, tables)
+        tables_for_dest, missing_dest = _filter_existing_destination_tables(dest_conn, tables_for_source)
+        if missing_source:
+            LOGGER.warning("Skipping table(s) missing in source SQLite schema: %s", ", ".join(sorted(missing_source)))
+        if missing_dest:
+            LOGGER.warning("Skipping table(s) missing in destination schema: %s", ", ".join(sorted(missing_dest)))
+
+        plans: dict[str, list[sa.Column[Any]]] = {}
+        for table in tables_for_dest:
+            common = _get_table_column_names(source_conn, table.name) & _get_table_column_names(dest_conn, table.name)
+            selected_columns = [col for col in table.columns if col.name in common]
+            required_missing = _required_missing_columns(table, {col.name for col in selected_columns})
+            if required_missing:
+                LOGGER.warning(
+                    "%s: skipping table because required destination columns are missing from source schema: %s",
+                    table.name,
+                    ", ".join(required_missing),
+                )
+                continue
+            if not selected_columns:
+                LOGGER.warning("%s: no compatible columns between source and destination - skipping", table.name)
+                continue
+            plans[table.name] = selected_columns
+        dest_conn.rollback()
+
+    if not plans:
+        LOGGER.warning("No selected tables can be migrated. Nothing to do.")
+        return 0
+
+    table_by_name = {table.name: table for table in tables if table.name in plans}
+    with postgres_engine.begin() as conn:
+        captured = _capture_deferrable_ddl(conn, sorted(plans))
+        # Saved before anything is dropped, and never replacing definitions still pending
+        state.set_deferred_ddl(_merge_deferred_ddl(state.deferred_ddl or [], captured))
+        _drop_deferred_ddl(conn, captured)
+
+    def load_table(name: str) -> TableCopyStats:
+        table = table_by_name[name]
+        if state.is_completed(name):
+            LOGGER.info("%s: already loaded in a previous run - skipping", name)
+            return TableCopyStats(name, int(state.completed[name].get("rows", 0)), 0.0, skipped=True)
+
+        started = time.perf_counter()
+        with sqlite_engine.connect() as src, postgres_engine.begin() as dst:
+            if not args.no_truncate:
+                dst.execute(text(f"TRUNCATE TABLE {_quote_ident(name)} RESTART IDENTITY CASCADE"))
+            rows = _copy_table_fast(table, src, dst, args.batch_size, plans[name], args.no_truncate)
+            _reset_identity_sequences(dst, table)
+        stats = TableCopyStats(name, rows, time.perf_counter() - started)
+        state.mark_completed(stats)
+        LOGGER.info("%s: copied %s rows in %.2fs (%.0f rows/s)", name, stats.rows, stats.seconds, stats.rows_per_second)
+        return stats
+
+    load_started = time.perf_counter()
+    dependencies = _table_dependencies(list(table_by_name.values()))
+    results, failures = _run_in_dependency_order(dependencies, load_table, workers)
+    load_seconds = time.perf_counter() - load_started
+
+    for name, exc in sorted(failures.items()):
+        LOGGER.error("%s: load failed: %s", name, exc)
+
+    _log_copy_summary(results, load_seconds)
+
+    if failures:
+        LOGGER.error(
+            "%s table(s) failed. Indexes and foreign keys stay deferred; fix the cause and rerun with "
+            "--mode copy --resume --state-file %s",
+            len(failures),
+            state_path,
+        )
+        return 4
+
+    ddl_started = time.perf_counter()
+    deferred = state.deferred_ddl or []
+    failed_ddl = _recreate_deferred_ddl(postgres_engine, deferred)
+    _analyze_tables(postgres_engine, sorted(plans))
+    LOGGER.info("Recreated deferred indexes/foreign keys in %.2fs", time.perf_counter() - ddl_started)
+    if failed_ddl:
+        # Keep what could not be recreated so the next run retries it
+        state.set_deferred_ddl([item for item in deferred if item["name"] in failed_ddl])
+        LOGGER.error("Could not recreate: %s", ", ".join(failed_ddl))
+        return 4
+
+    state.discard()
+    return 0
+
+
+def _analyze_tables(engine: Engine, table_names: Sequence[str]) -> None:
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+            text("ANALYZE " + ", ".join(_quote_ident(name) for name in table_names))
+        )
+
+
+def _log_copy_summary(results: Sequence[TableCopyStats], elapsed: float) -> None:
+    loaded = [stats for stats in results if not stats.skipped]
+    total_rows = sum(stats.rows for stats in loaded)
+    LOGGER.info("%-32s %12s %10s %12s", "table", "rows", "seconds", "rows/s")
+    for stats in sorted(results, key=lambda item: item.seconds, reverse=True):
+        if stats.skipped:
+            LOGGER.info("%-32s %12s %10s %12s", stats.table, stats.rows, "-", "resumed")
+            continue
+        LOGGER.info("%-32s %12s %10.2f %12.0f", stats.table, stats.rows, stats.seconds, stats.rows_per_second)
+    LOGGER.info(
+        "Copied %s rows across %s table(s) in %.2fs (%.0f rows/s overall)",
+        total_rows,
+        len(loaded),
+        elapsed,
+        total_rows / elapsed if elapsed > 0 else float(total_rows),
+    )
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     args = _parse_arguments(argv or sys.argv[1:])
     logging.basicConfig(
@@ -304,6 +848,12 @@ def main(argv: Sequence[str] | None = None) -> int:
             LOGGER.error(str(exc))
             return 3
 
+    if args.mode == "copy" and not args.dry_run:
+        rc = _run_copy_migration(args, tables, sqlite_path, postgres_url)
+        if rc == 0:
+            LOGGER.info("Migration complete")
+        return rc
+
     sqlite_engine = _create_sqlite_source_engine(sqlite_path)
     postgres_engine = None if args.dry_run else create_engine(postgres_url)
 
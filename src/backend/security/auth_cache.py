@@ -0,0 +1,285 @@
+"""
+Caches behind ``get_current_user`` and RBAC permission checks.
+
+Every authenticated request used to verify the JWT signature, load the user
+row by email and re-query the user's roles and permissions. Three small
+in-process caches remove that work from the hot path:
+
+- verified tokens: token hash -> subject, kept until the token's ``exp`` or
+  ``AUTH_TOKEN_CACHE_TTL_SECONDS``, whichever comes first;
+- user snapshots: email -> immutable :class:`UserSnapshot`, kept for
+  ``AUTH_USER_CACHE_TTL_SECONDS``;
+- permission profiles: (user id, role, permission version) -> granted keys.
+
+Session hooks invalidate a user's snapshot when a commit touches that user
+and bump the permission version when a commit touches RBAC tables. Raw SQL
+writes to RBAC tables must call :func:`mark_permissions_changed` before
+committing. Other processes see changes once their TTL lapses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, FrozenSet, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import Permission, Role, RolePermission, User, UserPermission, UserRole
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+RBAC_MODELS = (Role, Permission, RolePermission, UserRole, UserPermission)
+
+_USERS_KEY = "auth_cache_users"
+_PERMISSIONS_KEY = "auth_cache_permissions"
+_ALL_USERS = -1
+
+
+class _ExpiringCache(Generic[K, V]):
+    """Bounded LRU map whose entries carry their own expiry timestamp."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(1, maxsize)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard_where(self, predicate: Callable[[K, V], bool]) -> None:
+        with self._lock:
+            for key in [k for k, (v, _) in self._entries.items() if predicate(k, v)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Identity of the caller as resolved at ``permission_version``."""
+
+    id: int
+    email: str
+    role: str
+    is_active: bool
+    full_name: Optional[str]
+    password_change_required: bool
+    permission_version: int
+
+    @classmethod
+    def from_user(cls, user: Any, permission_version: int) -> "UserSnapshot":
+        return cls(
+            id=int(user.id),
+            email=str(user.email),
+            role=str(user.role or ""),
+            is_active=bool(user.is_active),
+            full_name=user.full_name,
+            password_change_required=bool(getattr(user, "password_change_required", False)),
+            permission_version=permission_version,
+        )
+
+
+@dataclass(frozen=True)
+class PermissionProfile:
+    """Everything ``has_permission`` needs to know about one user's grants."""
+
+    granted: FrozenSet[str]
+    has_user_permissions: bool
+    use_role_defaults: bool
+    # Earliest expiry of a direct grant still in force (epoch seconds)
+    valid_until: Optional[float] = None
+
+
+class AuthCache:
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.tokens: _ExpiringCache[str, str] = _ExpiringCache(maxsize)
+        self.users: _ExpiringCache[str, UserSnapshot] = _ExpiringCache(maxsize)
+        self.permissions: _ExpiringCache[Tuple[int, str, int], PermissionProfile] = _ExpiringCache(maxsize)
+        self._version_lock = threading.Lock()
+        self.permission_version = 0
+
+    # -- verified tokens -------------------------------------------------
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        # The signing key is part of the hash so rotating it invalidates every entry
+        material = f"{settings.SECRET_KEY}\0{settings.ALGORITHM}\0{token}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get_subject(self, token: str) -> Optional[str]:
+        if _ttl("AUTH_TOKEN_CACHE_TTL_SECONDS") <= 0:
+            return None
+        return self.tokens.get(self.token_key(token))
+
+    def store_subject(self, token: str, subject: str, payload: dict) -> None:
+        ttl = _ttl("AUTH_TOKEN_CACHE_TTL_SECONDS")
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        self.tokens.set(self.token_key(token), subject, expires_at)
+
+    # -- user snapshots --------------------------------------------------
+
+    def get_user(self, email: str) -> Optional[UserSnapshot]:
+        snapshot = self.users.get(email)
+        if snapshot is None or snapshot.permission_version != self.permission_version:
+            return None
+        return snapshot
+
+    def store_user(self, user: Any) -> UserSnapshot:
+        snapshot = UserSnapshot.from_user(user, self.permission_version)
+        ttl = _ttl("AUTH_USER_CACHE_TTL_SECONDS")
+        if ttl > 0:
+            self.users.set(snapshot.email, snapshot, time.time() + ttl)
+        return snapshot
+
+    def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        ids = set(user_ids)
+        if _ALL_USERS in ids:
+            self.users.clear()
+            return
+        if ids:
+            self.users.discard_where(lambda _email, snapshot: snapshot.id in ids)
+
+    # -- permission profiles ---------------------------------------------
+
+    def get_permissions(self, user: Any) -> Optional[PermissionProfile]:
+        key = self._permission_key(user)
+        return self.permissions.get(key) if key else None
+
+    def store_permissions(self, user: Any, profile: PermissionProfile) -> None:
+        key = self._permission_key(user)
+        ttl = _ttl("AUTH_USER_CACHE_TTL_SECONDS")
+        if key is None or ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        if profile.valid_until is not None:
+            expires_at = min(expires_at, profile.valid_until)
+        self.permissions.set(key, profile, expires_at)
+
+    def _permission_key(self, user: Any) -> Optional[Tuple[int, str, int]]:
+        # Only snapshots are cached: their version pins the grants they were resolved with
+        if not isinstance(user, UserSnapshot) or user.permission_version != self.permission_version:
+            return None
+        return (user.id, user.role, user.permission_version)
+
+    def bump_permission_version(self) -> None:
+        with self._version_lock:
+            self.permission_version += 1
+        self.permissions.clear()
+
+    def clear(self) -> None:
+        self.tokens.clear()
+        self.users.clear()
+        self.permissions.clear()
+
+
+def _ttl(name: str) -> int:
+    return int(getattr(settings, name, 0) or 0)
+
+
+auth_cache = AuthCache(int(getattr(settings, "AUTH_CACHE_MAXSIZE", 4096)))
+
+
+def invalidate_user_cache(*user_ids: int) -> None:
+    """Drop cached snapshots for ``user_ids`` (all users when none are given)."""
+    auth_cache.invalidate_users(user_ids or (_ALL_USERS,))
+
+
+def mark_permissions_changed(session: Session) -> None:
+    """Flag an RBAC change made with raw SQL; applied when ``session`` commits."""
+    session.info[_PERMISSIONS_KEY] = True
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            if obj.id is not None:
+                session.info.setdefault(_USERS_KEY, set()).add(obj.id)
+        elif isinstance(obj, RBAC_MODELS):
+            session.info[_PERMISSIONS_KEY] = True
+
+
+def _after_bulk_write(context: Any) -> None:
+    model = getattr(getattr(context, "mapper", None), "class_", None)
+    if model is User:
+        context.session.info.setdefault(_USERS_KEY, set()).add(_ALL_USERS)
+    elif model in RBAC_MODELS:
+        context.session.info[_PERMISSIONS_KEY] = True
+
+
+def _before_commit(session: Session) -> None:
+    # Objects modified after the last flush are only flushed by commit itself
+    _after_flush(session, None)
+
+
+def _after_commit(session: Session) -> None:
+    user_ids = session.info.pop(_USERS_KEY, None)
+    if session.info.pop(_PERMISSIONS_KEY, False):
+        auth_cache.bump_permission_version()
+    if user_ids:
+        auth_cache.invalidate_users(user_ids)
+
+
+_hooks_registered = False
+
+
+def register_auth_cache_hooks() -> None:
+    """Attach the session listeners (idempotent)."""
+    global _hooks_registered
+    if _hooks_registered:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_bulk_update", _after_bulk_write)
+    event.listen(Session, "after_bulk_delete", _after_bulk_write)
+    event.listen(Session, "before_commit", _before_commit)
+    # Pending invalidations deliberately survive rollbacks: dropping a
+    # snapshot that did not change costs one query, keeping a stale one
+    # would let a deactivated user through.
+    event.listen(Session, "after_commit", _after_commit)
+    _hooks_registered = True
+
+
+register_auth_cache_hooks()
+
+
+__all__ = [
+    "AuthCache",
+    "PermissionProfile",
+    "UserSnapshot",
+    "auth_cache",
+    "invalidate_user_cache",
+    "mark_permissions_changed",
+    "register_auth_cache_hooks",
+]
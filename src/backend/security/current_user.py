@@ -11,6 +11,8 @@ from backend.config import settings
 # password hashing helpers are available in backend.security.password_hash if needed
 from backend.db import get_session as get_db
 from backend.errors import ErrorCode, http_error
+from backend.middleware.prometheus_metrics import track_cache_hit, track_cache_miss
+from backend.security.auth_cache import auth_cache
 
 
 def decode_token(token: str) -> dict:
@@ -87,20 +89,32 @@ async def get_current_user(
         request,
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = decode_token(token)
-        email_val = payload.get("sub")
-        email: str = str(email_val) if email_val is not None else ""
-        if not email:
+    email = auth_cache.get_subject(token)
+    if email is None:
+        try:
+            payload = decode_token(token)
+            email_val = payload.get("sub")
+            email = str(email_val) if email_val is not None else ""
+            if not email:
+                raise credentials_exception
+        except InvalidTokenError:
             raise credentials_exception
-    except InvalidTokenError:
-        raise credentials_exception
-    except Exception:
-        raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == email).first()
-    if user is None or not bool(getattr(user, "is_active", False)):
+        except Exception:
+            raise credentials_exception
+        auth_cache.store_subject(token, email, payload)
+
+    snapshot = auth_cache.get_user(email)
+    if snapshot is not None:
+        track_cache_hit("auth_user")
+    else:
+        track_cache_miss("auth_user")
+        user = db.query(models.User).filter(models.User.email == email).first()
+        if user is None:
+            raise credentials_exception
+        snapshot = auth_cache.store_user(user)
+    if not snapshot.is_active:
         raise credentials_exception
-    return user
+    return snapshot
 
 
 async def require_auth_even_if_disabled(
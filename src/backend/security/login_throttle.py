@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from threading import Lock
-from typing import Dict, Optional
+from threading import RLock
+from typing import Iterator, Optional, Protocol, Tuple
 
 from backend.config import settings
+from backend.rate_limit_storage import (
+    SQLiteThrottleStore,
+    ThrottleRecord,
+    resolve_storage_uri,
+    sqlite_path_from_uri,
+)
 
 
 def _now() -> datetime:
@@ -18,13 +27,111 @@ class _ThrottleState:
     window_start: datetime
     lockout_until: Optional[datetime] = None
 
+    def to_record(self) -> ThrottleRecord:
+        lockout = self.lockout_until.timestamp() if self.lockout_until else None
+        return (self.attempts, self.window_start.timestamp(), lockout)
+
+    @classmethod
+    def from_record(cls, record: ThrottleRecord) -> "_ThrottleState":
+        attempts, window_start, lockout_until = record
+        return cls(
+            attempts=attempts,
+            window_start=datetime.fromtimestamp(window_start, timezone.utc),
+            lockout_until=datetime.fromtimestamp(lockout_until, timezone.utc) if lockout_until else None,
+        )
+
+
+class ThrottleStore(Protocol):
+    def locked(self): ...
+
+    def get(self, key: str, now: float) -> Optional[ThrottleRecord]: ...
+
+    def set(self, key: str, record: ThrottleRecord, expires_at: float) -> None: ...
+
+    def pop(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class MemoryThrottleStore:
+    """Bounded in-process store whose entries expire with their window or lockout.
+
+    Expired entries are dropped as they are touched and swept on insert; once
+    ``max_entries`` live keys exist, the least recently used one is evicted.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max(1, max_entries)
+        self._lock = RLock()
+        self._entries: OrderedDict[str, Tuple[ThrottleRecord, float]] = OrderedDict()
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def get(self, key: str, now: float) -> Optional[ThrottleRecord]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            record, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return record
+
+    def set(self, key: str, record: ThrottleRecord, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (record, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._evict(time.time())
+
+    def _evict(self, now: float) -> None:
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _build_store() -> ThrottleStore:
+    """Share state through the rate limit SQLite file when one is configured."""
+    path = sqlite_path_from_uri(resolve_storage_uri())
+    if path and bool(getattr(settings, "AUTH_LOGIN_THROTTLE_SHARED", True)):
+        return SQLiteThrottleStore(path)
+    return MemoryThrottleStore(int(getattr(settings, "AUTH_LOGIN_THROTTLE_MAX_ENTRIES", 10000)))
+
 
 class LoginThrottle:
-    """In-memory login throttle with per-identifier tracking."""
+    """Login throttle with per-identifier tracking."""
 
-    def __init__(self) -> None:
-        self._lock = Lock()
-        self._entries: Dict[str, _ThrottleState] = {}
+    def __init__(self, store: Optional[ThrottleStore] = None) -> None:
+        self._store_lock = RLock()
+        self._store = store
+
+    @property
+    def store(self) -> ThrottleStore:
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    self._store = _build_store()
+        return self._store
 
     def _limits(self) -> tuple[int, timedelta, timedelta]:
         max_attempts = max(1, int(getattr(settings, "AUTH_LOGIN_MAX_ATTEMPTS", 5)))
@@ -36,6 +143,17 @@ class LoginThrottle:
             timedelta(seconds=lockout_seconds),
         )
 
+    def _load(self, key: str, now: datetime) -> Optional[_ThrottleState]:
+        record = self.store.get(key, now.timestamp())
+        return _ThrottleState.from_record(record) if record else None
+
+    def _save(self, key: str, state: _ThrottleState, window: timedelta) -> None:
+        # Nothing about the entry matters once both its window and lockout are over
+        expires_at = state.window_start + window
+        if state.lockout_until and state.lockout_until > expires_at:
+            expires_at = state.lockout_until
+        self.store.set(key, state.to_record(), expires_at.timestamp())
+
     def get_lockout_until(self, key: str) -> Optional[datetime]:
         # Throttle can be disabled for CI/E2E via env flags
         if (
@@ -45,17 +163,13 @@ class LoginThrottle:
         ):
             return None
         now = _now()
-        with self._lock:
-            state = self._entries.get(key)
-            if not state or not state.lockout_until:
-                return None
-            if state.lockout_until <= now:
-                # Lockout expired; reset state for future attempts
-                state.lockout_until = None
-                state.attempts = 0
-                state.window_start = now
-                return None
-            return state.lockout_until
+        state = self._load(key, now)
+        if not state or not state.lockout_until:
+            return None
+        if state.lockout_until <= now:
+            # Lockout expired; the next failure starts a fresh window
+            return None
+        return state.lockout_until
 
     def register_failure(self, key: str) -> Optional[datetime]:
         # Throttle can be disabled for CI/E2E via env flags
@@ -67,14 +181,13 @@ class LoginThrottle:
             return None
         now = _now()
         max_attempts, window, lockout = self._limits()
-        with self._lock:
-            state = self._entries.get(key)
+        with self.store.locked():
+            state = self._load(key, now)
             if state is None or now - state.window_start > window:
                 state = _ThrottleState(attempts=0, window_start=now)
 
             # If still locked, keep enforcing the lockout window
             if state.lockout_until and state.lockout_until > now:
-                self._entries[key] = state
                 return state.lockout_until
 
             if state.lockout_until and state.lockout_until <= now:
@@ -88,18 +201,16 @@ class LoginThrottle:
                 state.attempts = 0
                 state.window_start = now
 
-            self._entries[key] = state
+            self._save(key, state, window)
             return state.lockout_until
 
     def reset(self, key: str) -> None:
-        with self._lock:
-            self._entries.pop(key, None)
+        self.store.pop(key)
 
     def clear(self) -> None:
-        with self._lock:
-            self._entries.clear()
+        self.store.clear()
 
 
 login_throttle = LoginThrottle()
 
-__all__ = ["LoginThrottle", "login_throttle"]
+__all__ = ["LoginThrottle", "MemoryThrottleStore", "login_throttle"]
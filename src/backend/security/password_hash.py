@@ -1,28 +1,202 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
 import bcrypt as _bcrypt
 from passlib.context import CryptContext as _CryptContext
+from passlib.utils.binary import ab64_decode, ab64_encode
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 # Passlib is only kept for verifying legacy PBKDF2-SHA256 hashes already in
-# the database.  All NEW hashes use bcrypt directly (below).  Once all users
-# have logged in at least once the auto-rehash path will have migrated every
-# row, at which point passlib can be removed entirely.
+# the database.  All NEW hashes use bcrypt directly (below).  Rows that never
+# log in are wrapped in place by wrap_legacy_hash() so no bare PBKDF2 digest
+# stays at rest; the wrapped form is upgraded to plain bcrypt at next login.
 _legacy_ctx = _CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+_legacy_handler = _legacy_ctx.handler("pbkdf2_sha256")
 
 _BCRYPT_PREFIXES = ("$2b$", "$2a$", "$2y$")
 
+# $bcrypt-pbkdf2-sha256$<rounds>$<ab64 salt>$<bcrypt hash of the ab64 PBKDF2 digest>
+WRAPPED_LEGACY_PREFIX = "$bcrypt-pbkdf2-sha256$"
+
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Raised when the hashing queue is full; callers should answer 503."""
+
+
+def _setting(name: str, default: int) -> int:
+    try:
+        from backend.config import settings
+
+        return int(getattr(settings, name, default))
+    except Exception:  # pragma: no cover - settings unavailable in stripped-down environments
+        return default
+
+
+def _bcrypt_rounds() -> int:
+    return _setting("PASSWORD_BCRYPT_ROUNDS", DEFAULT_BCRYPT_ROUNDS)
+
+
+def _bcrypt_cost(hashed_password: str) -> Optional[int]:
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
 
 def get_password_hash(password: str) -> str:
-    return _bcrypt.hashpw(password.encode(), _bcrypt.gensalt(rounds=12)).decode()
+    return _bcrypt.hashpw(password.encode(), _bcrypt.gensalt(rounds=_bcrypt_rounds())).decode()
+
+
+def _verify_wrapped_legacy(plain_password: str, hashed_password: str) -> bool:
+    _, _, rounds, salt, inner = hashed_password.split("$", 4)
+    digest = hashlib.pbkdf2_hmac("sha256", plain_password.encode(), ab64_decode(salt), int(rounds), 32)
+    return _bcrypt.checkpw(ab64_encode(digest), f"${inner}".encode())
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         if hashed_password.startswith(_BCRYPT_PREFIXES):
             return _bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        if hashed_password.startswith(WRAPPED_LEGACY_PREFIX):
+            return _verify_wrapped_legacy(plain_password, hashed_password)
         return bool(_legacy_ctx.verify(plain_password, hashed_password))
     except Exception:
         return False
 
 
 def needs_rehash(hashed_password: str) -> bool:
-    """True when the stored hash should be upgraded to bcrypt at next login."""
-    return not hashed_password.startswith(_BCRYPT_PREFIXES)
+    """True when the stored hash should be upgraded at next login.
+
+    Covers legacy and wrapped PBKDF2 hashes as well as bcrypt hashes whose cost
+    differs from ``PASSWORD_BCRYPT_ROUNDS``.
+    """
+    if not hashed_password.startswith(_BCRYPT_PREFIXES):
+        return True
+    return _bcrypt_cost(hashed_password) != _bcrypt_rounds()
+
+
+def is_bare_legacy_hash(hashed_password: str) -> bool:
+    """True for PBKDF2-SHA256 hashes that have not been wrapped yet."""
+    return bool(hashed_password) and bool(_legacy_handler.identify(hashed_password))
+
+
+def wrap_legacy_hash(hashed_password: str) -> str:
+    """Wrap a PBKDF2-SHA256 hash in bcrypt without knowing the password.
+
+    The PBKDF2 salt and rounds are kept so verification can recompute the
+    digest, which is then checked against the bcrypt layer.
+    """
+    parsed = _legacy_handler.from_string(hashed_password)
+    inner = _bcrypt.hashpw(ab64_encode(parsed.checksum), _bcrypt.gensalt(rounds=_bcrypt_rounds())).decode()
+    salt = ab64_encode(parsed.salt).decode()
+    return f"{WRAPPED_LEGACY_PREFIX}{parsed.rounds}${salt}{inner}"
+
+
+def _observe_wait(operation: str, seconds: float) -> None:
+    try:
+        from backend.middleware.prometheus_metrics import observe_password_hash_wait
+
+        observe_password_hash_wait(operation, seconds)
+    except Exception:  # pragma: no cover - metrics are best effort
+        pass
+
+
+def _track_rejected(operation: str) -> None:
+    try:
+        from backend.middleware.prometheus_metrics import track_password_hash_rejected
+
+        track_password_hash_rejected(operation)
+    except Exception:  # pragma: no cover - metrics are best effort
+        pass
+
+
+class PasswordHashingPool:
+    """Runs bcrypt and PBKDF2 work on a small thread pool with a bounded queue.
+
+    Both libraries release the GIL while hashing, so threads keep the event
+    loop responsive without the cost of pickling to worker processes. At most
+    ``max_workers + max_queue`` operations are admitted at once; further
+    requests fail fast with :class:`PasswordHashingBusy`.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None) -> None:
+        self.max_workers = max(1, _setting("PASSWORD_HASH_WORKERS", 4) if max_workers is None else max_workers)
+        self.max_queue = max(0, _setting("PASSWORD_HASH_QUEUE_SIZE", 32) if max_queue is None else max_queue)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    async def run(self, operation: str, fn: Callable[..., T], *args: Any) -> T:
+        """Await ``fn(*args)`` on the pool; ``operation`` labels the metrics."""
+        if not self._slots.acquire(blocking=False):
+            _track_rejected(operation)
+            raise PasswordHashingBusy("Password hashing queue is full")
+
+        submitted = time.perf_counter()
+
+        def task() -> T:
+            # The slot is released here, so abandoned awaits still free it
+            try:
+                _observe_wait(operation, time.perf_counter() - submitted)
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._get_executor().submit(task)
+        except BaseException:
+            self._slots.release()
+            raise
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_hasher: Optional[PasswordHashingPool] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHashingPool:
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHashingPool()
+        return _hasher
+
+
+def shutdown_password_hasher() -> None:
+    global _hasher
+    with _hasher_lock:
+        hasher, _hasher = _hasher, None
+    if hasher is not None:
+        hasher.shutdown()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """:func:`verify_password` off the event loop; raises :class:`PasswordHashingBusy`."""
+    return await get_password_hasher().run("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """:func:`get_password_hash` off the event loop; raises :class:`PasswordHashingBusy`."""
+    return await get_password_hasher().run("hash", get_password_hash, password)
@@ -5,16 +5,57 @@ from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, cast
 
-from sqlalchemy import case, func, inspect
+from sqlalchemy import String, and_, case, cast as sa_cast, distinct, func, inspect, literal
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.orm import Session, joinedload
 
+from backend.db.data_version import get_data_version
 from backend.db.utils import get_by_id_or_404
 from backend.import_resolver import import_names
+from backend.middleware.prometheus_metrics import track_cache_hit, track_cache_miss
 from backend.services.cache_service import get_cache_manager
+from backend.services.course_analytics_snapshot import get_course_snapshot
+from backend.services.final_grade_batch import (
+    EXAM_CATEGORIES,
+    AttendanceColumns,
+    DailyColumns,
+    GradeColumns,
+    calculate_final_grades,
+    compile_course_rules,
+    normalize_category,
+)
 
 logger = logging.getLogger(__name__)
 
+# Histogram buckets as (label, lowest percentage), checked in order
+GRADE_BUCKETS = (
+    ("A (90-100%)", 90),
+    ("B (80-89%)", 80),
+    ("C (70-79%)", 70),
+    ("D (60-69%)", 60),
+    ("F (0-59%)", float("-inf")),
+)
+
+PERCENTILES = (25, 50, 75, 90)
+
+# The analytics lookups payload is keyed by the data version of these tables
+LOOKUP_SOURCE_TABLES = ("students", "courses", "course_enrollments", "grades")
+LOOKUPS_CACHE_PREFIX = "analytics:lookups:"
+LOOKUPS_TTL_SECONDS = 600
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Linearly interpolated percentile of an ascending, non-empty list."""
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def invalidate_analytics_lookups() -> None:
+    """Drop every cached analytics lookups payload."""
+    get_cache_manager().delete_pattern(f"{LOOKUPS_CACHE_PREFIX}*")
+
 
 @dataclass
 class StudentCourseSummary:
@@ -32,16 +73,7 @@ class StudentCourseSummary:
 class AnalyticsService:
     """Encapsulates analytics-related business logic and heavy DB work."""
 
-    exam_categories = {
-        "midterm",
-        "midterm exam",
-        "final exam",
-        "final",
-        "ενδιάμεση",
-        "ενδιάμεση εξέταση",
-        "τελική εξέταση",
-        "τελική",
-    }
+    exam_categories = set(EXAM_CATEGORIES)
 
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -54,6 +86,10 @@ class AnalyticsService:
             self.CourseEnrollment,
         ) = import_names("models", "Student", "Course", "Grade", "DailyPerformance", "Attendance", "CourseEnrollment")
 
+    def _can_cache_snapshots(self) -> bool:
+        # Snapshots built on a read replica that is behind the primary are served but not cached
+        return not self.db.info.get("replica_lag_seconds")
+
     # ----------------------------- Public API ---------------------------------
     def calculate_final_grade(self, student_id: int, course_id: int) -> Dict[str, Any]:
         get_by_id_or_404(self.db, self.Student, student_id)
@@ -93,6 +129,68 @@ class AnalyticsService:
 
         return self._calculate_final_grade_from_records(student_id, course, grades, daily, attendance)
 
+    def calculate_course_final_grades(self, course_id: int, student_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Final grades for many students of one course in a single vectorized pass.
+
+        Defaults to every actively enrolled student. Each entry carries the same
+        scalar fields as :meth:`calculate_final_grade` without the category breakdown.
+        """
+        course = get_by_id_or_404(self.db, self.Course, course_id)
+        if not course.evaluation_rules:
+            return {"error": "No evaluation rules defined for this course"}
+
+        if student_ids is None:
+            student_ids = [
+                row.student_id
+                for row in self.db.query(self.CourseEnrollment.student_id)
+                .filter(self.CourseEnrollment.course_id == course_id, self.CourseEnrollment.deleted_at.is_(None))
+                .distinct()
+                .order_by(self.CourseEnrollment.student_id)
+            ]
+
+        # Rows for other students are dropped by the batch pass, so filter by course only
+        grades = (
+            self.db.query(
+                self.Grade.student_id,
+                self.Grade.category,
+                self.Grade.grade,
+                self.Grade.max_grade,
+                self.Grade.date_submitted,
+                self.Grade.id,
+            )
+            .filter(self.Grade.course_id == course_id, self.Grade.deleted_at.is_(None))
+            .all()
+        )
+        daily = (
+            self.db.query(
+                self.DailyPerformance.student_id,
+                self.DailyPerformance.category,
+                self.DailyPerformance.score,
+                self.DailyPerformance.max_score,
+            )
+            .filter(self.DailyPerformance.course_id == course_id, self.DailyPerformance.deleted_at.is_(None))
+            .all()
+        )
+        attendance = (
+            self.db.query(self.Attendance.student_id, self.Attendance.status)
+            .filter(self.Attendance.course_id == course_id, self.Attendance.deleted_at.is_(None))
+            .all()
+        )
+
+        results = calculate_final_grades(
+            compile_course_rules(course, self.exam_categories),
+            student_ids,
+            GradeColumns.from_rows(grades),
+            DailyColumns.from_rows(daily),
+            AttendanceColumns.from_rows(attendance),
+        )
+        return {
+            "course_id": course.id,
+            "course_name": course.course_name,
+            "student_count": len(results),
+            "students": results,
+        }
+
     def get_student_all_courses_summary(self, student_id: int) -> Dict[str, Any]:
         # Fetch student without expensive joinedloads
         student = self.db.query(self.Student).filter(self.Student.id == student_id).first()
@@ -338,6 +436,112 @@ class AnalyticsService:
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
+    def get_analytics_lookups(self) -> Dict[str, Any]:
+        """Selector lists and class/division/course grade averages for the analytics page.
+
+        The payload is cached under the current data version of its source tables,
+        so any committed student, course, enrollment or grade write is picked up.
+        """
+        version = get_data_version(self.db, LOOKUP_SOURCE_TABLES)
+        key = f"{LOOKUPS_CACHE_PREFIX}{version}"
+        cache = get_cache_manager()
+        cached = cache.get(key)
+        if cached is not None:
+            track_cache_hit("analytics_lookups")
+            return cached
+
+        track_cache_miss("analytics_lookups")
+        payload = self._build_analytics_lookups()
+        cache.set(key, payload, ttl=LOOKUPS_TTL_SECONDS)
+        return payload
+
+    def _build_analytics_lookups(self) -> Dict[str, Any]:
+        Student, Course, Grade, CourseEnrollment = self.Student, self.Course, self.Grade, self.CourseEnrollment
+
+        students = [
+            dict(row._mapping)
+            for row in self.db.query(
+                Student.id,
+                Student.student_id,
+                Student.first_name,
+                Student.last_name,
+                Student.is_active,
+                Student.study_year,
+                Student.academic_year,
+                Student.class_division,
+            )
+            .filter(Student.deleted_at.is_(None))
+            .order_by(Student.last_name.asc(), Student.first_name.asc())
+        ]
+        courses = [
+            dict(row._mapping)
+            for row in self.db.query(
+                Course.id, Course.course_code, Course.course_name, Course.semester, Course.is_active
+            )
+            .filter(Course.deleted_at.is_(None))
+            .order_by(Course.course_name.asc())
+        ]
+
+        # Same labels the selectors derive client-side
+        class_label = case(
+            (func.coalesce(Student.academic_year, "") != "", Student.academic_year),
+            (Student.study_year == 1, "A"),
+            (Student.study_year == 2, "B"),
+            (func.coalesce(Student.study_year, 0) != 0, literal("Year ") + sa_cast(Student.study_year, String)),
+            else_="Unknown Class",
+        )
+        division_label = func.coalesce(func.nullif(Student.class_division, ""), "Unassigned Division")
+        grade_join = and_(Grade.student_id == Student.id, Grade.deleted_at.is_(None), Grade.max_grade > 0)
+        grade_percentage = (Grade.grade / Grade.max_grade) * 100
+
+        def _grouped_averages(label: Any) -> List[Dict[str, Any]]:
+            rows = (
+                self.db.query(
+                    label.label("label"),
+                    func.count(distinct(Student.id)).label("count"),
+                    func.avg(grade_percentage).label("average"),
+                )
+                .outerjoin(Grade, grade_join)
+                .filter(Student.deleted_at.is_(None))
+                .group_by(label)
+                .all()
+            )
+            averages = [
+                {"label": str(row.label), "count": int(row.count), "average": float(row.average or 0.0)} for row in rows
+            ]
+            averages.sort(key=lambda item: (-item["count"], item["label"]))
+            return averages
+
+        enrollment_counts = dict(
+            self.db.query(CourseEnrollment.course_id, func.count(CourseEnrollment.id))
+            .filter(CourseEnrollment.deleted_at.is_(None))
+            .group_by(CourseEnrollment.course_id)
+            .all()
+        )
+        course_grade_averages = dict(
+            self.db.query(Grade.course_id, func.avg(grade_percentage))
+            .filter(Grade.deleted_at.is_(None), Grade.max_grade > 0)
+            .group_by(Grade.course_id)
+            .all()
+        )
+        course_averages = [
+            {
+                "label": course["course_name"],
+                "count": int(enrollment_counts.get(course["id"], 0)),
+                "average": float(course_grade_averages.get(course["id"]) or 0.0),
+            }
+            for course in courses
+        ]
+        course_averages.sort(key=lambda item: item["count"], reverse=True)
+
+        return {
+            "students": students,
+            "courses": courses,
+            "class_averages": _grouped_averages(class_label),
+            "course_averages": course_averages,
+            "division_averages": _grouped_averages(division_label),
+        }
+
     # ----------------------------- Helpers ------------------------------------
     @staticmethod
     def get_letter_grade(percentage: float) -> str:
@@ -526,70 +730,13 @@ class AnalyticsService:
         Returns:
             Dictionary with course info and ranked student performance
         """
-        course = self.db.query(self.Course).filter(self.Course.id == course_id).first()
-        if not course:
-            get_by_id_or_404(self.db, self.Course, course_id)
-        assert course is not None  # Type narrowing for MyPy
-
-        # Get all students enrolled in course
-        enrollments = (
-            self.db.query(self.CourseEnrollment)
-            .filter(self.CourseEnrollment.course_id == course_id, self.CourseEnrollment.deleted_at.is_(None))
-            .all()
+        snapshot = get_course_snapshot(
+            self.db, course_id, self.build_course_snapshot, store=self._can_cache_snapshots()
         )
-
-        student_ids = [e.student_id for e in enrollments]
-
-        # Calculate grades for each student
-        student_stats = []
-        for student_id in student_ids:
-            grades = (
-                self.db.query(self.Grade)
-                .filter(
-                    self.Grade.student_id == student_id,
-                    self.Grade.course_id == course_id,
-                    self.Grade.deleted_at.is_(None),
-                )
-                .all()
-            )
-
-            if grades:
-                avg_pct = sum((g.grade / g.max_grade) * 100 for g in grades if g.max_grade) / len(grades)
-                student = self.db.query(self.Student).filter(self.Student.id == student_id).first()
-                if student:
-                    student_stats.append(
-                        {
-                            "student_id": student.student_id,
-                            "student_name": f"{student.first_name} {student.last_name}",
-                            "average_percentage": round(avg_pct, 2),
-                            "grade_count": len(grades),
-                            "letter_grade": self.get_letter_grade(avg_pct),
-                        }
-                    )
-
-        # Sort by average descending
-        student_stats.sort(key=lambda s: s["average_percentage"], reverse=True)
-
-        # Calculate class statistics
-        if student_stats:
-            percentages = [s["average_percentage"] for s in student_stats]
-            class_avg = sum(percentages) / len(percentages)
-            class_median = sorted(percentages)[len(percentages) // 2]
-            class_min = min(percentages)
-            class_max = max(percentages)
-        else:
-            class_avg = class_median = class_min = class_max = 0
-
         return {
-            "course": {"id": course.id, "code": course.course_code, "name": course.course_name},
-            "class_statistics": {
-                "average": round(class_avg, 2),
-                "median": round(class_median, 2),
-                "min": round(class_min, 2),
-                "max": round(class_max, 2),
-                "student_count": len(student_stats),
-            },
-            "students": student_stats[:limit],
+            "course": dict(snapshot["course"]),
+            "class_statistics": dict(snapshot["class_statistics"]),
+            "students": [dict(s) for s in snapshot["students"][:limit]],
         }
 
     def get_attendance_summary(self, student_id: int, course_id: Optional[int] = None) -> Dict[str, Any]:
@@ -675,54 +822,122 @@ class AnalyticsService:
         Returns:
             Dictionary with grade distribution buckets
         """
+        snapshot = get_course_snapshot(
+            self.db, course_id, self.build_course_snapshot, store=self._can_cache_snapshots()
+        )
+        if not snapshot["grade_rows"]:
+            return {"course": dict(snapshot["course"]), "distribution": {}, "total_grades": 0}
+
+        return {
+            "course": dict(snapshot["course"]),
+            "distribution": dict(snapshot["distribution"]),
+            "average_percentage": snapshot["average_percentage"],
+            "percentiles": dict(snapshot["percentiles"]),
+            "total_grades": snapshot["total_grades"],
+        }
+
+    def build_course_snapshot(self, course_id: int) -> Dict[str, Any]:
+        """Compute the course analytics snapshot served by the course-level endpoints.
+
+        One pass over the course's grade rows yields the histogram, percentiles
+        and per-student averages; attendance is counted in one grouped query.
+        """
         course = self.db.query(self.Course).filter(self.Course.id == course_id).first()
         if not course:
             get_by_id_or_404(self.db, self.Course, course_id)
         assert course is not None  # Type narrowing for MyPy
 
-        # Get all grades for course
-        grades = (
-            self.db.query(self.Grade).filter(self.Grade.course_id == course_id, self.Grade.deleted_at.is_(None)).all()
+        grade_rows = (
+            self.db.query(self.Grade.student_id, self.Grade.grade, self.Grade.max_grade)
+            .filter(self.Grade.course_id == course_id, self.Grade.deleted_at.is_(None))
+            .order_by(self.Grade.id)
+            .all()
         )
 
-        if not grades:
-            return {
-                "course": {"id": course.id, "code": course.course_code, "name": course.course_name},
-                "distribution": {},
-                "total_grades": 0,
-            }
+        buckets = {label: 0 for label, _ in GRADE_BUCKETS}
+        percentages: List[float] = []
+        # student id -> [sum of percentages, number of grade rows]
+        per_student: Dict[int, List[float]] = {}
+        for student_id, grade, max_grade in grade_rows:
+            stats = per_student.setdefault(student_id, [0.0, 0])
+            stats[1] += 1
+            if max_grade:
+                pct = (grade / max_grade) * 100
+                stats[0] += pct
+                percentages.append(pct)
+                buckets[next(label for label, floor in GRADE_BUCKETS if pct >= floor)] += 1
 
-        # Calculate percentages and bucket them
-        buckets = {"A (90-100%)": 0, "B (80-89%)": 0, "C (70-79%)": 0, "D (60-69%)": 0, "F (0-59%)": 0}
+        present = func.sum(case((func.lower(self.Attendance.status) == "present", 1), else_=0))
+        attendance = {
+            student_id: (total, int(present_count or 0))
+            for student_id, total, present_count in self.db.query(
+                self.Attendance.student_id, func.count(self.Attendance.id), present
+            )
+            .filter(self.Attendance.course_id == course_id, self.Attendance.deleted_at.is_(None))
+            .group_by(self.Attendance.student_id)
+        }
 
-        percentages = []
-        for grade in grades:
-            if grade.max_grade:
-                pct = (grade.grade / grade.max_grade) * 100
-                percentages.append(pct)
+        enrolled = (
+            self.db.query(self.Student.id, self.Student.student_id, self.Student.first_name, self.Student.last_name)
+            .join(self.CourseEnrollment, self.CourseEnrollment.student_id == self.Student.id)
+            .filter(self.CourseEnrollment.course_id == course_id, self.CourseEnrollment.deleted_at.is_(None))
+            .order_by(self.CourseEnrollment.id)
+            .all()
+        )
 
-                if pct >= 90:
-                    buckets["A (90-100%)"] += 1
-                elif pct >= 80:
-                    buckets["B (80-89%)"] += 1
-                elif pct >= 70:
-                    buckets["C (70-79%)"] += 1
-                elif pct >= 60:
-                    buckets["D (60-69%)"] += 1
-                else:
-                    buckets["F (0-59%)"] += 1
-
-        # Convert to percentages
-        total = len(percentages)
-        distribution = {k: round((v / total * 100), 2) if total > 0 else 0 for k, v in buckets.items()}
+        student_stats = []
+        seen: set[int] = set()
+        for student_pk, student_code, first_name, last_name in enrolled:
+            stats = per_student.get(student_pk)
+            if not stats or student_pk in seen:
+                continue
+            seen.add(student_pk)
+            avg_pct = stats[0] / stats[1]
+            total_classes, present_count = attendance.get(student_pk, (0, 0))
+            student_stats.append(
+                {
+                    "student_id": student_code,
+                    "student_name": f"{first_name} {last_name}",
+                    "average_percentage": round(avg_pct, 2),
+                    "grade_count": int(stats[1]),
+                    "letter_grade": self.get_letter_grade(avg_pct),
+                    "attendance_rate": round(present_count / total_classes * 100, 2) if total_classes else 0,
+                }
+            )
+
+        # Sort by average descending; tied students share a rank
+        student_stats.sort(key=lambda s: s["average_percentage"], reverse=True)
+        for index, entry in enumerate(student_stats):
+            previous = student_stats[index - 1] if index else None
+            tied = previous is not None and previous["average_percentage"] == entry["average_percentage"]
+            entry["rank"] = previous["rank"] if tied else index + 1
 
-        avg_pct = sum(percentages) / len(percentages) if percentages else 0
+        if student_stats:
+            averages = [s["average_percentage"] for s in student_stats]
+            class_avg = sum(averages) / len(averages)
+            class_median = sorted(averages)[len(averages) // 2]
+            class_min = min(averages)
+            class_max = max(averages)
+        else:
+            class_avg = class_median = class_min = class_max = 0
 
+        total = len(percentages)
+        ordered = sorted(percentages)
         return {
             "course": {"id": course.id, "code": course.course_code, "name": course.course_name},
-            "distribution": distribution,
-            "average_percentage": round(avg_pct, 2),
+            "grade_rows": len(grade_rows),
+            "distribution": {k: round((v / total * 100), 2) if total > 0 else 0 for k, v in buckets.items()},
+            "average_percentage": round(sum(percentages) / total, 2) if total else 0,
+            "percentiles": {f"p{q}": round(_percentile(ordered, q), 2) for q in PERCENTILES} if total else {},
             "total_grades": total,
+            "class_statistics": {
+                "average": round(class_avg, 2),
+                "median": round(class_median, 2),
+                "min": round(class_min, 2),
+                "max": round(class_max, 2),
+                "student_count": len(student_stats),
+            },
+            "students": student_stats,
         }
 
     def _calculate_final_grade_from_records(
@@ -744,94 +959,6 @@ class AnalyticsService:
         category_scores: Dict[str, float] = {}
         category_details: Dict[str, Any] = {}
 
-        def _normalize_category(name: Optional[str]) -> str:
-            """Normalize category names to improve matching between evaluation rules and recorded items.
-
-            Handles case-insensitive comparisons, common synonyms, and Greek equivalents.
-            """
-            if not name:
-                return ""
-            n = str(name).strip().lower()
-            # Remove common punctuation
-            for ch in [":", ";", ",", ".", "-", "_", "(", ")"]:
-                n = n.replace(ch, " ")
-            n = " ".join(n.split())  # collapse whitespace
-
-            # Synonyms map (both EN and EL)
-            synonyms = {
-                # Exams
-                "midterm exam": "midterm",
-                "midterm": "midterm",
-                "intermediate": "midterm",
-                "ενδιάμεση": "midterm",
-                "ενδιάμεση εξέταση": "midterm",
-                "ενδιάμεση εξεταση": "midterm",
-                "final exam": "final",
-                "final": "final",
-                "τελική": "final",
-                "τελική εξέταση": "final",
-                "τελικη": "final",
-                "τελικη εξεταση": "final",
-                # Coursework
-                "homework": "homework",
-                "assignment": "homework",
-                "assignments": "homework",
-                "εργασία": "homework",
-                "εργασια": "homework",
-                "άσκηση": "homework",
-                "ασκηση": "homework",
-                "project": "project",
-                "πρότζεκτ": "project",
-                "προτζεκτ": "project",
-                "lab": "lab",
-                "lab work": "lab",
-                "εργαστήριο": "lab",
-                "εργαστηριο": "lab",
-                "quiz": "quiz",
-                "κουίζ": "quiz",
-                "κουιζ": "quiz",
-                # Participation / attendance
-                "class participation": "participation",
-                "participation": "participation",
-                "συμμετοχή": "participation",
-                "συμμετοχη": "participation",
-                "no participation": "no participation",
-                "minor participation": "minor participation",
-                "minor participation mobile usage": "minor participation (mobile usage)",
-                "minor participation with mobile usage": "minor participation (mobile usage)",
-                "attendance": "attendance",
-                "παρουσία": "attendance",
-                "παρουσια": "attendance",
-            }
-
-            # Direct map
-            if n in synonyms:
-                return synonyms[n]
-
-            # Heuristic contains-based mapping
-            contains_map = {
-                "minor participation (mobile usage)": [
-                    "minor participation mobile usage",
-                    "minor participation with mobile usage",
-                    "mobile usage participation",
-                    "mobile use participation",
-                ],
-                "no participation": ["no participation"],
-                "minor participation": ["minor participation"],
-                "midterm": ["midterm", "ενδιάμεση", "ενδιαμεση"],
-                "final": ["final", "τελική", "τελικη"],
-                "homework": ["homework", "assignment", "εργασ", "άσκη", "ασκη"],
-                "project": ["project", "πρότζεκ", "προτζεκ"],
-                "lab": ["lab", "εργαστηρ"],
-                "quiz": ["quiz", "κουιζ", "κουίζ", "τεστ"],
-                "participation": ["participation", "συμμετο"],
-                "attendance": ["attendance", "παρουσ"],
-            }
-            for key, needles in contains_map.items():
-                if any(needle in n for needle in needles):
-                    return key
-            return n
-
         for rule in evaluation_rules:
             category = rule.get("category")
             weight = float(rule.get("weight", 0))
@@ -846,8 +973,8 @@ class AnalyticsService:
 
             category_lower = (category or "").lower()
             # Match grades to this rule category using normalized names
-            rule_norm = _normalize_category(category)
-            category_grades = [gr for gr in grades if _normalize_category(getattr(gr, "category", None)) == rule_norm]
+            rule_norm = normalize_category(category)
+            category_grades = [gr for gr in grades if normalize_category(getattr(gr, "category", None)) == rule_norm]
 
             if category_lower in self.exam_categories and category_grades:
                 category_grades = sorted(
@@ -864,7 +991,7 @@ class AnalyticsService:
 
             if include_daily:
                 for perf in (
-                    p for p in daily_performance if _normalize_category(getattr(p, "category", None)) == rule_norm
+                    p for p in daily_performance if normalize_category(getattr(p, "category", None)) == rule_norm
                 ):
                     if getattr(perf, "max_score", 0):
                         daily_pct = (perf.score / perf.max_score) * 100
@@ -13,9 +13,6 @@ from typing import Optional, Dict, Any, List, cast
 from enum import Enum
 import csv
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 from sqlalchemy.orm import Session
 
 try:
@@ -30,6 +27,7 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
 
 from backend.models import Student, Course, Grade, ExportJob
+from backend.xlsx_writer import StreamingXlsxWriter, solid_fill
 
 logger = logging.getLogger(__name__)
 
@@ -87,31 +85,29 @@ class AsyncExportService:
             students = query.order_by(Student.last_name, Student.first_name).limit(limit).all()
 
             # Generate workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Students"
+            writer = StreamingXlsxWriter()
+            ws = writer.add_sheet("Students", widths=18)
 
             # Headers
             headers = ["ID", "First Name", "Last Name", "Email", "Student ID", "Enrollment Date", "Status"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
+            ws.header(headers)
 
             # Data rows with progress tracking
             total_students = len(students)
-            for row, student in enumerate(students, 2):
-                ws.cell(row=row, column=1, value=student.id)
-                ws.cell(row=row, column=2, value=student.first_name)
-                ws.cell(row=row, column=3, value=student.last_name)
-                ws.cell(row=row, column=4, value=student.email)
-                ws.cell(row=row, column=5, value=student.student_id)
-                ws.cell(row=row, column=6, value=str(student.enrollment_date) if student.enrollment_date else "")
-                ws.cell(row=row, column=7, value="Active" if student.is_active else "Inactive")
+            for current_index, student in enumerate(students, 1):
+                ws.append(
+                    [
+                        student.id,
+                        student.first_name,
+                        student.last_name,
+                        student.email,
+                        student.student_id,
+                        str(student.enrollment_date) if student.enrollment_date else "",
+                        "Active" if student.is_active else "Inactive",
+                    ]
+                )
 
                 # Update progress every 10% or every 100 records (whichever is smaller)
-                current_index = row - 1  # row starts at 2, so index is row-1
                 update_interval = min(max(total_students // 10, 1), 100)
                 if current_index % update_interval == 0 or current_index == total_students:
                     progress = int((current_index / total_students) * 100)
@@ -120,13 +116,9 @@ class AsyncExportService:
                         self._set_job_fields(export_job, progress_percent=progress)
                         db.commit()
 
-            # Adjust column widths
-            for col in range(1, len(headers) + 1):
-                ws.column_dimensions[get_column_letter(col)].width = 18
-
             # Save file
             file_path = self.get_export_path(export_job_id, "excel")
-            wb.save(file_path)
+            writer.save(file_path)
 
             # Update export job
             export_job = db.query(ExportJob).filter(ExportJob.id == export_job_id).first()
@@ -172,27 +164,25 @@ class AsyncExportService:
             courses = query.order_by(Course.code).limit(limit).all()
 
             # Generate workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Courses"
+            writer = StreamingXlsxWriter()
+            ws = writer.add_sheet("Courses", widths=18)
 
             headers = ["Code", "Name", "Description", "Instructor", "Credits", "Status"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="059669", end_color="059669", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-
-            for row, course in enumerate(courses, 2):
-                ws.cell(row=row, column=1, value=course.code)
-                ws.cell(row=row, column=2, value=course.name)
-                ws.cell(row=row, column=3, value=course.description or "")
-                ws.cell(row=row, column=4, value=course.instructor or "")
-                ws.cell(row=row, column=5, value=course.credits or 0)
-                ws.cell(row=row, column=6, value="Active" if course.is_active else "Inactive")
+            ws.header(headers, fill=solid_fill("059669"))
+
+            for current_index, course in enumerate(courses, 1):
+                ws.append(
+                    [
+                        course.code,
+                        course.name,
+                        course.description or "",
+                        course.instructor or "",
+                        course.credits or 0,
+                        "Active" if course.is_active else "Inactive",
+                    ]
+                )
 
                 # Update progress every 10% or every 100 records
-                current_index = row - 1
                 total_courses = len(courses)
                 update_interval = min(max(total_courses // 10, 1), 100)
                 if current_index % update_interval == 0 or current_index == total_courses:
@@ -202,11 +192,8 @@ class AsyncExportService:
                         self._set_job_fields(export_job, progress_percent=progress)
                         db.commit()
 
-            for col in range(1, len(headers) + 1):
-                ws.column_dimensions[get_column_letter(col)].width = 18
-
             file_path = self.get_export_path(export_job_id, "excel")
-            wb.save(file_path)
+            writer.save(file_path)
 
             export_job = db.query(ExportJob).filter(ExportJob.id == export_job_id).first()
             if export_job:
@@ -251,26 +238,24 @@ class AsyncExportService:
 
             grades = query.order_by(Grade.created_at.desc()).limit(limit).all()
 
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Grades"
+            writer = StreamingXlsxWriter()
+            ws = writer.add_sheet("Grades", widths=18)
 
             headers = ["Student ID", "Course Code", "Grade", "Points", "Recorded Date"]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="7C3AED", end_color="7C3AED", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-
-            for row, grade in enumerate(grades, 2):
-                ws.cell(row=row, column=1, value=grade.student_id if grade.student else "")
-                ws.cell(row=row, column=2, value=grade.course.code if grade.course else "")
-                ws.cell(row=row, column=3, value=grade.grade)
-                ws.cell(row=row, column=4, value=grade.points)
-                ws.cell(row=row, column=5, value=str(grade.created_at) if grade.created_at else "")
+            ws.header(headers, fill=solid_fill("7C3AED"))
+
+            for current_index, grade in enumerate(grades, 1):
+                ws.append(
+                    [
+                        grade.student_id if grade.student else "",
+                        grade.course.code if grade.course else "",
+                        grade.grade,
+                        grade.points,
+                        str(grade.created_at) if grade.created_at else "",
+                    ]
+                )
 
                 # Update progress every 10% or every 100 records
-                current_index = row - 1
                 total_grades = len(grades)
                 update_interval = min(max(total_grades // 10, 1), 100)
                 if current_index % update_interval == 0 or current_index == total_grades:
@@ -280,11 +265,8 @@ class AsyncExportService:
                         self._set_job_fields(export_job, progress_percent=progress)
                         db.commit()
 
-            for col in range(1, len(headers) + 1):
-                ws.column_dimensions[get_column_letter(col)].width = 18
-
             file_path = self.get_export_path(export_job_id, "excel")
-            wb.save(file_path)
+            writer.save(file_path)
 
             export_job = db.query(ExportJob).filter(ExportJob.id == export_job_id).first()
             if export_job:
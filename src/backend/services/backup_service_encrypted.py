@@ -17,6 +17,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from cryptography.exceptions import InvalidTag
+
 from backend.security.path_validation import validate_path
 from backend.services.encryption_service import EncryptionService
 
@@ -365,7 +367,17 @@ class BackupServiceEncrypted:
             raise FileNotFoundError(f"Backup not found: {backup_path}")
 
         try:
-            # Try to read the encrypted file header and verify structure
+            if self.encryption_service.is_chunked_file(backup_path):
+                # Authenticate every chunk; streams the file in constant memory
+                self.encryption_service.verify_file(backup_path)
+                return {
+                    "backup_name": backup_name,
+                    "valid": True,
+                    "size_bytes": backup_path.stat().st_size,
+                    "message": "Backup integrity verified",
+                }
+
+            # Legacy single-message backups: check the header structure only
             # CodeQL: backup_path is safe (validated via _validate_backup_name and _resolve_backup_path)
             with open(str(backup_path), "rb") as f:
                 # Read encrypted package size
@@ -401,6 +413,13 @@ class BackupServiceEncrypted:
                 "message": "Backup integrity verified",
             }
 
+        except InvalidTag:
+            return {
+                "backup_name": backup_name,
+                "valid": False,
+                "error": "Authentication failed",
+                "message": "Backup integrity check failed: contents or metadata were modified or truncated",
+            }
         except (ValueError, json.JSONDecodeError, UnicodeDecodeError) as e:
             return {
                 "backup_name": backup_name,
@@ -46,14 +46,15 @@ class InMemoryCache:
         Returns:
             Cached value if found and not expired, None otherwise
         """
-        if key not in self.cache:
+        entry = self.cache.get(key)
+        if entry is None:
             return None
 
-        value, expiration = self.cache[key]
+        value, expiration = entry
         import time
 
         if time.time() > expiration:
-            del self.cache[key]
+            self.cache.pop(key, None)
             return None
 
         return value
@@ -77,8 +78,7 @@ class InMemoryCache:
         Args:
             key: Cache key to delete
         """
-        if key in self.cache:
-            del self.cache[key]
+        self.cache.pop(key, None)
 
     def clear(self) -> None:
         """Clear entire cache."""
@@ -92,9 +92,10 @@ class InMemoryCache:
         """
         import fnmatch
 
-        keys_to_delete = [k for k in self.cache.keys() if fnmatch.fnmatch(k, pattern)]
+        # Snapshot the keys first: background refreshers may insert concurrently
+        keys_to_delete = [k for k in list(self.cache) if fnmatch.fnmatch(k, pattern)]
         for key in keys_to_delete:
-            del self.cache[key]
+            self.cache.pop(key, None)
 
 
 # ==================== Redis Cache ====================
@@ -8,8 +8,14 @@ Ensures stored is_active values stay synchronized with current date for reportin
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
-from typing import Optional, Any, cast, TYPE_CHECKING
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Optional, Any, Dict, List, Tuple, cast, TYPE_CHECKING
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
 
 if TYPE_CHECKING:
     from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore[import-not-found]
@@ -89,90 +95,154 @@ class CourseActivationScheduler:
     @staticmethod
     def _run_bulk_update() -> None:
         """Background task to bulk-update course activation status."""
-        db = SessionLocal()
-        try:
-            # Import here to avoid circular imports
-            from backend.routers.routers_courses import (
-                _semester_date_range,
-            )
-
-            # Get all non-deleted courses with semester strings
-            deleted_at = cast(Any, Course.deleted_at)
-            courses = db.query(Course).filter(deleted_at.is_(None), Course.semester.isnot(None)).all()
-
-            updated_count = 0
-            activated_count = 0
-            deactivated_count = 0
-            enrollment_updated = 0
-            inactive_course_ids: list[int] = []
-
-            for course in courses:
-                semester = str(course.semester or "")
-                if not semester:
-                    continue
-
-                # Compute auto-activation status
-                today = datetime.now(timezone.utc).date()
-                date_range = _semester_date_range(semester, today)
-                if not date_range:
-                    continue
-
-                start_date, end_date = date_range
-
-                should_be_active = start_date <= today <= end_date
-                current_is_active = bool(course.is_active) if course.is_active is not None else True
-
-                # Only update if status changed
-                if should_be_active != current_is_active:
-                    old_status = current_is_active
-                    course.is_active = should_be_active  # type: ignore[assignment]
-                    updated_count += 1
-
-                    if should_be_active:
-                        activated_count += 1
-                    else:
-                        deactivated_count += 1
-
-                    logger.info(
-                        f"Course {course.id} ({course.course_code}): "
-                        f"auto-updated is_active from {old_status} to {should_be_active} "
-                        f"(semester: {semester})"
-                    )
-
-                if not should_be_active:
-                    inactive_course_ids.append(int(course.id))
-
-            if inactive_course_ids:
-                deleted_at_enrollment = cast(Any, CourseEnrollment.deleted_at)
-                enrollment_updated = (
-                    db.query(CourseEnrollment)
-                    .filter(
-                        CourseEnrollment.course_id.in_(inactive_course_ids),
-                        deleted_at_enrollment.is_(None),
-                        CourseEnrollment.status == "active",
-                    )
-                    .update({"status": "completed"}, synchronize_session=False)
-                )
-
-            if updated_count > 0 or enrollment_updated > 0:
-                db.commit()
-                logger.info(
-                    f"Bulk course activation update complete: "
-                    f"{updated_count} courses updated "
-                    f"({activated_count} activated, {deactivated_count} deactivated)"
-                )
-                if enrollment_updated > 0:
-                    logger.info(
-                        f"Enrollment status cleanup complete: {enrollment_updated} enrollments set to completed"
-                    )
+        run_course_activation_sweep()
+
+
+@dataclass
+class ActivationSweepReport:
+    """Outcome of one activation sweep; with ``dry_run`` the counts are what would change."""
+
+    today: date
+    dry_run: bool
+    semesters: int = 0
+    unrecognized_semesters: List[str] = field(default_factory=list)
+    active_semesters: List[str] = field(default_factory=list)
+    inactive_semesters: List[str] = field(default_factory=list)
+    courses_activated: int = 0
+    courses_deactivated: int = 0
+    enrollments_completed: int = 0
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def courses_updated(self) -> int:
+        return self.courses_activated + self.courses_deactivated
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["today"] = self.today.isoformat()
+        data["courses_updated"] = self.courses_updated
+        return data
+
+
+@lru_cache(maxsize=1024)
+def _semester_range(semester: str, today: date) -> Optional[Tuple[date, date]]:
+    # Import here to avoid circular imports
+    from backend.routers.routers_courses import _semester_date_range
+
+    # Keyed by day too: semesters without a year fall back to today's year
+    return _semester_date_range(semester, today)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def run_course_activation_sweep(
+    db: Optional[Session] = None, *, dry_run: bool = False, today: Optional[date] = None
+) -> ActivationSweepReport:
+    """
+    Synchronize ``Course.is_active`` with semester dates and complete enrollments of inactive courses.
+
+    Only the distinct semester strings are loaded; each maps to a date range
+    once, and the changes are applied as set-based UPDATEs in one transaction.
+
+    Args:
+        db: Session to use; a new one is opened (and closed) when omitted
+        dry_run: Count the rows that would change without writing anything
+        today: Reference date (defaults to the current UTC date)
+    """
+    owns_session = db is None
+    session = db if db is not None else SessionLocal()
+    report = ActivationSweepReport(today=today or datetime.now(timezone.utc).date(), dry_run=dry_run)
+    started = time.perf_counter()
+    try:
+        deleted_at = cast(Any, Course.deleted_at)
+        step = time.perf_counter()
+        semesters = (
+            session.execute(select(Course.semester).where(deleted_at.is_(None), Course.semester.isnot(None)).distinct())
+            .scalars()
+            .all()
+        )
+        for semester in sorted(str(s) for s in semesters if s):
+            date_range = _semester_range(semester, report.today)
+            if not date_range:
+                report.unrecognized_semesters.append(semester)
+                continue
+            start_date, end_date = date_range
+            if start_date <= report.today <= end_date:
+                report.active_semesters.append(semester)
             else:
-                logger.info("Bulk course activation update: No courses needed updates")
-
-        except Exception as e:
-            logger.error(f"Failed to run bulk course activation update: {e}", exc_info=True)
-            db.rollback()
-        finally:
-            db.close()
+                report.inactive_semesters.append(semester)
+        report.semesters = len(semesters)
+        report.timings_ms["semesters"] = _elapsed_ms(step)
+
+        is_active = cast(Any, Course.is_active)
+        # A NULL is_active counts as active, so it is only rewritten when the course should be inactive
+        activate_where = (deleted_at.is_(None), Course.semester.in_(report.active_semesters), is_active.is_(False))
+        deactivate_where = (
+            deleted_at.is_(None),
+            Course.semester.in_(report.inactive_semesters),
+            or_(is_active.is_(None), is_active.is_(True)),
+        )
+        step = time.perf_counter()
+        if report.active_semesters:
+            report.courses_activated = _apply(session, Course, activate_where, {"is_active": True}, dry_run)
+        if report.inactive_semesters:
+            report.courses_deactivated = _apply(session, Course, deactivate_where, {"is_active": False}, dry_run)
+        report.timings_ms["courses"] = _elapsed_ms(step)
+
+        step = time.perf_counter()
+        if report.inactive_semesters:
+            inactive_courses = select(Course.id).where(
+                deleted_at.is_(None), Course.semester.in_(report.inactive_semesters)
+            )
+            enrollment_where = (
+                CourseEnrollment.course_id.in_(inactive_courses),
+                cast(Any, CourseEnrollment.deleted_at).is_(None),
+                CourseEnrollment.status == "active",
+            )
+            report.enrollments_completed = _apply(
+                session, CourseEnrollment, enrollment_where, {"status": "completed"}, dry_run
+            )
+        report.timings_ms["enrollments"] = _elapsed_ms(step)
+
+        if not dry_run and (report.courses_updated or report.enrollments_completed):
+            step = time.perf_counter()
+            session.commit()
+            report.timings_ms["commit"] = _elapsed_ms(step)
+        report.timings_ms["total"] = _elapsed_ms(started)
+
+        if report.courses_updated or report.enrollments_completed:
+            logger.info(
+                "%s course activation update: %s courses (%s activated, %s deactivated), "
+                "%s enrollments set to completed in %.1f ms",
+                "Dry-run" if dry_run else "Bulk",
+                report.courses_updated,
+                report.courses_activated,
+                report.courses_deactivated,
+                report.enrollments_completed,
+                report.timings_ms["total"],
+            )
+        else:
+            logger.info("Bulk course activation update: No courses needed updates")
+        return report
+    except Exception as e:
+        logger.error(f"Failed to run bulk course activation update: {e}", exc_info=True)
+        session.rollback()
+        if not owns_session:
+            raise
+        return report
+    finally:
+        if owns_session:
+            session.close()
+
+
+def _apply(session: Session, model: Any, where: Tuple[Any, ...], values: Dict[str, Any], dry_run: bool) -> int:
+    """Run one set-based UPDATE (or COUNT for a dry run) and return the affected row count."""
+    if dry_run:
+        return int(session.execute(select(func.count()).select_from(model).where(*where)).scalar() or 0)
+    # Query.update (not session.execute(update(...))) so the after_bulk_update cache hooks fire
+    return int(session.query(model).filter(*where).update(values, synchronize_session=False) or 0)
 
 
 # Global singleton instance
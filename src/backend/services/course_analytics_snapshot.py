@@ -0,0 +1,283 @@
+"""
+Per-course analytics snapshots.
+
+``get_grade_distribution`` and ``get_students_comparison`` used to rebuild
+every student's average from raw grade rows, one query per student, each time
+a course page opened. Both now read a single snapshot per course (histogram,
+percentiles, per-student averages and ranks, attendance rates) built from one
+pass over the course's grades and one grouped attendance query.
+
+Snapshots live in the shared cache layer under ``analytics:course:{id}:``, the
+per-course tag that ``CacheManager.invalidate_course_cache`` already clears.
+Each snapshot is stored with the data version of its own course (bumped by
+every committed grade, attendance, enrollment or course write for that course),
+of ``course:*`` (bulk and raw writes that cannot be attributed to a course) and
+of ``students`` (names), and is only served while those are current. Writes
+committed by any worker (whose hooks only clear their own in-process cache) are
+therefore picked up everywhere, while grade entry in one course leaves every
+other course's snapshot valid. Within
+the committing process, session hooks also drop the snapshot of every course
+touched by a grade, attendance or enrollment write and hand the course to a
+background refresher, which rebuilds it after a short debounce so a burst of
+grade entry costs one rebuild and readers rarely wait for one.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from backend.db.data_version import ALL_COURSES_VERSION, course_version_name, get_data_version
+from backend.middleware.prometheus_metrics import track_cache_hit, track_cache_miss
+from backend.models import Attendance, Course, CourseEnrollment, Grade, Student
+from backend.services.cache_service import get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Writes that bypass the ORM (raw SQL, restores) are bounded by this TTL
+SNAPSHOT_TTL_SECONDS = 900
+
+# Delay between a committed write and the rebuild it triggers
+REFRESH_DEBOUNCE_SECONDS = 1.0
+
+COURSE_SCOPED_MODELS = (Grade, Attendance, CourseEnrollment)
+
+_PENDING_KEY = "course_snapshot_courses"
+_ALL_COURSES = -1
+
+_lock = threading.Lock()
+_generations: Dict[int, int] = {}
+_global_generation = 0
+
+
+def snapshot_key(course_id: int) -> str:
+    return f"analytics:course:{course_id}:snapshot"
+
+
+def snapshot_version(db: Session, course_id: int) -> str:
+    """Data version a snapshot of ``course_id`` is valid for."""
+    return get_data_version(db, ("students", course_version_name(course_id), ALL_COURSES_VERSION))
+
+
+def _generation(course_id: int) -> tuple[int, int]:
+    with _lock:
+        return _global_generation, _generations.get(course_id, 0)
+
+
+def _store(course_id: int, generation: tuple[int, int], version: str, snapshot: Dict[str, Any]) -> None:
+    # Skip storing if a write committed while the snapshot was being built
+    with _lock:
+        current = (_global_generation, _generations.get(course_id, 0))
+    if current == generation:
+        get_cache_manager().set(
+            snapshot_key(course_id), {"version": version, "snapshot": snapshot}, ttl=SNAPSHOT_TTL_SECONDS
+        )
+
+
+def get_course_snapshot(
+    db: Session, course_id: int, build: Callable[[int], Dict[str, Any]], *, store: bool = True
+) -> Dict[str, Any]:
+    """Return the cached snapshot for ``course_id``, building it with ``build`` on a miss.
+
+    ``store=False`` serves a miss without caching it (e.g. when built from a lagging read replica).
+    """
+    version = snapshot_version(db, course_id)
+    entry = get_cache_manager().get(snapshot_key(course_id))
+    if entry is not None and entry.get("version") == version:
+        track_cache_hit("course_analytics")
+        return entry["snapshot"]
+
+    track_cache_miss("course_analytics")
+    generation = _generation(course_id)
+    snapshot = build(course_id)
+    if store:
+        _store(course_id, generation, version, snapshot)
+    return snapshot
+
+
+def invalidate_course_snapshots(course_ids: Optional[Iterable[int]] = None) -> None:
+    """Drop snapshots for ``course_ids`` (every course when ``None``)."""
+    global _global_generation
+    cache = get_cache_manager()
+    if course_ids is None:
+        with _lock:
+            _global_generation += 1
+        cache.delete_pattern(snapshot_key("*"))
+        return
+    for course_id in set(course_ids):
+        with _lock:
+            _generations[course_id] = _generations.get(course_id, 0) + 1
+        cache.delete(snapshot_key(course_id))
+
+
+def refresh_course_snapshot(db: Session, course_id: int) -> None:
+    """Rebuild and store the snapshot for ``course_id`` using ``db``."""
+    from backend.services.analytics_service import AnalyticsService
+
+    generation = _generation(course_id)
+    version = snapshot_version(db, course_id)
+    if db.query(Course.id).filter(Course.id == course_id).first() is None:
+        return
+    _store(course_id, generation, version, AnalyticsService(db).build_course_snapshot(course_id))
+
+
+class CourseSnapshotRefresher:
+    """Rebuilds invalidated course snapshots on a background thread."""
+
+    def __init__(
+        self, session_factory: Callable[[], Session], debounce_seconds: float = REFRESH_DEBOUNCE_SECONDS
+    ) -> None:
+        self.session_factory = session_factory
+        self.debounce_seconds = debounce_seconds
+        self._due: Dict[int, float] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def schedule(self, course_ids: Iterable[int]) -> None:
+        due = time.monotonic() + self.debounce_seconds
+        with self._condition:
+            for course_id in course_ids:
+                # Later writes push the rebuild back so a burst is rebuilt once
+                self._due[course_id] = due
+            self._condition.notify()
+
+    def refresh_pending(self, now: Optional[float] = None) -> int:
+        """Rebuild every course whose debounce has elapsed; returns the count."""
+        now = time.monotonic() if now is None else now
+        with self._condition:
+            ready = [course_id for course_id, due in self._due.items() if due <= now]
+            for course_id in ready:
+                del self._due[course_id]
+        for course_id in ready:
+            db = self.session_factory()
+            try:
+                refresh_course_snapshot(db, course_id)
+            except Exception as exc:
+                logger.warning(f"Course analytics snapshot refresh failed for course {course_id}: {exc}")
+            finally:
+                db.close()
+        return len(ready)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    if self._due:
+                        wait = min(self._due.values()) - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+                if self._stopping:
+                    return
+            self.refresh_pending()
+
+    def start(self) -> None:
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="course-snapshot-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+
+_refresher: Optional[CourseSnapshotRefresher] = None
+
+
+def start_course_snapshot_refresher(session_factory: Callable[[], Session]) -> CourseSnapshotRefresher:
+    global _refresher
+    if _refresher is None:
+        _refresher = CourseSnapshotRefresher(session_factory)
+        _refresher.start()
+    return _refresher
+
+
+def stop_course_snapshot_refresher() -> None:
+    global _refresher
+    refresher, _refresher = _refresher, None
+    if refresher is not None:
+        refresher.stop()
+
+
+# ============================================================================
+# CACHE INVALIDATION
+# ============================================================================
+
+
+def _touched_courses(obj: Any) -> Set[int]:
+    if isinstance(obj, Course):
+        return {obj.id} if obj.id is not None else set()
+    if isinstance(obj, Student):
+        # Names appear in every snapshot the student is ranked in
+        return {_ALL_COURSES}
+    courses = {obj.course_id} if obj.course_id is not None else set()
+    # A row moved to another course changes the old course too
+    courses.update(cid for cid in sa_inspect(obj).attrs.course_id.history.deleted if cid is not None)
+    return courses
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    touched: Set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, COURSE_SCOPED_MODELS):
+            touched |= _touched_courses(obj)
+        elif isinstance(obj, (Course, Student)) and obj not in session.new:
+            touched |= _touched_courses(obj)
+    if touched:
+        session.info.setdefault(_PENDING_KEY, set()).update(touched)
+
+
+def _after_bulk_write(context: Any) -> None:
+    entity = getattr(getattr(context, "mapper", None), "class_", None)
+    if entity in (*COURSE_SCOPED_MODELS, Course, Student):
+        context.session.info.setdefault(_PENDING_KEY, set()).add(_ALL_COURSES)
+
+
+def _after_commit(session: Session) -> None:
+    touched = session.info.pop(_PENDING_KEY, None)
+    if not touched:
+        return
+    if _ALL_COURSES in touched:
+        invalidate_course_snapshots()
+        return
+    invalidate_course_snapshots(touched)
+    if _refresher is not None:
+        _refresher.schedule(touched)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+event.listen(Session, "after_flush", _after_flush)
+event.listen(Session, "after_bulk_update", _after_bulk_write)
+event.listen(Session, "after_bulk_delete", _after_bulk_write)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
+
+
+__all__ = [
+    "CourseSnapshotRefresher",
+    "get_course_snapshot",
+    "invalidate_course_snapshots",
+    "refresh_course_snapshot",
+    "snapshot_key",
+    "snapshot_version",
+    "start_course_snapshot_refresher",
+    "stop_course_snapshot_refresher",
+]
@@ -0,0 +1,257 @@
+"""
+Incremental import of course templates from a directory of JSON files.
+
+Each run stats the template files and compares them with a manifest of
+(mtime, size, SHA-256, course codes) written after the last successful import.
+Manifests are kept in the data directory, one per template directory, so the
+(usually version-controlled) template directory is never written to.
+Files that are unchanged, and whose courses still exist, are skipped without
+being parsed. Changed files are read and parsed in a thread pool, and all of
+their courses are upserted together through ``ImportService.upsert_courses``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.config import DATA_DIR
+from backend.import_resolver import import_names
+from backend.services.import_service import ImportService
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR = DATA_DIR
+MANIFEST_FILENAME = ".course_import_manifest"
+MANIFEST_VERSION = 1
+DEFAULT_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Parses the raw bytes of one template file into normalized course dicts and error messages
+ParseFn = Callable[[str, bytes], Tuple[List[dict], List[str]]]
+
+# Fallback for manifests that cannot be written (e.g. a read-only data directory)
+_memory_manifests: Dict[str, Dict[str, Any]] = {}
+_memory_lock = threading.Lock()
+
+
+def default_manifest_path(directory: str) -> str:
+    """Manifest location for a template directory: ``MANIFEST_DIR/.course_import_manifest.<hash>``."""
+    digest = hashlib.sha256(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(MANIFEST_DIR, f"{MANIFEST_FILENAME}.{digest}")
+
+
+@dataclass
+class _TemplateFile:
+    name: str
+    path: str
+    mtime_ns: int
+    size: int
+    data: Optional[bytes] = None
+    sha256: Optional[str] = None
+
+    def read(self) -> None:
+        with open(self.path, "rb") as f:
+            self.data = f.read()
+        self.sha256 = hashlib.sha256(self.data).hexdigest()
+
+
+@dataclass
+class CourseTemplateImportResult:
+    created: int = 0
+    updated: int = 0
+    unchanged_files: int = 0
+    parsed_files: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class CourseTemplateImporter:
+    """Import course templates from ``directory``, skipping files unchanged since the last import."""
+
+    def __init__(
+        self,
+        directory: str,
+        parse_file: ParseFn,
+        *,
+        manifest_path: Optional[str] = None,
+        workers: int = DEFAULT_PARSE_WORKERS,
+    ):
+        self.directory = os.path.abspath(directory)
+        self.parse_file = parse_file
+        self.manifest_path = manifest_path or default_manifest_path(self.directory)
+        self.workers = max(1, workers)
+        self._pending_manifest: Optional[Dict[str, Any]] = None
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+    def load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        with _memory_lock:
+            manifest = _memory_manifests.get(self.manifest_path)
+        if manifest is None:
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                return {}
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("directory") != self.directory:
+            return {}
+        files = manifest.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def save_manifest(self) -> None:
+        """Persist the manifest of the last :meth:`run`; call only after its transaction commits."""
+        manifest = self._pending_manifest
+        if manifest is None:
+            return
+        self._pending_manifest = None
+        tmp_path = f"{self.manifest_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as exc:
+            logger.debug("Course import manifest kept in memory: %s", exc)
+            with _memory_lock:
+                _memory_manifests[self.manifest_path] = manifest
+            return
+        with _memory_lock:
+            _memory_manifests.pop(self.manifest_path, None)
+
+    def clear_manifest(self) -> None:
+        with _memory_lock:
+            _memory_manifests.pop(self.manifest_path, None)
+        try:
+            os.remove(self.manifest_path)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+    def _scan(self) -> List[_TemplateFile]:
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".json") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files.append(_TemplateFile(entry.name, entry.path, stat.st_mtime_ns, stat.st_size))
+        return sorted(files, key=lambda f: f.name)
+
+    @staticmethod
+    def _existing_codes(db: Session, codes: List[str]) -> set[str]:
+        (Course,) = import_names("models", "Course")
+        found: set[str] = set()
+        chunk = ImportService.UPSERT_LOOKUP_CHUNK
+        for start in range(0, len(codes), chunk):
+            stmt = select(Course.course_code).where(
+                Course.course_code.in_(codes[start : start + chunk]), Course.deleted_at.is_(None)
+            )
+            found.update(db.execute(stmt).scalars())
+        return found
+
+    def _parse(self, template: _TemplateFile) -> Tuple[List[dict], List[str]]:
+        try:
+            if template.data is None:
+                template.read()
+            return self.parse_file(template.name, template.data or b"")
+        except Exception as exc:
+            logger.error("Failed to import course", extra={"name": template.name, "error_type": type(exc).__name__})
+            return [], [f"{template.name}: {exc}"]
+
+    def run(self, db: Session, *, force: bool = False) -> CourseTemplateImportResult:
+        """Parse changed template files and upsert their courses into ``db`` (without committing)."""
+        result = CourseTemplateImportResult()
+        previous = {} if force else self.load_manifest()
+        templates = self._scan()
+
+        # Files whose stat matches the manifest are candidates for skipping
+        unchanged: Dict[str, _TemplateFile] = {}
+        for template in templates:
+            entry = previous.get(template.name)
+            if entry and entry.get("mtime_ns") == template.mtime_ns and entry.get("size") == template.size:
+                unchanged[template.name] = template
+        changed = [t for t in templates if t.name not in unchanged]
+
+        # A touched file with identical content is still unchanged
+        for template in changed:
+            entry = previous.get(template.name)
+            if entry and entry.get("size") == template.size:
+                try:
+                    template.read()
+                except OSError:
+                    continue
+                if template.sha256 == entry.get("sha256"):
+                    unchanged[template.name] = template
+
+        # Skipped files must still have all their courses in the database
+        expected = sorted({code for name in unchanged for code in previous[name].get("course_codes", [])})
+        present = self._existing_codes(db, expected) if expected else set()
+        for name in list(unchanged):
+            if not set(previous[name].get("course_codes", [])) <= present:
+                del unchanged[name]
+        changed = [t for t in templates if t.name not in unchanged]
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(changed)))) as executor:
+            parsed = list(executor.map(self._parse, changed))
+
+        items: List[dict] = []
+        owners: List[str] = []
+        file_errors: Dict[str, bool] = {}
+        for template, (file_items, errors) in zip(changed, parsed):
+            result.errors.extend(errors)
+            file_errors[template.name] = bool(errors)
+            items.extend(file_items)
+            owners.extend(template.name for _ in file_items)
+
+        for owner, (was_created, err) in zip(owners, ImportService.upsert_courses(db, items)):
+            if err:
+                result.errors.append(f"{owner}: {err}")
+                file_errors[owner] = True
+            elif was_created:
+                result.created += 1
+            else:
+                result.updated += 1
+
+        codes_by_file: Dict[str, set[str]] = {}
+        for item, owner in zip(items, owners):
+            if item.get("course_code"):
+                codes_by_file.setdefault(owner, set()).add(str(item["course_code"]))
+
+        files: Dict[str, Dict[str, Any]] = {}
+        for template in templates:
+            if template.name in unchanged:
+                entry = dict(previous[template.name])
+                entry["mtime_ns"] = template.mtime_ns
+                files[template.name] = entry
+            elif not file_errors.get(template.name) and template.sha256:
+                # Files with errors are parsed again next time so their errors keep being reported
+                files[template.name] = {
+                    "mtime_ns": template.mtime_ns,
+                    "size": template.size,
+                    "sha256": template.sha256,
+                    "course_codes": sorted(codes_by_file.get(template.name, ())),
+                }
+        self._pending_manifest = {"version": MANIFEST_VERSION, "directory": self.directory, "files": files}
+        result.unchanged_files = len(unchanged)
+        result.parsed_files = len(changed)
+        return result
+
+
+__all__ = [
+    "CourseTemplateImportResult",
+    "CourseTemplateImporter",
+    "MANIFEST_DIR",
+    "MANIFEST_FILENAME",
+    "default_manifest_path",
+]
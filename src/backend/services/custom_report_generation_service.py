@@ -8,40 +8,108 @@ Uses a background-task-friendly entrypoint that opens its own DB session.
 from __future__ import annotations
 
 import csv
+import hashlib
+import json
 import logging
 import os
 import re
 import time
+from dataclasses import dataclass, field as dataclass_field
 from datetime import date, datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
-
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill
-from openpyxl.utils import get_column_letter
-from sqlalchemy.orm import Session, joinedload
-from xml.sax.saxutils import escape
-
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_CENTER
-    from reportlab.lib.pagesizes import landscape, letter
-    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-    from reportlab.lib.units import inch
-    from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
-
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    Flowable = Any  # type: ignore
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl.styles import Font
+from sqlalchemy import Float, Numeric, String, and_, case, cast, false, func, inspect as sa_inspect, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from backend.config import settings
-from backend.models import Attendance, Course, DailyPerformance, GeneratedReport, Grade, Report, Student, User
+from backend.db.data_version import get_data_version
+from backend.models import (
+    Attendance,
+    Course,
+    CourseEnrollment,
+    DailyPerformance,
+    GeneratedReport,
+    Grade,
+    Report,
+    Student,
+    User,
+)
 from backend.services.email_notification_service import EmailNotificationService
-from backend.services.report_exporters import register_report_fonts
+from backend.middleware.prometheus_metrics import track_cache_hit, track_cache_miss
+from backend.pdf_rendering import REPORTLAB_AVAILABLE, CUSTOM_REPORT_LAYOUT, PdfTableDocument, get_pdf_renderer
+from backend.xlsx_writer import StreamingXlsxWriter, solid_fill
 
 logger = logging.getLogger(__name__)
 
 
+# Rows fetched per round trip when streaming compiled report queries
+REPORT_FETCH_BATCH_SIZE = 1000
+
+# Filter operators that match text; numeric fields are cast to strings for them
+TEXT_FILTER_OPERATORS = frozenset({"contains", "not_contains", "starts_with", "ends_with"})
+
+# Bump when report rendering changes so cached artifacts are not reused.
+REPORT_CACHE_FORMAT_VERSION = 1
+
+# Source tables each report type reads; their data versions key the result cache.
+REPORT_SOURCE_TABLES: Dict[str, Tuple[str, ...]] = {
+    "student": ("students", "attendances", "grades"),
+    "course": ("courses", "course_enrollments"),
+    "grade": ("grades", "students", "courses"),
+    "attendance": ("attendances", "students", "courses"),
+    "daily_performance": ("daily_performances", "students", "courses"),
+}
+
+
+@dataclass(frozen=True)
+class _FieldPlan:
+    """How one report field is selected, rendered, filtered and sorted in SQL.
+
+    ``expressions`` are selected and passed to ``render`` to produce the cell
+    value exactly as ``_resolve_field`` would. ``sql`` is the expression used
+    for WHERE/ORDER BY; ``numeric`` marks computed values whose filter values
+    are coerced to numbers. A plan without ``sql`` is a constant empty cell.
+    """
+
+    expressions: Tuple[Any, ...] = ()
+    render: Callable[..., Any] = lambda *values: ""
+    sql: Any = None
+    numeric: bool = False
+
+
+_EMPTY_PLAN = _FieldPlan()
+
+
+@dataclass
+class _CompileContext:
+    report_type: str
+    model: Any
+    relational: bool
+    joins: Dict[str, Any] = dataclass_field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CompiledReportQuery:
+    """A report definition compiled into one SELECT plus per-column renderers."""
+
+    statement: Any
+    columns: Tuple[Tuple[int, int, Callable[..., Any]], ...]
+
+
+class _CountedRows:
+    """Single-pass row iterator that counts the rows it yields."""
+
+    def __init__(self, rows: Iterable[Sequence[Any]]) -> None:
+        self._rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Sequence[Any]]:
+        for row in self._rows:
+            self.count += 1
+            yield row
+
+
 class CustomReportGenerationService:
     """Generate report files for custom report definitions."""
 
@@ -179,8 +247,10 @@ class CustomReportGenerationService:
         "workshop": {"en": "Workshop", "el": "Εργαστήριο"},
     }
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, read_db: Optional[Session] = None):
         self.db = db
+        # Report data (and the data version its cache key is built from) may come from a read replica
+        self.read_db = read_db if read_db is not None else db
         self.reports_dir = os.path.join(os.path.dirname(__file__), "..", "reports")
         os.makedirs(self.reports_dir, exist_ok=True)
         self._allow_sensitive_fields = False
@@ -345,21 +415,22 @@ class CustomReportGenerationService:
         language: Optional[str] = None,
     ) -> None:
         """Background task entrypoint with isolated DB session."""
-        from backend.db import SessionLocal
+        from backend.db import SessionLocal, read_session_scope
 
         db = SessionLocal()
         try:
-            service = CustomReportGenerationService(db)
-            service.generate_report(
-                report_id,
-                generated_report_id,
-                user_id,
-                export_format,
-                include_charts,
-                email_recipients=email_recipients,
-                email_enabled=email_enabled,
-                language=language,
-            )
+            with read_session_scope() as read_db:
+                service = CustomReportGenerationService(db, read_db=read_db)
+                service.generate_report(
+                    report_id,
+                    generated_report_id,
+                    user_id,
+                    export_format,
+                    include_charts,
+                    email_recipients=email_recipients,
+                    email_enabled=email_enabled,
+                    language=language,
+                )
         finally:
             db.close()
 
@@ -392,7 +463,34 @@ class CustomReportGenerationService:
         self._update_status(generated, "generating")
 
         try:
+            # The data version is read before the rows, so a concurrent write
+            # can only cause a later cache miss, never a stale hit.
+            cache_key = self._report_cache_key(report, export_format, include_charts)
+            cached = self._find_cached_artifact(cache_key)
+            if cached is not None:
+                track_cache_hit("custom_report")
+                logger.info("Reusing cached report artifact %s for report %s", cached.id, report_id)
+                self._complete_generated_report(
+                    report,
+                    generated,
+                    user_id=user_id,
+                    file_path=str(cached.file_path),
+                    record_count=cached.record_count,  # type: ignore[arg-type]
+                    cache_key=cache_key,
+                    duration=time.perf_counter() - start_time,
+                )
+                self._send_report_email(
+                    report=report,
+                    generated=generated,
+                    export_format=export_format,
+                    email_recipients=email_recipients,
+                    email_enabled=email_enabled,
+                )
+                return
+            track_cache_miss("custom_report")
+
             rows, headers = self._build_report_rows(report)
+            counted_rows = _CountedRows(rows)
 
             # Extract group_by from report fields
             group_by_field = None
@@ -412,25 +510,22 @@ class CustomReportGenerationService:
                         break
 
             file_path = self._export_report(
-                rows,
+                counted_rows,
                 headers,
                 export_format,
                 str(generated.file_name),
                 title=str(report.name) if report.name else None,
                 group_by_col_index=group_by_col_index,
             )  # type: ignore[arg-type]
-            duration = time.perf_counter() - start_time
-
-            generated.file_path = file_path  # type: ignore[assignment]
-            generated.file_size_bytes = os.path.getsize(file_path) if file_path else None  # type: ignore[assignment]
-            generated.record_count = len(rows)  # type: ignore[assignment]
-            generated.generation_duration_seconds = round(float(duration), 3)  # type: ignore[arg-type,assignment]
-            generated.status = "completed"  # type: ignore[assignment]
-            generated.error_message = None  # type: ignore[assignment]
-
-            report.last_run_at = datetime.now(timezone.utc)  # type: ignore[assignment]
-            self._supersede_prior_generated_reports(report_id, user_id, generated_report_id)
-            self.db.commit()
+            self._complete_generated_report(
+                report,
+                generated,
+                user_id=user_id,
+                file_path=file_path,
+                record_count=counted_rows.count,
+                cache_key=cache_key,
+                duration=time.perf_counter() - start_time,
+            )
 
             self._send_report_email(
                 report=report,
@@ -443,6 +538,66 @@ class CustomReportGenerationService:
             logger.error("Report generation failed: %s", exc, exc_info=True)
             self._mark_failed(generated, str(exc))
 
+    def _complete_generated_report(
+        self,
+        report: Report,
+        generated: GeneratedReport,
+        *,
+        user_id: int,
+        file_path: str,
+        record_count: Optional[int],
+        cache_key: Optional[str],
+        duration: float,
+    ) -> None:
+        generated.file_path = file_path  # type: ignore[assignment]
+        generated.file_size_bytes = os.path.getsize(file_path) if file_path else None  # type: ignore[assignment]
+        generated.record_count = record_count  # type: ignore[assignment]
+        generated.generation_duration_seconds = round(float(duration), 3)  # type: ignore[arg-type,assignment]
+        generated.cache_key = cache_key  # type: ignore[assignment]
+        generated.status = "completed"  # type: ignore[assignment]
+        generated.error_message = None  # type: ignore[assignment]
+
+        report.last_run_at = datetime.now(timezone.utc)  # type: ignore[assignment]
+        self._supersede_prior_generated_reports(report.id, user_id, generated.id)  # type: ignore[arg-type]
+        self.db.commit()
+
+    def _report_cache_key(self, report: Report, export_format: str, include_charts: bool) -> str:
+        """Hash of everything that shapes the output file plus the source data version."""
+        report_type = str(report.report_type or "").lower()
+        definition = {
+            "format_version": REPORT_CACHE_FORMAT_VERSION,
+            "report_type": report_type,
+            "fields": report.fields,
+            "filters": report.filters,
+            "sort_by": report.sort_by,
+            "title": report.name,
+            "language": self._language,
+            "export_format": (export_format or "pdf").lower(),
+            "include_charts": bool(include_charts),
+            "sensitive_fields": self._allow_sensitive_fields,
+            "data_version": get_data_version(self.read_db, REPORT_SOURCE_TABLES.get(report_type, ())),
+        }
+        payload = json.dumps(definition, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _find_cached_artifact(self, cache_key: str) -> Optional[GeneratedReport]:
+        """Latest generated report with the same cache key whose file still exists."""
+        candidates = (
+            self.db.query(GeneratedReport)
+            .filter(
+                GeneratedReport.cache_key == cache_key,
+                GeneratedReport.status.in_(("completed", "superseded")),
+                GeneratedReport.file_path.isnot(None),
+            )
+            .order_by(GeneratedReport.id.desc())
+            .limit(5)
+            .all()
+        )
+        for candidate in candidates:
+            if os.path.exists(str(candidate.file_path)):
+                return candidate
+        return None
+
     def _send_report_email(
         self,
         report: Report,
@@ -551,7 +706,22 @@ class CustomReportGenerationService:
             previous_report.status = "superseded"  # type: ignore[assignment]
             previous_report.error_message = f"Superseded by generated report {generated_report_id} at {superseded_at}"  # type: ignore[assignment]
 
-    def _build_report_rows(self, report: Report) -> Tuple[List[List[Any]], List[str]]:
+    def _build_report_rows(self, report: Report) -> Tuple[Iterable[Sequence[Any]], List[str]]:
+        report_type = str(report.report_type or "").lower()
+        columns = self._normalize_columns(report_type, report.fields)
+        if not self._allow_sensitive_fields:
+            columns = [(key, label) for key, label in columns if not self._is_sensitive_field(key)]
+        headers = [label for _, label in columns]
+
+        compiled = self._compile_report_query(report, columns)
+        if compiled is not None:
+            return self._iter_compiled_rows(compiled), headers
+
+        # Definitions referencing non-column attributes keep the ORM path.
+        logger.info("Report %s uses fields that cannot be compiled to SQL; using ORM evaluation", report.id)
+        return self._build_report_rows_orm(report, columns), headers
+
+    def _build_report_rows_orm(self, report: Report, columns: List[Tuple[str, str]]) -> List[Sequence[Any]]:
         report_type = str(report.report_type or "").lower()
         model, query = self._build_query(report)
         # Handle filters as a list of filter objects or dict
@@ -561,32 +731,415 @@ class CustomReportGenerationService:
         query = self._apply_filters(query, model, filters_list, report_type)
         query = self._apply_sort(query, model, sort_list, report_type)
 
-        columns = self._normalize_columns(report_type, report.fields)
-        if not self._allow_sensitive_fields:
-            columns = [(key, label) for key, label in columns if not self._is_sensitive_field(key)]
-        headers = [label for _, label in columns]
-
         records = query.all()
         records = self._apply_post_filters(records, filters_list, report_type)
         records = self._apply_post_sort(records, sort_list, report_type)
 
-        rows: List[List[Any]] = []
-        for record in records:
-            row = [self._resolve_field(record, key) for key, _ in columns]
-            rows.append(row)
+        return [[self._resolve_field(record, key) for key, _ in columns] for record in records]
+
+    # ========================================================================
+    # SQL REPORT COMPILER
+    # ========================================================================
+
+    def _compile_report_query(
+        self, report: Report, columns: Sequence[Tuple[str, str]]
+    ) -> Optional[CompiledReportQuery]:
+        """Compile a report definition into a single SELECT.
+
+        Computed metrics become grouped joins, and filters and sorts are
+        applied in SQL. Returns None when a referenced field has no SQL
+        equivalent (e.g. relationship attributes), in which case the caller
+        falls back to ORM evaluation.
+        """
+        report_type = str(report.report_type or "").lower()
+        model = self._REPORT_MODELS.get(report_type)
+        if model is None:
+            raise ValueError(f"Unsupported report type: {report.report_type}")
+
+        ctx = _CompileContext(
+            report_type=report_type,
+            model=model,
+            relational=report_type in self.RELATIONAL_STUDENT_REPORT_TYPES,
+        )
+
+        selected: List[Any] = []
+        compiled_columns: List[Tuple[int, int, Callable[..., Any]]] = []
+        for key, _label in columns:
+            plan = self._plan_field(ctx, key)
+            if plan is None:
+                return None
+            compiled_columns.append((len(selected), len(selected) + len(plan.expressions), plan.render))
+            selected.extend(plan.expressions)
+
+        conditions: List[Any] = [model.deleted_at.is_(None)]
+        for field_name, operator, value in self._normalize_filter_specs(report.filters):
+            plan = self._plan_field(ctx, self._normalize_report_field_key(report_type, field_name))
+            if plan is None:
+                return None
+            if plan.sql is None:
+                if not self._compare_values("", operator, value):
+                    conditions.append(false())
+                continue
+            if not plan.numeric:
+                clause = self._filter_clause(plan.sql, operator, value)
+            elif str(operator or "").lower() in TEXT_FILTER_OPERATORS:
+                # ILIKE on a number fails on PostgreSQL; match its text form as the ORM path does
+                clause = self._filter_clause(cast(plan.sql, String), operator, value)
+            else:
+                clause = self._filter_clause(plan.sql, operator, self._coerce_sql_value(value))
+            if clause is not None:
+                conditions.append(clause)
+
+        order_by: List[Any] = []
+        for field_name, direction in self._normalize_sort_specs(report.sort_by):
+            plan = self._plan_field(ctx, self._normalize_report_field_key(report_type, field_name))
+            if plan is None:
+                return None
+            if plan.sql is not None:
+                order_by.append(plan.sql.desc() if direction == "desc" else plan.sql.asc())
+        order_by.append(model.id.asc())
+
+        # SELECT needs at least one column even if every cell is constant.
+        statement = select(*(selected or [model.id])).select_from(model)
+        if ctx.relational:
+            statement = statement.outerjoin(Student, model.student_id == Student.id).outerjoin(
+                Course, model.course_id == Course.id
+            )
+        for subquery, onclause in ctx.joins.values():
+            statement = statement.outerjoin(subquery, onclause)
+        statement = statement.where(*conditions).order_by(*order_by)
+
+        return CompiledReportQuery(statement=statement, columns=tuple(compiled_columns))
+
+    def _iter_compiled_rows(self, compiled: CompiledReportQuery) -> Iterator[Tuple[Any, ...]]:
+        """Stream rendered report rows as tuples."""
+        result = self.read_db.execute(compiled.statement, execution_options={"yield_per": REPORT_FETCH_BATCH_SIZE})
+        for raw in result:
+            yield tuple(render(*raw[start:end]) for start, end, render in compiled.columns)
+
+    _REPORT_MODELS: Dict[str, Any] = {
+        "student": Student,
+        "course": Course,
+        "grade": Grade,
+        "attendance": Attendance,
+        "daily_performance": DailyPerformance,
+    }
+
+    def _plan_field(self, ctx: _CompileContext, field: str) -> Optional[_FieldPlan]:
+        """SQL counterpart of ``_resolve_field`` for one report field."""
+        canonical = self._canonical_field_key(field)
+        model = ctx.model
+
+        if not self._allow_sensitive_fields and self._is_sensitive_field(field):
+            return _EMPTY_PLAN
+
+        if canonical == "percentage":
+            if model is DailyPerformance:
+                return self._percentage_plan(DailyPerformance.score, DailyPerformance.max_score)
+            if model is Grade:
+                return self._percentage_plan(Grade.grade, Grade.max_grade)
+            return _EMPTY_PLAN
+
+        if canonical == "student_name":
+            if ctx.relational:
+                return _FieldPlan(
+                    expressions=(Student.id, Student.first_name, Student.last_name),
+                    render=lambda sid, first, last: f"{first} {last}".strip() if sid is not None else "",
+                    sql=Student.first_name + " " + Student.last_name,
+                )
+            if model is Student:
+                return _FieldPlan(
+                    expressions=(Student.first_name, Student.last_name),
+                    render=lambda first, last: f"{first} {last}".strip(),
+                    sql=Student.first_name + " " + Student.last_name,
+                )
+            return _EMPTY_PLAN
+
+        if canonical == "student_id":
+            if ctx.relational:
+                return _FieldPlan(
+                    expressions=(Student.student_id, model.student_id),
+                    render=lambda external, internal: external if external is not None else (internal or ""),
+                    sql=func.coalesce(Student.student_id, cast(model.student_id, String)),
+                )
+            if model is Student:
+                return _FieldPlan(
+                    expressions=(Student.student_id,),
+                    render=lambda value: value or "",
+                    sql=Student.student_id,
+                )
+            return _EMPTY_PLAN
+
+        if model is Student and canonical in self.COMPUTED_STUDENT_FIELDS:
+            return self._student_metric_plan(ctx, canonical)
+
+        if model is Course and canonical == "enrollment_count":
+            enrollments = self._metric_join(ctx, "enrollments")
+            count = func.coalesce(enrollments.c.enrollment_count, 0)
+            return _FieldPlan(expressions=(count,), render=lambda value: value, sql=count, numeric=True)
+
+        if canonical in {"course_code", "course_name"}:
+            if ctx.relational:
+                column = getattr(Course, canonical)
+                return _FieldPlan(
+                    expressions=(Course.id, column),
+                    render=lambda cid, value: value if cid is not None else "",
+                    sql=column,
+                )
+            if model is Course:
+                column = getattr(Course, canonical)
+                return _FieldPlan(expressions=(column,), render=lambda value: value, sql=column)
+            return _EMPTY_PLAN
+
+        if canonical == "date_submitted":
+            if model is not Grade:
+                return _EMPTY_PLAN
+            return _FieldPlan(
+                expressions=(Grade.date_submitted, Grade.date_assigned),
+                render=self._render_date_submitted,
+                sql=func.coalesce(Grade.date_submitted, Grade.date_assigned),
+            )
+
+        if "." in canonical:
+            relation, _, attribute = canonical.partition(".")
+            target = {"student": Student, "course": Course}.get(relation) if ctx.relational else None
+            if target is None or not self._is_column(target, attribute):
+                return None
+            column = getattr(target, attribute)
+            return _FieldPlan(
+                expressions=(column,),
+                render=lambda value: "" if value is None else value,
+                sql=column,
+            )
+
+        if hasattr(model, canonical):
+            if not self._is_column(model, canonical):
+                return None
+            return self._column_plan(getattr(model, canonical), canonical)
+
+        if ctx.relational:
+            for target in (Student, Course):
+                if hasattr(target, canonical):
+                    if not self._is_column(target, canonical):
+                        return None
+                    return self._column_plan(getattr(target, canonical), canonical)
+
+        return _EMPTY_PLAN
+
+    @staticmethod
+    def _is_column(model: Any, attribute: str) -> bool:
+        return attribute in sa_inspect(model).columns
+
+    def _column_plan(self, column: Any, canonical: str) -> _FieldPlan:
+        def render(value: Any) -> Any:
+            if value is None:
+                return ""
+            return self._translate_value(self._format_temporal_value(value), canonical)
+
+        return _FieldPlan(expressions=(column,), render=render, sql=column)
+
+    @staticmethod
+    def _percentage_plan(score: Any, max_score: Any) -> _FieldPlan:
+        def render(value: Any, maximum: Any) -> Any:
+            if value is None or not maximum:
+                return ""
+            try:
+                return f"{(float(value) / float(maximum)) * 100:.2f}%"
+            except Exception:
+                return ""
+
+        sql = case((and_(max_score.isnot(None), max_score != 0), cast(score, Float) / max_score * 100), else_=None)
+        return _FieldPlan(expressions=(score, max_score), render=render, sql=sql, numeric=True)
+
+    def _render_date_submitted(self, submitted: Any, assigned: Any) -> Any:
+        if submitted is None:
+            if assigned is None:
+                return ""
+            return self._format_temporal_value(assigned)
+        return self._format_temporal_value(submitted)
+
+    def _student_metric_plan(self, ctx: _CompileContext, canonical: str) -> _FieldPlan:
+        if canonical in {"attendance_rate", "total_classes", "attended"}:
+            attendance = self._metric_join(ctx, "attendance")
+            total = func.coalesce(attendance.c.total_classes, 0)
+            attended = func.coalesce(attendance.c.attended, 0)
+            if canonical == "total_classes":
+                return _FieldPlan(expressions=(total,), render=lambda value: value, sql=total, numeric=True)
+            if canonical == "attended":
+                return _FieldPlan(expressions=(attended,), render=lambda value: value, sql=attended, numeric=True)
+            return _FieldPlan(
+                expressions=(total, attended),
+                render=lambda total_classes, attended_classes: (
+                    round((attended_classes / total_classes) * 100, 1) if total_classes > 0 else 0.0
+                ),
+                sql=self._round_metric(case((total > 0, cast(attended, Float) * 100 / total), else_=0.0)),
+                numeric=True,
+            )
+
+        grades = self._metric_join(ctx, "grades")
+        if canonical in {"passed_courses", "failed_courses"}:
+            count = func.coalesce(grades.c[canonical], 0)
+            return _FieldPlan(expressions=(count,), render=lambda value: value, sql=count, numeric=True)
+
+        graded = func.coalesce(grades.c.graded, 0)
+        return _FieldPlan(
+            expressions=(grades.c.percentage_sum, graded),
+            render=lambda total, graded_count: round(total / graded_count, 1) if graded_count else 0.0,
+            sql=self._round_metric(case((graded > 0, grades.c.percentage_sum / graded), else_=0.0)),
+            numeric=True,
+        )
+
+    @staticmethod
+    def _round_metric(expression: Any) -> Any:
+        """Round like the rendered value (1 dp) so filters and sorts see what the report shows."""
+        # PostgreSQL only has round(numeric, int)
+        return func.round(cast(expression, Numeric), 1)
+
+    @staticmethod
+    def _metric_join(ctx: _CompileContext, name: str) -> Any:
+        """Grouped per-student/per-course aggregate, outer-joined once per report."""
+        existing = ctx.joins.get(name)
+        if existing is not None:
+            return existing[0]
+
+        if name == "attendance":
+            subquery = (
+                select(
+                    Attendance.student_id.label("student_id"),
+                    func.count(Attendance.id).label("total_classes"),
+                    func.sum(case((func.lower(Attendance.status).in_(("present", "late")), 1), else_=0)).label(
+                        "attended"
+                    ),
+                )
+                .where(Attendance.deleted_at.is_(None))
+                .group_by(Attendance.student_id)
+                .subquery("report_attendance")
+            )
+            onclause = subquery.c.student_id == Student.id
+        elif name == "grades":
+            percentage = cast(Grade.grade, Float) / Grade.max_grade * 100
+            subquery = (
+                select(
+                    Grade.student_id.label("student_id"),
+                    func.sum(percentage).label("percentage_sum"),
+                    func.count(Grade.id).label("graded"),
+                    func.sum(case((percentage >= 50, 1), else_=0)).label("passed_courses"),
+                    func.sum(case((percentage < 50, 1), else_=0)).label("failed_courses"),
+                )
+                .where(
+                    Grade.deleted_at.is_(None),
+                    Grade.grade.isnot(None),
+                    Grade.max_grade.isnot(None),
+                    Grade.max_grade != 0,
+                )
+                .group_by(Grade.student_id)
+                .subquery("report_grades")
+            )
+            onclause = subquery.c.student_id == Student.id
+        else:
+            subquery = (
+                select(
+                    CourseEnrollment.course_id.label("course_id"),
+                    func.count(CourseEnrollment.id).label("enrollment_count"),
+                )
+                .where(CourseEnrollment.deleted_at.is_(None))
+                .group_by(CourseEnrollment.course_id)
+                .subquery("report_enrollments")
+            )
+            onclause = subquery.c.course_id == Course.id
+
+        ctx.joins[name] = (subquery, onclause)
+        return subquery
+
+    @staticmethod
+    def _coerce_sql_value(value: Any) -> Any:
+        """Numeric filter values for computed metrics may arrive as strings."""
+        if isinstance(value, str):
+            try:
+                return float(value.strip())
+            except ValueError:
+                return value
+        if isinstance(value, (list, tuple)):
+            return [CustomReportGenerationService._coerce_sql_value(item) for item in value]
+        return value
+
+    @staticmethod
+    def _filter_clause(column: Any, operator: str, value: Any) -> Any:
+        """SQL condition for one filter operator, or None for unsupported operators."""
+        normalized_operator = str(operator or "equals").lower()
+        if normalized_operator in {"equals", "eq"}:
+            return column == value
+        if normalized_operator in {"not_equals", "ne"}:
+            return column != value
+        if normalized_operator == "contains":
+            return column.ilike(f"%{value}%")
+        if normalized_operator == "not_contains":
+            return ~column.ilike(f"%{value}%")
+        if normalized_operator == "starts_with":
+            return column.ilike(f"{value}%")
+        if normalized_operator == "ends_with":
+            return column.ilike(f"%{value}")
+        if normalized_operator in {"greater_than", "gt"}:
+            return column > value
+        if normalized_operator in {"less_than", "lt"}:
+            return column < value
+        if normalized_operator in {"greater_than_or_equal", "gte"}:
+            return column >= value
+        if normalized_operator in {"less_than_or_equal", "lte"}:
+            return column <= value
+        if normalized_operator == "in":
+            return column.in_(value) if isinstance(value, (list, tuple)) else column == value
+        if normalized_operator == "between":
+            if isinstance(value, dict) and "from" in value and "to" in value:
+                return column.between(value["from"], value["to"])
+        return None
 
-        return rows, headers
+    @staticmethod
+    def _normalize_filter_specs(filters: Any) -> List[Tuple[str, str, Any]]:
+        """Flatten list and dict filter formats into ``(field, operator, value)``."""
+        normalized_filters: List[Tuple[str, str, Any]] = []
+        if isinstance(filters, list):
+            for filter_obj in filters:
+                if isinstance(filter_obj, dict) and filter_obj.get("field"):
+                    normalized_filters.append(
+                        (
+                            str(filter_obj.get("field")),
+                            str(filter_obj.get("operator", "equals")),
+                            filter_obj.get("value"),
+                        )
+                    )
+        elif isinstance(filters, dict):
+            for field_name, filter_spec in filters.items():
+                if isinstance(filter_spec, dict) and "value" in filter_spec:
+                    normalized_filters.append(
+                        (str(field_name), str(filter_spec.get("operator", "equals")), filter_spec.get("value"))
+                    )
+                else:
+                    normalized_filters.append((str(field_name), "equals", filter_spec))
+        return normalized_filters
+
+    @staticmethod
+    def _normalize_sort_specs(sort_by: Any) -> List[Tuple[str, str]]:
+        """Flatten list and legacy dict sort formats into ``(field, direction)``."""
+        sort_rules: List[Tuple[str, str]] = []
+        if isinstance(sort_by, list):
+            for sort_obj in sort_by:
+                if isinstance(sort_obj, dict) and sort_obj.get("field"):
+                    sort_rules.append((str(sort_obj.get("field")), str(sort_obj.get("order", "asc")).lower()))
+        elif isinstance(sort_by, dict) and sort_by.get("field"):
+            sort_rules.append((str(sort_by.get("field")), str(sort_by.get("direction", "asc")).lower()))
+        return sort_rules
 
     def _build_query(self, report: Report):
         report_type = str(report.report_type or "").lower()
 
         if report_type == "student":
             query = (
-                self.db.query(Student)
+                self.read_db.query(Student)
                 .options(
-                    joinedload(Student.attendances),
-                    joinedload(Student.grades),
-                    joinedload(Student.enrollments),
+                    selectinload(Student.attendances),
+                    selectinload(Student.grades),
+                    selectinload(Student.enrollments),
                 )
                 .filter(Student.deleted_at.is_(None))
             )
@@ -594,9 +1147,9 @@ class CustomReportGenerationService:
 
         if report_type == "course":
             query = (
-                self.db.query(Course)
+                self.read_db.query(Course)
                 .options(
-                    joinedload(Course.enrollments),
+                    selectinload(Course.enrollments),
                 )
                 .filter(Course.deleted_at.is_(None))
             )
@@ -604,7 +1157,7 @@ class CustomReportGenerationService:
 
         if report_type == "grade":
             query = (
-                self.db.query(Grade)
+                self.read_db.query(Grade)
                 .options(joinedload(Grade.student), joinedload(Grade.course))
                 .filter(Grade.deleted_at.is_(None))
             )
@@ -612,7 +1165,7 @@ class CustomReportGenerationService:
 
         if report_type == "attendance":
             query = (
-                self.db.query(Attendance)
+                self.read_db.query(Attendance)
                 .options(joinedload(Attendance.student), joinedload(Attendance.course))
                 .filter(Attendance.deleted_at.is_(None))
             )
@@ -620,7 +1173,7 @@ class CustomReportGenerationService:
 
         if report_type == "daily_performance":
             query = (
-                self.db.query(DailyPerformance)
+                self.read_db.query(DailyPerformance)
                 .options(joinedload(DailyPerformance.student), joinedload(DailyPerformance.course))
                 .filter(DailyPerformance.deleted_at.is_(None))
             )
@@ -873,6 +1426,9 @@ class CustomReportGenerationService:
 
     def _matches_filter(self, record: Any, report_type: str, field: str, operator: str, expected: Any) -> bool:
         actual = self._get_resolved_filter_value(record, report_type, field)
+        return self._compare_values(actual, operator, expected)
+
+    def _compare_values(self, actual: Any, operator: str, expected: Any) -> bool:
         normalized_operator = str(operator or "equals").lower()
 
         actual_cmp = self._coerce_comparable_value(actual)
@@ -906,25 +1462,7 @@ class CustomReportGenerationService:
         if not filters:
             return records
 
-        normalized_filters: List[Tuple[str, str, Any]] = []
-        if isinstance(filters, list):
-            for filter_obj in filters:
-                if isinstance(filter_obj, dict) and filter_obj.get("field"):
-                    normalized_filters.append(
-                        (
-                            str(filter_obj.get("field")),
-                            str(filter_obj.get("operator", "equals")),
-                            filter_obj.get("value"),
-                        )
-                    )
-        elif isinstance(filters, dict):
-            for field_name, filter_spec in filters.items():
-                if isinstance(filter_spec, dict) and "value" in filter_spec:
-                    normalized_filters.append(
-                        (str(field_name), str(filter_spec.get("operator", "equals")), filter_spec.get("value"))
-                    )
-                else:
-                    normalized_filters.append((str(field_name), "equals", filter_spec))
+        normalized_filters = self._normalize_filter_specs(filters)
 
         filtered_records = records
         for field, operator, value in normalized_filters:
@@ -939,13 +1477,7 @@ class CustomReportGenerationService:
         if not sort_by:
             return records
 
-        sort_rules: List[Tuple[str, str]] = []
-        if isinstance(sort_by, list):
-            for sort_obj in sort_by:
-                if isinstance(sort_obj, dict) and sort_obj.get("field"):
-                    sort_rules.append((str(sort_obj.get("field")), str(sort_obj.get("order", "asc")).lower()))
-        elif isinstance(sort_by, dict) and sort_by.get("field"):
-            sort_rules.append((str(sort_by.get("field")), str(sort_by.get("direction", "asc")).lower()))
+        sort_rules = self._normalize_sort_specs(sort_by)
 
         sorted_records = list(records)
         for field, direction in reversed(sort_rules):
@@ -1160,7 +1692,7 @@ class CustomReportGenerationService:
 
     def _export_report(
         self,
-        rows: List[List[Any]],
+        rows: Iterable[Sequence[Any]],
         headers: List[str],
         export_format: str,
         file_name: str,
@@ -1171,7 +1703,7 @@ class CustomReportGenerationService:
         file_path = os.path.join(self.reports_dir, file_name)
 
         # Sort rows by group column so groups are contiguous
-        if group_by_col_index is not None and rows:
+        if group_by_col_index is not None:
             rows = sorted(rows, key=lambda r: str(r[group_by_col_index]) if group_by_col_index < len(r) else "")
 
         if format_lower == "csv":
@@ -1215,22 +1747,13 @@ class CustomReportGenerationService:
         file_path: str,
         group_by_col_index: Optional[int] = None,
     ) -> None:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Report"
+        writer = StreamingXlsxWriter()
+        ws = writer.add_sheet("Report", widths=[max(len(str(header)), 10, 12) for header in headers])
+        ws.header(headers)
 
-        header_fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        group_fill = PatternFill(start_color="E0E7FF", end_color="E0E7FF", fill_type="solid")
+        group_fill = solid_fill("E0E7FF")
         group_font = Font(bold=True, color="1E40AF")
 
-        for col_index, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_index, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center")
-
-        current_row = 2
         current_group = None
         for row in rows:
             if group_by_col_index is not None and group_by_col_index < len(row):
@@ -1238,30 +1761,15 @@ class CustomReportGenerationService:
                 if group_val != current_group:
                     current_group = group_val
                     group_label = f"{headers[group_by_col_index]}: {group_val}"
-                    cell = ws.cell(row=current_row, column=1, value=group_label)
-                    cell.font = group_font
-                    cell.fill = group_fill
-                    ws.merge_cells(
-                        start_row=current_row,
-                        start_column=1,
-                        end_row=current_row,
-                        end_column=len(headers),
-                    )
-                    current_row += 1
-
-            for col_index, value in enumerate(row, 1):
-                ws.cell(row=current_row, column=col_index, value=self._stringify_value(value))
-            current_row += 1
+                    ws.styled_row(group_label, span=len(headers), font=group_font, fill=group_fill)
 
-        for col_index, header in enumerate(headers, 1):
-            width = max(len(str(header)), 10)
-            ws.column_dimensions[get_column_letter(col_index)].width = max(width, 12)
+            ws.append([self._stringify_value(value) for value in row])
 
-        wb.save(file_path)
+        writer.save(file_path)
 
     def _export_pdf(
         self,
-        rows: List[List[Any]],
+        rows: Iterable[Sequence[Any]],
         headers: List[str],
         file_path: str,
         title: Optional[str] = None,
@@ -1270,155 +1778,18 @@ class CustomReportGenerationService:
         if not REPORTLAB_AVAILABLE:
             raise ImportError("ReportLab is required for PDF generation. Install with: pip install reportlab")
 
-        page_size = letter
-        if len(headers) > 8:
-            page_size = landscape(letter)
-
-        doc = SimpleDocTemplate(
-            file_path,
-            pagesize=page_size,
-            leftMargin=0.5 * inch,
-            rightMargin=0.5 * inch,
-            topMargin=0.5 * inch,
-            bottomMargin=0.5 * inch,
-        )
-        styles = getSampleStyleSheet()
-        base_font, base_font_bold = register_report_fonts()
-        body_font_size = 10
-        if len(headers) > 6:
-            body_font_size = 9
-        if len(headers) > 8:
-            body_font_size = 8
-        if len(headers) > 10:
-            body_font_size = 7
-
-        title_style = ParagraphStyle(
-            "ReportTitle",
-            parent=styles["Heading1"],
-            fontSize=16,
-            textColor=colors.HexColor("#1f77b4"),
-            spaceAfter=12,
-            fontName=base_font_bold,
-            alignment=TA_CENTER,
-        )
-        header_style = ParagraphStyle(
-            "ReportHeader",
-            parent=styles["BodyText"],
-            fontName=base_font_bold,
-            fontSize=body_font_size,
-            leading=body_font_size + 2,
-            textColor=colors.whitesmoke,
-            alignment=TA_CENTER,
-        )
-        cell_style = ParagraphStyle(
-            "ReportCell",
-            parent=styles["BodyText"],
-            fontName=base_font,
-            fontSize=body_font_size,
-            leading=body_font_size + 2,
-        )
-        group_style = ParagraphStyle(
-            "GroupHeader",
-            parent=styles["BodyText"],
-            fontName=base_font_bold,
-            fontSize=body_font_size,
-            leading=body_font_size + 2,
-            textColor=colors.HexColor("#1E40AF"),
-        )
-
         report_title = title
         if not report_title:
             report_title = "Προσαρμοσμένη Αναφορά" if self._language == "el" else "Custom Report"
-        elements: List[Flowable] = [Paragraph(report_title, title_style), Spacer(1, 0.2 * inch)]
-
-        safe_headers: List[Flowable] = [Paragraph(escape(str(header)), header_style) for header in headers]
-        col_count = max(len(headers), 1)
-
-        # Build table_data with optional group header rows
-        table_data: List[List[Flowable]] = [safe_headers]
-        group_row_indices: List[int] = []  # 0-based indices in table_data
-        current_group = None
 
-        for row in rows:
-            if group_by_col_index is not None and group_by_col_index < len(row):
-                group_val = str(self._stringify_value(row[group_by_col_index]))
-                if group_val != current_group:
-                    current_group = group_val
-                    group_label = f"{headers[group_by_col_index]}: {group_val}"
-                    group_row: List[Flowable] = [Paragraph(escape(group_label), group_style)]
-                    group_row += [Paragraph("", cell_style)] * (col_count - 1)
-                    group_row_indices.append(len(table_data))
-                    table_data.append(group_row)
-
-            safe_row: List[Flowable] = [
-                Paragraph(escape(str(self._stringify_value(value))), cell_style) for value in row
-            ]
-            table_data.append(safe_row)
-
-        def _estimate_column_width(index: int) -> float:
-            header_length = len(str(headers[index]))
-            row_lengths = [len(str(self._stringify_value(row[index]))) for row in rows if index < len(row)]
-            max_length = max([header_length, *row_lengths, 6])
-            font_factor = body_font_size * 0.62
-            return max(72.0, max_length * font_factor + 12)
-
-        estimated_widths = [_estimate_column_width(index) for index in range(col_count)]
-        total_estimated_width = sum(estimated_widths) or doc.width
-        scale = min(1.0, doc.width / total_estimated_width)
-
-        min_col_width = 20.0
-        col_widths = [max(min_col_width, width * scale) for width in estimated_widths]
-
-        total_width = sum(col_widths)
-        if total_width > doc.width and total_width > 0:
-            rescale = doc.width / total_width
-            col_widths = [max(min_col_width, width * rescale) for width in col_widths]
-            total_width = sum(col_widths)
-
-        if total_width < doc.width:
-            extra = (doc.width - total_width) / col_count
-            col_widths = [width + extra for width in col_widths]
-
-        table = Table(table_data, repeatRows=1, colWidths=col_widths)
-
-        style_commands: list = [
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f77b4")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-            ("ALIGN", (0, 1), (-1, -1), "LEFT"),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("FONTNAME", (0, 0), (-1, 0), base_font_bold),
-            ("FONTNAME", (0, 1), (-1, -1), base_font),
-            ("FONTSIZE", (0, 0), (-1, 0), body_font_size),
-            ("FONTSIZE", (0, 1), (-1, -1), body_font_size),
-            ("LEFTPADDING", (0, 0), (-1, -1), 6),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-            ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
-            ("BOTTOMPADDING", (0, 1), (-1, -1), 6),
-            ("TOPPADDING", (0, 1), (-1, -1), 6),
-            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ]
-
-        if group_row_indices:
-            # Per-row alternating backgrounds, skipping group headers
-            data_row_counter = 0
-            for i in range(1, len(table_data)):
-                if i in group_row_indices:
-                    continue
-                bg = colors.white if data_row_counter % 2 == 0 else colors.HexColor("#F3F4F6")
-                style_commands.append(("BACKGROUND", (0, i), (-1, i), bg))
-                data_row_counter += 1
-            # Style group header rows
-            for gi in group_row_indices:
-                style_commands.append(("BACKGROUND", (0, gi), (-1, gi), colors.HexColor("#DBEAFE")))
-                style_commands.append(("SPAN", (0, gi), (-1, gi)))
-                style_commands.append(("FONTNAME", (0, gi), (-1, gi), base_font_bold))
-        else:
-            style_commands.append(("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F3F4F6")]))
-
-        table.setStyle(TableStyle(style_commands))
-        elements.append(table)
-        doc.build(elements)
+        document = PdfTableDocument(
+            title=report_title,
+            headers=[str(header) for header in headers],
+            rows=[[str(self._stringify_value(value)) for value in row] for row in rows],
+            layout=CUSTOM_REPORT_LAYOUT,
+            group_by_col_index=group_by_col_index,
+        )
+        get_pdf_renderer().render_table_to_file(document, file_path)
 
     def _stringify_value(self, value: Any) -> Any:
         if isinstance(value, (datetime, date)):
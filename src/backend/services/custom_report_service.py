@@ -279,8 +279,19 @@ class CustomReportService:
         if not report_instance:
             return False
 
+        # Cached generations share one artifact; keep it while others still point at it
+        file_shared = bool(report_instance.file_path) and (
+            self.db.query(GeneratedReport.id)
+            .filter(
+                GeneratedReport.file_path == report_instance.file_path,
+                GeneratedReport.id != report_instance.id,
+            )
+            .first()
+            is not None
+        )
+
         # Delete file from disk if it exists
-        if report_instance.file_path and os.path.exists(report_instance.file_path):
+        if report_instance.file_path and not file_shared and os.path.exists(report_instance.file_path):
             try:
                 os.remove(report_instance.file_path)
             except Exception as e:
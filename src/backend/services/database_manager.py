@@ -18,9 +18,12 @@ import logging
 import os
 import shutil
 import subprocess
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from backend.config import get_settings
 from backend.security.path_validation import validate_filename
@@ -249,63 +252,133 @@ def check_instance_health(instance: dict[str, Any]) -> dict[str, Any]:
     return result
 
 
-def get_instance_stats(instance: dict[str, Any]) -> dict[str, Any]:
-    """Gather detailed statistics for a PostgreSQL instance."""
-    import psycopg
+# Idle connections kept per configured instance for repeated stats calls.
+_POOL_MAX_IDLE_PER_INSTANCE = 2
+_POOL_MAX_CONNECTION_AGE_SECONDS = 300.0
+_INSTANCE_POOLS: dict[str, list[tuple[float, Any]]] = {}
+_INSTANCE_POOLS_LOCK = threading.Lock()
+
+# One catalog pass for every table: planner row estimates plus on-disk size.
+# reltuples is -1 for tables that were never vacuumed/analyzed, in which case
+# the live-tuple counter from pg_stat_user_tables is used instead.
+_TABLE_STATS_SQL = """
+SELECT c.relname AS name,
+       COALESCE(NULLIF(c.reltuples, -1)::bigint, s.n_live_tup, 0) AS rows,
+       pg_total_relation_size(c.oid) AS size_bytes
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+ORDER BY c.relname
+"""
 
-    dsn = (
+_DATABASE_STATS_SQL = """
+SELECT (SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()),
+       pg_database_size(current_database())
+"""
+
+
+def _instance_dsn(instance: dict[str, Any]) -> str:
+    return (
         f"host={instance['host']} port={instance['port']} "
         f"dbname={instance['dbname']} user={instance['user']} "
         f"password={instance['password']} sslmode={instance.get('sslmode', 'prefer')} "
         f"connect_timeout=5"
     )
-    stats: dict[str, Any] = {"name": instance.get("name", "unknown")}
+
+
+@contextmanager
+def _pooled_connection(instance: dict[str, Any]) -> Iterator[Any]:
+    """Borrow an autocommit connection to ``instance`` from a small idle pool.
+
+    Connections are returned to the pool only when the block finishes cleanly
+    and they are younger than ``_POOL_MAX_CONNECTION_AGE_SECONDS``; broken or
+    stale connections are closed instead of reused.
+    """
+    import psycopg
+
+    dsn = _instance_dsn(instance)
+    conn = None
+    created_at = 0.0
+    now = time.monotonic()
+    with _INSTANCE_POOLS_LOCK:
+        idle = _INSTANCE_POOLS.get(dsn, [])
+        while idle:
+            created_at, candidate = idle.pop()
+            if not candidate.closed and now - created_at < _POOL_MAX_CONNECTION_AGE_SECONDS:
+                conn = candidate
+                break
+            candidate.close()
+    if conn is None:
+        conn = psycopg.connect(dsn, autocommit=True)
+        created_at = now
 
     try:
-        with psycopg.connect(dsn, autocommit=True) as conn:
-            # Table count
-            row = conn.execute(
-                "SELECT count(*) FROM information_schema.tables "
-                "WHERE table_schema = 'public' AND table_type = 'BASE TABLE'"
-            ).fetchone()
-            stats["table_count"] = row[0] if row else 0
-
-            # Row counts for key tables
-            tables_row = conn.execute(
-                "SELECT table_name FROM information_schema.tables "
-                "WHERE table_schema = 'public' AND table_type = 'BASE TABLE' "
-                "ORDER BY table_name"
-            ).fetchall()
-            table_sizes = []
-            for (tname,) in tables_row:
-                try:
-                    cnt = conn.execute(
-                        f'SELECT count(*) FROM "{tname}"'  # noqa: S608
-                    ).fetchone()
-                    tsize = conn.execute(
-                        f"SELECT pg_total_relation_size('\"{tname}\"')"  # noqa: S608
-                    ).fetchone()
-                    table_sizes.append(
-                        {
-                            "name": tname,
-                            "rows": cnt[0] if cnt else 0,
-                            "size_bytes": tsize[0] if tsize else 0,
-                            "size_human": _human_size(tsize[0]) if tsize else "0 B",
-                        }
-                    )
-                except Exception:
-                    table_sizes.append({"name": tname, "rows": -1, "size_bytes": 0})
-            stats["tables"] = table_sizes
+        yield conn
+    except Exception:
+        conn.close()
+        raise
+
+    if conn.closed or conn.broken:
+        return
+    with _INSTANCE_POOLS_LOCK:
+        idle = _INSTANCE_POOLS.setdefault(dsn, [])
+        if len(idle) < _POOL_MAX_IDLE_PER_INSTANCE:
+            idle.append((created_at, conn))
+            return
+    conn.close()
+
+
+def close_instance_pools() -> None:
+    """Close every pooled instance connection (used on application shutdown)."""
+    with _INSTANCE_POOLS_LOCK:
+        pools = list(_INSTANCE_POOLS.values())
+        _INSTANCE_POOLS.clear()
+    for idle in pools:
+        for _, conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def get_instance_stats(instance: dict[str, Any], *, exact_counts: bool = False) -> dict[str, Any]:
+    """Gather detailed statistics for a PostgreSQL instance.
+
+    Row counts come from the planner estimate (``pg_class.reltuples``) so the
+    call never scans table data. Pass ``exact_counts=True`` to run ``count(*)``
+    per table instead, which is accurate but scans every table.
+    """
+    stats: dict[str, Any] = {"name": instance.get("name", "unknown"), "rows_exact": exact_counts}
 
-            # Active connections
-            row = conn.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()").fetchone()
-            stats["active_connections"] = row[0] if row else 0
+    try:
+        with _pooled_connection(instance) as conn:
+            table_sizes = [
+                {
+                    "name": tname,
+                    "rows": rows,
+                    "size_bytes": size_bytes,
+                    "size_human": _human_size(size_bytes),
+                }
+                for tname, rows, size_bytes in conn.execute(_TABLE_STATS_SQL).fetchall()
+            ]
+            if exact_counts:
+                for table in table_sizes:
+                    try:
+                        cnt = conn.execute(
+                            f'SELECT count(*) FROM "{table["name"]}"'  # noqa: S608
+                        ).fetchone()
+                        table["rows"] = cnt[0] if cnt else 0
+                    except Exception:
+                        table["rows"] = -1
+            stats["table_count"] = len(table_sizes)
+            stats["tables"] = table_sizes
 
-            # Database size
-            row = conn.execute("SELECT pg_database_size(current_database())").fetchone()
+            row = conn.execute(_DATABASE_STATS_SQL).fetchone()
             if row:
-                stats["size_bytes"] = row[0]
-                stats["size_human"] = _human_size(row[0])
+                stats["active_connections"] = row[0]
+                stats["size_bytes"] = row[1]
+                stats["size_human"] = _human_size(row[1])
 
     except Exception as exc:
         stats["error"] = str(exc)
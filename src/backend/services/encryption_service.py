@@ -14,19 +14,68 @@ Usage:
     service = EncryptionService()
     encrypted_data = service.encrypt(b"sensitive data")
     decrypted_data = service.decrypt(encrypted_data)
+
+File format (chunked-v2):
+    Files are streamed in fixed-size chunks so encrypting, decrypting and
+    verifying a backup runs in constant memory. The header is
+
+        magic (8) | chunk size (4) | salt (16) | metadata length (4) | metadata JSON
+
+    followed by one AES-256-GCM sealed chunk per ``chunk size`` bytes of
+    plaintext. Each file gets its own key, derived from the master key and the
+    salt with HKDF. A chunk's nonce is its index plus a final-chunk flag, and
+    the whole header is authenticated with every chunk, so reordering,
+    truncating, extending or editing the metadata all fail authentication.
+    Files written before this format (one AES-GCM message behind a 4-byte
+    size header) are still decrypted by ``decrypt_file``.
 """
 
 import json
+import os
 import secrets
+import struct
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+T = TypeVar("T")
+
+CHUNKED_MAGIC = b"SMSENC\x00\x02"
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+# magic, chunk size, salt, metadata length
+_CHUNKED_HEADER = struct.Struct(">8sI16sI")
+_FILE_KEY_INFO = b"sms-backup-chunked-v2"
+
+# Master keys by path, tagged with the key file's (mtime, size) so a key
+# replaced on disk by another process is re-read
+_master_keys: Dict[Path, Tuple[Tuple[int, int], bytes]] = {}
+_master_keys_lock = threading.Lock()
+
+
+def _read_chunks(stream: BinaryIO, size: int) -> Iterator[Tuple[int, bytes, bool]]:
+    """Yield ``(index, data, is_final)``; an empty stream yields one empty final chunk."""
+    index = 0
+    current = stream.read(size)
+    while True:
+        following = stream.read(size) if len(current) == size else b""
+        final = not following
+        yield index, current, final
+        if final:
+            return
+        current = following
+        index += 1
+
 
 class EncryptionService:
     """AES-256 encryption service for backups with key management."""
@@ -38,13 +87,19 @@ class EncryptionService:
     PBKDF2_ITERATIONS = 100_000
     TAG_LENGTH = 16  # 128 bits authentication tag
 
-    def __init__(self, key_dir: Optional[Path] = None):
+    def __init__(self, key_dir: Optional[Path] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1):
         """
         Initialize encryption service.
 
         Args:
             key_dir: Directory for storing encryption keys. Defaults to project root.
+            chunk_size: Plaintext bytes per sealed chunk when encrypting files
+            workers: Threads used to seal/open file chunks (1 = inline)
         """
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE} bytes")
+        self.chunk_size = chunk_size
+        self.workers = max(1, workers)
         self.key_dir = key_dir or Path(__file__).parent.parent.parent / ".keys"
         self.key_dir.mkdir(parents=True, exist_ok=True)
         self.master_key_path = self.key_dir / "master.key"
@@ -61,12 +116,27 @@ class EncryptionService:
         """
         Get or create the master encryption key.
 
+        The key is cached in memory and only re-read when the key file changes.
+
         Returns:
             Master key (256 bits)
         """
-        if self.master_key_path.exists():
+        try:
+            stat = self.master_key_path.stat()
+        except FileNotFoundError:
+            stat = None
+
+        if stat is not None:
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            with _master_keys_lock:
+                cached = _master_keys.get(self.master_key_path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
             with open(self.master_key_path, "rb") as f:
-                return f.read()
+                master_key = f.read()
+            with _master_keys_lock:
+                _master_keys[self.master_key_path] = (stamp, master_key)
+            return master_key
 
         # Generate new master key
         master_key = secrets.token_bytes(self.KEY_LENGTH)
@@ -172,6 +242,45 @@ class EncryptionService:
 
         return plaintext
 
+    def _file_key(self, salt: bytes) -> bytes:
+        """Derive the per-file key for chunked files from the master key."""
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=self.KEY_LENGTH,
+            salt=salt,
+            info=_FILE_KEY_INFO,
+            backend=default_backend(),
+        )
+        return hkdf.derive(self._get_or_create_master_key())
+
+    @staticmethod
+    def _chunk_nonce(index: int, final: bool) -> bytes:
+        return index.to_bytes(11, byteorder="big") + (b"\x01" if final else b"\x00")
+
+    def _map_chunks(self, fn: Callable[[Any], T], items: Iterable[Any]) -> Iterator[T]:
+        """Apply ``fn`` to chunks in order, on ``workers`` threads with a bounded backlog."""
+        if self.workers <= 1:
+            yield from map(fn, items)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backup-crypto") as executor:
+            pending: Deque[Any] = deque()
+            try:
+                for item in items:
+                    pending.append(executor.submit(fn, item))
+                    if len(pending) >= self.workers * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def is_chunked_file(self, path: Path) -> bool:
+        """True when ``path`` uses the chunked-v2 container format."""
+        with open(path, "rb") as f:
+            return f.read(len(CHUNKED_MAGIC)) == CHUNKED_MAGIC
+
     def encrypt_file(
         self,
         input_path: Path,
@@ -179,17 +288,13 @@ class EncryptionService:
         metadata: Optional[Dict] = None,
     ) -> None:
         """
-        Encrypt a file and write encrypted version with metadata.
+        Encrypt a file in chunks and write the chunked-v2 container with metadata.
 
         Args:
             input_path: Path to file to encrypt
             output_path: Path to write encrypted file
-            metadata: Optional metadata to include (not encrypted)
+            metadata: Optional metadata to include (authenticated, not encrypted)
         """
-        # Read input file
-        with open(input_path, "rb") as f:
-            data = f.read()
-
         # Prepare metadata
         if metadata is None:
             metadata = {}
@@ -197,29 +302,57 @@ class EncryptionService:
         metadata.update(
             {
                 "original_name": input_path.name,
-                "original_size": len(data),
+                "original_size": input_path.stat().st_size,
                 "encrypted_at": datetime.now(timezone.utc).isoformat(),
                 "algorithm": "AES-256-GCM",
+                "format": "chunked-v2",
+                "chunk_size": self.chunk_size,
             }
         )
-
-        # Encrypt associated data (metadata)
         metadata_bytes = json.dumps(metadata).encode()
 
-        # Encrypt file
-        encrypted_data = self.encrypt(data, associated_data=metadata_bytes)
+        salt = secrets.token_bytes(self.SALT_LENGTH)
+        header = _CHUNKED_HEADER.pack(CHUNKED_MAGIC, self.chunk_size, salt, len(metadata_bytes)) + metadata_bytes
+        cipher = AESGCM(self._file_key(salt))
+
+        def seal(chunk: Tuple[int, bytes, bool]) -> bytes:
+            index, data, final = chunk
+            return cipher.encrypt(self._chunk_nonce(index, final), data, header)
 
-        # Write encrypted file
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "wb") as f:
-            # Write header: encrypted package size (4 bytes, big-endian)
-            # This allows detection of encrypted vs unencrypted files
-            f.write(len(encrypted_data).to_bytes(4, byteorder="big"))
-            # Write metadata length (2 bytes) and metadata
-            f.write(len(metadata_bytes).to_bytes(2, byteorder="big"))
-            f.write(metadata_bytes)
-            # Write encrypted data
-            f.write(encrypted_data)
+        with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+            dst.write(header)
+            for sealed in self._map_chunks(seal, _read_chunks(src, self.chunk_size)):
+                dst.write(sealed)
+
+    def _open_chunked_file(self, input_path: Path, sink: Optional[Callable[[bytes], Any]]) -> Dict:
+        """Authenticate every chunk of a chunked-v2 file, passing plaintext to ``sink``."""
+        with open(input_path, "rb") as src:
+            fixed = src.read(_CHUNKED_HEADER.size)
+            if len(fixed) < _CHUNKED_HEADER.size:
+                raise ValueError("Invalid encrypted file format: missing header")
+            magic, chunk_size, salt, metadata_len = _CHUNKED_HEADER.unpack(fixed)
+            if magic != CHUNKED_MAGIC:
+                raise ValueError("Invalid encrypted file format: unknown container")
+            if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+                raise ValueError(f"Invalid encrypted file format: chunk size {chunk_size}")
+
+            metadata_bytes = src.read(metadata_len)
+            if len(metadata_bytes) != metadata_len:
+                raise ValueError("Invalid encrypted file format: incomplete metadata")
+
+            header = fixed + metadata_bytes
+            cipher = AESGCM(self._file_key(salt))
+
+            def open_chunk(chunk: Tuple[int, bytes, bool]) -> bytes:
+                index, data, final = chunk
+                return cipher.decrypt(self._chunk_nonce(index, final), data, header)
+
+            for plaintext in self._map_chunks(open_chunk, _read_chunks(src, chunk_size + self.TAG_LENGTH)):
+                if sink is not None:
+                    sink(plaintext)
+
+        return json.loads(metadata_bytes)
 
     def decrypt_file(
         self,
@@ -229,13 +362,53 @@ class EncryptionService:
         """
         Decrypt a file that was encrypted with encrypt_file().
 
+        Chunked files are streamed to a temporary file that only replaces
+        ``output_path`` once every chunk has authenticated.
+
         Args:
             input_path: Path to encrypted file
             output_path: Path to write decrypted file
 
         Returns:
             Metadata from encrypted file
+
+        Raises:
+            cryptography.exceptions.InvalidTag: If authentication fails
+            ValueError: If the file is malformed
+        """
+        if not self.is_chunked_file(input_path):
+            return self._decrypt_single_shot_file(input_path, output_path)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = output_path.with_name(f"{output_path.name}.partial")
+        try:
+            with open(partial_path, "wb") as dst:
+                metadata = self._open_chunked_file(input_path, dst.write)
+            os.replace(partial_path, output_path)
+        finally:
+            if partial_path.exists():
+                partial_path.unlink()
+        return metadata
+
+    def verify_file(self, input_path: Path) -> Dict:
         """
+        Authenticate every chunk of a chunked-v2 file without writing plaintext.
+
+        Returns:
+            Metadata from encrypted file
+
+        Raises:
+            cryptography.exceptions.InvalidTag: If authentication fails
+            ValueError: If the file is malformed or not a chunked file
+        """
+        return self._open_chunked_file(input_path, None)
+
+    def _decrypt_single_shot_file(
+        self,
+        input_path: Path,
+        output_path: Path,
+    ) -> Dict:
+        """Decrypt a file written in the original single-message format."""
         with open(input_path, "rb") as f:
             # Read encrypted package size
             size_bytes = f.read(4)
@@ -286,6 +459,8 @@ class EncryptionService:
             "pbkdf2_iterations": self.PBKDF2_ITERATIONS,
             "salt_length_bytes": self.SALT_LENGTH,
             "nonce_length_bytes": self.NONCE_LENGTH,
+            "file_format": "chunked-v2",
+            "chunk_size_bytes": self.chunk_size,
         }
 
     def rotate_master_key(self, new_key: Optional[bytes] = None) -> bytes:
@@ -302,6 +477,9 @@ class EncryptionService:
         Returns:
             New master key
         """
+        with _master_keys_lock:
+            _master_keys.pop(self.master_key_path, None)
+
         # Backup old key if it exists
         if self.master_key_path.exists():
             backup_path = self.key_dir / f"master.key.bak.{datetime.now(timezone.utc).timestamp()}"
@@ -1,9 +1,10 @@
 """Enrollment business logic service."""
 
 import logging
-from datetime import date
-from typing import Dict, List
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from backend.db_utils import get_by_id_or_404, paginate
@@ -19,6 +20,9 @@ from backend.schemas.enrollments import (
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on student IDs per IN (...) lookup when enrolling a cohort
+ENROLLMENT_LOOKUP_CHUNK = 500
+
 
 class EnrollmentService:
     """Service for managing course enrollments."""
@@ -156,9 +160,10 @@ class EnrollmentService:
         """
         Enroll multiple students in a course.
 
-        Uses database locking to prevent race conditions and handles:
+        Existing enrollments for the whole cohort are fetched (and locked) in
+        one query per chunk instead of one locking query per student, and handles:
         - Invalid student IDs (skipped)
-        - Duplicate enrollments (reactivated if soft-deleted)
+        - Duplicate enrollments (reactivated if soft-deleted, in one UPDATE)
         - Concurrent enrollment attempts (with_for_update)
 
         Args:
@@ -178,57 +183,68 @@ class EnrollmentService:
         # Verify course exists
         _course = get_by_id_or_404(db, Course, course_id)
 
-        # Fetch all students at once to avoid N+1 queries
-        students = db.query(Student).filter(Student.id.in_(payload.student_ids), Student.deleted_at.is_(None)).all()
-        valid_student_ids = {s.id for s in students}
+        # Preserve request order while dropping repeated IDs
+        requested_ids = list(dict.fromkeys(payload.student_ids))
+        chunks = [
+            requested_ids[start : start + ENROLLMENT_LOOKUP_CHUNK]
+            for start in range(0, len(requested_ids), ENROLLMENT_LOOKUP_CHUNK)
+        ]
+
+        valid_student_ids: Set[int] = set()
+        for chunk in chunks:
+            valid_student_ids.update(
+                db.execute(select(Student.id).where(Student.id.in_(chunk), Student.deleted_at.is_(None))).scalars()
+            )
 
         if not valid_student_ids:
             logger.warning(f"No valid students found for enrollment in course {course_id}")
             return {"created": 0, "reactivated": 0}
 
-        created = 0
-        reactivated = 0
+        # Lock every existing enrollment of the cohort, including soft-deleted ones
+        existing: Dict[int, Optional[datetime]] = {}
+        for chunk in chunks:
+            rows = db.execute(
+                select(CourseEnrollment.id, CourseEnrollment.student_id, CourseEnrollment.deleted_at)
+                .where(CourseEnrollment.course_id == course_id, CourseEnrollment.student_id.in_(chunk))
+                .with_for_update()
+                .execution_options(include_deleted=True)
+            ).all()
+            existing.update({row.student_id: row.deleted_at for row in rows})
+            # Enrollments of missing or soft-deleted students stay deleted
+            reactivate_ids = [
+                row.id for row in rows if row.deleted_at is not None and row.student_id in valid_student_ids
+            ]
+            if reactivate_ids:
+                values: Dict[str, object] = {"deleted_at": None, "status": "active"}
+                if payload.enrolled_at:
+                    values["enrolled_at"] = payload.enrolled_at
+                # Query.update so the after_bulk_update cache hooks fire
+                db.query(CourseEnrollment).filter(CourseEnrollment.id.in_(reactivate_ids)).update(
+                    values, synchronize_session="fetch"
+                )
 
-        for sid in payload.student_ids:
+        enrolled_at = payload.enrolled_at or date.today()
+        new_enrollments = []
+        reactivated = 0
+        for sid in requested_ids:
             if sid not in valid_student_ids:
                 logger.debug(f"Skipping invalid student ID {sid} for enrollment")
                 continue
-
-            # Use locking to prevent race conditions
-            existing = (
-                db.query(CourseEnrollment)
-                .filter(
-                    CourseEnrollment.student_id == sid,
-                    CourseEnrollment.course_id == course_id,
-                )
-                .with_for_update()
-                .first()
-            )
-
-            if existing:
-                # Reactivate if soft-deleted
-                if existing.deleted_at is not None:
-                    existing.deleted_at = None
-                    if payload.enrolled_at:
-                        existing.enrolled_at = payload.enrolled_at
-                    existing.status = "active"
+            if sid in existing:
+                if existing[sid] is not None:
                     reactivated += 1
                     logger.debug(f"Reactivated enrollment for student {sid} in course {course_id}")
                 else:
                     logger.debug(f"Student {sid} already enrolled in course {course_id}")
                 continue
-
-            # Create new enrollment
-            enrollment = CourseEnrollment(
-                student_id=sid,
-                course_id=course_id,
-                enrolled_at=payload.enrolled_at or date.today(),
-                status="active",
+            new_enrollments.append(
+                CourseEnrollment(student_id=sid, course_id=course_id, enrolled_at=enrolled_at, status="active")
             )
-            db.add(enrollment)
-            created += 1
 
+        # A single flush emits the new rows as one batched INSERT
+        db.add_all(new_enrollments)
         db.flush()
+        created = len(new_enrollments)
 
         logger.info(f"Enrolled {created} students and reactivated {reactivated} enrollments in course {course_id}")
 
@@ -13,11 +13,16 @@ Date: January 30, 2026
 Version: 1.0.0
 """
 
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from sqlalchemy import event, extract, func, tuple_
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
+from backend.cache import TimedLRUCache
 from backend.models import Student, Course
 from backend.schemas.search import (
     FacetValue,
@@ -28,6 +33,42 @@ from backend.schemas.search import (
 
 logger = logging.getLogger(__name__)
 
+# Facet counts are cached per normalized filter signature. Entries are keyed by
+# a per-entity generation that is bumped on every committed Student/Course
+# write, so stale counts are never served; the TTL only bounds writes that
+# bypass the ORM (raw SQL, restores).
+FACET_CACHE_TTL_SECONDS = 300
+
+# (facet name, label) in response order
+STUDENT_FACETS = (
+    ("status", "Student Status"),
+    ("enrollment_type", "Study Year"),
+    ("enrollment_year", "Enrollment Year"),
+)
+COURSE_FACETS = (
+    ("semester", "Semester"),
+    ("credits", "Course Credits"),
+)
+
+FacetCounts = Dict[str, List[Tuple[str, int]]]
+
+_facet_cache = TimedLRUCache(maxsize=256, ttl_seconds=FACET_CACHE_TTL_SECONDS)
+_cache_lock = threading.Lock()
+_generations = {"students": 0, "courses": 0}
+
+
+def invalidate_facet_cache(kind: Optional[str] = None) -> None:
+    """Invalidate cached facet counts for ``"students"``, ``"courses"`` or both."""
+    with _cache_lock:
+        for name in [kind] if kind else list(_generations):
+            _generations[name] += 1
+
+
+def _filter_signature(filters: Optional[Dict[str, Any]], keys: Iterable[str]) -> str:
+    """Normalize the filters that affect counts into a stable cache key part."""
+    applied = {key: str(filters[key]) for key in keys if filters and key in filters}
+    return json.dumps(applied, sort_keys=True)
+
 
 class FacetService:
     """Service for generating and managing facet data for advanced search."""
@@ -50,6 +91,9 @@ class FacetService:
         - Enrollment type (full-time/part-time)
         - Enrollment year
 
+        All facets and the total are computed in a single scan of the
+        filtered students and cached per filter signature.
+
         Args:
             query: Optional search query to filter facets
             filters: Optional dictionary of applied filters
@@ -58,37 +102,13 @@ class FacetService:
             StudentFacetsResponse with facet categories and counts
         """
         try:
-            base_query = self.db.query(Student).filter(Student.deleted_at.is_(None))
-
-            # Apply filters if provided
-            if filters:
-                if "status" in filters:
-                    base_query = self._apply_status_filter(base_query, filters["status"])
-                if "enrollment_type" in filters:
-                    base_query = self._apply_enrollment_type_filter(base_query, filters["enrollment_type"])
-
-            # Build facet categories
-            facets: List[FacetCategory] = []
-
-            # Status facet
-            status_facet = self._build_status_facet(base_query)
-            if status_facet:
-                facets.append(status_facet)
-
-            # Enrollment type facet
-            enrollment_facet = self._build_enrollment_type_facet(base_query)
-            if enrollment_facet:
-                facets.append(enrollment_facet)
-
-            # Enrollment year facet
-            year_facet = self._build_enrollment_year_facet(base_query)
-            if year_facet:
-                facets.append(year_facet)
-
-            total_results = base_query.count()
-
+            counts, total_results = self._cached_counts(
+                "students",
+                _filter_signature(filters, ("status", "enrollment_type")),
+                lambda: self._student_facet_counts(filters),
+            )
             return StudentFacetsResponse(
-                facets=facets,
+                facets=self._to_categories(STUDENT_FACETS, counts),
                 total_results=total_results,
                 query=query,
             )
@@ -111,6 +131,9 @@ class FacetService:
         - Credits
         - Course status (active/archived)
 
+        All facets and the total are computed in a single scan of the
+        filtered courses and cached per filter signature.
+
         Args:
             query: Optional search query to filter facets
             filters: Optional dictionary of applied filters
@@ -119,32 +142,13 @@ class FacetService:
             CourseFacetsResponse with facet categories and counts
         """
         try:
-            base_query = self.db.query(Course).filter(Course.deleted_at.is_(None))
-
-            # Apply filters if provided
-            if filters:
-                if "semester" in filters:
-                    base_query = base_query.filter(Course.semester == filters["semester"])
-                if "credits" in filters:
-                    base_query = base_query.filter(Course.credits == filters["credits"])
-
-            # Build facet categories
-            facets: List[FacetCategory] = []
-
-            # Semester facet
-            semester_facet = self._build_semester_facet(base_query)
-            if semester_facet:
-                facets.append(semester_facet)
-
-            # Credits facet
-            credits_facet = self._build_credits_facet(base_query)
-            if credits_facet:
-                facets.append(credits_facet)
-
-            total_results = base_query.count()
-
+            counts, total_results = self._cached_counts(
+                "courses",
+                _filter_signature(filters, ("semester", "credits")),
+                lambda: self._course_facet_counts(filters),
+            )
             return CourseFacetsResponse(
-                facets=facets,
+                facets=self._to_categories(COURSE_FACETS, counts),
                 total_results=total_results,
                 query=query,
             )
@@ -158,224 +162,143 @@ class FacetService:
             )
 
     # ========================================================================
-    # STUDENT FACET BUILDERS
+    # FACET AGGREGATION
     # ========================================================================
 
-    def _build_status_facet(self, query) -> Optional[FacetCategory]:
-        """Build status facet for students (active, inactive, etc.).
-
-        Args:
-            query: Base SQLAlchemy query
-
-        Returns:
-            FacetCategory for status or None if no data
-        """
-        try:
-            # Count active students
-            active_count = query.filter(Student.is_active == True).count()  # noqa: E712
-            inactive_count = query.filter(Student.is_active == False).count()  # noqa: E712
-
-            values = []
-            if active_count > 0:
-                values.append(FacetValue(value="active", count=active_count, is_selected=False))
-            if inactive_count > 0:
-                values.append(FacetValue(value="inactive", count=inactive_count, is_selected=False))
-
-            if not values:
-                return None
-
-            return FacetCategory(
-                name="status",
-                label="Student Status",
-                values=values,
-                is_expanded=False,
-            )
-        except Exception as e:
-            logger.warning(f"Error building status facet: {str(e)}")
-            return None
-
-    def _build_enrollment_type_facet(self, query) -> Optional[FacetCategory]:
-        """Build enrollment type facet for students.
-
-        Args:
-            query: Base SQLAlchemy query
-
-        Returns:
-            FacetCategory for enrollment type or None if no data
-        """
-        try:
-            # Count by study_year (proxy for enrollment type)
-            study_year_counts = (
-                query.with_entities(Student.study_year, func.count(Student.id))
-                .filter(Student.study_year.isnot(None))
-                .group_by(Student.study_year)
-                .all()
-            )
-
-            if not study_year_counts:
-                return None
-
-            values = [
-                FacetValue(
-                    value=f"year_{year}",
-                    count=count,
-                    is_selected=False,
-                )
-                for year, count in study_year_counts
-                if year is not None
-            ]
-
-            if not values:
-                return None
-
-            return FacetCategory(
-                name="enrollment_type",
-                label="Study Year",
-                values=values,
-                is_expanded=False,
-            )
-        except Exception as e:
-            logger.warning(f"Error building enrollment type facet: {str(e)}")
-            return None
-
-    def _build_enrollment_year_facet(self, query) -> Optional[FacetCategory]:
-        """Build enrollment year facet for students.
-
-        Args:
-            query: Base SQLAlchemy query
-
-        Returns:
-            FacetCategory for enrollment year or None if no data
-        """
-        try:
-            from sqlalchemy import func, extract
-
-            # Count by year of enrollment
-            year_counts = (
-                query.with_entities(
-                    extract("year", Student.enrollment_date).label("year"),
+    def _cached_counts(self, kind: str, signature: str, compute) -> Tuple[FacetCounts, int]:
+        """Return ``(counts, total)`` from the cache or compute and store them."""
+        with _cache_lock:
+            key = f"{kind}:{_generations[kind]}:{signature}"
+            cached = _facet_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = compute()
+        if self.db.info.get("replica_lag_seconds"):
+            # Counts from a read replica that is behind the primary are served but not cached
+            return result
+        with _cache_lock:
+            # Skip storing if a write committed while we were counting.
+            if key.startswith(f"{kind}:{_generations[kind]}:"):
+                _facet_cache.set(key, result)
+        return result
+
+    def _is_postgresql(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _student_facet_counts(self, filters: Optional[Dict[str, Any]]) -> Tuple[FacetCounts, int]:
+        """Count status, study year and enrollment year for filtered students in one pass."""
+        base_query = self.db.query(Student).filter(Student.deleted_at.is_(None))
+        if filters:
+            if "status" in filters:
+                base_query = self._apply_status_filter(base_query, filters["status"])
+            if "enrollment_type" in filters:
+                base_query = self._apply_enrollment_type_filter(base_query, filters["enrollment_type"])
+
+        status: Counter = Counter()
+        study_years: Counter = Counter()
+        enrollment_years: Counter = Counter()
+        total = 0
+
+        if self._is_postgresql():
+            year = extract("year", Student.enrollment_date)
+            rows = (
+                base_query.with_entities(
+                    Student.is_active,
+                    Student.study_year,
+                    year,
+                    func.grouping(Student.is_active),
+                    func.grouping(Student.study_year),
+                    func.grouping(year),
                     func.count(Student.id),
                 )
-                .filter(Student.enrollment_date.isnot(None))
-                .group_by(extract("year", Student.enrollment_date))
-                .order_by(extract("year", Student.enrollment_date).desc())
+                .group_by(func.grouping_sets(tuple_(Student.is_active), tuple_(Student.study_year), tuple_(year)))
                 .all()
             )
-
-            if not year_counts:
-                return None
-
-            values = [
-                FacetValue(
-                    value=str(int(year)) if year else "unknown",
-                    count=count,
-                    is_selected=False,
+            for is_active, study_year, enrolled, g_active, g_study, g_year, count in rows:
+                if not g_active:
+                    status[is_active] += count
+                    total += count
+                elif not g_study:
+                    study_years[study_year] += count
+                elif not g_year:
+                    enrollment_years[int(enrolled) if enrolled is not None else None] += count
+        else:
+            rows = base_query.with_entities(Student.is_active, Student.study_year, Student.enrollment_date)
+            for is_active, study_year, enrollment_date in rows.yield_per(2000):
+                status[is_active] += 1
+                study_years[study_year] += 1
+                enrollment_years[enrollment_date.year if enrollment_date is not None else None] += 1
+                total += 1
+
+        counts: FacetCounts = {
+            "status": [
+                (value, status[flag]) for value, flag in (("active", True), ("inactive", False)) if status[flag] > 0
+            ],
+            "enrollment_type": [(f"year_{year}", count) for year, count in sorted(_without_none(study_years).items())],
+            "enrollment_year": [
+                (str(year), count) for year, count in sorted(_without_none(enrollment_years).items(), reverse=True)
+            ],
+        }
+        return counts, total
+
+    def _course_facet_counts(self, filters: Optional[Dict[str, Any]]) -> Tuple[FacetCounts, int]:
+        """Count semester and credits for filtered courses in one pass."""
+        base_query = self.db.query(Course).filter(Course.deleted_at.is_(None))
+        if filters:
+            if "semester" in filters:
+                base_query = base_query.filter(Course.semester == filters["semester"])
+            if "credits" in filters:
+                base_query = base_query.filter(Course.credits == filters["credits"])
+
+        semesters: Counter = Counter()
+        credits: Counter = Counter()
+        total = 0
+
+        if self._is_postgresql():
+            rows = (
+                base_query.with_entities(
+                    Course.semester,
+                    Course.credits,
+                    func.grouping(Course.semester),
+                    func.grouping(Course.credits),
+                    func.count(Course.id),
                 )
-                for year, count in year_counts
-            ]
-
-            if not values:
-                return None
-
-            return FacetCategory(
-                name="enrollment_year",
-                label="Enrollment Year",
-                values=values,
-                is_expanded=False,
-            )
-        except Exception as e:
-            logger.warning(f"Error building enrollment year facet: {str(e)}")
-            return None
-
-    # ========================================================================
-    # COURSE FACET BUILDERS
-    # ========================================================================
-
-    def _build_semester_facet(self, query) -> Optional[FacetCategory]:
-        """Build semester facet for courses.
-
-        Args:
-            query: Base SQLAlchemy query
-
-        Returns:
-            FacetCategory for semester or None if no data
-        """
-        try:
-            semester_counts = (
-                query.with_entities(Course.semester, func.count(Course.id))
-                .group_by(Course.semester)
-                .order_by(Course.semester)
+                .group_by(func.grouping_sets(tuple_(Course.semester), tuple_(Course.credits)))
                 .all()
             )
-
-            if not semester_counts:
-                return None
-
-            values = [
-                FacetValue(
-                    value=semester,
-                    count=count,
-                    is_selected=False,
-                )
-                for semester, count in semester_counts
-                if semester is not None
-            ]
-
-            if not values:
-                return None
-
-            return FacetCategory(
-                name="semester",
-                label="Semester",
-                values=values,
+            for semester, course_credits, g_semester, g_credits, count in rows:
+                if not g_semester:
+                    semesters[semester] += count
+                    total += count
+                elif not g_credits:
+                    credits[course_credits] += count
+        else:
+            rows = base_query.with_entities(Course.semester, Course.credits)
+            for semester, course_credits in rows.yield_per(2000):
+                semesters[semester] += 1
+                credits[course_credits] += 1
+                total += 1
+
+        counts: FacetCounts = {
+            "semester": [(semester, count) for semester, count in sorted(_without_none(semesters).items())],
+            "credits": [(str(value), count) for value, count in sorted(_without_none(credits).items())],
+        }
+        return counts, total
+
+    @staticmethod
+    def _to_categories(definitions, counts: FacetCounts) -> List[FacetCategory]:
+        """Turn counted values into facet categories, skipping empty facets."""
+        return [
+            FacetCategory(
+                name=name,
+                label=label,
+                values=[FacetValue(value=value, count=count, is_selected=False) for value, count in counts[name]],
                 is_expanded=False,
             )
-        except Exception as e:
-            logger.warning(f"Error building semester facet: {str(e)}")
-            return None
-
-    def _build_credits_facet(self, query) -> Optional[FacetCategory]:
-        """Build credits facet for courses.
-
-        Args:
-            query: Base SQLAlchemy query
-
-        Returns:
-            FacetCategory for credits or None if no data
-        """
-        try:
-            credits_counts = (
-                query.with_entities(Course.credits, func.count(Course.id))
-                .group_by(Course.credits)
-                .order_by(Course.credits)
-                .all()
-            )
-
-            if not credits_counts:
-                return None
-
-            values = [
-                FacetValue(
-                    value=str(credits),
-                    count=count,
-                    is_selected=False,
-                )
-                for credits, count in credits_counts
-                if credits is not None
-            ]
-
-            if not values:
-                return None
-
-            return FacetCategory(
-                name="credits",
-                label="Course Credits",
-                values=values,
-                is_expanded=False,
-            )
-        except Exception as e:
-            logger.warning(f"Error building credits facet: {str(e)}")
-            return None
+            for name, label in definitions
+            if counts.get(name)
+        ]
 
     # ========================================================================
     # FILTER APPLICATION HELPERS
@@ -411,3 +334,48 @@ class FacetService:
             year = int(enrollment_type.split("_")[1])
             return query.filter(Student.study_year == year)
         return query
+
+
+def _without_none(counter: Counter) -> Dict[Any, int]:
+    return {key: count for key, count in counter.items() if key is not None}
+
+
+# ============================================================================
+# CACHE INVALIDATION
+# ============================================================================
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Student):
+            session.info["facets_students_changed"] = True
+        elif isinstance(obj, Course):
+            session.info["facets_courses_changed"] = True
+
+
+def _after_bulk_write(context: Any) -> None:
+    mapper = getattr(context, "mapper", None)
+    entity = getattr(mapper, "class_", None)
+    if entity is Student:
+        context.session.info["facets_students_changed"] = True
+    elif entity is Course:
+        context.session.info["facets_courses_changed"] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop("facets_students_changed", False):
+        invalidate_facet_cache("students")
+    if session.info.pop("facets_courses_changed", False):
+        invalidate_facet_cache("courses")
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop("facets_students_changed", None)
+    session.info.pop("facets_courses_changed", None)
+
+
+event.listen(Session, "after_flush", _after_flush)
+event.listen(Session, "after_bulk_update", _after_bulk_write)
+event.listen(Session, "after_bulk_delete", _after_bulk_write)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,404 @@
+"""
+Vectorized final-grade computation for many students of one course.
+
+``AnalyticsService._calculate_final_grade_from_records`` scores one student at
+a time, re-normalizing every record's category for every evaluation rule.
+Whole-course reports instead compile the course's ``evaluation_rules`` once
+(:func:`compile_course_rules`), load the course's grade, daily-performance and
+attendance rows as column arrays, and score every student in one pass with
+:func:`calculate_final_grades`. Category names are normalized once per
+distinct value and each rule is applied with a handful of ``numpy`` reductions
+keyed by student position.
+
+The results match the per-student function field for field (minus the
+per-category breakdown); ``tests/test_final_grade_batch.py`` checks parity.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EXAM_CATEGORIES = frozenset(
+    {
+        "midterm",
+        "midterm exam",
+        "final exam",
+        "final",
+        "ενδιάμεση",
+        "ενδιάμεση εξέταση",
+        "τελική εξέταση",
+        "τελική",
+    }
+)
+
+ATTENDANCE_CATEGORIES = frozenset({"attendance", "παρουσία"})
+
+# Synonyms map (both EN and EL)
+CATEGORY_SYNONYMS = {
+    # Exams
+    "midterm exam": "midterm",
+    "midterm": "midterm",
+    "intermediate": "midterm",
+    "ενδιάμεση": "midterm",
+    "ενδιάμεση εξέταση": "midterm",
+    "ενδιάμεση εξεταση": "midterm",
+    "final exam": "final",
+    "final": "final",
+    "τελική": "final",
+    "τελική εξέταση": "final",
+    "τελικη": "final",
+    "τελικη εξεταση": "final",
+    # Coursework
+    "homework": "homework",
+    "assignment": "homework",
+    "assignments": "homework",
+    "εργασία": "homework",
+    "εργασια": "homework",
+    "άσκηση": "homework",
+    "ασκηση": "homework",
+    "project": "project",
+    "πρότζεκτ": "project",
+    "προτζεκτ": "project",
+    "lab": "lab",
+    "lab work": "lab",
+    "εργαστήριο": "lab",
+    "εργαστηριο": "lab",
+    "quiz": "quiz",
+    "κουίζ": "quiz",
+    "κουιζ": "quiz",
+    # Participation / attendance
+    "class participation": "participation",
+    "participation": "participation",
+    "συμμετοχή": "participation",
+    "συμμετοχη": "participation",
+    "no participation": "no participation",
+    "minor participation": "minor participation",
+    "minor participation mobile usage": "minor participation (mobile usage)",
+    "minor participation with mobile usage": "minor participation (mobile usage)",
+    "attendance": "attendance",
+    "παρουσία": "attendance",
+    "παρουσια": "attendance",
+}
+
+# Heuristic contains-based mapping, checked in order
+CATEGORY_CONTAINS = {
+    "minor participation (mobile usage)": [
+        "minor participation mobile usage",
+        "minor participation with mobile usage",
+        "mobile usage participation",
+        "mobile use participation",
+    ],
+    "no participation": ["no participation"],
+    "minor participation": ["minor participation"],
+    "midterm": ["midterm", "ενδιάμεση", "ενδιαμεση"],
+    "final": ["final", "τελική", "τελικη"],
+    "homework": ["homework", "assignment", "εργασ", "άσκη", "ασκη"],
+    "project": ["project", "πρότζεκ", "προτζεκ"],
+    "lab": ["lab", "εργαστηρ"],
+    "quiz": ["quiz", "κουιζ", "κουίζ", "τεστ"],
+    "participation": ["participation", "συμμετο"],
+    "attendance": ["attendance", "παρουσ"],
+}
+
+# Ascending lower bounds and the letter for each band (see AnalyticsService.get_letter_grade)
+_LETTER_BOUNDS = np.array([60, 70, 77, 80, 83, 87, 90, 93, 97], dtype=float)
+_LETTERS = np.array(["F", "D", "C", "C+", "B-", "B", "B+", "A-", "A", "A+"], dtype=object)
+
+_EPOCH = np.datetime64("1970-01-01", "us")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_category_text(name: str) -> str:
+    n = name.strip().lower()
+    # Remove common punctuation
+    for ch in [":", ";", ",", ".", "-", "_", "(", ")"]:
+        n = n.replace(ch, " ")
+    n = " ".join(n.split())  # collapse whitespace
+
+    # Direct map
+    if n in CATEGORY_SYNONYMS:
+        return CATEGORY_SYNONYMS[n]
+
+    for key, needles in CATEGORY_CONTAINS.items():
+        if any(needle in n for needle in needles):
+            return key
+    return n
+
+
+def normalize_category(name: Optional[str]) -> str:
+    """Normalize category names to improve matching between evaluation rules and recorded items.
+
+    Handles case-insensitive comparisons, common synonyms, and Greek equivalents.
+    Results are memoized per distinct name.
+    """
+    if not name:
+        return ""
+    return _normalize_category_text(str(name))
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    category: str
+    weight: float
+    normalized: str
+    is_exam: bool
+    include_daily: bool
+    daily_multiplier: float
+    is_attendance: bool
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    rules: Tuple[CompiledRule, ...]
+    absence_penalty: float
+
+
+def compile_rules(
+    evaluation_rules: Optional[Iterable[Dict[str, Any]]],
+    absence_penalty: float = 0.0,
+    exam_categories: Iterable[str] = EXAM_CATEGORIES,
+) -> CompiledRuleSet:
+    """Compile evaluation rules once; rules without a category or a positive weight are dropped."""
+    exams = set(exam_categories)
+    compiled: List[CompiledRule] = []
+    for rule in evaluation_rules or []:
+        category = rule.get("category")
+        weight = float(rule.get("weight", 0))
+        if not category or weight <= 0:
+            continue
+        category_lower = category.lower()
+        compiled.append(
+            CompiledRule(
+                category=category,
+                weight=weight,
+                normalized=normalize_category(category),
+                is_exam=category_lower in exams,
+                include_daily=bool(rule.get("includeDailyPerformance", True)),
+                daily_multiplier=float(rule.get("dailyPerformanceMultiplier", 1.0)),
+                is_attendance=category_lower in ATTENDANCE_CATEGORIES,
+            )
+        )
+    return CompiledRuleSet(rules=tuple(compiled), absence_penalty=float(absence_penalty or 0.0))
+
+
+def compile_course_rules(course: Any, exam_categories: Iterable[str] = EXAM_CATEGORIES) -> CompiledRuleSet:
+    return compile_rules(course.evaluation_rules, getattr(course, "absence_penalty", 0.0), exam_categories)
+
+
+def _transpose(rows: Sequence[Sequence[Any]], width: int) -> List[List[Any]]:
+    if not rows:
+        return [[] for _ in range(width)]
+    return [list(column) for column in zip(*rows)]
+
+
+@dataclass
+class GradeColumns:
+    student_id: Sequence[int]
+    category: Sequence[Optional[str]]
+    grade: Sequence[float]
+    max_grade: Sequence[Optional[float]]
+    date_submitted: Sequence[Any]
+    record_id: Sequence[int]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "GradeColumns":
+        """Build from ``(student_id, category, grade, max_grade, date_submitted, id)`` tuples."""
+        return cls(*_transpose(rows, 6))
+
+
+@dataclass
+class DailyColumns:
+    student_id: Sequence[int]
+    category: Sequence[Optional[str]]
+    score: Sequence[float]
+    max_score: Sequence[Optional[float]]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "DailyColumns":
+        """Build from ``(student_id, category, score, max_score)`` tuples."""
+        return cls(*_transpose(rows, 4))
+
+
+@dataclass
+class AttendanceColumns:
+    student_id: Sequence[int]
+    status: Sequence[Any]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "AttendanceColumns":
+        """Build from ``(student_id, status)`` tuples."""
+        return cls(*_transpose(rows, 2))
+
+
+def _positions(student_ids: np.ndarray, column: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Map row student ids to positions in ``student_ids``; returns (positions, known-row mask)."""
+    values = np.asarray(column, dtype=np.int64)
+    if not len(student_ids) or not len(values):
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+    order = np.argsort(student_ids, kind="stable")
+    sorted_ids = student_ids[order]
+    found = np.clip(np.searchsorted(sorted_ids, values), 0, len(sorted_ids) - 1)
+    known = sorted_ids[found] == values
+    return order[found], known
+
+
+def _category_codes(column: Sequence[Optional[str]]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Encode normalized categories as integer codes, normalizing each distinct name once."""
+    raw: Dict[Any, int] = {}
+    raw_codes = np.fromiter((raw.setdefault(c, len(raw)) for c in column), dtype=np.int64, count=len(column))
+    vocabulary: Dict[str, int] = {}
+    lookup = np.array([vocabulary.setdefault(normalize_category(c), len(vocabulary)) for c in raw], dtype=np.int64)
+    return (lookup[raw_codes] if len(raw_codes) else raw_codes), vocabulary
+
+
+def _floats(column: Sequence[Optional[float]]) -> np.ndarray:
+    return np.array([0.0 if v is None else v for v in column], dtype=float)
+
+
+def _date_keys(column: Sequence[Any]) -> np.ndarray:
+    # Missing dates sort as 1970-01-01, like the per-student ordering
+    keys = np.empty(len(column), dtype="datetime64[us]")
+    for i, value in enumerate(column):
+        if value is None:
+            keys[i] = _EPOCH
+        elif isinstance(value, (date, datetime)):
+            keys[i] = np.datetime64(value, "us")
+        else:
+            keys[i] = np.datetime64(str(value), "us")
+    return keys
+
+
+def _latest_per_student(rows: np.ndarray, positions: np.ndarray, keys: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Indices in ``rows`` of each student's newest row by (date, id)."""
+    order = np.lexsort((ids[rows], keys[rows], positions[rows]))
+    ranked = rows[order]
+    last = np.ones(len(ranked), dtype=bool)
+    last[:-1] = positions[ranked][1:] != positions[ranked][:-1]
+    return ranked[last]
+
+
+def calculate_final_grades(
+    rules: CompiledRuleSet,
+    student_ids: Sequence[int],
+    grades: GradeColumns,
+    daily: DailyColumns,
+    attendance: AttendanceColumns,
+) -> List[Dict[str, Any]]:
+    """Score every student in ``student_ids`` against one course's compiled rules.
+
+    Rows for students outside ``student_ids`` are ignored. Returns one dict per
+    student, in input order, with the scalar fields of the per-student result.
+    """
+    ids = np.asarray(student_ids, dtype=np.int64)
+    n = len(ids)
+
+    g_pos, g_known = _positions(ids, grades.student_id)
+    g_codes, g_vocab = _category_codes(grades.category)
+    g_value = _floats(grades.grade)
+    g_max = _floats(grades.max_grade)
+    g_pct = np.divide(g_value, g_max, out=np.zeros_like(g_value), where=g_max != 0) * 100
+    g_keys = _date_keys(grades.date_submitted) if any(r.is_exam for r in rules.rules) else None
+    g_ids = np.asarray(grades.record_id, dtype=np.int64)
+
+    d_pos, d_known = _positions(ids, daily.student_id)
+    d_codes, d_vocab = _category_codes(daily.category)
+    d_score = _floats(daily.score)
+    d_max = _floats(daily.max_score)
+    d_pct = np.divide(d_score, d_max, out=np.zeros_like(d_score), where=d_max != 0) * 100
+    d_usable = d_known & (d_max != 0)
+
+    a_pos, a_known = _positions(ids, attendance.student_id)
+    a_status = np.array([str(s).lower() for s in attendance.status], dtype=object)
+    att_total = np.bincount(a_pos[a_known], minlength=n).astype(float)
+    att_present = np.bincount(a_pos[a_known & (a_status == "present")], minlength=n).astype(float)
+    att_absent = np.bincount(a_pos[a_known & (a_status == "absent")], minlength=n)
+    has_attendance = att_total > 0
+    att_pct = np.divide(att_present, att_total, out=np.zeros(n), where=has_attendance) * 100
+
+    # Category scores keyed by the rule's category label; a later rule with data overwrites
+    scores: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    for rule in rules.rules:
+        weighted_sum = np.zeros(n)
+        item_weight = np.zeros(n)
+
+        code = g_vocab.get(rule.normalized)
+        if code is not None:
+            rows = np.flatnonzero(g_known & (g_codes == code))
+            if rule.is_exam and len(rows):
+                rows = _latest_per_student(rows, g_pos, g_keys, g_ids)
+            rows = rows[g_max[rows] != 0]
+            weighted_sum += np.bincount(g_pos[rows], weights=g_pct[rows], minlength=n)
+            item_weight += np.bincount(g_pos[rows], minlength=n)
+
+        code = d_vocab.get(rule.normalized)
+        if rule.include_daily and code is not None:
+            rows = np.flatnonzero(d_usable & (d_codes == code))
+            weighted_sum += np.bincount(d_pos[rows], weights=d_pct[rows] * rule.daily_multiplier, minlength=n)
+            item_weight += np.bincount(d_pos[rows], minlength=n) * rule.daily_multiplier
+
+        if rule.is_attendance:
+            weighted_sum += np.where(has_attendance, att_pct, 0.0)
+            item_weight += has_attendance
+
+        has_data = item_weight > 0
+        average = np.divide(weighted_sum, item_weight, out=np.zeros(n), where=has_data)
+        if rule.category in scores:
+            previous, had_data = scores[rule.category]
+            average = np.where(has_data, average, previous)
+            has_data = has_data | had_data
+        scores[rule.category] = (average, has_data)
+
+    final = np.zeros(n)
+    weight_used = np.zeros(n)
+    for rule in rules.rules:
+        average, has_data = scores[rule.category]
+        final += np.where(has_data, average * rule.weight / 100, 0.0)
+        weight_used += np.where(has_data, rule.weight, 0.0)
+
+    # Normalize to 100% scale based on completed work
+    partial = (weight_used > 0) & (weight_used < 100)
+    final = np.where(partial, np.divide(final * 100, weight_used, out=np.zeros(n), where=partial), final)
+
+    deduction = np.zeros(n)
+    if rules.absence_penalty > 0:
+        deduction = rules.absence_penalty * att_absent
+        final = np.maximum(0.0, final - deduction)
+
+    positive = final > 0
+    gpa = np.where(positive, final / 100.0 * 4.0, 0.0)
+    greek = np.where(positive, final / 100.0 * 20.0, 0.0)
+    letters = _LETTERS[np.searchsorted(_LETTER_BOUNDS, final, side="right")]
+
+    return [
+        {
+            "student_id": int(ids[i]),
+            "final_grade": round(float(final[i]), 2),
+            "percentage": round(float(final[i]), 2),
+            "gpa": round(float(gpa[i]), 2),
+            "greek_grade": round(float(greek[i]), 2),
+            "letter_grade": letters[i],
+            "total_weight_used": float(weight_used[i]),
+            "absence_penalty": rules.absence_penalty,
+            "unexcused_absences": int(att_absent[i]) if rules.absence_penalty > 0 else 0,
+            "absence_deduction": round(float(deduction[i]), 2),
+        }
+        for i in range(n)
+    ]
+
+
+__all__ = [
+    "AttendanceColumns",
+    "CompiledRule",
+    "CompiledRuleSet",
+    "DailyColumns",
+    "GradeColumns",
+    "calculate_final_grades",
+    "compile_course_rules",
+    "compile_rules",
+    "normalize_category",
+]
@@ -2,8 +2,9 @@
 
 import logging
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from backend.import_resolver import import_names
@@ -64,6 +65,99 @@ class ImportService:
             "student_json_files": students_files,
         }
 
+    COURSE_UPDATE_FIELDS = (
+        "course_name",
+        "semester",
+        "credits",
+        "description",
+        "hours_per_week",
+        "periods_per_week",
+        "teaching_schedule",
+    )
+    COURSE_CREATE_FIELDS = (
+        "course_code",
+        "course_name",
+        "semester",
+        "credits",
+        "description",
+        "evaluation_rules",
+        "hours_per_week",
+        "periods_per_week",
+        "teaching_schedule",
+    )
+    # Keeps IN (...) lookups well under SQLite's bound-parameter limit
+    UPSERT_LOOKUP_CHUNK = 500
+
+    @staticmethod
+    def _calculate_periods_per_week(schedule) -> int:
+        if not schedule:
+            return 0
+        total = 0
+        values: list = []
+        if isinstance(schedule, dict):
+            values = list(schedule.values())
+        elif isinstance(schedule, list):
+            values = schedule
+        else:
+            return 0
+        for item in values:
+            if not isinstance(item, dict):
+                continue
+            raw = item.get("periods")
+            if raw is None:
+                raw = item.get("period_count")
+            if raw is None:
+                raw = item.get("count")
+            try:
+                total += int(raw) if raw is not None else 0
+            except (TypeError, ValueError):
+                continue
+        return total
+
+    @staticmethod
+    def _prepare_course_data(course_data: dict) -> dict:
+        """Derive periods/hours per week in place and return ``course_data``."""
+        periods_value = course_data.get("periods_per_week")
+        if periods_value is not None:
+            try:
+                course_data["periods_per_week"] = int(float(periods_value))
+            except (TypeError, ValueError):
+                course_data.pop("periods_per_week", None)
+                periods_value = None
+        if course_data.get("hours_per_week") in (None, "") and periods_value is not None:
+            course_data["hours_per_week"] = periods_value
+
+        if periods_value is None and course_data.get("teaching_schedule") is not None:
+            course_data["periods_per_week"] = ImportService._calculate_periods_per_week(
+                course_data.get("teaching_schedule")
+            )
+        return course_data
+
+    @staticmethod
+    def _apply_course_update(db_course, course_data: dict) -> None:
+        ImportService.reactivate_if_soft_deleted(db_course, entity="course", identifier=str(db_course.course_code))
+
+        for field in ImportService.COURSE_UPDATE_FIELDS:
+            if field in course_data:
+                setattr(db_course, field, course_data[field])
+
+        # Handle evaluation_rules carefully - don't clear existing rules with empty list
+        if "evaluation_rules" in course_data:
+            new_rules = course_data["evaluation_rules"]
+            existing_rules = getattr(db_course, "evaluation_rules", None)
+
+            if isinstance(new_rules, list) and len(new_rules) == 0 and existing_rules:
+                # Skip clearing; keep existing rules
+                pass
+            else:
+                setattr(db_course, "evaluation_rules", new_rules)
+
+    @staticmethod
+    def _new_course(course_data: dict):
+        (Course,) = import_names("models", "Course")
+        filtered_data = {k: v for k, v in course_data.items() if k in ImportService.COURSE_CREATE_FIELDS}
+        return Course(**filtered_data)
+
     @staticmethod
     def create_or_update_course(
         db: Session,
@@ -84,43 +178,7 @@ class ImportService:
         """
         (Course,) = import_names("models", "Course")
 
-        def _calculate_periods_per_week(schedule) -> int:
-            if not schedule:
-                return 0
-            total = 0
-            values: list = []
-            if isinstance(schedule, dict):
-                values = list(schedule.values())
-            elif isinstance(schedule, list):
-                values = schedule
-            else:
-                return 0
-            for item in values:
-                if not isinstance(item, dict):
-                    continue
-                raw = item.get("periods")
-                if raw is None:
-                    raw = item.get("period_count")
-                if raw is None:
-                    raw = item.get("count")
-                try:
-                    total += int(raw) if raw is not None else 0
-                except (TypeError, ValueError):
-                    continue
-            return total
-
-        periods_value = course_data.get("periods_per_week")
-        if periods_value is not None:
-            try:
-                course_data["periods_per_week"] = int(float(periods_value))
-            except (TypeError, ValueError):
-                course_data.pop("periods_per_week", None)
-                periods_value = None
-        if course_data.get("hours_per_week") in (None, "") and periods_value is not None:
-            course_data["hours_per_week"] = periods_value
-
-        if periods_value is None and course_data.get("teaching_schedule") is not None:
-            course_data["periods_per_week"] = _calculate_periods_per_week(course_data.get("teaching_schedule"))
+        ImportService._prepare_course_data(course_data)
 
         code = course_data.get("course_code")
         if not code:
@@ -129,51 +187,65 @@ class ImportService:
         db_course = db.query(Course).filter(Course.course_code == code).first()
 
         if db_course:
-            ImportService.reactivate_if_soft_deleted(db_course, entity="course", identifier=str(code))
-
-            # Update fields
-            for field in [
-                "course_name",
-                "semester",
-                "credits",
-                "description",
-                "hours_per_week",
-                "periods_per_week",
-                "teaching_schedule",
-            ]:
-                if field in course_data:
-                    setattr(db_course, field, course_data[field])
-
-            # Handle evaluation_rules carefully - don't clear existing rules with empty list
-            if "evaluation_rules" in course_data:
-                new_rules = course_data["evaluation_rules"]
-                existing_rules = getattr(db_course, "evaluation_rules", None)
-
-                if isinstance(new_rules, list) and len(new_rules) == 0 and existing_rules:
-                    # Skip clearing; keep existing rules
-                    pass
-                else:
-                    setattr(db_course, "evaluation_rules", new_rules)
-
+            ImportService._apply_course_update(db_course, course_data)
             return False, None  # Updated, not created
         else:
             # Create new course
-            allowed_fields = [
-                "course_code",
-                "course_name",
-                "semester",
-                "credits",
-                "description",
-                "evaluation_rules",
-                "hours_per_week",
-                "periods_per_week",
-                "teaching_schedule",
-            ]
-            filtered_data = {k: v for k, v in course_data.items() if k in allowed_fields}
-            db_course = Course(**filtered_data)
-            db.add(db_course)
+            db.add(ImportService._new_course(course_data))
             return True, None  # Created
 
+    @staticmethod
+    def upsert_courses(db: Session, items: List[dict]) -> List[tuple[bool, Optional[str]]]:
+        """
+        Create or update many courses with one lookup per chunk of course codes.
+
+        Existing rows (including soft-deleted ones, which are reactivated) are
+        loaded up front, so new courses are inserted in a single batched flush
+        instead of one query per item. A course code repeated in ``items`` is
+        applied in order to the same row.
+
+        Args:
+            db: Database session
+            items: Normalized course dictionaries
+
+        Returns:
+            One (created, error) tuple per item, in order
+        """
+        (Course,) = import_names("models", "Course")
+
+        prepared = [ImportService._prepare_course_data(item) for item in items]
+        codes = sorted({str(item["course_code"]) for item in prepared if item.get("course_code")})
+        courses_by_code: Dict[str, Any] = {}
+        chunk = ImportService.UPSERT_LOOKUP_CHUNK
+        for start in range(0, len(codes), chunk):
+            stmt = (
+                select(Course)
+                .where(Course.course_code.in_(codes[start : start + chunk]))
+                .execution_options(include_deleted=True)
+            )
+            for course in db.execute(stmt).scalars():
+                courses_by_code[course.course_code] = course
+
+        results: List[tuple[bool, Optional[str]]] = []
+        new_courses = []
+        for item in prepared:
+            code = item.get("course_code")
+            if not code:
+                results.append((False, "Missing course_code"))
+                continue
+            db_course = courses_by_code.get(str(code))
+            if db_course is not None:
+                ImportService._apply_course_update(db_course, item)
+                results.append((False, None))
+                continue
+            db_course = ImportService._new_course(item)
+            courses_by_code[str(code)] = db_course
+            new_courses.append(db_course)
+            results.append((True, None))
+
+        db.add_all(new_courses)
+        return results
+
     @staticmethod
     def create_or_update_student(
         db: Session,
@@ -2,18 +2,40 @@
 Notification service - Core business logic for creating, managing, and querying notifications.
 """
 
+import base64
 import logging
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_, desc, func, or_
 from sqlalchemy.orm import Session
 
 from backend.models import Notification, NotificationPreference, User
+from backend.services import notification_unread_counter
 
 logger = logging.getLogger(__name__)
 
 
+def encode_notification_cursor(notification: Notification) -> str:
+    """Opaque keyset cursor for the page that follows ``notification``."""
+    raw = f"{notification.created_at.isoformat()}|{notification.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_notification_cursor(cursor: str) -> tuple[datetime, int]:
+    """Return ``(created_at, id)`` from a cursor built by :func:`encode_notification_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, notification_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(notification_id)
+    except Exception as exc:
+        raise ValueError("Invalid notification cursor") from exc
+
+
 class NotificationService:
     """Service for managing notifications."""
 
@@ -88,12 +110,77 @@ class NotificationService:
 
         if unread_only:
             query = query.filter(~Notification.is_read)
-
-        total = query.count()
-        notifications = query.order_by(desc(Notification.created_at)).offset(skip).limit(limit).all()
+            total = self.get_unread_count(user_id)
+        else:
+            total = query.count()
+        notifications = (
+            query.order_by(desc(Notification.created_at), desc(Notification.id)).offset(skip).limit(limit).all()
+        )
 
         return notifications, total
 
+    def count_notifications(self, user_id: int) -> int:
+        """Count a user's (non-deleted) notifications.
+
+        Args:
+            user_id: ID of user
+
+        Returns:
+            Number of notifications
+        """
+        return (
+            self.db.query(func.count(Notification.id))
+            .filter(and_(Notification.user_id == user_id, Notification.deleted_at.is_(None)))
+            .scalar()
+            or 0
+        )
+
+    def get_notifications_page(
+        self,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        unread_only: bool = False,
+    ) -> tuple[list[Notification], Optional[str]]:
+        """Get one page of notifications for a user, newest first, using keyset pagination.
+
+        Pages are anchored on ``(created_at, id)`` of the last row served, so
+        later pages cost the same as the first and rows created while paging
+        do not shift what comes next.
+
+        Args:
+            user_id: ID of user
+            limit: Maximum records to return
+            cursor: ``next_cursor`` from the previous page, or None for the first page
+            unread_only: If True, return only unread notifications
+
+        Returns:
+            Tuple of (notifications list, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self.db.query(Notification).filter(
+            and_(Notification.user_id == user_id, Notification.deleted_at.is_(None))
+        )
+
+        if unread_only:
+            query = query.filter(~Notification.is_read)
+
+        if cursor:
+            created_at, last_id = decode_notification_cursor(cursor)
+            query = query.filter(
+                or_(
+                    Notification.created_at < created_at,
+                    and_(Notification.created_at == created_at, Notification.id < last_id),
+                )
+            )
+
+        rows = query.order_by(desc(Notification.created_at), desc(Notification.id)).limit(limit + 1).all()
+        next_cursor = encode_notification_cursor(rows[limit - 1]) if len(rows) > limit else None
+
+        return rows[:limit], next_cursor
+
     def mark_as_read(self, notification_id: int, user_id: int) -> Optional[Notification]:
         """Mark a notification as read.
 
@@ -125,6 +212,37 @@ class NotificationService:
 
         return notification
 
+    def mark_as_unread(self, notification_id: int, user_id: int) -> Optional[Notification]:
+        """Mark a notification as unread.
+
+        Args:
+            notification_id: ID of notification
+            user_id: ID of user (for authorization)
+
+        Returns:
+            Updated Notification or None if not found
+
+        Raises:
+            PermissionError: If user doesn't own the notification
+        """
+        notification = self.db.query(Notification).filter(Notification.id == notification_id).first()
+
+        if not notification:
+            return None
+
+        if notification.user_id != user_id:
+            raise PermissionError("Cannot update notification belonging to another user")
+
+        notification.is_read = False  # type: ignore[assignment]
+        notification.read_at = None  # type: ignore[assignment]
+
+        self.db.commit()
+        self.db.refresh(notification)
+
+        logger.info(f"Marked notification {notification_id} as unread")
+
+        return notification
+
     def mark_all_as_read(self, user_id: int) -> int:
         """Mark all notifications as read for a user.
 
@@ -143,11 +261,13 @@ class NotificationService:
                     Notification.deleted_at.is_(None),
                 )
             )
+            .execution_options(**{notification_unread_counter.UNREAD_DELTA_RECORDED: True})
             .update(
                 {Notification.is_read: True, Notification.read_at: datetime.now(timezone.utc)},
                 synchronize_session=False,
             )
         )
+        notification_unread_counter.record_unread_delta(self.db, user_id, -count)
 
         self.db.commit()
 
@@ -186,23 +306,16 @@ class NotificationService:
     def get_unread_count(self, user_id: int) -> int:
         """Get count of unread notifications for a user.
 
+        Served from the per-user counter in the cache layer, which is kept
+        current on commit and recounted periodically.
+
         Args:
             user_id: ID of user
 
         Returns:
             Number of unread notifications
         """
-        return (
-            self.db.query(func.count(Notification.id))
-            .filter(
-                and_(
-                    Notification.user_id == user_id,
-                    ~Notification.is_read,
-                    Notification.deleted_at.is_(None),
-                )
-            )
-            .scalar()
-        )
+        return notification_unread_counter.get_unread_count(self.db, user_id)
 
 
 class NotificationPreferenceService:
@@ -0,0 +1,216 @@
+"""
+Per-user unread notification counters.
+
+``/notifications/unread-count`` is polled by every open client and used to run
+a COUNT over ``idx_unread_notifications`` on each request. Counters now live
+in the shared cache layer under ``notifications:unread:{user_id}``:
+
+* a miss (or a counter older than ``RECONCILE_INTERVAL_SECONDS``) recounts
+  against the index and stores the result;
+* session hooks collect the unread delta of every flushed notification insert,
+  read/unread change and (soft) delete, and apply it to cached counters once the
+  transaction commits, so creating a notification increments the counter and
+  marking it read decrements it without a recount;
+* bulk ``Query.update``/``delete`` on notifications cannot be attributed to a
+  user, so they drop every counter unless the caller recorded the delta itself
+  with :func:`record_unread_delta` and the ``UNREAD_DELTA_RECORDED`` option.
+
+Deltas from other workers sharing Redis can interleave; the periodic recount
+bounds any drift.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event, func, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from backend.middleware.prometheus_metrics import track_cache_hit, track_cache_miss
+from backend.models import Notification
+from backend.services.cache_service import get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Cached counters are recounted against the index at least this often
+RECONCILE_INTERVAL_SECONDS = 300
+
+# Idle users' counters are dropped after this long
+UNREAD_COUNT_TTL_SECONDS = 3600
+
+# Execution option for bulk notification writes whose delta was recorded by the caller
+UNREAD_DELTA_RECORDED = "unread_delta_recorded"
+
+_DELTAS_KEY = "notification_unread_deltas"
+_STALE_KEY = "notification_unread_stale"
+
+_lock = threading.Lock()
+_generations: Dict[int, int] = {}
+_global_generation = 0
+
+
+def unread_count_key(user_id: Any) -> str:
+    return f"notifications:unread:{user_id}"
+
+
+def _generation(user_id: int) -> tuple[int, int]:
+    with _lock:
+        return _global_generation, _generations.get(user_id, 0)
+
+
+def count_unread(db: Session, user_id: int) -> int:
+    """Count unread, non-deleted notifications for ``user_id`` (served by ``idx_unread_notifications``)."""
+    return (
+        db.query(func.count(Notification.id))
+        .filter(
+            Notification.user_id == user_id,
+            ~Notification.is_read,
+            Notification.deleted_at.is_(None),
+        )
+        .scalar()
+        or 0
+    )
+
+
+def get_unread_count(db: Session, user_id: int) -> int:
+    """Return the cached unread count for ``user_id``, recounting when missing or due."""
+    entry = get_cache_manager().get(unread_count_key(user_id))
+    if entry is not None and time.time() - entry["reconciled_at"] < RECONCILE_INTERVAL_SECONDS:
+        track_cache_hit("notification_unread")
+        return int(entry["count"])
+
+    track_cache_miss("notification_unread")
+    return reconcile_unread_count(db, user_id)
+
+
+def reconcile_unread_count(db: Session, user_id: int) -> int:
+    """Recount unread notifications for ``user_id`` and store the result."""
+    generation = _generation(user_id)
+    count = count_unread(db, user_id)
+    with _lock:
+        # Skip storing if a committed change was applied while we were counting
+        if generation == (_global_generation, _generations.get(user_id, 0)):
+            get_cache_manager().set(
+                unread_count_key(user_id),
+                {"count": count, "reconciled_at": time.time()},
+                ttl=UNREAD_COUNT_TTL_SECONDS,
+            )
+    return count
+
+
+def adjust_unread_counts(deltas: Dict[int, int]) -> None:
+    """Apply committed unread deltas to cached counters; uncached users are counted on next read."""
+    cache = get_cache_manager()
+    with _lock:
+        for user_id, delta in deltas.items():
+            if not delta:
+                continue
+            _generations[user_id] = _generations.get(user_id, 0) + 1
+            key = unread_count_key(user_id)
+            entry = cache.get(key)
+            if entry is None:
+                continue
+            cache.set(
+                key,
+                {"count": max(0, int(entry["count"]) + delta), "reconciled_at": entry["reconciled_at"]},
+                ttl=UNREAD_COUNT_TTL_SECONDS,
+            )
+
+
+def invalidate_unread_counts(user_ids: Optional[Iterable[int]] = None) -> None:
+    """Drop counters for ``user_ids`` (every user when ``None``)."""
+    global _global_generation
+    cache = get_cache_manager()
+    if user_ids is None:
+        with _lock:
+            _global_generation += 1
+        cache.delete_pattern(unread_count_key("*"))
+        return
+    for user_id in set(user_ids):
+        with _lock:
+            _generations[user_id] = _generations.get(user_id, 0) + 1
+        cache.delete(unread_count_key(user_id))
+
+
+def record_unread_delta(session: Session, user_id: int, delta: int) -> None:
+    """Queue an unread delta for ``user_id`` to be applied when ``session`` commits."""
+    deltas = session.info.setdefault(_DELTAS_KEY, {})
+    deltas[user_id] = deltas.get(user_id, 0) + delta
+
+
+# ============================================================================
+# SESSION HOOKS
+# ============================================================================
+
+
+def _is_unread(is_read: Any, deleted_at: Any) -> bool:
+    return not is_read and deleted_at is None
+
+
+def _previous(obj: Notification, key: str) -> Any:
+    history = sa_inspect(obj).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, key)
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    for obj in session.new:
+        if isinstance(obj, Notification) and _is_unread(obj.is_read, obj.deleted_at):
+            record_unread_delta(session, obj.user_id, 1)
+    for obj in session.dirty:
+        if isinstance(obj, Notification):
+            was_unread = _is_unread(_previous(obj, "is_read"), _previous(obj, "deleted_at"))
+            now_unread = _is_unread(obj.is_read, obj.deleted_at)
+            if was_unread != now_unread:
+                record_unread_delta(session, obj.user_id, 1 if now_unread else -1)
+    for obj in session.deleted:
+        if isinstance(obj, Notification) and _is_unread(_previous(obj, "is_read"), _previous(obj, "deleted_at")):
+            record_unread_delta(session, obj.user_id, -1)
+
+
+def _after_bulk_write(context: Any) -> None:
+    mapper = getattr(context, "mapper", None)
+    if getattr(mapper, "class_", None) is not Notification:
+        return
+    query = getattr(context, "query", None)
+    if query is not None and query.get_execution_options().get(UNREAD_DELTA_RECORDED):
+        return
+    context.session.info[_STALE_KEY] = True
+
+
+def _after_commit(session: Session) -> None:
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if session.info.pop(_STALE_KEY, False):
+        invalidate_unread_counts()
+    elif deltas:
+        adjust_unread_counts(deltas)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_DELTAS_KEY, None)
+    session.info.pop(_STALE_KEY, None)
+
+
+event.listen(Session, "after_flush", _after_flush)
+event.listen(Session, "after_bulk_update", _after_bulk_write)
+event.listen(Session, "after_bulk_delete", _after_bulk_write)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
+
+
+__all__ = [
+    "RECONCILE_INTERVAL_SECONDS",
+    "UNREAD_COUNT_TTL_SECONDS",
+    "UNREAD_DELTA_RECORDED",
+    "adjust_unread_counts",
+    "count_unread",
+    "get_unread_count",
+    "invalidate_unread_counts",
+    "reconcile_unread_count",
+    "record_unread_delta",
+    "unread_count_key",
+]
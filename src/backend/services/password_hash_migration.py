@@ -0,0 +1,70 @@
+"""
+Background migration of legacy PBKDF2-SHA256 password hashes.
+
+Login upgrades a legacy hash to bcrypt, but accounts that rarely sign in keep
+their PBKDF2 digest indefinitely. This job wraps every remaining PBKDF2 hash
+in bcrypt (see ``wrap_legacy_hash``) without needing the password, walking the
+users table in id order in small batches so it never holds a long write lock.
+The wrapped form is replaced by a plain bcrypt hash at the user's next login.
+"""
+
+import logging
+import time
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from backend.models import User
+from backend.security.password_hash import is_bare_legacy_hash, wrap_legacy_hash
+
+logger = logging.getLogger(__name__)
+
+LEGACY_HASH_PATTERN = "$pbkdf2-sha256$%"
+
+
+def migrate_legacy_password_hashes(
+    session_factory: Callable[[], Session],
+    batch_size: int = 100,
+    pause_seconds: float = 0.0,
+) -> int:
+    """Wrap all bare PBKDF2 hashes and return the number of rows updated.
+
+    Each row is updated only if its hash is unchanged, so a concurrent login
+    that already upgraded the password wins.
+    """
+    migrated = 0
+    last_id = 0
+    while True:
+        db = session_factory()
+        try:
+            rows = (
+                db.query(User.id, User.hashed_password)
+                .filter(User.id > last_id, User.hashed_password.like(LEGACY_HASH_PATTERN))
+                .order_by(User.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            for user_id, hashed_password in rows:
+                last_id = user_id
+                if not is_bare_legacy_hash(hashed_password):
+                    continue
+                migrated += (
+                    db.query(User)
+                    .filter(User.id == user_id, User.hashed_password == hashed_password)
+                    .update({User.hashed_password: wrap_legacy_hash(hashed_password)}, synchronize_session=False)
+                )
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning(f"Legacy password hash migration stopped after {migrated} rows: {exc}")
+            return migrated
+        finally:
+            db.close()
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    if migrated:
+        logger.info(f"Wrapped {migrated} legacy PBKDF2 password hashes in bcrypt")
+    return migrated
@@ -10,7 +10,7 @@ Provides:
 import csv
 import io
 from datetime import date
-from pathlib import Path
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 try:
@@ -19,8 +19,6 @@ try:
     from reportlab.lib.pagesizes import letter
     from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
     from reportlab.lib.units import inch
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
     from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
     REPORTLAB_AVAILABLE = True
@@ -28,6 +26,8 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
     Flowable = Any  # type: ignore
 
+from backend.pdf_rendering import register_report_fonts
+
 
 # Translation dictionaries for report labels
 REPORT_LABELS = {
@@ -144,25 +144,6 @@ REPORT_LABELS = {
 }
 
 
-def register_report_fonts() -> tuple[str, str]:
-    """Register Unicode-capable fonts for PDF rendering and return (regular, bold) names."""
-    font_regular = "DejaVuSans"
-    font_bold = "DejaVuSans-Bold"
-    fonts_dir = Path(__file__).resolve().parents[1] / "fonts"
-    regular_path = fonts_dir / "DejaVuSans.ttf"
-    bold_path = fonts_dir / "DejaVuSans-Bold.ttf"
-
-    if regular_path.exists() and bold_path.exists():
-        registered = set(pdfmetrics.getRegisteredFontNames())
-        if font_regular not in registered:
-            pdfmetrics.registerFont(TTFont(font_regular, str(regular_path)))
-        if font_bold not in registered:
-            pdfmetrics.registerFont(TTFont(font_bold, str(bold_path)))
-        return font_regular, font_bold
-
-    return "Helvetica", "Helvetica-Bold"
-
-
 def get_label(key: str, language: str = "en") -> str:
     """Get translated label for given key and language."""
     lang_dict = REPORT_LABELS.get(language, REPORT_LABELS["en"])
@@ -248,6 +229,32 @@ def translate_trend(trend: str, language: str = "en") -> str:
     return get_label(key, language)
 
 
+@lru_cache(maxsize=4)
+def _report_paragraph_styles(base_font: str) -> tuple[Any, Any, Any]:
+    """Title, heading and body styles for the student performance PDF."""
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        "CustomTitle",
+        parent=styles["Heading1"],
+        fontSize=24,
+        textColor=colors.HexColor("#4F46E5"),
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        fontName=base_font,
+    )
+    heading_style = ParagraphStyle(
+        "CustomHeading",
+        parent=styles["Heading2"],
+        fontSize=16,
+        textColor=colors.HexColor("#4F46E5"),
+        spaceAfter=10,
+        spaceBefore=10,
+        fontName=base_font,
+    )
+    normal_style = ParagraphStyle("Normal", parent=styles["Normal"], fontName=base_font)
+    return title_style, heading_style, normal_style
+
+
 def generate_pdf_report(
     report_data: Dict[str, Any], language: str = "en", *, course_notes: Optional[Dict[str, str]] = None
 ) -> bytes:
@@ -273,28 +280,9 @@ def generate_pdf_report(
     # Container for elements
     elements: list[Flowable] = []
 
-    # Styles
-    styles = getSampleStyleSheet()
+    # Styles (built once per font and reused across reports)
     base_font, base_font_bold = register_report_fonts()
-    title_style = ParagraphStyle(
-        "CustomTitle",
-        parent=styles["Heading1"],
-        fontSize=24,
-        textColor=colors.HexColor("#4F46E5"),
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName=base_font,
-    )
-    heading_style = ParagraphStyle(
-        "CustomHeading",
-        parent=styles["Heading2"],
-        fontSize=16,
-        textColor=colors.HexColor("#4F46E5"),
-        spaceAfter=10,
-        spaceBefore=10,
-        fontName=base_font,
-    )
-    normal_style = ParagraphStyle("Normal", parent=styles["Normal"], fontName=base_font)
+    title_style, heading_style, normal_style = _report_paragraph_styles(base_font)
 
     # Title
     elements.append(Paragraph(get_label("title", language), title_style))
@@ -0,0 +1,398 @@
+"""
+Search index backends for SearchService.
+
+Each backend turns a free-text query into a ``(id, score)`` subquery for
+students or courses. SearchService joins that subquery to the entity table,
+applies its own filters (soft delete, status, dates) and orders by ``score``,
+so matching and relevance ranking both happen inside the database.
+
+Backends:
+- ``PostgresSearchBackend``: ``search_vector`` tsvector generated columns with
+  GIN indexes for word-prefix matches, plus ``pg_trgm`` GIN indexes on the
+  lower-cased text columns so ``LIKE '%q%'`` substring matches use an index.
+- ``SqliteFtsSearchBackend``: FTS5 shadow tables (``students_fts`` and
+  ``courses_fts``) using the trigram tokenizer, kept in sync by triggers.
+- ``LikeSearchBackend``: portable ``LIKE`` fallback used when the index objects
+  have not been created (e.g. schemas built with ``create_all`` in tests).
+
+The index objects are created by the ``f130_add_search_index`` migration; for
+databases created outside Alembic, ``ensure_search_index`` creates them.
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import case, func, literal, literal_column, or_, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Subquery
+
+from backend.models import Course, Student
+
+logger = logging.getLogger(__name__)
+
+# FTS5 trigram matching needs at least three characters per phrase.
+_FTS_MIN_QUERY_LENGTH = 3
+_TSQUERY_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_SEARCH_INDEX_DDL: List[str] = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+        first_name, last_name, email, student_id,
+        content='students', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN
+        INSERT INTO students_fts(rowid, first_name, last_name, email, student_id)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.student_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, first_name, last_name, email, student_id)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.student_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_au
+    AFTER UPDATE OF first_name, last_name, email, student_id ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, first_name, last_name, email, student_id)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.student_id);
+        INSERT INTO students_fts(rowid, first_name, last_name, email, student_id)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.student_id);
+    END
+    """,
+    "INSERT INTO students_fts(students_fts) VALUES ('rebuild')",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5(
+        course_name, course_code, description,
+        content='courses', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_ai AFTER INSERT ON courses BEGIN
+        INSERT INTO courses_fts(rowid, course_name, course_code, description)
+        VALUES (new.id, new.course_name, new.course_code, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_ad AFTER DELETE ON courses BEGIN
+        INSERT INTO courses_fts(courses_fts, rowid, course_name, course_code, description)
+        VALUES ('delete', old.id, old.course_name, old.course_code, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_au
+    AFTER UPDATE OF course_name, course_code, description ON courses BEGIN
+        INSERT INTO courses_fts(courses_fts, rowid, course_name, course_code, description)
+        VALUES ('delete', old.id, old.course_name, old.course_code, old.description);
+        INSERT INTO courses_fts(rowid, course_name, course_code, description)
+        VALUES (new.id, new.course_name, new.course_code, new.description);
+    END
+    """,
+    "INSERT INTO courses_fts(courses_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_INDEX_DDL: List[str] = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE students ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(student_id, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(email, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_students_search_vector ON students USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_students_first_name_trgm ON students USING gin (lower(first_name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_students_last_name_trgm ON students USING gin (lower(last_name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_students_email_trgm ON students USING gin (lower(email) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_students_student_id_trgm ON students USING gin (lower(student_id) gin_trgm_ops)",
+    """
+    ALTER TABLE courses ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(course_name, '') || ' ' || coalesce(course_code, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_courses_search_vector ON courses USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_courses_course_name_trgm ON courses USING gin (lower(course_name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_courses_course_code_trgm ON courses USING gin (lower(course_code) gin_trgm_ops)",
+]
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+
+class SearchBackend(abc.ABC):
+    """Base class: builds ``(id, score)`` match subqueries for students and courses.
+
+    Scores are non-negative and only comparable within one query; SearchService
+    normalizes them to 0-1 against the best match before returning them.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def match_students(self, query: str) -> Subquery:
+        """Return an ``(id, score)`` subquery of students matching ``query``."""
+
+    @abc.abstractmethod
+    def match_courses(self, query: str) -> Subquery:
+        """Return an ``(id, score)`` subquery of courses matching ``query``."""
+
+
+class LikeSearchBackend(SearchBackend):
+    """Portable substring search with SQL-side relevance scoring.
+
+    Scores mirror the historical ``rank_results`` weights: an exact field match
+    scores 100, a prefix match 50 and a substring match 25 for name and code
+    fields; secondary fields (email, student id, description) add 10.
+    """
+
+    name = "like"
+
+    @staticmethod
+    def _field_score(column: Any, query_lower: str, pattern: str) -> ColumnElement[Any]:
+        lowered = func.lower(column)
+        return case(
+            (lowered == query_lower, 100),
+            (lowered.like(f"{_escape_like(query_lower)}%", escape="\\"), 50),
+            (lowered.like(pattern, escape="\\"), 25),
+            else_=0,
+        )
+
+    @staticmethod
+    def _secondary_score(column: Any, pattern: str) -> ColumnElement[Any]:
+        return case((func.lower(column).like(pattern, escape="\\"), 10), else_=0)
+
+    def _match(
+        self, id_column: Any, primary: Sequence[Any], secondary: Sequence[Any], query: str, name: str
+    ) -> Subquery:
+        query_lower = (query or "").lower()
+        pattern = f"%{_escape_like(query_lower)}%"
+        columns = list(primary) + list(secondary)
+        score: ColumnElement[Any] = literal(0)
+        for column in primary:
+            score = score + self._field_score(column, query_lower, pattern)
+        for column in secondary:
+            score = score + self._secondary_score(column, pattern)
+        return (
+            select(id_column.label("id"), score.label("score"))
+            .where(or_(*[func.lower(column).like(pattern, escape="\\") for column in columns]))
+            .subquery(name)
+        )
+
+    def match_students(self, query: str) -> Subquery:
+        return self._match(
+            Student.id,
+            [Student.first_name, Student.last_name],
+            [Student.email, Student.student_id],
+            query,
+            "student_match",
+        )
+
+    def match_courses(self, query: str) -> Subquery:
+        return self._match(
+            Course.id,
+            [Course.course_name, Course.course_code],
+            [Course.description],
+            query,
+            "course_match",
+        )
+
+
+class SqliteFtsSearchBackend(SearchBackend):
+    """FTS5 trigram index on SQLite, ranked with ``bm25``.
+
+    Queries shorter than three characters cannot be answered by a trigram index
+    and are delegated to ``LikeSearchBackend``.
+    """
+
+    name = "sqlite_fts5"
+
+    def __init__(self) -> None:
+        self._fallback = LikeSearchBackend()
+
+    @staticmethod
+    def _phrase(query: str) -> str:
+        return '"' + query.replace('"', '""') + '"'
+
+    def _match(self, fts_table: str, weights: str, query: str, name: str) -> Subquery:
+        # bm25() is lower-is-better, so negate it for a descending score.
+        return (
+            select(
+                literal_column(f"{fts_table}.rowid").label("id"),
+                (-func.bm25(literal_column(fts_table), *[literal(w) for w in weights.split(",")])).label("score"),
+            )
+            .select_from(text(fts_table))
+            .where(literal_column(fts_table).op("MATCH")(self._phrase(query)))
+            .subquery(name)
+        )
+
+    def match_students(self, query: str) -> Subquery:
+        if len((query or "").strip()) < _FTS_MIN_QUERY_LENGTH:
+            return self._fallback.match_students(query)
+        return self._match("students_fts", "10.0,10.0,1.0,5.0", query.strip(), "student_match")
+
+    def match_courses(self, query: str) -> Subquery:
+        if len((query or "").strip()) < _FTS_MIN_QUERY_LENGTH:
+            return self._fallback.match_courses(query)
+        return self._match("courses_fts", "10.0,10.0,1.0", query.strip(), "course_match")
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector + pg_trgm search on PostgreSQL.
+
+    A row matches when every query word is a prefix of a word in
+    ``search_vector`` or when the whole query is a substring of one of the
+    trigram-indexed columns. Rank combines ``ts_rank`` with trigram similarity.
+    """
+
+    name = "postgresql"
+
+    @staticmethod
+    def _tsquery(query: str) -> Optional[ColumnElement[Any]]:
+        tokens = _TSQUERY_TOKEN_RE.findall((query or "").lower())
+        if not tokens:
+            return None
+        return func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+
+    def _match(self, table: str, id_column: Any, columns: Sequence[Any], query: str, name: str) -> Subquery:
+        query_lower = (query or "").lower()
+        pattern = f"%{_escape_like(query_lower)}%"
+        vector = literal_column(f"{table}.search_vector")
+        tsquery = self._tsquery(query)
+        substring = or_(*[func.lower(column).like(pattern, escape="\\") for column in columns])
+        similarity = func.greatest(*[func.similarity(func.lower(column), query_lower) for column in columns])
+        if tsquery is None:
+            condition: ColumnElement[Any] = substring
+            score: ColumnElement[Any] = similarity * 50
+        else:
+            condition = or_(vector.op("@@")(tsquery), substring)
+            score = func.ts_rank(vector, tsquery) * 100 + similarity * 50
+        return select(id_column.label("id"), score.label("score")).where(condition).subquery(name)
+
+    def match_students(self, query: str) -> Subquery:
+        return self._match(
+            "students",
+            Student.id,
+            [Student.first_name, Student.last_name, Student.email, Student.student_id],
+            query,
+            "student_match",
+        )
+
+    def match_courses(self, query: str) -> Subquery:
+        return self._match("courses", Course.id, [Course.course_name, Course.course_code], query, "course_match")
+
+
+# ============================================================================
+# BACKEND SELECTION & INDEX MANAGEMENT
+# ============================================================================
+
+_backend_cache: Dict[str, SearchBackend] = {}
+_backend_cache_lock = threading.Lock()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _engine_for(bind: Any) -> Engine:
+    return bind.engine if isinstance(bind, Connection) else bind
+
+
+def _detect_backend(bind: Any) -> SearchBackend:
+    dialect = bind.dialect.name
+    try:
+        if dialect == "sqlite":
+            row = bind.execute(
+                text(
+                    "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name IN ('students_fts', 'courses_fts')"
+                )
+            ).scalar()
+            if row == 2:
+                return SqliteFtsSearchBackend()
+        elif dialect == "postgresql":
+            row = bind.execute(
+                text(
+                    "SELECT (SELECT count(*) FROM information_schema.columns "
+                    "        WHERE table_schema = current_schema() AND column_name = 'search_vector' "
+                    "        AND table_name IN ('students', 'courses')) = 2 "
+                    "AND EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+                )
+            ).scalar()
+            if row:
+                return PostgresSearchBackend()
+    except Exception as exc:  # pragma: no cover - defensive: detection must never break search
+        logger.warning(f"Search index detection failed, using LIKE search: {exc}")
+    return LikeSearchBackend()
+
+
+def get_search_backend(db: Session) -> SearchBackend:
+    """Return the search backend for the session's database (detected once per engine)."""
+    bind = db.get_bind()
+    key = str(id(_engine_for(bind)))
+    backend = _backend_cache.get(key)
+    if backend is not None:
+        return backend
+    detected = _detect_backend(db.connection())
+    with _backend_cache_lock:
+        backend = _backend_cache.setdefault(key, detected)
+    if backend.name != "like":
+        logger.info(f"Search index backend: {backend.name}")
+    return backend
+
+
+def reset_search_backend_cache() -> None:
+    """Forget detected backends (call after creating or dropping index objects)."""
+    with _backend_cache_lock:
+        _backend_cache.clear()
+
+
+def ensure_search_index(bind: Any) -> bool:
+    """Create the search index objects for the bind's dialect if missing.
+
+    Returns True when an index backend is available afterwards. Used for
+    databases created outside Alembic; regular installs get the same objects
+    from the ``f130_add_search_index`` migration.
+    """
+    dialect = bind.dialect.name
+    statements = (
+        SQLITE_SEARCH_INDEX_DDL if dialect == "sqlite" else POSTGRES_SEARCH_INDEX_DDL if dialect == "postgresql" else []
+    )
+    if not statements:
+        return False
+    try:
+        if isinstance(bind, Connection):
+            for statement in statements:
+                bind.execute(text(statement))
+        else:
+            with bind.begin() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+    except Exception as exc:
+        logger.warning(f"Could not create search index ({dialect}): {exc}")
+        return False
+    finally:
+        reset_search_backend_cache()
+    return True
+
+
+__all__ = [
+    "SearchBackend",
+    "LikeSearchBackend",
+    "SqliteFtsSearchBackend",
+    "PostgresSearchBackend",
+    "get_search_backend",
+    "reset_search_backend_cache",
+    "ensure_search_index",
+]
@@ -4,6 +4,10 @@ Advanced search service for Student Management System.
 Provides full-text search across students, courses, and grades with
 filtering, ranking, and optimization for quick query results.
 
+Student and course text matching is delegated to a search index backend
+(see ``search_backends``): a tsvector/pg_trgm index on PostgreSQL, an FTS5
+index on SQLite, or a LIKE fallback. Relevance scores are computed in SQL.
+
 Author: AI Agent
 Date: January 17, 2026
 Version: 1.0.0
@@ -16,10 +20,24 @@ from sqlalchemy import or_, func
 import logging
 
 from backend.models import Student, Course, Grade
+from backend.services.search_backends import SearchBackend, get_search_backend
+from backend.services.suggestion_index import get_suggestion_index
 
 logger = logging.getLogger(__name__)
 
 
+def _relevance(score: Any, top_score: Any) -> float:
+    """Scale a backend score to 0-1 relative to the best match of the same query."""
+    if not score or not top_score or top_score <= 0:
+        return 0.0
+    return round(min(1.0, max(0.0, float(score) / float(top_score))), 4)
+
+
+def _top_score(base_query: Any, match: Any) -> Any:
+    # ORDER BY ... LIMIT 1 rather than MAX(): SQLite's bm25() cannot run inside an aggregate
+    return base_query.with_entities(match.c.score).order_by(match.c.score.desc()).limit(1).scalar()
+
+
 class SearchService:
     """Service for searching across students, courses, and grades."""
 
@@ -31,6 +49,14 @@ class SearchService:
             db: SQLAlchemy database session
         """
         self.db = db
+        self._backend: Optional[SearchBackend] = None
+
+    @property
+    def backend(self) -> SearchBackend:
+        """Search index backend for this session's database (resolved lazily)."""
+        if self._backend is None:
+            self._backend = get_search_backend(self.db)
+        return self._backend
 
     # ============================================================================
     # STUDENT SEARCH
@@ -40,7 +66,7 @@ class SearchService:
         """
         Search students by name, email, or ID number.
 
-        Uses full-text search across first_name, last_name, and email fields.
+        Uses the search index across first_name, last_name, email and student_id.
         Results are ordered by relevance (name matches ranked higher).
 
         Args:
@@ -56,21 +82,12 @@ class SearchService:
             >>> # Returns students with "John" in name/email
         """
         try:
-            # Normalize query for case-insensitive search
-            query_lower = f"%{query.lower()}%"
-
-            # Build search query with multiple field matches
+            match = self.backend.match_students(query)
             students = (
                 self.db.query(Student)
-                .filter(
-                    or_(
-                        func.lower(Student.first_name).ilike(query_lower),
-                        func.lower(Student.last_name).ilike(query_lower),
-                        func.lower(Student.email).ilike(query_lower),
-                        func.lower(Student.student_id).ilike(query_lower),
-                    ),
-                    Student.deleted_at.is_(None),  # Soft delete filter
-                )
+                .join(match, Student.id == match.c.id)
+                .filter(Student.deleted_at.is_(None))  # Soft delete filter
+                .order_by(match.c.score.desc(), Student.id)
                 .limit(limit)
                 .offset(offset)
                 .all()
@@ -100,7 +117,8 @@ class SearchService:
         """
         Search courses by name, code, or description.
 
-        Uses full-text search across course_name, course_code, and description fields.
+        Uses the search index across course_name, course_code, and description fields.
+        Results are ordered by relevance.
 
         Args:
             query: Search query string (course name or code)
@@ -115,26 +133,12 @@ class SearchService:
             >>> # Returns courses with "Mathematics" in name or code
         """
         try:
-            # Normalize query for case-insensitive search
-            query_lower = f"%{query.lower()}%"
-
-            # Build search query with multiple field matches
-            description_filter = (
-                func.lower(Course.description).ilike(query_lower) if Course.description is not None else None
-            )
-            filters = [
-                func.lower(Course.course_name).ilike(query_lower),
-                func.lower(Course.course_code).ilike(query_lower),
-            ]
-            if description_filter is not None:
-                filters.append(description_filter)
-
+            match = self.backend.match_courses(query)
             courses = (
                 self.db.query(Course)
-                .filter(
-                    or_(*filters),
-                    Course.deleted_at.is_(None),  # Soft delete filter
-                )
+                .join(match, Course.id == match.c.id)
+                .filter(Course.deleted_at.is_(None))  # Soft delete filter
+                .order_by(match.c.score.desc(), Course.id)
                 .limit(limit)
                 .offset(offset)
                 .all()
@@ -503,6 +507,9 @@ class SearchService:
         """
         Rank search results by relevance.
 
+        Student and course searches are already ranked in SQL by the search
+        backend; this helper remains for ordering merged or grade result lists.
+
         Scoring criteria:
         1. Exact matches score highest
         2. Prefix matches (starts with query) score high
@@ -578,20 +585,20 @@ class SearchService:
             >>> suggestions = search_service.get_search_suggestions("mat")
             >>> # Returns ["Mathematics", "Materials Science", etc.]
         """
+        index = get_suggestion_index()
+        if index.ready:
+            return index.suggest(query, limit)
+
         try:
             suggestions = []
-            query_lower = f"%{query.lower()}%"
 
             # Get student suggestions
+            student_match = self.backend.match_students(query)
             students = (
-                self.db.query(Student)
-                .filter(
-                    or_(
-                        func.lower(Student.first_name).ilike(query_lower),
-                        func.lower(Student.last_name).ilike(query_lower),
-                    ),
-                    Student.deleted_at.is_(None),
-                )
+                self.db.query(Student.id, Student.first_name, Student.last_name)
+                .join(student_match, Student.id == student_match.c.id)
+                .filter(Student.deleted_at.is_(None))
+                .order_by(student_match.c.score.desc(), Student.id)
                 .limit(limit // 2)
                 .all()
             )
@@ -600,9 +607,12 @@ class SearchService:
                 suggestions.append({"text": f"{s.first_name} {s.last_name}", "type": "student", "id": s.id})
 
             # Get course suggestions
+            course_match = self.backend.match_courses(query)
             courses = (
-                self.db.query(Course)
-                .filter(func.lower(Course.course_name).ilike(query_lower), Course.deleted_at.is_(None))
+                self.db.query(Course.id, Course.course_name)
+                .join(course_match, Course.id == course_match.c.id)
+                .filter(Course.deleted_at.is_(None))
+                .order_by(course_match.c.score.desc(), Course.id)
                 .limit(limit - len(suggestions))
                 .all()
             )
@@ -638,6 +648,33 @@ class SearchService:
     # PHASE 4: ADVANCED SEARCH & FILTERING
     # ============================================================================
 
+    def full_text_search(self, query: str, limit: int = 20, offset: int = 0) -> tuple[List[tuple[Student, float]], int]:
+        """
+        Full-text search on students ordered by relevance.
+
+        Args:
+            query: Search query string (name, email, ID)
+            limit: Maximum results per page
+            offset: Pagination offset
+
+        Returns:
+            Tuple of ((student, relevance score 0-1) list, total match count)
+        """
+        try:
+            match = self.backend.match_students(query)
+            base_query = (
+                self.db.query(Student, match.c.score)
+                .join(match, Student.id == match.c.id)
+                .filter(Student.deleted_at.is_(None))
+            )
+            total_count = base_query.count()
+            top_score = _top_score(base_query, match)
+            rows = base_query.order_by(match.c.score.desc(), Student.id).limit(limit).offset(offset).all()
+            return [(student, _relevance(score, top_score)) for student, score in rows], total_count
+        except Exception as e:
+            logger.error(f"Error performing full-text search: {str(e)}")
+            return [], 0
+
     def advanced_student_search(
         self,
         query: str,
@@ -646,70 +683,65 @@ class SearchService:
         sort_direction: str = "desc",
         limit: int = 20,
         offset: int = 0,
-    ) -> tuple[List[Student], int, Dict[str, Any]]:
+    ) -> tuple[List[tuple[Student, float]], int, Dict[str, Any]]:
         """
         Perform advanced full-text search on students with filters and sorting.
 
         Args:
             query: Search query string (name, email, ID)
             filters: Optional filter dictionary with keys:
-                - status: Student status (active, inactive, suspended)
-                - enrollment_type: Enrollment type (full-time, part-time)
-                - created_after: Created date minimum (YYYY-MM-DD)
-                - created_before: Created date maximum (YYYY-MM-DD)
-                - updated_after: Updated date minimum (YYYY-MM-DD)
-                - updated_before: Updated date maximum (YYYY-MM-DD)
-            sort_field: Field to sort by (relevance, name, email, created_at, updated_at)
+                - status: Student status (active, inactive); maps to ``is_active``
+                - created_after: Enrollment date minimum (YYYY-MM-DD)
+                - created_before: Enrollment date maximum (YYYY-MM-DD)
+            sort_field: Field to sort by (relevance, name, email, created_at, updated_at);
+                students carry no audit timestamps, so the date sorts use the enrollment date
             sort_direction: Sort direction (asc, desc)
             limit: Maximum results per page (1-100)
             offset: Pagination offset
 
         Returns:
-            Tuple of (results list, total count, filters applied dict)
+            Tuple of ((student, relevance score 0-1) list, total count, filters applied dict)
         """
         try:
             from datetime import datetime
 
             filters = filters or {}
-            query_lower = f"%{query.lower()}%"
 
             # Build base search
-            base_query = self.db.query(Student).filter(
-                or_(
-                    func.lower(Student.first_name).ilike(query_lower),
-                    func.lower(Student.last_name).ilike(query_lower),
-                    func.lower(Student.email).ilike(query_lower),
-                    func.lower(Student.student_id).ilike(query_lower),
-                ),
-                Student.deleted_at.is_(None),  # Soft delete filter
+            match = self.backend.match_students(query)
+            base_query = (
+                self.db.query(Student, match.c.score)
+                .join(match, Student.id == match.c.id)
+                .filter(Student.deleted_at.is_(None))  # Soft delete filter
             )
 
             # Apply filters
             filters_applied = {}
 
             if filters.get("status"):
-                base_query = base_query.filter(Student.status == filters["status"])
+                base_query = base_query.filter(Student.is_active.is_(filters["status"] == "active"))
                 filters_applied["status"] = filters["status"]
 
             # Date filters
             if filters.get("created_after"):
                 try:
-                    created_after = datetime.strptime(filters["created_after"], "%Y-%m-%d")
-                    base_query = base_query.filter(Student.created_at >= created_after)
+                    created_after = datetime.strptime(filters["created_after"], "%Y-%m-%d").date()
+                    base_query = base_query.filter(Student.enrollment_date >= created_after)
                     filters_applied["created_after"] = filters["created_after"]
                 except (ValueError, TypeError):
                     pass  # Invalid date, skip filter
 
             if filters.get("created_before"):
                 try:
-                    created_before = datetime.strptime(filters["created_before"], "%Y-%m-%d")
-                    base_query = base_query.filter(Student.created_at <= created_before)
+                    created_before = datetime.strptime(filters["created_before"], "%Y-%m-%d").date()
+                    base_query = base_query.filter(Student.enrollment_date <= created_before)
                     filters_applied["created_before"] = filters["created_before"]
                 except (ValueError, TypeError):
                     pass
 
-            # Get total before pagination
+            # Get total and best score before pagination
             total_count = base_query.count()
+            top_score = _top_score(base_query, match)
 
             # Apply sorting
             if sort_field == "name":
@@ -722,21 +754,19 @@ class SearchService:
                     base_query = base_query.order_by(Student.email.asc())
                 else:
                     base_query = base_query.order_by(Student.email.desc())
-            elif sort_field == "created_at":
-                if sort_direction.lower() == "asc":
-                    base_query = base_query.order_by(Student.created_at.asc())
-                else:
-                    base_query = base_query.order_by(Student.created_at.desc())
-            elif sort_field == "updated_at":
+            elif sort_field in ("created_at", "updated_at"):
                 if sort_direction.lower() == "asc":
-                    base_query = base_query.order_by(Student.updated_at.asc())
+                    base_query = base_query.order_by(Student.enrollment_date.asc(), Student.id.asc())
                 else:
-                    base_query = base_query.order_by(Student.updated_at.desc())
+                    base_query = base_query.order_by(Student.enrollment_date.desc(), Student.id.desc())
             else:  # relevance (default)
-                base_query = base_query.order_by(Student.last_name, Student.first_name)
+                base_query = base_query.order_by(match.c.score.desc(), Student.last_name, Student.first_name)
 
             # Apply pagination
-            results = base_query.limit(limit).offset(offset).all()
+            results = [
+                (student, _relevance(score, top_score))
+                for student, score in base_query.limit(limit).offset(offset).all()
+            ]
 
             return results, total_count, filters_applied
 
@@ -759,16 +789,10 @@ class SearchService:
         try:
             from backend.models import CourseEnrollment
 
-            query_lower = f"%{query.lower()}%"
-
             # Base search
-            base_query = self.db.query(Student).filter(
-                or_(
-                    func.lower(Student.first_name).ilike(query_lower),
-                    func.lower(Student.last_name).ilike(query_lower),
-                    func.lower(Student.email).ilike(query_lower),
-                ),
-                Student.deleted_at.is_(None),
+            match = self.backend.match_students(query)
+            base_query = (
+                self.db.query(Student).join(match, Student.id == match.c.id).filter(Student.deleted_at.is_(None))
             )
 
             # Status facets
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import Request
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -16,13 +17,16 @@ from backend.errors import (
     internal_server_error,
 )
 from backend.schemas.audit import AuditAction, AuditResource
-from backend.schemas.students import StudentCreate, StudentUpdate
+from backend.schemas.students import StudentBulkStatusUpdate, StudentCreate, StudentUpdate
 from backend.services.audit_service import AuditLogger
 
 logger = logging.getLogger(__name__)
 
 DuplicateCheckResult = Tuple[int, ErrorCode, str, Optional[Dict[str, Any]]]
 
+# Upper bound on student/enrollment IDs per IN (...) when cascading status changes
+STATUS_CASCADE_CHUNK = 500
+
 
 class StudentService:
     """Encapsulates business logic for student CRUD + bulk operations."""
@@ -233,74 +237,136 @@ class StudentService:
         When a student is marked as inactive, they are automatically unenrolled
         from all courses to prevent them from appearing in course rosters.
         """
-        removed_courses: List[Dict[str, Any]] = []
         try:
-            from sqlalchemy.orm import selectinload
-
-            from backend.models import CourseEnrollment
-
-            # Get all active enrollments for this student
-            enrollments = (
-                self.db.query(CourseEnrollment)
-                .options(selectinload(CourseEnrollment.course))
-                .filter(CourseEnrollment.student_id == db_student.id, CourseEnrollment.deleted_at.is_(None))
-                .all()
-            )
-
-            # Soft-delete each enrollment
-            for enrollment in enrollments:
-                course = enrollment.course
-                removed_courses.append(
-                    {
-                        "course_id": enrollment.course_id,
-                        "course_code": getattr(course, "course_code", None) if course else None,
-                        "course_name": getattr(course, "course_name", None) if course else None,
-                    }
-                )
-                enrollment.mark_deleted()
-                logger.info(
-                    "Unenrolled student %s from course %s (id: %s)",
-                    db_student.id,
-                    enrollment.course_id,
-                    enrollment.id,
-                )
+            return self._unenroll_students([db_student.id]).get(db_student.id, [])
         except Exception as exc:  # pragma: no cover
             logger.exception("Error unenrolling student from courses: %s", exc)
             # Don't raise - log and continue (enrollment removal is secondary to deactivation)
-        return removed_courses
+            return []
 
     def _reenroll_previous_courses(self, db_student) -> List[Dict[str, Any]]:
         """Restore previously soft-deleted course enrollments for a student.
 
         Used when reactivating a student with re-enrollment enabled.
         """
-        restored_courses: List[Dict[str, Any]] = []
         try:
-            from sqlalchemy.orm import selectinload
+            return self._reenroll_students([db_student.id]).get(db_student.id, [])
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Error re-enrolling student into courses: %s", exc)
+            return []
+
+    def _unenroll_students(self, student_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Soft-delete the active enrollments of ``student_ids`` with one UPDATE per chunk."""
+        return self._set_enrollments_deleted(student_ids, datetime.now(timezone.utc))
+
+    def _reenroll_students(self, student_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Restore the soft-deleted enrollments of ``student_ids`` with one UPDATE per chunk."""
+        return self._set_enrollments_deleted(student_ids, None)
 
-            from backend.models import CourseEnrollment
+    def _set_enrollments_deleted(
+        self, student_ids: List[int], deleted_at: Optional[datetime]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Set ``deleted_at`` on the enrollments of ``student_ids`` that are in the opposite state.
 
-            enrollments = (
-                self.db.query(CourseEnrollment)
+        A narrow locked pre-select of (student, course) columns builds the
+        per-student course list for the audit log; the change itself is a
+        single bulk UPDATE per chunk instead of one ORM write per enrollment.
+        """
+        from backend.models import Course, CourseEnrollment
+
+        courses_by_student: Dict[int, List[Dict[str, Any]]] = {}
+        state = CourseEnrollment.deleted_at.is_(None) if deleted_at else CourseEnrollment.deleted_at.is_not(None)
+        for start in range(0, len(student_ids), STATUS_CASCADE_CHUNK):
+            chunk = student_ids[start : start + STATUS_CASCADE_CHUNK]
+            rows = self.db.execute(
+                select(
+                    CourseEnrollment.id,
+                    CourseEnrollment.student_id,
+                    CourseEnrollment.course_id,
+                    Course.course_code,
+                    Course.course_name,
+                )
+                .outerjoin(Course, and_(Course.id == CourseEnrollment.course_id, Course.deleted_at.is_(None)))
+                .where(CourseEnrollment.student_id.in_(chunk), state)
+                .order_by(CourseEnrollment.id)
+                .with_for_update(of=CourseEnrollment)
                 .execution_options(include_deleted=True)
-                .options(selectinload(CourseEnrollment.course))
-                .filter(CourseEnrollment.student_id == db_student.id, CourseEnrollment.deleted_at.is_not(None))
-                .all()
+            ).all()
+            if not rows:
+                continue
+            for row in rows:
+                courses_by_student.setdefault(row.student_id, []).append(
+                    {"course_id": row.course_id, "course_code": row.course_code, "course_name": row.course_name}
+                )
+            # Query.update so the after_bulk_update cache hooks fire
+            self.db.query(CourseEnrollment).filter(CourseEnrollment.id.in_([row.id for row in rows])).update(
+                {"deleted_at": deleted_at}, synchronize_session="fetch"
             )
 
-            for enrollment in enrollments:
-                course = enrollment.course
-                restored_courses.append(
-                    {
-                        "course_id": enrollment.course_id,
-                        "course_code": getattr(course, "course_code", None) if course else None,
-                        "course_name": getattr(course, "course_name", None) if course else None,
-                    }
-                )
-                enrollment.deleted_at = None  # type: ignore[assignment]
-        except Exception as exc:  # pragma: no cover
-            logger.exception("Error re-enrolling student into courses: %s", exc)
-        return restored_courses
+        logger.info(
+            "%s %s enrollments for %s students",
+            "Unenrolled" if deleted_at else "Re-enrolled",
+            sum(len(courses) for courses in courses_by_student.values()),
+            len(courses_by_student),
+        )
+        return courses_by_student
+
+    def bulk_set_active(self, payload: StudentBulkStatusUpdate) -> Dict[str, Any]:
+        """Activate or deactivate a selection of students in one transaction.
+
+        Deactivation unenrolls the students from all courses; reactivation
+        restores their previous enrollments when ``re_enroll_previous`` is set.
+        Students already in the requested state are skipped.
+        """
+        filters = [self.Student.deleted_at.is_(None)]
+        if payload.is_active:
+            filters.append(self.Student.is_active.is_(False))
+        else:
+            filters.append(or_(self.Student.is_active.is_(None), self.Student.is_active.is_(True)))
+        if payload.student_ids is not None:
+            filters.append(self.Student.id.in_(payload.student_ids))
+        if payload.study_year is not None:
+            filters.append(self.Student.study_year == payload.study_year)
+        if payload.academic_year is not None:
+            filters.append(self.Student.academic_year == payload.academic_year)
+
+        courses_by_student: Dict[int, List[Dict[str, Any]]] = {}
+        with transaction(self.db):
+            student_ids = list(
+                self.db.execute(
+                    select(self.Student.id).where(*filters).order_by(self.Student.id).with_for_update()
+                ).scalars()
+            )
+            if not payload.is_active:
+                courses_by_student = self._unenroll_students(student_ids)
+            elif payload.re_enroll_previous:
+                courses_by_student = self._reenroll_students(student_ids)
+            for start in range(0, len(student_ids), STATUS_CASCADE_CHUNK):
+                self.db.query(self.Student).filter(
+                    self.Student.id.in_(student_ids[start : start + STATUS_CASCADE_CHUNK])
+                ).update({"is_active": payload.is_active}, synchronize_session="fetch")
+
+        if payload.is_active:
+            action, courses_key = "bulk_activate", "reenrolled_courses"
+        else:
+            action, courses_key = "bulk_deactivate", "unenrolled_courses"
+        enrollments_changed = sum(len(courses) for courses in courses_by_student.values())
+        logger.info("%s: %s students, %s enrollments", action, len(student_ids), enrollments_changed)
+        self._log_audit(
+            action=AuditAction.UPDATE,
+            resource_id=None,
+            details={
+                "action": action,
+                "student_ids": student_ids,
+                courses_key: {str(sid): courses for sid, courses in courses_by_student.items()},
+            },
+            new_values={"is_active": payload.is_active},
+        )
+        return {
+            "updated": len(student_ids),
+            "student_ids": student_ids,
+            "enrollments_changed": enrollments_changed,
+        }
 
     def bulk_create_students(self, students_data: List[StudentCreate]) -> Dict[str, Any]:
         created: List[str] = []
@@ -0,0 +1,397 @@
+"""
+In-process autocomplete index for search suggestions.
+
+Student names and course names/codes are folded (case-folded, accents
+stripped, so Greek "Μαρία" and "μαρια" match) and stored as a sorted array of
+``(key, kind, id)`` postings. A prefix lookup is a ``bisect`` into that array
+followed by a short forward scan, so suggestions are answered without touching
+the database.
+
+Lifecycle:
+- ``build()`` loads id/name columns once (started from the app lifespan).
+- ``register_orm_hooks()`` listens to SQLAlchemy session flushes and applies
+  committed Student/Course inserts, updates and (soft) deletes incrementally.
+- ``POST /search/suggestions/index/rebuild`` rebuilds on demand, e.g. after
+  bulk SQL updates that bypass the ORM.
+
+Until the index is built, ``SearchService.get_search_suggestions`` keeps using
+the database query path.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on postings scanned per lookup; keeps one-letter queries cheap.
+MAX_CANDIDATES_SCANNED = 2000
+
+_PENDING_KEY = "suggestion_index_pending"
+
+Posting = Tuple[str, str, int]
+
+
+def fold_text(value: Optional[str]) -> str:
+    """Case-fold and strip diacritics (Greek tonos/dialytika included)."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.casefold()
+
+
+@dataclass(frozen=True)
+class _Entry:
+    kind: str
+    id: int
+    text: str
+    folded: str
+    words: Tuple[str, ...]
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        # Every word plus the full folded text so multi-word prefixes
+        # ("maria pap") can be anchored on the whole string as well.
+        if len(self.words) > 1:
+            return self.words + (self.folded,)
+        return self.words
+
+
+class SuggestionIndex:
+    """Thread-safe sorted-array prefix index over student and course names."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._postings: List[Posting] = []
+        self._entries: Dict[Tuple[str, int], _Entry] = {}
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self.build_seconds: float = 0.0
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.incremental_updates = 0
+        # Maintained on every change so stats and metrics never walk the index
+        self._student_count = 0
+        self._entry_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    def build(self, db: Session) -> Dict[str, Any]:
+        """(Re)build the index from the database and mark it ready."""
+        from backend.models import Course, Student
+
+        started = time.perf_counter()
+        students = (
+            db.query(Student.id, Student.first_name, Student.last_name).filter(Student.deleted_at.is_(None)).all()
+        )
+        courses = db.query(Course.id, Course.course_name, Course.course_code).filter(Course.deleted_at.is_(None)).all()
+
+        entries: Dict[Tuple[str, int], _Entry] = {}
+        for student_id, first_name, last_name in students:
+            entry = self._student_entry(student_id, first_name, last_name)
+            if entry is not None:
+                entries[(entry.kind, entry.id)] = entry
+        for course_id, course_name, course_code in courses:
+            entry = self._course_entry(course_id, course_name, course_code)
+            if entry is not None:
+                entries[(entry.kind, entry.id)] = entry
+
+        postings = sorted((key, entry.kind, entry.id) for entry in entries.values() for key in entry.keys)
+        student_count = sum(1 for kind, _ in entries if kind == "student")
+        entry_bytes = sum(_entry_size(entry) for entry in entries.values())
+        with self._lock:
+            self._entries = entries
+            self._postings = postings
+            self._student_count = student_count
+            self._entry_bytes = entry_bytes
+            self.ready = True
+            self.built_at = time.time()
+            self.build_seconds = time.perf_counter() - started
+
+        self._publish_metrics()
+        logger.info(
+            "Suggestion index built: %d entries, %d postings in %.1f ms",
+            len(entries),
+            len(postings),
+            self.build_seconds * 1000,
+        )
+        return self.stats()
+
+    def clear(self) -> None:
+        """Drop all data and mark the index as not ready."""
+        with self._lock:
+            self._entries = {}
+            self._postings = []
+            self._student_count = 0
+            self._entry_bytes = 0
+            self.ready = False
+            self.built_at = None
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+    def upsert_student(self, student_id: int, first_name: Optional[str], last_name: Optional[str]) -> None:
+        self._upsert(self._student_entry(student_id, first_name, last_name), ("student", student_id))
+
+    def upsert_course(self, course_id: int, course_name: Optional[str], course_code: Optional[str]) -> None:
+        self._upsert(self._course_entry(course_id, course_name, course_code), ("course", course_id))
+
+    def remove(self, kind: str, entity_id: int) -> None:
+        with self._lock:
+            self._remove_locked((kind, entity_id))
+            self.incremental_updates += 1
+
+    def _upsert(self, entry: Optional[_Entry], ref: Tuple[str, int]) -> None:
+        with self._lock:
+            existing = self._entries.get(ref)
+            if existing == entry:
+                return
+            self._remove_locked(ref)
+            if entry is not None:
+                self._entries[ref] = entry
+                for key in entry.keys:
+                    insort(self._postings, (key, entry.kind, entry.id))
+                self._count_locked(entry, 1)
+            self.incremental_updates += 1
+
+    def _remove_locked(self, ref: Tuple[str, int]) -> None:
+        entry = self._entries.pop(ref, None)
+        if entry is None:
+            return
+        self._count_locked(entry, -1)
+        for key in entry.keys:
+            posting = (key, entry.kind, entry.id)
+            idx = bisect_left(self._postings, posting)
+            if idx < len(self._postings) and self._postings[idx] == posting:
+                del self._postings[idx]
+
+    def _count_locked(self, entry: _Entry, sign: int) -> None:
+        if entry.kind == "student":
+            self._student_count += sign
+        self._entry_bytes += sign * _entry_size(entry)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def suggest(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Return the top ``limit`` suggestions for a (partial) query.
+
+        Every query word must prefix a word of the suggestion. Ranking prefers
+        an exact match, then a match at the start of the full text, then
+        shorter texts.
+        """
+        started = time.perf_counter()
+        folded_query = " ".join(fold_text(query).split())
+        tokens = folded_query.split(" ") if folded_query else []
+        if not tokens or limit <= 0:
+            return []
+
+        anchor = max(tokens, key=len)
+        scored: List[Tuple[int, int, str, str, int]] = []
+        seen: set[Tuple[str, int]] = set()
+        with self._lock:
+            postings = self._postings
+            idx = bisect_left(postings, (anchor,))
+            scanned = 0
+            while idx < len(postings) and scanned < MAX_CANDIDATES_SCANNED:
+                key, kind, entity_id = postings[idx]
+                if not key.startswith(anchor):
+                    break
+                idx += 1
+                scanned += 1
+                ref = (kind, entity_id)
+                if ref in seen:
+                    continue
+                seen.add(ref)
+                entry = self._entries.get(ref)
+                if entry is None or not _matches_all(tokens, entry.words):
+                    continue
+                if entry.folded == folded_query:
+                    rank = 0
+                elif entry.folded.startswith(folded_query):
+                    rank = 1
+                else:
+                    rank = 2
+                scored.append((rank, len(entry.text), entry.text, kind, entity_id))
+
+        best = heapq.nsmallest(limit, scored)
+        self.lookups += 1
+        self.lookup_seconds += time.perf_counter() - started
+        return [{"text": text, "type": kind, "id": entity_id} for _, _, text, kind, entity_id in best]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def memory_bytes(self) -> int:
+        """Approximate heap footprint of postings and entries (shallow object sizes)."""
+        with self._lock:
+            return sys.getsizeof(self._postings) + sys.getsizeof(self._entries) + self._entry_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            students = self._student_count
+            entries = len(self._entries)
+            postings = len(self._postings)
+        return {
+            "ready": self.ready,
+            "students": students,
+            "courses": entries - students,
+            "entries": entries,
+            "postings": postings,
+            "memory_bytes": self.memory_bytes(),
+            "built_at": self.built_at,
+            "build_ms": round(self.build_seconds * 1000, 3),
+            "incremental_updates": self.incremental_updates,
+            "lookups": self.lookups,
+            "avg_lookup_us": round(self.lookup_seconds / self.lookups * 1_000_000, 3) if self.lookups else 0.0,
+        }
+
+    def _publish_metrics(self) -> None:
+        try:
+            from backend.middleware.prometheus_metrics import update_suggestion_index_metrics
+
+            stats = self.stats()
+            update_suggestion_index_metrics(stats["entries"], stats["postings"], stats["memory_bytes"])
+        except Exception as exc:  # pragma: no cover - metrics must never break the index
+            logger.debug("Suggestion index metrics not published: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Entry construction
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _make_entry(kind: str, entity_id: int, text: str, extra_words: Iterable[str] = ()) -> Optional[_Entry]:
+        text = " ".join(text.split())
+        folded = fold_text(text)
+        if not folded:
+            return None
+        words = tuple(dict.fromkeys(list(folded.split(" ")) + [fold_text(word) for word in extra_words if word]))
+        return _Entry(kind=kind, id=int(entity_id), text=text, folded=folded, words=words)
+
+    def _student_entry(self, student_id: int, first_name: Optional[str], last_name: Optional[str]) -> Optional[_Entry]:
+        return self._make_entry("student", student_id, f"{first_name or ''} {last_name or ''}")
+
+    def _course_entry(self, course_id: int, course_name: Optional[str], course_code: Optional[str]) -> Optional[_Entry]:
+        # Suggestions show the course name (as before); the code is searchable too.
+        return self._make_entry("course", course_id, course_name or course_code or "", [course_code or ""])
+
+
+def _entry_size(entry: _Entry) -> int:
+    """Shallow size of an entry and of the postings it contributes."""
+    total = sys.getsizeof(entry) + sys.getsizeof(entry.text) + sys.getsizeof(entry.folded)
+    total += sys.getsizeof(entry.words) + sum(sys.getsizeof(word) for word in entry.words)
+    for key in entry.keys:
+        total += sys.getsizeof((key, entry.kind, 0)) + sys.getsizeof(key)
+    return total
+
+
+def _matches_all(tokens: List[str], words: Tuple[str, ...]) -> bool:
+    return all(any(word.startswith(token) for word in words) for token in tokens)
+
+
+# ============================================================================
+# Singleton + ORM hooks
+# ============================================================================
+
+suggestion_index = SuggestionIndex()
+_hooks_registered = False
+_hooks_lock = threading.Lock()
+
+
+def get_suggestion_index() -> SuggestionIndex:
+    return suggestion_index
+
+
+def build_suggestion_index(session_factory) -> None:
+    """Build the index with a fresh session (used from the app lifespan thread)."""
+    db = session_factory()
+    try:
+        suggestion_index.build(db)
+    except Exception as exc:
+        logger.warning(f"Suggestion index build failed; suggestions use the database: {exc}")
+    finally:
+        db.close()
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    if not suggestion_index.ready:
+        return
+    from backend.models import Course, Student
+
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Student):
+            pending[("student", obj.id)] = None if obj.deleted_at is not None else (obj.first_name, obj.last_name)
+        elif isinstance(obj, Course):
+            pending[("course", obj.id)] = None if obj.deleted_at is not None else (obj.course_name, obj.course_code)
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            pending[("student", obj.id)] = None
+        elif isinstance(obj, Course):
+            pending[("course", obj.id)] = None
+
+
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not suggestion_index.ready:
+        return
+    for (kind, entity_id), values in pending.items():
+        if entity_id is None:
+            continue
+        if values is None:
+            suggestion_index.remove(kind, entity_id)
+        elif kind == "student":
+            suggestion_index.upsert_student(entity_id, *values)
+        else:
+            suggestion_index.upsert_course(entity_id, *values)
+    suggestion_index._publish_metrics()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_orm_hooks() -> None:
+    """Attach session listeners that keep the index in sync with committed writes."""
+    global _hooks_registered
+    with _hooks_lock:
+        if _hooks_registered:
+            return
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+        _hooks_registered = True
+
+
+def unregister_orm_hooks() -> None:
+    global _hooks_registered
+    with _hooks_lock:
+        if not _hooks_registered:
+            return
+        event.remove(Session, "after_flush", _after_flush)
+        event.remove(Session, "after_commit", _after_commit)
+        event.remove(Session, "after_rollback", _after_rollback)
+        _hooks_registered = False
+
+
+__all__ = [
+    "SuggestionIndex",
+    "fold_text",
+    "suggestion_index",
+    "get_suggestion_index",
+    "build_suggestion_index",
+    "register_orm_hooks",
+    "unregister_orm_hooks",
+]
@@ -0,0 +1,267 @@
+"""
+Streaming ingestion helpers for uploaded import files.
+
+Uploads are copied to a spooled temporary file in fixed-size chunks so the
+size limit is enforced before the whole body is buffered. Text encodings are
+sniffed from a short prefix. JSON arrays are decoded one element at a time, and
+both JSON records and CSV rows reach the import engine in batches as they are
+read, so only one batch of decoded records is held at a time.
+"""
+
+from __future__ import annotations
+
+import codecs
+import io
+import json
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterable, Iterator, List
+
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Uploads smaller than this stay in memory; larger ones roll over to disk
+SPOOL_MEMORY_LIMIT = 1024 * 1024
+SNIFF_PREFIX_SIZE = 4096
+IMPORT_BATCH_SIZE = 500
+TEXT_READ_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\r\n"
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the size limit while it is being spooled."""
+
+    def __init__(self, size: int, limit: int):
+        super().__init__(f"Upload exceeds {limit} bytes")
+        self.size = size
+        self.limit = limit
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded file copied to a rewindable temporary file."""
+
+    filename: str
+    size: int
+    file: IO[bytes]
+    prefix: bytes = b""
+    _closed: bool = field(default=False, repr=False)
+
+    def read_bytes(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    @contextmanager
+    def open_text(self, encoding: str) -> Iterator[io.TextIOWrapper]:
+        """Yield a text stream over the spooled bytes, starting from the beginning."""
+        self.file.seek(0)
+        stream = io.TextIOWrapper(self.file, encoding=encoding, newline="")  # type: ignore[arg-type]
+        try:
+            yield stream
+        finally:
+            # Detach so the wrapper does not close the spool when it is collected
+            stream.detach()
+
+    def decodes_as(self, encoding: str) -> bool:
+        """Whether the whole upload decodes with ``encoding``, checked chunk by chunk."""
+        decoder = codecs.getincrementaldecoder(encoding)()
+        self.file.seek(0)
+        try:
+            while chunk := self.file.read(UPLOAD_CHUNK_SIZE):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return False
+        return True
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    memory_limit: int = SPOOL_MEMORY_LIMIT,
+) -> SpooledUpload:
+    """Copy ``file`` into a spooled temporary file, stopping once ``max_size`` is exceeded.
+
+    Raises:
+        UploadTooLargeError: As soon as more than ``max_size`` bytes have been read.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=memory_limit, mode="w+b")
+    size = 0
+    prefix = bytearray()
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLargeError(size, max_size)
+            if len(prefix) < SNIFF_PREFIX_SIZE:
+                prefix.extend(chunk[: SNIFF_PREFIX_SIZE - len(prefix)])
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return SpooledUpload(filename=file.filename or "", size=size, file=spool, prefix=bytes(prefix))
+
+
+def sniff_encoding(prefix: bytes, fallback: str | None = "latin-1") -> str:
+    """Pick a text encoding for an upload from its first bytes.
+
+    A UTF-8 byte order mark selects ``utf-8-sig``; a prefix that decodes as
+    UTF-8 (allowing a multi-byte sequence cut off at the end of a full-size
+    prefix) selects ``utf-8``. Otherwise ``fallback`` is returned, or ``UnicodeDecodeError`` is
+    raised when no fallback is allowed.
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # Only a full-size prefix can end in the middle of a character
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=len(prefix) < SNIFF_PREFIX_SIZE)
+        return "utf-8"
+    except UnicodeDecodeError:
+        if fallback is None:
+            raise
+        return fallback
+
+
+def batched(items: Iterable[Any], batch_size: int = IMPORT_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Group ``items`` into lists of at most ``batch_size``, consuming them lazily."""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _JsonArrayReader:
+    """Decode the elements of a top-level JSON array from a text stream."""
+
+    def __init__(self, stream: IO[str], read_size: int):
+        self.stream = stream
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # Grow reads with the pending value so a large element is not re-scanned once per chunk
+        chunk = self.stream.read(max(self.read_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > self.read_size:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def _decode_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise json.JSONDecodeError(exc.msg, exc.doc, exc.pos) from None
+            # A number or literal ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._peek() != "[":
+            raise self._error("Expecting '['")
+        self.pos += 1
+        if self._peek() == "]":
+            self.pos += 1
+        else:
+            while True:
+                yield self._decode_value()
+                delimiter = self._peek()
+                self.pos += 1
+                if delimiter == "]":
+                    break
+                if delimiter != ",":
+                    self.pos -= 1
+                    raise self._error("Expecting ',' delimiter")
+        if self._peek():
+            raise self._error("Extra data")
+
+
+def iter_json_records(stream: IO[str], read_size: int = TEXT_READ_SIZE) -> Iterator[Any]:
+    """Yield import records from a JSON document without loading it all at once.
+
+    A top-level array is decoded element by element; any other document is
+    parsed whole and yielded as a single record, matching how the import
+    endpoints treat a single object.
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed.
+    """
+    head = ""
+    while not head.lstrip(_WHITESPACE):
+        chunk = stream.read(read_size)
+        if not chunk:
+            break
+        head += chunk
+    if not head.lstrip(_WHITESPACE).startswith("["):
+        yield json.loads(head + stream.read())
+        return
+    yield from _JsonArrayReader(_PrefixedStream(head, stream), read_size)
+
+
+def iter_json_batches(
+    stream: IO[str], batch_size: int = IMPORT_BATCH_SIZE, read_size: int = TEXT_READ_SIZE
+) -> Iterator[List[Any]]:
+    """Group :func:`iter_json_records` output into lists of at most ``batch_size`` records."""
+    return batched(iter_json_records(stream, read_size), batch_size)
+
+
+class _PrefixedStream:
+    """Replay an already-read prefix before continuing with the wrapped stream."""
+
+    def __init__(self, prefix: str, stream: IO[str]):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> str:
+        if self.prefix:
+            chunk, self.prefix = self.prefix, ""
+            return chunk
+        return self.stream.read(size)
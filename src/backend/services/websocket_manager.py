@@ -194,6 +194,25 @@ async def broadcast_notification(
     await manager.broadcast_to_user(user_id, payload)
 
 
+async def broadcast_unread_count(user_id: int, unread_count: int) -> int:
+    """Push a user's current unread notification count to their open connections.
+
+    Args:
+        user_id: ID of user to notify
+        unread_count: Current number of unread notifications
+
+    Returns:
+        Number of connections message was sent to
+    """
+    payload: dict[str, Any] = {
+        "type": "unread_count",
+        "unread_count": unread_count,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+    return await manager.broadcast_to_user(user_id, payload)
+
+
 async def broadcast_system_message(title: str, message: str, data: Optional[dict[str, Any]] = None) -> int:
     """Broadcast a system message to all connected users.
 
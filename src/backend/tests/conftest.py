@@ -239,6 +239,14 @@ def patch_settings_for_tests(request, monkeypatch):
     except Exception as e:
         logging.warning(f"Failed to reset login throttle for tests: {e}")
 
+    # 6. Reset cached tokens, user snapshots and permission profiles
+    try:
+        from backend.security.auth_cache import auth_cache
+
+        auth_cache.clear()
+    except Exception as e:
+        logging.warning(f"Failed to reset auth cache for tests: {e}")
+
     logging.info("Successfully patched settings for test execution")
 
 
@@ -295,6 +303,19 @@ def setup_db(setup_db_schema):
                 # Ignore errors for tables that don't exist or can't be truncated
                 pass
 
+    # Truncation bypasses the ORM hooks that invalidate cached facet counts,
+    # course analytics snapshots and unread notification counters, and resets
+    # the data versions that key the analytics lookups payload
+    from backend.services.analytics_service import invalidate_analytics_lookups
+    from backend.services.course_analytics_snapshot import invalidate_course_snapshots
+    from backend.services.facet_service import invalidate_facet_cache
+    from backend.services.notification_unread_counter import invalidate_unread_counts
+
+    invalidate_facet_cache()
+    invalidate_course_snapshots()
+    invalidate_analytics_lookups()
+    invalidate_unread_counts()
+
 
 @pytest.fixture(scope="function")
 def db(setup_db):
@@ -369,7 +390,7 @@ def client(db):
     from types import SimpleNamespace
 
     from backend.config import settings as cfg
-    from backend.db import get_session
+    from backend.db import get_read_session, get_session
     from backend.dependencies import get_db
     from backend.main import app
     from backend.security.current_user import get_current_user as real_get_current_user
@@ -380,6 +401,7 @@ def client(db):
 
     app.dependency_overrides[get_session] = _override_session
     app.dependency_overrides[get_db] = _override_session  # Also override get_db for routers using it
+    app.dependency_overrides[get_read_session] = _override_session  # Read-replica routed endpoints
 
     async def _override_current_user(request: Request, token: str | None = None, db=Depends(get_session)):
         from backend.errors import ErrorCode, http_error
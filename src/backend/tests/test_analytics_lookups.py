@@ -0,0 +1,126 @@
+"""
+Tests for the cached analytics lookups payload.
+"""
+
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.models import Course, CourseEnrollment, Grade, Student
+from backend.services.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def school(db):
+    course = Course(course_code="LOOK101", course_name="Lookups", credits=3, semester="Fall 2025")
+    db.add(course)
+    students = [
+        Student(student_id="L1", first_name="Ann", last_name="Alpha", email="l1@x.test", academic_year="A"),
+        Student(student_id="L2", first_name="Bob", last_name="Beta", email="l2@x.test", study_year=1),
+        Student(
+            student_id="L3", first_name="Cid", last_name="Gamma", email="l3@x.test", study_year=3, class_division="Γ1"
+        ),
+        Student(student_id="L4", first_name="Dee", last_name="Delta", email="l4@x.test", class_division=""),
+    ]
+    db.add_all(students)
+    db.flush()
+    scores = {"L1": [90.0, 70.0], "L2": [60.0], "L3": [40.0]}
+    for student in students:
+        db.add(CourseEnrollment(student_id=student.id, course_id=course.id, enrolled_at=date.today()))
+        for i, score in enumerate(scores.get(student.student_id, [])):
+            db.add(
+                Grade(
+                    student_id=student.id,
+                    course_id=course.id,
+                    assignment_name=f"A{i}",
+                    category="Assignment",
+                    grade=score,
+                    max_grade=100.0,
+                )
+            )
+    db.commit()
+    return course, students
+
+
+@contextmanager
+def count_queries(db, marker):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if marker in statement:
+            statements.append(statement)
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+
+def _by_label(items):
+    return {item["label"]: (item["count"], item["average"]) for item in items}
+
+
+def test_lookups_group_classes_and_divisions_in_sql(db, school):
+    lookups = AnalyticsService(db).get_analytics_lookups()
+
+    assert [s["student_id"] for s in lookups["students"]] == ["L1", "L2", "L4", "L3"]
+    assert set(lookups["students"][0]) == {
+        "id",
+        "student_id",
+        "first_name",
+        "last_name",
+        "is_active",
+        "study_year",
+        "academic_year",
+        "class_division",
+    }
+    # Academic year wins over study year; study year 1 maps to "A" as well
+    assert _by_label(lookups["class_averages"]) == {
+        "A": (2, pytest.approx(220 / 3)),
+        "Year 3": (1, 40.0),
+        "Unknown Class": (1, 0.0),
+    }
+    assert _by_label(lookups["division_averages"]) == {
+        "Unassigned Division": (3, pytest.approx(220 / 3)),
+        "Γ1": (1, 40.0),
+    }
+    assert _by_label(lookups["course_averages"]) == {"Lookups": (4, 65.0)}
+
+
+def test_lookups_are_cached_until_grades_change(db, school):
+    course, students = school
+    service = AnalyticsService(db)
+    first = service.get_analytics_lookups()
+
+    with count_queries(db, "FROM grades") as statements:
+        assert service.get_analytics_lookups() == first
+    assert statements == []
+
+    db.add(
+        Grade(
+            student_id=students[3].id,
+            course_id=course.id,
+            assignment_name="Late",
+            category="Assignment",
+            grade=100.0,
+            max_grade=100.0,
+        )
+    )
+    db.commit()
+
+    refreshed = service.get_analytics_lookups()
+    assert _by_label(refreshed["class_averages"])["Unknown Class"] == (1, 100.0)
+
+
+def test_lookups_endpoint_returns_selector_payload(client, admin_headers, school):
+    response = client.get("/api/v1/analytics/lookups", headers=admin_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {c["course_code"] for c in data["courses"]} == {"LOOK101"}
+    assert len(data["students"]) == 4
@@ -0,0 +1,152 @@
+"""
+Tests for the verified-token, user snapshot and permission profile caches.
+"""
+
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event, text
+
+from backend.config import settings
+from backend.models import Permission, Role, User
+from backend.rbac import has_permission
+from backend.routers.routers_auth import create_access_token
+from backend.security.auth_cache import UserSnapshot, auth_cache, mark_permissions_changed
+from backend.security.password_hash import get_password_hash
+
+
+@pytest.fixture
+def auth_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "AUTH_MODE", "strict", raising=False)
+
+
+@pytest.fixture
+def teacher(db):
+    user = User(
+        email="cached.teacher@example.com",
+        hashed_password=get_password_hash("Teacher123!"),
+        full_name="Cached Teacher",
+        role="teacher",
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@contextmanager
+def count_queries(db, marker: str = ""):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if marker in statement:
+            statements.append(statement)
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+
+def _me(client, token):
+    return client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_token_cache_never_outlives_token_expiry():
+    auth_cache.store_subject("short-lived", "user@example.com", {"exp": time.time() + 1})
+    assert auth_cache.get_subject("short-lived") == "user@example.com"
+
+    time.sleep(1.1)
+    assert auth_cache.get_subject("short-lived") is None
+
+
+def test_token_cache_is_keyed_by_signing_key(monkeypatch):
+    auth_cache.store_subject("token", "user@example.com", {"exp": time.time() + 60})
+    assert auth_cache.get_subject("token") == "user@example.com"
+
+    monkeypatch.setattr(settings, "SECRET_KEY", settings.SECRET_KEY + "-rotated", raising=False)
+    assert auth_cache.get_subject("token") is None
+
+
+def test_authenticated_requests_reuse_user_snapshot(client, db, auth_enabled, teacher):
+    token = create_access_token(subject=teacher.email)
+    assert _me(client, token).status_code == 200
+
+    with count_queries(db, "FROM users") as statements:
+        response = _me(client, token)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == teacher.email
+    assert statements == []
+
+
+def test_deactivation_commit_invalidates_snapshot(client, db, auth_enabled, teacher):
+    token = create_access_token(subject=teacher.email)
+    assert _me(client, token).status_code == 200
+
+    teacher.is_active = False
+    db.commit()
+
+    assert _me(client, token).status_code == 401
+
+
+def test_admin_deactivation_endpoint_invalidates_snapshot(client, db, auth_enabled, teacher):
+    admin = User(
+        email="cached.admin@example.com",
+        hashed_password=get_password_hash("Admin@12345678"),
+        full_name="Cached Admin",
+        role="admin",
+        is_active=True,
+    )
+    db.add(admin)
+    db.commit()
+    admin_token = create_access_token(subject=admin.email)
+    teacher_token = create_access_token(subject=teacher.email)
+    assert _me(client, teacher_token).status_code == 200
+
+    response = client.patch(
+        f"/api/v1/admin/users/{teacher.id}",
+        json={"is_active": False},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert _me(client, teacher_token).status_code == 401
+
+
+def test_permission_profile_is_cached_until_rbac_changes(db, auth_enabled, teacher):
+    role = Role(name="teacher", description="Teacher")
+    permission = Permission(key="reports:read", resource="reports", action="read", description="Read reports")
+    db.add_all([role, permission])
+    db.flush()
+    db.execute(
+        text("INSERT INTO user_roles (user_id, role_id) VALUES (:user_id, :role_id)"),
+        {"user_id": teacher.id, "role_id": role.id},
+    )
+    db.commit()
+
+    snapshot = auth_cache.store_user(teacher)
+    assert isinstance(snapshot, UserSnapshot)
+    assert has_permission(snapshot, "reports:read", db) is False
+
+    with count_queries(db) as statements:
+        assert has_permission(snapshot, "reports:read", db) is False
+    assert statements == []
+
+    db.execute(
+        text("INSERT INTO role_permissions (role_id, permission_id, created_at) VALUES (:role_id, :perm_id, :now)"),
+        {"role_id": role.id, "perm_id": permission.id, "now": datetime.now(timezone.utc)},
+    )
+    mark_permissions_changed(db)
+    db.commit()
+
+    # The old snapshot is pinned to the previous version and no longer served
+    assert auth_cache.get_user(teacher.email) is None
+    refreshed = auth_cache.store_user(teacher)
+    assert refreshed.permission_version == snapshot.permission_version + 1
+    assert has_permission(refreshed, "reports:read", db) is True
@@ -4,11 +4,14 @@ Test suite for Backup Encryption (v1.15.0)
 Tests AES-256 encryption, backup encryption/decryption, and backup management.
 """
 
+import json
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 import pytest
+from cryptography.exceptions import InvalidTag
 
+from backend.services import encryption_service as encryption_module
 from backend.services.backup_service_encrypted import BackupServiceEncrypted
 from backend.services.encryption_service import EncryptionService
 
@@ -149,6 +152,73 @@ class TestEncryptionService:
         assert metadata["source"] == "test"
         assert metadata["original_name"] == "sample.txt"
 
+    @pytest.mark.parametrize("size", [0, 64, 200, 1000])
+    def test_chunked_file_roundtrip_with_workers(self, tmp_path, size):
+        """Test chunked encryption across chunk boundaries, inline and threaded."""
+        data = bytes(range(256)) * 4
+        source = tmp_path / "source.bin"
+        source.write_bytes(data[:size])
+
+        for workers in (1, 3):
+            service = EncryptionService(key_dir=tmp_path / "keys", chunk_size=64, workers=workers)
+            encrypted_path = tmp_path / f"source_{workers}.enc"
+            restored_path = tmp_path / f"restored_{workers}.bin"
+            service.encrypt_file(source, encrypted_path)
+
+            assert service.is_chunked_file(encrypted_path)
+            assert service.verify_file(encrypted_path)["original_size"] == size
+            service.decrypt_file(encrypted_path, restored_path)
+            assert restored_path.read_bytes() == data[:size]
+
+    def test_truncated_chunked_file_fails(self, tmp_path, sample_file):
+        """Test that dropping whole trailing chunks is detected."""
+        service = EncryptionService(key_dir=tmp_path / "keys", chunk_size=256)
+        encrypted_path = tmp_path / "sample.enc"
+        service.encrypt_file(sample_file, encrypted_path)
+
+        # Cut exactly one sealed chunk (256 bytes + 16 byte tag) off the end
+        data = encrypted_path.read_bytes()
+        encrypted_path.write_bytes(data[: -(256 + service.TAG_LENGTH)])
+
+        with pytest.raises(InvalidTag):
+            service.verify_file(encrypted_path)
+        with pytest.raises(InvalidTag):
+            service.decrypt_file(encrypted_path, tmp_path / "restored.txt")
+        assert not (tmp_path / "restored.txt").exists()
+
+    def test_legacy_single_shot_file_still_decrypts(self, encryption_service, sample_data, tmp_path):
+        """Test that files written in the original format remain readable."""
+        metadata_bytes = json.dumps({"original_name": "legacy.db"}).encode()
+        package = encryption_service.encrypt(sample_data, associated_data=metadata_bytes)
+        legacy_path = tmp_path / "legacy.enc"
+        legacy_path.write_bytes(
+            len(package).to_bytes(4, byteorder="big")
+            + len(metadata_bytes).to_bytes(2, byteorder="big")
+            + metadata_bytes
+            + package
+        )
+
+        assert not encryption_service.is_chunked_file(legacy_path)
+        metadata = encryption_service.decrypt_file(legacy_path, tmp_path / "legacy.db")
+
+        assert metadata["original_name"] == "legacy.db"
+        assert (tmp_path / "legacy.db").read_bytes() == sample_data
+
+    def test_master_key_is_cached(self, encryption_service, monkeypatch):
+        """Test that the master key file is read once until it changes."""
+        key = encryption_service._get_or_create_master_key()
+        encryption_service._get_or_create_master_key()
+
+        def _no_reads(*args, **kwargs):
+            raise AssertionError("master key re-read")
+
+        monkeypatch.setattr(encryption_module, "open", _no_reads, raising=False)
+        assert encryption_service._get_or_create_master_key() == key
+        monkeypatch.undo()
+
+        rotated = encryption_service.rotate_master_key()
+        assert encryption_service._get_or_create_master_key() == rotated
+
     def test_get_key_info(self, encryption_service):
         """Test key info retrieval."""
         info = encryption_service.get_key_info()
@@ -293,6 +363,21 @@ class TestBackupServiceEncrypted:
         assert result["valid"] is False
         assert "error" in result
 
+    def test_verify_truncated_backup_fails(self, backup_service, sample_file):
+        """Test that integrity check authenticates the whole chunked backup."""
+        backup_result = backup_service.create_encrypted_backup(
+            source_path=sample_file,
+            backup_name="test_backup",
+        )
+
+        backup_path = Path(backup_result["backup_path"])
+        backup_path.write_bytes(backup_path.read_bytes()[:-1])
+
+        result = backup_service.verify_backup_integrity("test_backup")
+
+        assert result["valid"] is False
+        assert "error" in result
+
     def test_cleanup_old_backups(self, backup_service, sample_file):
         """Test cleanup of old backups."""
         # Create multiple backups
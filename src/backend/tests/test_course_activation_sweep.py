@@ -0,0 +1,130 @@
+"""
+Tests for the set-based course activation sweep.
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.db import get_data_version
+from backend.models import Course, CourseEnrollment, Student
+from backend.services import facet_service
+from backend.services.course_activation_scheduler import run_course_activation_sweep
+
+TODAY = date(2025, 10, 1)
+
+
+@pytest.fixture
+def catalogue(db):
+    courses = {
+        "FALL1": Course(course_code="FALL1", course_name="Fall", semester="Fall 2025", is_active=False),
+        "FALL2": Course(course_code="FALL2", course_name="Fall", semester="Fall 2025", is_active=True),
+        "SPR1": Course(course_code="SPR1", course_name="Spring", semester="Spring 2025", is_active=True),
+        "SPR2": Course(course_code="SPR2", course_name="Spring", semester="Spring 2025"),
+        "SPR3": Course(course_code="SPR3", course_name="Spring", semester="Spring 2025", is_active=False),
+        "ACAD": Course(course_code="ACAD", course_name="Year", semester="Academic Year 2025-2026", is_active=False),
+        "ODD": Course(course_code="ODD", course_name="Odd", semester="Elective block", is_active=False),
+        "GONE": Course(course_code="GONE", course_name="Gone", semester="Spring 2025", is_active=True),
+    }
+    db.add_all(courses.values())
+    student = Student(student_id="SW1", first_name="Sweep", last_name="Student", email="sweep@example.com")
+    db.add(student)
+    db.flush()
+    for code in ("FALL1", "SPR1", "SPR3", "GONE"):
+        db.add(CourseEnrollment(student_id=student.id, course_id=courses[code].id, status="active"))
+    db.commit()
+    courses["GONE"].mark_deleted()
+    db.commit()
+    return courses
+
+
+def _state(db):
+    db.expire_all()
+    active = {
+        c.course_code: c.is_active
+        for c in db.query(Course).execution_options(include_deleted=True).order_by(Course.course_code)
+    }
+    statuses = {
+        e.course.course_code: e.status for e in db.query(CourseEnrollment).execution_options(include_deleted=True)
+    }
+    return active, statuses
+
+
+def test_dry_run_reports_changes_without_writing(db, catalogue):
+    before = _state(db)
+
+    report = run_course_activation_sweep(db, dry_run=True, today=TODAY)
+
+    assert report.dry_run is True
+    assert report.active_semesters == ["Academic Year 2025-2026", "Fall 2025"]
+    assert report.inactive_semesters == ["Spring 2025"]
+    assert report.unrecognized_semesters == ["Elective block"]
+    assert (report.courses_activated, report.courses_deactivated, report.enrollments_completed) == (2, 2, 2)
+    assert {"semesters", "courses", "enrollments", "total"} <= set(report.timings_ms)
+    assert _state(db) == before
+
+
+def test_sweep_applies_set_based_updates(db, catalogue):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        report = run_course_activation_sweep(db, today=TODAY)
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+    assert report.courses_updated == 4
+    active, statuses = _state(db)
+    assert active == {
+        "ACAD": True,
+        "FALL1": True,
+        "FALL2": True,
+        "GONE": True,  # soft-deleted courses are left alone
+        "ODD": False,
+        "SPR1": False,
+        "SPR2": False,
+        "SPR3": False,
+    }
+    assert statuses == {"FALL1": "active", "SPR1": "completed", "SPR3": "completed", "GONE": "active"}
+    # The catalogue is never hydrated: courses are only read as distinct semesters
+    assert not any("courses.course_name" in s for s in statements)
+    assert sum(s.lstrip().upper().startswith("UPDATE") for s in statements if "data_versions" not in s) == 3
+
+    rerun = run_course_activation_sweep(db, today=TODAY)
+    assert (rerun.courses_updated, rerun.enrollments_completed) == (0, 0)
+
+
+def _versions(db):
+    return {
+        name: int(version)
+        for name, version in (
+            part.split(":") for part in get_data_version(db, ["courses", "course_enrollments"]).split(",")
+        )
+    }
+
+
+def test_sweep_invalidates_caches(db, catalogue):
+    versions_before = _versions(db)
+    facet_generation = facet_service._generations["courses"]
+
+    run_course_activation_sweep(db, today=TODAY)
+
+    versions_after = _versions(db)
+    assert all(versions_after[name] > versions_before[name] for name in versions_before)
+    assert facet_service._generations["courses"] > facet_generation
+
+
+def test_activation_sweep_endpoint_defaults_to_dry_run(client, admin_headers, db, catalogue):
+    response = client.post("/api/v1/courses/activation-sweep", headers=admin_headers)
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["dry_run"] is True
+    assert data["courses_updated"] == data["courses_activated"] + data["courses_deactivated"]
+    assert "total" in data["timings_ms"]
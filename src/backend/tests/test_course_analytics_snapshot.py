@@ -0,0 +1,204 @@
+"""
+Tests for cached per-course analytics snapshots.
+"""
+
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.db.data_version import bump_data_versions
+from backend.models import Attendance, Course, CourseEnrollment, Grade, Student
+from backend.services.analytics_service import AnalyticsService
+from backend.services.cache_service import get_cache_manager
+from backend.services.course_analytics_snapshot import CourseSnapshotRefresher, snapshot_key, snapshot_version
+
+
+@pytest.fixture
+def course(db):
+    course = Course(course_code="SNAP101", course_name="Snapshots", credits=3, semester="Fall 2025")
+    other = Course(course_code="SNAP102", course_name="Other", credits=3, semester="Fall 2025")
+    db.add_all([course, other])
+    db.commit()
+    return course, other
+
+
+@pytest.fixture
+def graded_course(db, course):
+    course, other = course
+    scores = {"S1": [95, 85], "S2": [70, 72], "S3": [85, 95], "S4": [50]}
+    for code, values in scores.items():
+        student = Student(
+            student_id=code,
+            first_name=code,
+            last_name="Snapshot",
+            email=f"{code.lower()}@snapshot.test",
+            enrollment_date=date.today(),
+            is_active=True,
+        )
+        db.add(student)
+        db.flush()
+        db.add(CourseEnrollment(student_id=student.id, course_id=course.id, enrolled_at=date.today()))
+        for i, value in enumerate(values):
+            db.add(
+                Grade(
+                    student_id=student.id,
+                    course_id=course.id,
+                    assignment_name=f"A{i}",
+                    category="Assignment",
+                    grade=float(value),
+                    max_grade=100.0,
+                    date_submitted=date.today(),
+                )
+            )
+        for status in ("Present", "Absent") if code == "S1" else ("Present",):
+            db.add(Attendance(student_id=student.id, course_id=course.id, date=date.today(), status=status))
+    db.commit()
+    return course, other
+
+
+@contextmanager
+def count_grade_queries(db):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM grades" in statement:
+            statements.append(statement)
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+
+def _add_grade(db, course, student_code, value):
+    student = db.query(Student).filter(Student.student_id == student_code).one()
+    db.add(
+        Grade(
+            student_id=student.id,
+            course_id=course.id,
+            assignment_name="Extra",
+            category="Assignment",
+            grade=float(value),
+            max_grade=100.0,
+            date_submitted=date.today(),
+        )
+    )
+    db.commit()
+
+
+def test_snapshot_backs_distribution_and_comparison(db, graded_course):
+    course, _ = graded_course
+    service = AnalyticsService(db)
+
+    distribution = service.get_grade_distribution(course.id)
+    comparison = service.get_students_comparison(course.id, limit=3)
+
+    assert distribution["total_grades"] == 7
+    assert distribution["distribution"]["A (90-100%)"] == round(2 / 7 * 100, 2)
+    assert distribution["percentiles"] == {"p25": 71.0, "p50": 85.0, "p75": 90.0, "p90": 95.0}
+    assert [(s["student_id"], s["rank"]) for s in comparison["students"]] == [("S1", 1), ("S3", 1), ("S2", 3)]
+    assert comparison["students"][0]["attendance_rate"] == 50.0
+    assert comparison["class_statistics"]["student_count"] == 4
+    assert comparison["class_statistics"]["min"] == 50.0
+
+
+def test_repeated_reads_are_served_from_cache(db, graded_course):
+    course, _ = graded_course
+    service = AnalyticsService(db)
+    first = service.get_students_comparison(course.id)
+
+    with count_grade_queries(db) as statements:
+        assert service.get_students_comparison(course.id) == first
+        service.get_grade_distribution(course.id)
+
+    assert statements == []
+
+
+def test_grade_write_invalidates_only_its_course(db, graded_course):
+    course, other = graded_course
+    service = AnalyticsService(db)
+    service.get_grade_distribution(course.id)
+    service.get_grade_distribution(other.id)
+    cache = get_cache_manager()
+
+    _add_grade(db, course, "S4", 100)
+
+    assert cache.get(snapshot_key(course.id)) is None
+    assert cache.get(snapshot_key(other.id)) is not None
+    assert service.get_grade_distribution(course.id)["total_grades"] == 8
+
+
+def test_grade_write_in_another_course_keeps_snapshot_version(db, graded_course):
+    course, other = graded_course
+    service = AnalyticsService(db)
+    service.get_grade_distribution(course.id)
+    version = snapshot_version(db, course.id)
+
+    # Another worker grading a different course moves only that course's version
+    _add_grade(db, other, "S4", 60)
+    assert snapshot_version(db, course.id) == version
+    with count_grade_queries(db) as statements:
+        assert service.get_grade_distribution(course.id)["total_grades"] == 7
+    assert statements == []
+
+    _add_grade(db, course, "S4", 100)
+    assert snapshot_version(db, course.id) != version
+
+
+def test_bulk_grade_write_moves_every_course_version(db, graded_course):
+    course, other = graded_course
+    versions = [snapshot_version(db, c.id) for c in (course, other)]
+
+    db.query(Grade).filter(Grade.course_id == course.id).update({"grade": 100.0}, synchronize_session=False)
+    db.commit()
+
+    # The update cannot be attributed to a course, so every snapshot is rebuilt
+    assert all(snapshot_version(db, c.id) != v for c, v in zip((course, other), versions))
+
+
+def test_refresher_rebuilds_after_write(db, graded_course):
+    course, _ = graded_course
+    service = AnalyticsService(db)
+    service.get_students_comparison(course.id)
+    refresher = CourseSnapshotRefresher(lambda: Session(bind=db.connection()), debounce_seconds=0)
+
+    _add_grade(db, course, "S4", 100)
+    refresher.schedule([course.id])
+    assert refresher.refresh_pending() == 1
+
+    entry = get_cache_manager().get(snapshot_key(course.id))
+    assert entry is not None
+    s4 = next(s for s in entry["snapshot"]["students"] if s["student_id"] == "S4")
+    assert s4["average_percentage"] == 75.0
+    assert s4["grade_count"] == 2
+
+
+def test_write_from_another_worker_is_seen_through_data_version(db, graded_course):
+    course, _ = graded_course
+    service = AnalyticsService(db)
+    assert service.get_grade_distribution(course.id)["total_grades"] == 7
+    student = db.query(Student).filter(Student.student_id == "S4").one()
+
+    # Another worker's hooks clear only its own cache; here only the shared version moves
+    db.execute(
+        insert(Grade.__table__).values(
+            student_id=student.id,
+            course_id=course.id,
+            assignment_name="Remote",
+            category="Assignment",
+            grade=100.0,
+            max_grade=100.0,
+            date_submitted=date.today(),
+        )
+    )
+    bump_data_versions(db.connection(), ["grades"])
+    db.commit()
+
+    assert get_cache_manager().get(snapshot_key(course.id)) is not None
+    assert service.get_grade_distribution(course.id)["total_grades"] == 8
@@ -0,0 +1,166 @@
+"""
+Tests for the incremental course template import (POST /imports/courses).
+"""
+
+import json
+import os
+
+import pytest
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.models import Course
+from backend.routers import routers_imports
+from backend.services import course_template_import
+from backend.services.course_template_import import MANIFEST_FILENAME, default_manifest_path
+from backend.services.import_service import ImportService
+
+
+def _write(path, payload):
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def templates(tmp_path, monkeypatch):
+    monkeypatch.setattr(routers_imports, "COURSES_DIR", str(tmp_path))
+    monkeypatch.setattr(course_template_import, "MANIFEST_DIR", str(tmp_path / "state"))
+    _write(
+        tmp_path / "math.json",
+        [
+            {
+                "course_code": "TPL101",
+                "course_name": "Μαθηματικά",
+                "semester": "Α' Εξάμηνο",
+                "credits": "4",
+                "evaluation_rules": [
+                    {"category": "Τελική Εξέταση", "weight": "60%"},
+                    {"category": "Συμμετοχή:", "weight": 40},
+                ],
+            },
+            {"course_code": "TPL102", "course_name": "Algebra", "semester": "Fall", "periods_per_week": 3},
+        ],
+    )
+    _write(tmp_path / "physics.json", {"course_code": "TPL201", "course_name": "Physics", "semester": "Fall"})
+    return tmp_path
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    parse = routers_imports._parse_course_template
+
+    def _recording_parse(name, data):
+        calls.append(name)
+        return parse(name, data)
+
+    monkeypatch.setattr(routers_imports, "_parse_course_template", _recording_parse)
+    return calls
+
+
+def _import(client, **params):
+    response = client.post("/api/v1/imports/courses", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_first_import_creates_courses_and_translates_rules(client, db, templates, parse_calls):
+    data = _import(client)
+
+    assert (data["created"], data["updated"], data["unchanged_files"]) == (3, 0, 0)
+    assert data["errors"] == []
+    assert sorted(parse_calls) == ["math.json", "physics.json"]
+    course = db.query(Course).filter_by(course_code="TPL101").one()
+    assert course.credits == 4
+    assert course.evaluation_rules == [
+        {"category": "Final Exam", "weight": 60.0},
+        {"category": "Class Participation", "weight": 40.0},
+    ]
+    assert db.query(Course).filter_by(course_code="TPL102").one().hours_per_week == 3.0
+    assert os.path.exists(default_manifest_path(str(templates)))
+    assert os.path.dirname(default_manifest_path(str(templates))) == str(templates / "state")
+    assert not any(name.startswith(MANIFEST_FILENAME) for name in os.listdir(templates))
+
+
+def test_rerun_skips_unchanged_and_touched_files(client, templates, parse_calls):
+    _import(client)
+    parse_calls.clear()
+    # Same content with a new mtime is still unchanged
+    stat = os.stat(templates / "physics.json")
+    os.utime(templates / "physics.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    data = _import(client)
+
+    assert (data["created"], data["updated"], data["unchanged_files"]) == (0, 0, 2)
+    assert parse_calls == []
+
+
+def test_changed_file_is_the_only_one_reparsed(client, db, templates, parse_calls):
+    _import(client)
+    parse_calls.clear()
+    _write(templates / "physics.json", {"course_code": "TPL201", "course_name": "Physics II", "semester": "Fall"})
+
+    data = _import(client)
+
+    assert parse_calls == ["physics.json"]
+    assert (data["created"], data["updated"], data["unchanged_files"]) == (0, 1, 1)
+    assert db.query(Course).filter_by(course_code="TPL201").one().course_name == "Physics II"
+
+
+def test_missing_course_forces_reimport_of_its_file(client, db, templates, parse_calls):
+    _import(client)
+    parse_calls.clear()
+    db.query(Course).filter_by(course_code="TPL102").one().mark_deleted()
+    db.commit()
+
+    data = _import(client)
+
+    assert parse_calls == ["math.json"]
+    assert (data["created"], data["updated"]) == (0, 2)
+    assert db.query(Course).filter_by(course_code="TPL102").one().deleted_at is None
+
+
+def test_force_and_files_with_errors_are_always_reparsed(client, templates, parse_calls):
+    _write(templates / "broken.json", [{"course_name": "No code"}])
+    first = _import(client)
+    assert "Missing course_code in broken.json" in first["errors"]
+    parse_calls.clear()
+
+    second = _import(client)
+    assert parse_calls == ["broken.json"]
+    assert second["errors"] == ["Missing course_code in broken.json"]
+    parse_calls.clear()
+
+    forced = _import(client, force="true")
+    assert sorted(parse_calls) == ["broken.json", "math.json", "physics.json"]
+    assert (forced["updated"], forced["unchanged_files"]) == (3, 0)
+
+
+def test_upsert_courses_batches_lookups_and_reactivates(db):
+    archived = Course(course_code="UPS1", course_name="Old", semester="Fall", credits=3)
+    db.add(archived)
+    db.commit()
+    archived.mark_deleted()
+    db.commit()
+
+    results = ImportService.upsert_courses(
+        db,
+        [
+            {"course_code": "UPS1", "course_name": "Restored", "semester": "Fall", "evaluation_rules": []},
+            {"course_code": "UPS2", "course_name": "New", "semester": "Fall"},
+            {"course_code": "UPS2", "course_name": "New again", "semester": "Fall"},
+            {"course_name": "Missing"},
+        ],
+    )
+    db.commit()
+
+    assert results == [(False, None), (True, None), (False, None), (False, "Missing course_code")]
+    assert db.query(Course).filter_by(course_code="UPS1").one().deleted_at is None
+    assert db.query(Course).filter_by(course_code="UPS2").one().course_name == "New again"
+
+
+def test_map_category_is_memoized():
+    routers_imports._map_category_text.cache_clear()
+
+    labels = [routers_imports._map_category(raw) for raw in ["Εργαστήριο:", "Εργαστήριο:", "lab work", None]]
+
+    assert labels == ["Lab Work", "Lab Work", "Lab Work", "None"]
+    assert routers_imports._map_category_text.cache_info().hits == 1
@@ -777,3 +777,250 @@ def test_xlsx_and_csv_both_empty_for_pre_alias_grade_value_field(db, tmp_path: P
 
     # Both formats return the same value — confirming the source is the data pipeline,
     # not the rendering layer (Paragraph / plain str distinction is irrelevant here).
+
+
+def _seed_compiled_report_data(db):
+    students = [
+        Student(  # type: ignore[call-arg]
+            first_name=first,
+            last_name=last,
+            email=f"{first.lower()}@example.com",
+            student_id=f"S-{index}",
+            enrollment_date=date(2024, 9, index),
+            is_active=index != 3,
+            study_year=index,
+        )
+        for index, (first, last) in enumerate((("Anna", "Alpha"), ("Bob", "Beta"), ("Cleo", "Gamma")), start=1)
+    ]
+    course = Course(course_code="CMP-1", course_name="Compiled", semester="1", credits=3)  # type: ignore[call-arg]
+    db.add_all([*students, course])
+    db.commit()
+
+    for offset, (student, scores) in enumerate(zip(students, ((90, 40), (55,), ()))):
+        for position, score in enumerate(scores):
+            db.add(
+                Grade(  # type: ignore[call-arg]
+                    student_id=student.id,
+                    course_id=course.id,
+                    assignment_name="Final exam" if position else "Quiz",
+                    category="Exam",
+                    grade=score,
+                    max_grade=100,
+                    date_assigned=date(2024, 10, 1 + offset),
+                    date_submitted=date(2024, 10, 2 + offset) if position else None,
+                )
+            )
+        for day, status in enumerate(("Present", "Late", "Absent")[: 3 - offset]):
+            db.add(
+                Attendance(  # type: ignore[call-arg]
+                    student_id=student.id,
+                    course_id=course.id,
+                    date=date(2024, 10, 1 + day),
+                    status=status,
+                    period_number=1,
+                )
+            )
+    db.add(CourseEnrollment(student_id=students[0].id, course_id=course.id, status="active"))  # type: ignore[call-arg]
+    db.commit()
+
+
+def _rows_both_ways(service, report):
+    report_type = str(report.report_type).lower()
+    columns = service._normalize_columns(report_type, report.fields)
+    compiled = service._compile_report_query(report, columns)
+    assert compiled is not None
+    compiled_rows = [list(row) for row in service._iter_compiled_rows(compiled)]
+    orm_rows = [list(row) for row in service._build_report_rows_orm(report, columns)]
+    return compiled_rows, orm_rows
+
+
+def test_compiled_report_query_matches_orm_evaluation(db):
+    _seed_compiled_report_data(db)
+    service = CustomReportGenerationService(db)
+    service._allow_sensitive_fields = True
+
+    definitions = [
+        Report(  # type: ignore[call-arg]
+            report_type="student",
+            fields={"columns": ["id", "student_name", "attendance_rate", "attended", "gpa", "passed_courses"]},
+            filters={"gpa": {"operator": "gte", "value": "50"}},
+            sort_by=[{"field": "attendance_rate", "order": "desc"}],
+        ),
+        Report(  # type: ignore[call-arg]
+            report_type="grade",
+            fields={"columns": ["student_name", "id", "course_code", "grade", "percentage", "exam_date"]},
+            filters=[{"field": "first_name", "operator": "contains", "value": "a"}],
+            sort_by=[{"field": "grade", "order": "asc"}],
+        ),
+        Report(  # type: ignore[call-arg]
+            report_type="attendance",
+            fields={"columns": ["student_name", "date", "status", "student.email"]},
+            filters=[{"field": "status", "operator": "not_equals", "value": "Absent"}],
+            sort_by=[{"field": "date", "order": "asc"}],
+        ),
+        Report(  # type: ignore[call-arg]
+            report_type="course",
+            fields={"columns": ["name", "code", "enrollment_count", "fictional_column"]},
+        ),
+    ]
+
+    for report in definitions:
+        compiled_rows, orm_rows = _rows_both_ways(service, report)
+        assert compiled_rows == orm_rows, report.report_type
+        assert compiled_rows
+
+
+def test_compiled_report_applies_metric_filters_and_sorts_in_sql(db):
+    _seed_compiled_report_data(db)
+    service = CustomReportGenerationService(db)
+    service._set_language("el")
+    report = Report(  # type: ignore[call-arg]
+        report_type="student",
+        fields={"columns": ["first_name", "total_classes", "gpa", "email"]},
+        filters=[{"field": "total_classes", "operator": "gt", "value": 1}],
+        sort_by=[{"field": "gpa", "order": "asc"}],
+    )
+    columns = service._normalize_columns("student", report.fields)
+    compiled = service._compile_report_query(report, columns)
+    assert compiled is not None
+
+    sql = str(compiled.statement)
+    assert "report_attendance" in sql and "report_grades" in sql
+
+    rows = list(service._iter_compiled_rows(compiled))
+    assert rows == [("Bob", 2, 55.0, ""), ("Anna", 3, 65.0, "")]
+    assert all(isinstance(row, tuple) for row in rows)
+
+
+def test_compiled_metric_filters_compare_rounded_values(db):
+    _seed_compiled_report_data(db)
+    service = CustomReportGenerationService(db)
+
+    # Anna attended 2 of 3 classes: 66.666... is shown and compared as 66.7
+    for filters in (
+        [{"field": "attendance_rate", "operator": "equals", "value": "66.7"}],
+        [{"field": "attendance_rate", "operator": "contains", "value": "66.7"}],
+        [{"field": "gpa", "operator": "starts_with", "value": "65"}],
+    ):
+        report = Report(  # type: ignore[call-arg]
+            report_type="student",
+            fields={"columns": ["first_name", "attendance_rate", "gpa"]},
+            filters=filters,
+        )
+        compiled_rows, orm_rows = _rows_both_ways(service, report)
+        assert compiled_rows == orm_rows == [["Anna", 66.7, 65.0]], filters
+
+    columns = service._normalize_columns("student", {"columns": ["first_name"]})
+    compiled = service._compile_report_query(
+        Report(report_type="student", filters={"attended": {"operator": "contains", "value": "2"}}),  # type: ignore[call-arg]
+        columns,
+    )
+    assert compiled is not None
+    assert "CAST(" in str(compiled.statement)
+
+
+def test_compiled_report_rows_are_streamed(db):
+    _seed_compiled_report_data(db)
+    service = CustomReportGenerationService(db)
+    report = Report(report_type="student", fields={"columns": ["first_name"]})  # type: ignore[call-arg]
+
+    rows, _headers = service._build_report_rows(report)
+
+    assert not isinstance(rows, list)
+    assert [row[0] for row in rows] == ["Anna", "Bob", "Cleo"]
+
+
+def test_report_with_relationship_field_falls_back_to_orm(db):
+    _seed_compiled_report_data(db)
+    service = CustomReportGenerationService(db)
+    report = Report(  # type: ignore[call-arg]
+        report_type="student",
+        fields={"columns": ["first_name", "grades"]},
+        sort_by=[{"field": "first_name", "order": "asc"}],
+    )
+    columns = service._normalize_columns("student", report.fields)
+
+    assert service._compile_report_query(report, columns) is None
+    rows, headers = service._build_report_rows(report)
+    assert [row[0] for row in rows] == ["Anna", "Bob", "Cleo"]
+    assert headers == ["First Name", "Grades"]
+
+
+def _generate(db, service, report_id: int, user_id: int, file_name: str) -> GeneratedReport:
+    generated = GeneratedReport(  # type: ignore[call-arg]
+        report_id=report_id, user_id=user_id, file_name=file_name, export_format="csv", status="pending"
+    )
+    db.add(generated)
+    db.commit()
+    service.generate_report(report_id, cast(int, generated.id), user_id, "csv", include_charts=False)
+    db.refresh(generated)
+    return generated
+
+
+def test_unchanged_report_reuses_cached_artifact(db, tmp_path: Path, monkeypatch):
+    user_id = 1
+    _create_student(db)
+    report = _create_report(db, user_id)
+    report_id = cast(int, report.id)
+    service = CustomReportGenerationService(db)
+    service.reports_dir = str(tmp_path)
+
+    first = _generate(db, service, report_id, user_id, "report_first.csv")
+    assert first.status == "completed" and first.cache_key
+
+    def fail_build(*_args, **_kwargs):
+        raise AssertionError("cached report should not be rebuilt")
+
+    monkeypatch.setattr(service, "_build_report_rows", fail_build)
+    second = _generate(db, service, report_id, user_id, "report_second.csv")
+    db.refresh(first)
+
+    assert second.status == "completed"
+    assert second.file_path == first.file_path
+    assert second.cache_key == first.cache_key
+    assert second.record_count == first.record_count == 1
+    assert first.status == "superseded"
+
+
+def test_source_data_change_invalidates_cached_artifact(db, tmp_path: Path):
+    from backend.db import get_data_version
+
+    user_id = 1
+    student = _create_student(db)
+    report = _create_report(db, user_id)
+    report_id = cast(int, report.id)
+    service = CustomReportGenerationService(db)
+    service.reports_dir = str(tmp_path)
+
+    first = _generate(db, service, report_id, user_id, "report_first.csv")
+    version_before = get_data_version(db, ["students"])
+
+    student.first_name = "Janet"  # type: ignore[assignment]
+    db.commit()
+    assert get_data_version(db, ["students"]) != version_before
+
+    second = _generate(db, service, report_id, user_id, "report_second.csv")
+
+    assert second.cache_key != first.cache_key
+    assert second.file_path != first.file_path
+    assert "Janet" in Path(cast(str, second.file_path)).read_text(encoding="utf-8")
+
+
+def test_deleting_one_generation_keeps_shared_cached_file(db, tmp_path: Path):
+    from backend.services.custom_report_service import CustomReportService
+
+    user_id = 1
+    _create_student(db)
+    report = _create_report(db, user_id)
+    report_id = cast(int, report.id)
+    service = CustomReportGenerationService(db)
+    service.reports_dir = str(tmp_path)
+
+    first = _generate(db, service, report_id, user_id, "report_first.csv")
+    second = _generate(db, service, report_id, user_id, "report_second.csv")
+    shared_path = Path(cast(str, first.file_path))
+
+    assert CustomReportService(db).delete_generated_report(report_id, cast(int, first.id), user_id)
+    assert shared_path.exists()
+    assert CustomReportService(db).delete_generated_report(report_id, cast(int, second.id), user_id)
+    assert not shared_path.exists()
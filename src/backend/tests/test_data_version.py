@@ -0,0 +1,63 @@
+"""
+Tests for per-table data versions bumped after commit.
+
+These use a file-backed engine so sessions are bound to an Engine (not to the
+shared test connection) and the post-commit bump runs in its own transaction.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.db.data_version import get_data_version
+from backend.models import Base, Student, init_db
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = init_db(f"sqlite:///{tmp_path / 'versions.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _student(suffix: str) -> Student:
+    return Student(first_name="Ver", last_name=suffix, email=f"v{suffix}@example.com", student_id=f"V{suffix}")
+
+
+def test_versions_are_bumped_after_the_write_commits(session_factory):
+    engine = session_factory.kw["bind"]
+    log = []
+    event.listen(engine, "commit", lambda conn: log.append("COMMIT"))
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: log.append(statement.split()[0].upper()),
+    )
+
+    with session_factory() as session:
+        session.add(_student("1"))
+        session.commit()
+        assert get_data_version(session, ["students"]) == "students:1"
+
+    write = log.index("INSERT")
+    assert log[write + 1] == "COMMIT"
+    # The counter is touched in a transaction of its own, after the write committed
+    bump = log.index("UPDATE", write)
+    assert "COMMIT" in log[bump:]
+
+
+def test_rolled_back_and_savepoint_writes(session_factory):
+    with session_factory() as session:
+        session.add(_student("1"))
+        session.flush()
+        session.rollback()
+        assert get_data_version(session, ["students"]) == "students:0"
+
+        with session.begin_nested():
+            session.add(_student("2"))
+        # Releasing the savepoint does not bump; the outer commit does, once
+        assert get_data_version(session, ["students"]) == "students:0"
+        session.commit()
+        assert get_data_version(session, ["students"]) == "students:1"
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from backend.services import database_manager
+
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.queries: list[str] = []
+
+    def execute(self, query: str):
+        self.queries.append(query)
+        if query is database_manager._TABLE_STATS_SQL:
+            return _FakeCursor([("courses", 40, 8192), ("students", 1200, 65536)])
+        if query is database_manager._DATABASE_STATS_SQL:
+            return _FakeCursor([(3, 1048576)])
+        return _FakeCursor([(1234,)])
+
+
+def _patch_connection(monkeypatch, conn: _FakeConnection) -> None:
+    @contextmanager
+    def fake_pooled_connection(instance):
+        yield conn
+
+    monkeypatch.setattr(database_manager, "_pooled_connection", fake_pooled_connection)
+
+
+def test_instance_stats_use_catalog_estimates_without_scanning(monkeypatch):
+    conn = _FakeConnection()
+    _patch_connection(monkeypatch, conn)
+
+    stats = database_manager.get_instance_stats({"name": "primary"})
+
+    assert stats["table_count"] == 2
+    assert stats["rows_exact"] is False
+    assert [t["rows"] for t in stats["tables"]] == [40, 1200]
+    assert stats["active_connections"] == 3
+    assert stats["size_bytes"] == 1048576
+    assert not any('count(*) FROM "' in query for query in conn.queries)
+
+
+def test_instance_stats_exact_counts_on_request(monkeypatch):
+    conn = _FakeConnection()
+    _patch_connection(monkeypatch, conn)
+
+    stats = database_manager.get_instance_stats({"name": "primary"}, exact_counts=True)
+
+    assert stats["rows_exact"] is True
+    assert [t["rows"] for t in stats["tables"]] == [1234, 1234]
+    assert sum('count(*) FROM "' in query for query in conn.queries) == 2
+
+
+def test_stats_endpoint_caches_results(client, monkeypatch):
+    from backend.routers.control import base as control_base
+    from backend.routers.control import database as db_router
+
+    control_base._CONTROL_CACHE.clear()
+    calls: list[bool] = []
+
+    def fake_stats(instance, *, exact_counts=False):
+        calls.append(exact_counts)
+        return {"name": instance["name"], "table_count": 0, "tables": [], "rows_exact": exact_counts}
+
+    monkeypatch.setattr(db_router, "_find_instance", lambda name: {"name": name})
+    monkeypatch.setattr(db_router, "get_instance_stats", fake_stats)
+
+    try:
+        for _ in range(2):
+            resp = client.get("/control/api/database/instances/primary/stats")
+            assert resp.status_code == 200, resp.text
+        assert calls == [False]
+
+        resp = client.get("/control/api/database/instances/primary/stats?exact=true")
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["rows_exact"] is True
+
+        client.get("/control/api/database/instances/primary/stats?refresh=true")
+        assert calls == [False, True, False]
+    finally:
+        control_base._CONTROL_CACHE.clear()
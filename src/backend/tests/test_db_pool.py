@@ -0,0 +1,119 @@
+"""
+Tests for connection pool configuration, per-connection SQLite PRAGMAs and pool metrics.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import exc, text
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.db_pool import (
+    InstrumentedQueuePool,
+    InstrumentedSingletonThreadPool,
+    build_engine_options,
+    pool_status,
+)
+from backend.models import init_db
+
+
+def _sample(name, pool):
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0.0
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'pool.db'}"
+
+
+def test_postgres_pool_sizes_come_from_settings():
+    options = build_engine_options(
+        "postgresql://u:p@db/sms",
+        SimpleNamespace(
+            DATABASE_POOL_SIZE=7, DATABASE_MAX_OVERFLOW=3, DATABASE_POOL_TIMEOUT=2.5, DATABASE_POOL_RECYCLE=600
+        ),
+    )
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"], options["pool_timeout"]) == (7, 3, 2.5)
+    assert (options["pool_recycle"], options["pool_pre_ping"]) == (600, True)
+
+
+@pytest.mark.parametrize(
+    ("url", "strategy", "pool_class"),
+    [
+        ("sqlite:///data.db", "queue", "InstrumentedQueuePool"),
+        ("sqlite:///data.db", "singleton", "InstrumentedSingletonThreadPool"),
+        ("sqlite:///data.db", "null", "InstrumentedNullPool"),
+        ("sqlite:///:memory:", "queue", "InstrumentedSingletonThreadPool"),
+    ],
+)
+def test_sqlite_pool_strategy(url, strategy, pool_class):
+    options = build_engine_options(url, SimpleNamespace(DATABASE_SQLITE_POOL=strategy))
+
+    assert options["poolclass"].__name__ == pool_class
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_every_sqlite_connection_gets_tuned_pragmas(sqlite_url):
+    engine = init_db(sqlite_url)
+    try:
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        # Two connections held at once are two distinct DBAPI connections
+        with engine.connect() as first, engine.connect() as second:
+            assert first.connection.dbapi_connection is not second.connection.dbapi_connection
+            for conn in (first, second):
+                pragmas = {
+                    name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                    for name in ("journal_mode", "synchronous", "foreign_keys", "busy_timeout", "cache_size")
+                }
+                assert pragmas == {
+                    "journal_mode": "wal",
+                    "synchronous": 1,
+                    "foreign_keys": 1,
+                    "busy_timeout": 5000,
+                    "cache_size": -65536,
+                }
+                assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+        # Connections are reused rather than reopened per checkout
+        assert pool_status(engine)["checked_out"] == 0
+        with engine.connect() as again:
+            assert again.execute(text("SELECT 1")).scalar() == 1
+        assert engine.pool.checkedout() == 0
+    finally:
+        engine.dispose()
+
+
+def test_pool_metrics_record_checkouts_age_and_timeouts(sqlite_url, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_SQLITE_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DATABASE_POOL_TIMEOUT", 0.05)
+    engine = init_db(sqlite_url)
+    checkouts = _sample("sms_db_pool_checkout_wait_seconds_count", "primary")
+    ages = _sample("sms_db_pool_connection_age_seconds_count", "primary")
+    timeouts = _sample("sms_db_pool_timeouts_total", "primary")
+    try:
+        with engine.connect():
+            assert _sample("sms_db_pool_checked_out", "primary") == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        assert _sample("sms_db_pool_checked_out", "primary") == 0
+        assert _sample("sms_db_pool_checkout_wait_seconds_count", "primary") == checkouts + 2
+        assert _sample("sms_db_pool_connection_age_seconds_count", "primary") == ages + 1
+        assert _sample("sms_db_pool_timeouts_total", "primary") == timeouts + 1
+        assert _sample("sms_db_pool_size", "primary") == 1
+    finally:
+        engine.dispose()
+
+
+def test_memory_database_is_shared_within_a_thread():
+    engine = init_db("sqlite:///:memory:")
+    try:
+        assert isinstance(engine.pool, InstrumentedSingletonThreadPool)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+    finally:
+        engine.dispose()
@@ -503,3 +503,83 @@ def test_enroll_with_custom_date(client):
     enrollments = client.get(f"/api/v1/enrollments/course/{course_id}").json()
     assert len(enrollments) == 1
     assert enrollments[0]["enrolled_at"] == custom_date
+
+
+def test_enroll_cohort_reactivates_and_creates_in_bulk(client):
+    """Re-enrolling a cohort restores unenrolled students and creates the rest"""
+    course_resp = client.post(
+        "/api/v1/courses/",
+        json={
+            "course_code": "CS214",
+            "course_name": "Cohort Test",
+            "semester": "Fall 2025",
+            "credits": 3,
+        },
+    )
+    course_id = course_resp.json()["id"]
+
+    student_ids = []
+    for i in range(6):
+        student_resp = client.post(
+            "/api/v1/students/",
+            json={
+                "student_id": f"ENRC{i:03d}",
+                "email": f"enrc{i}@test.com",
+                "first_name": f"Cohort{i}",
+                "last_name": "Student",
+            },
+        )
+        student_ids.append(student_resp.json()["id"])
+
+    first = client.post(f"/api/v1/enrollments/course/{course_id}", json={"student_ids": student_ids[:4]})
+    assert first.json() == {"created": 4, "reactivated": 0}
+    for sid in student_ids[:2]:
+        client.delete(f"/api/v1/enrollments/course/{course_id}/student/{sid}")
+
+    # Repeated and unknown IDs are ignored
+    response = client.post(
+        f"/api/v1/enrollments/course/{course_id}",
+        json={"student_ids": student_ids + student_ids[:1] + [99999], "enrolled_at": "2025-09-01"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 2, "reactivated": 2}
+    enrollments = client.get(f"/api/v1/enrollments/course/{course_id}").json()
+    assert sorted(e["student_id"] for e in enrollments) == sorted(student_ids)
+    restored = [e for e in enrollments if e["student_id"] in student_ids[:2]]
+    assert {(e["status"], e["enrolled_at"]) for e in restored} == {("active", "2025-09-01")}
+
+
+def test_enroll_cohort_skips_deleted_students_and_bumps_versions(db):
+    """Only valid students are reactivated, and the reactivation moves the data version"""
+    from backend.db import get_data_version
+    from backend.models import Course, CourseEnrollment, Student
+    from backend.schemas.enrollments import EnrollmentCreate
+    from backend.services.enrollment_service import EnrollmentService
+
+    course = Course(course_code="CS215", course_name="Versions", semester="Fall 2025", credits=3)
+    students = [
+        Student(student_id=f"ENRV{i}", email=f"enrv{i}@test.com", first_name=f"V{i}", last_name="Student")
+        for i in range(2)
+    ]
+    db.add_all([course, *students])
+    db.flush()
+    for student in students:
+        db.add(CourseEnrollment(student_id=student.id, course_id=course.id, status="active"))
+    db.commit()
+    for enrollment in db.query(CourseEnrollment).filter(CourseEnrollment.course_id == course.id):
+        enrollment.mark_deleted()
+    students[1].mark_deleted()
+    db.commit()
+    version_before = get_data_version(db, ["course_enrollments"])
+
+    result = EnrollmentService.enroll_students(db, course.id, EnrollmentCreate(student_ids=[s.id for s in students]))
+    db.commit()
+
+    assert result == {"created": 0, "reactivated": 1}
+    assert get_data_version(db, ["course_enrollments"]) != version_before
+    deleted = {
+        e.student_id: e.deleted_at is not None
+        for e in db.query(CourseEnrollment).execution_options(include_deleted=True)
+    }
+    assert deleted == {students[0].id: False, students[1].id: True}
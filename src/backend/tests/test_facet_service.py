@@ -418,3 +418,71 @@ class TestFacetEndpoints:
         inactive_value = next((v for v in status_facet.values if v.value == "inactive"), None)
         assert active_value.count == 3
         assert inactive_value.count == 2
+
+    def test_student_facets_single_scan_with_filters(self, clean_db: Session):
+        """Test all facets come from one query and honour filters."""
+        from datetime import date
+
+        from sqlalchemy import event
+
+        for i in range(4):
+            clean_db.add(
+                Student(
+                    first_name=f"Scan{i}",
+                    last_name="Test",
+                    email=f"scan{i}@test.com",
+                    student_id=f"SC{i:03d}",
+                    is_active=i != 3,
+                    study_year=1 + i % 2,
+                    enrollment_date=date(2022 + i % 2, 9, 1),
+                )
+            )
+        clean_db.commit()
+
+        statements = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        engine = clean_db.get_bind()
+        event.listen(engine, "before_cursor_execute", count_selects)
+        try:
+            result = FacetService(clean_db).get_student_facets(filters={"status": "active"})
+        finally:
+            event.remove(engine, "before_cursor_execute", count_selects)
+
+        assert len(statements) == 1
+        assert result.total_results == 3
+        facets = {f.name: {v.value: v.count for v in f.values} for f in result.facets}
+        assert facets["status"] == {"active": 3}
+        assert facets["enrollment_type"] == {"year_1": 2, "year_2": 1}
+        assert [v.value for v in result.facets[2].values] == ["2023", "2022"]
+
+    def test_facet_cache_reused_and_invalidated_on_write(self, clean_db: Session):
+        """Test cached facet counts are reused until a course is written."""
+        clean_db.add(Course(course_code="FC101", course_name="Cache I", semester="Fall", credits=3))
+        clean_db.commit()
+
+        service = FacetService(clean_db)
+        assert service.get_course_facets().total_results == 1
+
+        calls = []
+        original = service._course_facet_counts
+
+        def counting(filters):
+            calls.append(filters)
+            return original(filters)
+
+        service._course_facet_counts = counting
+        assert service.get_course_facets(query="cache").total_results == 1
+        assert calls == []
+
+        clean_db.add(Course(course_code="FC102", course_name="Cache II", semester="Spring", credits=4))
+        clean_db.commit()
+
+        result = service.get_course_facets()
+        assert len(calls) == 1
+        assert result.total_results == 2
+        semester_facet = next(f for f in result.facets if f.name == "semester")
+        assert [v.value for v in semester_facet.values] == ["Fall", "Spring"]
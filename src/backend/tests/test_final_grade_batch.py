@@ -0,0 +1,207 @@
+"""
+Parity tests for the vectorized final-grade computation.
+"""
+
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.models import Attendance, Course, CourseEnrollment, DailyPerformance, Grade, Student
+from backend.services.analytics_service import AnalyticsService
+from backend.services.final_grade_batch import (
+    AttendanceColumns,
+    DailyColumns,
+    GradeColumns,
+    calculate_final_grades,
+    compile_rules,
+)
+
+SCALAR_FIELDS = (
+    "final_grade",
+    "percentage",
+    "gpa",
+    "greek_grade",
+    "total_weight_used",
+    "unexcused_absences",
+    "absence_deduction",
+)
+
+RULES = [
+    {"category": "Midterm", "weight": 20},
+    {"category": "Final Exam", "weight": 30, "includeDailyPerformance": False},
+    {"category": "Homework", "weight": 15, "dailyPerformanceMultiplier": 1.5},
+    {"category": "Εργασία", "weight": 5},
+    {"category": "Participation", "weight": 10, "dailyPerformanceMultiplier": 0.5},
+    {"category": "Attendance", "weight": 10},
+    {"category": "Homework", "weight": 5},
+    {"category": "Lab", "weight": 0},
+    {"category": None, "weight": 10},
+]
+
+GRADE_CATEGORIES = ["Midterm", "midterm exam", "Final", "Τελική εξέταση", "Assignment", "ΑΣΚΗΣΗ", "Lab", "Quiz", None]
+DAILY_CATEGORIES = ["Participation", "Class participation", "homework", "Συμμετοχή", "Minor participation"]
+STATUSES = ["Present", "present", "Absent", "Late", "Excused"]
+
+
+def _random_records(rng, student_count):
+    grades, daily, attendance = [], [], []
+    start = date(2025, 9, 1)
+    for sid in range(1, student_count + 1):
+        for _ in range(rng.randint(0, 8)):
+            grades.append(
+                SimpleNamespace(
+                    id=len(grades) + 1,
+                    student_id=sid,
+                    category=rng.choice(GRADE_CATEGORIES),
+                    grade=float(rng.randint(0, 100)),
+                    max_grade=rng.choice([100.0, 100.0, 50.0, 0.0]),
+                    date_submitted=start + timedelta(days=rng.randint(0, 5)),
+                )
+            )
+        for _ in range(rng.randint(0, 6)):
+            daily.append(
+                SimpleNamespace(
+                    student_id=sid,
+                    category=rng.choice(DAILY_CATEGORIES),
+                    score=float(rng.randint(0, 10)),
+                    max_score=rng.choice([10.0, 10.0, 0.0]),
+                )
+            )
+        for _ in range(rng.randint(0, 5)):
+            attendance.append(SimpleNamespace(student_id=sid, status=rng.choice(STATUSES)))
+    return grades, daily, attendance
+
+
+def _per_student(service, course, sid, grades, daily, attendance):
+    return service._calculate_final_grade_from_records(
+        sid,
+        course,
+        [g for g in grades if g.student_id == sid],
+        [d for d in daily if d.student_id == sid],
+        [a for a in attendance if a.student_id == sid],
+    )
+
+
+def _assert_parity(batch, expected):
+    for field in SCALAR_FIELDS:
+        assert batch[field] == pytest.approx(expected[field], abs=0.011), field
+    assert batch["letter_grade"] == expected["letter_grade"]
+
+
+@pytest.mark.parametrize("absence_penalty", [0.0, 2.5])
+def test_batch_matches_per_student_records(db, absence_penalty):
+    rng = random.Random(39)
+    course = SimpleNamespace(id=1, course_name="Parity", evaluation_rules=RULES, absence_penalty=absence_penalty)
+    grades, daily, attendance = _random_records(rng, 60)
+    service = AnalyticsService(db)
+    student_ids = list(range(1, 61))
+
+    results = calculate_final_grades(
+        compile_rules(RULES, absence_penalty, service.exam_categories),
+        student_ids,
+        GradeColumns.from_rows(
+            [(g.student_id, g.category, g.grade, g.max_grade, g.date_submitted, g.id) for g in grades]
+        ),
+        DailyColumns.from_rows([(d.student_id, d.category, d.score, d.max_score) for d in daily]),
+        AttendanceColumns.from_rows([(a.student_id, a.status) for a in attendance]),
+    )
+
+    assert [r["student_id"] for r in results] == student_ids
+    for result in results:
+        _assert_parity(result, _per_student(service, course, result["student_id"], grades, daily, attendance))
+
+
+def test_letter_grades_follow_scale():
+    rules = compile_rules([{"category": "Homework", "weight": 100}])
+    scores = [100, 97, 96.99, 93, 90, 87, 83, 80, 77, 70, 60, 59.99, 0]
+    results = calculate_final_grades(
+        rules,
+        list(range(len(scores))),
+        GradeColumns.from_rows([(i, "homework", s, 100.0, None, i) for i, s in enumerate(scores)]),
+        DailyColumns.from_rows([]),
+        AttendanceColumns.from_rows([]),
+    )
+
+    assert [r["letter_grade"] for r in results] == [AnalyticsService.get_letter_grade(s) for s in scores]
+
+
+def test_course_final_grades_match_per_student_endpoint(db):
+    course = Course(
+        course_code="BATCH101",
+        course_name="Batch",
+        credits=3,
+        semester="Fall 2025",
+        evaluation_rules=RULES,
+        absence_penalty=1.0,
+    )
+    db.add(course)
+    db.flush()
+    rng = random.Random(7)
+    grades, daily, attendance = _random_records(rng, 8)
+    students = []
+    for sid in range(1, 9):
+        student = Student(
+            student_id=f"B{sid}",
+            first_name="Batch",
+            last_name=str(sid),
+            email=f"batch{sid}@example.com",
+            enrollment_date=date(2025, 9, 1),
+            is_active=True,
+        )
+        db.add(student)
+        db.flush()
+        db.add(CourseEnrollment(student_id=student.id, course_id=course.id, enrolled_at=date(2025, 9, 1)))
+        students.append(student)
+    for g in grades:
+        db.add(
+            Grade(
+                student_id=students[g.student_id - 1].id,
+                course_id=course.id,
+                assignment_name=f"Item {g.id}",
+                category=g.category,
+                grade=g.grade,
+                max_grade=g.max_grade,
+                date_submitted=g.date_submitted,
+            )
+        )
+    for d in daily:
+        db.add(
+            DailyPerformance(
+                student_id=students[d.student_id - 1].id,
+                course_id=course.id,
+                date=date(2025, 9, 2),
+                category=d.category,
+                score=d.score,
+                max_score=d.max_score,
+            )
+        )
+    for i, a in enumerate(attendance):
+        db.add(
+            Attendance(
+                student_id=students[a.student_id - 1].id,
+                course_id=course.id,
+                date=date(2025, 9, 1) + timedelta(days=i),
+                status=a.status,
+            )
+        )
+    db.commit()
+    service = AnalyticsService(db)
+
+    report = service.calculate_course_final_grades(course.id)
+
+    assert report["student_count"] == len(students)
+    for result in report["students"]:
+        _assert_parity(result, service.calculate_final_grade(result["student_id"], course.id))
+
+
+def test_course_without_rules_reports_error(db):
+    course = Course(course_code="NORULE1", course_name="No rules", credits=3, semester="Fall 2025")
+    db.add(course)
+    db.commit()
+
+    assert AnalyticsService(db).calculate_course_final_grades(course.id) == {
+        "error": "No evaluation rules defined for this course"
+    }
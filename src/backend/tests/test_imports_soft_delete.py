@@ -72,6 +72,7 @@ def test_import_courses_reactivates_soft_deleted_record(client, tmp_path, monkey
     courses_file = tmp_path / "courses.json"
     courses_file.write_text(json.dumps(payload), encoding="utf-8")
     monkeypatch.setattr("backend.routers.routers_imports.COURSES_DIR", str(tmp_path))
+    monkeypatch.setattr("backend.services.course_template_import.MANIFEST_DIR", str(tmp_path / "state"))
 
     response = client.post("/api/v1/imports/courses")
     assert response.status_code in (200, 404)
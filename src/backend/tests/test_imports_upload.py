@@ -135,3 +135,51 @@ def test_upload_courses_preserves_evaluation_rules(client: TestClient):
     # Verify all expected categories are present (may be translated)
     categories = [rule.get("category") for rule in er]
     assert len(categories) == 4
+
+
+def _student_records(count: int) -> list:
+    return [
+        {"student_id": f"STR{i}", "email": f"str{i}@example.com", "first_name": "Stream", "last_name": f"S{i}"}
+        for i in range(count)
+    ]
+
+
+def test_upload_imports_each_batch_as_it_is_parsed(client: TestClient, monkeypatch):
+    from backend.routers import routers_imports
+    from backend.services.import_service import ImportService
+    from backend.services.upload_ingestion import iter_json_batches
+
+    events = []
+
+    def one_record_batches(request, upload):
+        with upload.open_text("utf-8") as stream:
+            for batch in iter_json_batches(stream, batch_size=1):
+                events.append("parsed")
+                yield batch
+
+    create_or_update = ImportService.create_or_update_student
+
+    def record_import(db, obj):
+        events.append("imported")
+        return create_or_update(db, obj)
+
+    monkeypatch.setattr(routers_imports, "_iter_json_upload", one_record_batches)
+    monkeypatch.setattr(ImportService, "create_or_update_student", staticmethod(record_import))
+    files = {"files": ("students.json", json.dumps(_student_records(3)).encode("utf-8"), "application/json")}
+
+    resp = client.post("/api/v1/imports/upload", files=files, data={"import_type": "students"})
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["created"] == 3
+    assert events == ["parsed", "imported"] * 3
+
+
+def test_upload_invalid_json_after_valid_records_imports_nothing(client: TestClient):
+    body = json.dumps(_student_records(2))[:-1] + ", {broken"
+    files = {"files": ("students.json", body.encode("utf-8"), "application/json")}
+
+    resp = client.post("/api/v1/imports/upload", files=files, data={"import_type": "students"})
+
+    assert resp.status_code == 400, resp.text
+    students = client.get("/api/v1/students/?limit=1000").json()["items"]
+    assert not any(s["student_id"].startswith("STR") for s in students)
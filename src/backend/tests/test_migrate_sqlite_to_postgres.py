@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import argparse
+import threading
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+from backend import models
+from backend.scripts import migrate_sqlite_to_postgres as sqlite_to_pg
+
+
+def test_table_dependencies_follow_foreign_keys():
+    tables = [models.Student.__table__, models.Course.__table__, models.Grade.__table__]
+    deps = sqlite_to_pg._table_dependencies(tables)
+
+    assert deps["students"] == set()
+    assert deps["courses"] == set()
+    assert deps["grades"] == {"students", "courses"}
+
+
+def test_run_in_dependency_order_starts_children_after_parents():
+    deps = {"students": set(), "courses": set(), "grades": {"students", "courses"}, "roles": set()}
+    finished: list[str] = []
+    lock = threading.Lock()
+
+    def worker(name: str) -> sqlite_to_pg.TableCopyStats:
+        if name == "grades":
+            assert {"students", "courses"} <= set(finished)
+        with lock:
+            finished.append(name)
+        return sqlite_to_pg.TableCopyStats(name, rows=10, seconds=0.5)
+
+    results, failures = sqlite_to_pg._run_in_dependency_order(deps, worker, max_workers=3)
+
+    assert failures == {}
+    assert {stats.table for stats in results} == set(deps)
+    assert finished.index("grades") > max(finished.index("students"), finished.index("courses"))
+    assert results[0].rows_per_second == pytest.approx(20.0)
+
+
+def test_run_in_dependency_order_skips_dependents_of_failed_tables():
+    deps = {"students": set(), "grades": {"students"}, "roles": set()}
+
+    def worker(name: str) -> sqlite_to_pg.TableCopyStats:
+        if name == "students":
+            raise RuntimeError("boom")
+        return sqlite_to_pg.TableCopyStats(name, rows=1, seconds=0.1)
+
+    results, failures = sqlite_to_pg._run_in_dependency_order(deps, worker, max_workers=2)
+
+    assert [stats.table for stats in results] == ["roles"]
+    assert set(failures) == {"students", "grades"}
+
+
+def test_migration_state_round_trip(tmp_path: Path):
+    path = tmp_path / "state.json"
+    state = sqlite_to_pg.MigrationState(path, "abc")
+    state.set_deferred_ddl([{"kind": "index", "table_name": "grades", "name": "idx", "definition": "CREATE INDEX"}])
+    state.mark_completed(sqlite_to_pg.TableCopyStats("students", rows=5, seconds=1.0))
+
+    reloaded = sqlite_to_pg.MigrationState.load(path, "abc")
+    assert reloaded.is_completed("students")
+    assert not reloaded.is_completed("grades")
+    assert reloaded.deferred_ddl and reloaded.deferred_ddl[0]["name"] == "idx"
+
+    # Progress is only reused when resuming the same pair; dropped DDL is always kept
+    other_pair = sqlite_to_pg.MigrationState.load(path, "different")
+    assert other_pair.completed == {}
+    assert other_pair.deferred_ddl == reloaded.deferred_ddl
+    not_resuming = sqlite_to_pg.MigrationState.load(path, "abc", resume=False)
+    assert not_resuming.completed == {}
+    assert not_resuming.deferred_ddl == reloaded.deferred_ddl
+
+
+def test_migration_state_refuses_unreadable_file(tmp_path: Path):
+    path = tmp_path / "state.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(sqlite_to_pg.MigrationStateError):
+        sqlite_to_pg.MigrationState.load(path, "abc", resume=False)
+
+
+@pytest.fixture
+def copy_harness(tmp_path: Path, monkeypatch):
+    """Run the COPY path against a SQLite target, faking the PostgreSQL-only steps."""
+    tables = [models.Student.__table__, models.Course.__table__]
+    source_path = tmp_path / "source.db"
+    target_url = f"sqlite:///{tmp_path / 'target.db'}"
+    source = sa.create_engine(f"sqlite:///{source_path}")
+    target = sa.create_engine(target_url)
+    for engine in (source, target):
+        models.Base.metadata.create_all(engine, tables=tables)
+    with source.begin() as conn:
+        conn.execute(
+            models.Student.__table__.insert(),
+            [
+                {"student_id": "S1", "first_name": "A", "last_name": "B", "email": "s1@example.com"},
+                {"student_id": "S2", "first_name": "C", "last_name": "D", "email": "s2@example.com"},
+            ],
+        )
+        conn.execute(
+            models.Course.__table__.insert(), [{"course_code": "C1", "course_name": "Course", "semester": "Fall 2025"}]
+        )
+    source.dispose()
+
+    ddl = {
+        "idx_students_name": {"kind": "index", "table_name": "students", "name": "idx_students_name"},
+        "fk_courses_x": {"kind": "foreign_key", "table_name": "courses", "name": "fk_courses_x"},
+    }
+    harness = {"catalog": dict(ddl), "fail": set(), "captures": 0}
+
+    def capture(conn, table_names):
+        harness["captures"] += 1
+        return [dict(item, definition="...") for item in harness["catalog"].values()]
+
+    def drop(conn, items):
+        for item in items:
+            harness["catalog"].pop(item["name"], None)
+
+    def recreate(engine, items):
+        for item in items:
+            harness["catalog"][item["name"]] = ddl[item["name"]]
+        return []
+
+    def copy_table(table, source_conn, dest_conn, batch_size, selected_columns, append_safe):
+        if table.name in harness["fail"]:
+            raise RuntimeError("connection lost")
+        rows = [dict(row._mapping) for row in source_conn.execute(sa.select(*selected_columns))]
+        dest_conn.execute(table.insert().prefix_with("OR IGNORE"), rows)
+        return len(rows)
+
+    monkeypatch.setattr(sqlite_to_pg, "_copy_engine_url", lambda url: sa.engine.make_url(target_url))
+    monkeypatch.setattr(
+        sqlite_to_pg, "_filter_existing_destination_tables", lambda conn, selected: (list(selected), [])
+    )
+    monkeypatch.setattr(sqlite_to_pg, "_capture_deferrable_ddl", capture)
+    monkeypatch.setattr(sqlite_to_pg, "_drop_deferred_ddl", drop)
+    monkeypatch.setattr(sqlite_to_pg, "_recreate_deferred_ddl", recreate)
+    monkeypatch.setattr(sqlite_to_pg, "_copy_table_fast", copy_table)
+    monkeypatch.setattr(sqlite_to_pg, "_reset_identity_sequences", lambda conn, table: None)
+    monkeypatch.setattr(sqlite_to_pg, "_analyze_tables", lambda engine, names: None)
+
+    def run(resume: bool = False) -> int:
+        args = argparse.Namespace(
+            state_file=str(tmp_path / "state.json"), resume=resume, workers=2, no_truncate=True, batch_size=100
+        )
+        return sqlite_to_pg._run_copy_migration(args, tables, source_path, "postgresql://u:p@db:5432/sms")
+
+    harness.update(run=run, ddl=ddl, target=target, state_path=tmp_path / "state.json")
+    yield harness
+    target.dispose()
+
+
+def test_copy_migration_loads_tables_and_restores_ddl(copy_harness):
+    assert copy_harness["run"]() == 0
+
+    assert copy_harness["catalog"] == copy_harness["ddl"]
+    assert not copy_harness["state_path"].exists()
+    with copy_harness["target"].connect() as conn:
+        assert conn.execute(sa.text("SELECT count(*) FROM students")).scalar() == 2
+        assert conn.execute(sa.text("SELECT count(*) FROM courses")).scalar() == 1
+
+
+def test_copy_migration_rerun_keeps_ddl_dropped_by_failed_run(copy_harness, monkeypatch):
+    copy_harness["fail"].add("courses")
+    assert copy_harness["run"]() == 4
+    assert copy_harness["catalog"] == {}
+    assert copy_harness["state_path"].exists()
+
+    # A fresh run (no --resume, changed source) captures the already-stripped schema
+    copy_harness["fail"].clear()
+    monkeypatch.setattr(sqlite_to_pg, "_migration_fingerprint", lambda *args: "changed-source")
+    assert copy_harness["run"](resume=False) == 0
+
+    assert copy_harness["catalog"] == copy_harness["ddl"]
+    assert not copy_harness["state_path"].exists()
+
+
+def test_copy_migration_refuses_unreadable_state_file(copy_harness):
+    copy_harness["state_path"].write_text("{truncated", encoding="utf-8")
+
+    assert copy_harness["run"]() == 4
+    assert copy_harness["captures"] == 0
+    assert copy_harness["catalog"] == copy_harness["ddl"]
+
+
+def test_copy_mode_uses_psycopg_driver():
+    url = sqlite_to_pg._copy_engine_url("postgresql://user:pw@db:5432/sms")  # pragma: allowlist secret
+    assert url.drivername == "postgresql+psycopg"
+    assert url.database == "sms"
@@ -316,6 +316,21 @@ def test_update_notification_to_read_via_put(client, admin_token, db: Session, t
     assert data["is_read"] is True
 
 
+def test_notification_writes_by_non_owner_are_forbidden(client, admin_token, db: Session, test_user_id: int):
+    """Test that another user's notification cannot be marked or deleted."""
+    notification = make_notification_in_db(db, test_user_id + 1, is_read=True)
+    headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
+
+    r = client.put(f"/api/v1/notifications/{notification.id}", json={"is_read": False}, headers=headers)
+    assert r.status_code == 403
+    assert client.post(f"/api/v1/notifications/{notification.id}/read", headers=headers).status_code == 403
+    assert client.delete(f"/api/v1/notifications/{notification.id}", headers=headers).status_code == 403
+
+    db.refresh(notification)
+    assert notification.is_read is True
+    assert notification.deleted_at is None
+
+
 def test_update_notification_not_found(client, admin_token):
     """Test updating non-existent notification returns 404."""
     headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
@@ -754,5 +769,62 @@ def test_preference_response_format(client, admin_token):
         assert field in data
 
 
+def test_list_notifications_cursor_pagination(client, admin_token, db: Session, test_user_id: int):
+    """Test keyset pagination through next_cursor."""
+    for i in range(5):
+        make_notification_in_db(db, test_user_id, title=f"Notification {i}")
+
+    headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
+    r = client.get("/api/v1/notifications/?limit=2", headers=headers)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == 5
+    ids = [item["id"] for item in data["items"]]
+
+    while data["next_cursor"]:
+        r = client.get(f"/api/v1/notifications/?limit=2&cursor={data['next_cursor']}", headers=headers)
+        assert r.status_code == 200
+        data = r.json()
+        assert data["total"] is None  # Only the first page is counted
+        ids.extend(item["id"] for item in data["items"])
+
+    assert len(ids) == len(set(ids)) == 5
+
+    r = client.get("/api/v1/notifications/?cursor=bogus", headers=headers)
+    assert r.status_code == 400
+
+
+def test_unread_count_changes_are_pushed_over_websocket(client, admin_token, db: Session, test_user_id: int):
+    """Test that marking notifications read or unread pushes the new unread count."""
+    from backend.services.websocket_manager import manager
+
+    class _Socket:
+        def __init__(self):
+            self.sent = []
+
+        async def send_json(self, message):
+            self.sent.append(message)
+
+    first = make_notification_in_db(db, test_user_id)
+    make_notification_in_db(db, test_user_id)
+    socket = _Socket()
+    manager.active_connections[test_user_id] = {socket}
+    try:
+        headers = {"Authorization": f"Bearer {admin_token}"} if admin_token else {}
+        assert client.post(f"/api/v1/notifications/{first.id}/read", headers=headers).status_code == 200
+        assert client.post("/api/v1/notifications/read-all", headers=headers).status_code == 200
+        r = client.put(f"/api/v1/notifications/{first.id}", json={"is_read": False}, headers=headers)
+        assert r.status_code == 200
+        assert r.json()["is_read"] is False
+    finally:
+        manager.active_connections.pop(test_user_id, None)
+
+    assert [(m["type"], m["unread_count"]) for m in socket.sent] == [
+        ("unread_count", 1),
+        ("unread_count", 0),
+        ("unread_count", 1),
+    ]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""
+Tests for online and incremental SQLite backups in ops.database.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.ops.database import CHUNK_PAGES, DatabaseOperations
+
+
+@pytest.fixture
+def ops(tmp_path):
+    operations = DatabaseOperations(root_dir=tmp_path)
+    operations.data_dir.mkdir(parents=True)
+    db_path = operations.data_dir / operations.db_name
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    # Enough rows to span several chunks
+    connection.executemany("INSERT INTO notes (body) VALUES (?)", [(f"note {i} " * 20,) for i in range(20000)])
+    connection.commit()
+    connection.close()
+    return operations
+
+
+def _rows(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*), MAX(id) FROM notes").fetchone()
+    finally:
+        connection.close()
+
+
+def test_native_backup_includes_uncheckpointed_wal_pages(ops):
+    db_path = ops.data_dir / ops.db_name
+    writer = sqlite3.connect(db_path)
+    writer.execute("PRAGMA wal_autocheckpoint=0")
+    writer.execute("INSERT INTO notes (body) VALUES ('only in the WAL')")
+    writer.commit()
+
+    result = ops.backup_database_native(version="1.0", pages_per_step=16)
+    writer.close()
+
+    assert result.success, result.message
+    assert _rows(result.data["path"]) == (20001, 20001)
+
+
+def test_incremental_backups_share_unchanged_chunks(ops):
+    db_path = ops.data_dir / ops.db_name
+    first = ops.backup_database_incremental(version="1.0")
+    assert first.success, first.message
+    assert first.data["total_chunks"] > 1
+    first_manifest = json.loads(Path(first.data["path"]).read_text())
+
+    connection = sqlite3.connect(db_path)
+    connection.execute("UPDATE notes SET body = 'changed' WHERE id = 1")
+    connection.commit()
+    connection.close()
+
+    second = ops.backup_database_incremental(version="1.1")
+    assert second.success, second.message
+    assert second.data["new_chunks"] < second.data["total_chunks"]
+    assert second.data["stored_bytes"] < second.data["size_bytes"] / 2
+
+    restored = ops.restore_database_incremental(Path(first.data["path"]))
+    assert restored.success, restored.message
+    assert hashlib.sha256(db_path.read_bytes()).hexdigest() == first_manifest["sha256"]
+    connection = sqlite3.connect(db_path)
+    assert connection.execute("SELECT body FROM notes WHERE id = 1").fetchone()[0].startswith("note 0")
+    connection.close()
+
+
+def test_restore_rejects_corrupt_chunk(ops):
+    result = ops.backup_database_incremental()
+    manifest = ops.list_incremental_backups()[0]
+    assert manifest.path.name == Path(result.data["path"]).name
+
+    chunk = next((ops.backup_dir / "chunks").glob("*/*.z"))
+    chunk.write_bytes(b"not a chunk")
+
+    restored = ops.restore_database_incremental(manifest.path)
+    assert not restored.success
+    assert _rows(ops.data_dir / ops.db_name) == (20000, 20000)
+
+
+def test_clean_old_incremental_backups_prunes_unreferenced_chunks(ops):
+    db_path = ops.data_dir / ops.db_name
+    ops.backup_database_incremental(version="1.0")
+    connection = sqlite3.connect(db_path)
+    connection.execute("DELETE FROM notes WHERE id > 10000")
+    connection.commit()
+    connection.execute("VACUUM")
+    connection.close()
+    # Distinct timestamps in the manifest names
+    for manifest in ops.backup_dir.glob("*.manifest.json"):
+        manifest.rename(manifest.with_name(f"old_{manifest.name}"))
+    ops.backup_database_incremental(version="1.1")
+    chunks_before = len(list((ops.backup_dir / "chunks").glob("*/*.z")))
+
+    result = ops.clean_old_incremental_backups(keep_count=1)
+
+    assert result.success, result.message
+    assert result.data["deleted_backups"] == 1
+    assert result.data["removed_chunks"] > 0
+    assert len(list((ops.backup_dir / "chunks").glob("*/*.z"))) == chunks_before - result.data["removed_chunks"]
+    restored = ops.restore_database_incremental(ops.list_incremental_backups()[0].path)
+    assert restored.success, restored.message
+    assert _rows(db_path) == (10000, 10000)
+
+
+def test_chunk_size_is_page_aligned(ops):
+    result = ops.backup_database_incremental()
+    manifest_path = ops.list_incremental_backups()[0].path
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest["chunk_size"] == manifest["page_size"] * CHUNK_PAGES
+    assert result.data["size_bytes"] == manifest["size_bytes"]
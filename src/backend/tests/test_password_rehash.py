@@ -5,10 +5,20 @@ New hashes are bcrypt ($2b$).  Legacy PBKDF2-SHA256 hashes are still verified
 but are flagged for upgrade via needs_rehash().
 """
 
+import asyncio
+import threading
+
+import pytest
+
+from backend.config import settings
 from backend.security.password_hash import (
+    PasswordHashingBusy,
+    PasswordHashingPool,
     get_password_hash,
+    is_bare_legacy_hash,
     needs_rehash,
     verify_password,
+    wrap_legacy_hash,
 )
 
 
@@ -24,6 +34,7 @@ def test_bcrypt_hash_does_not_need_rehash():
 
 def test_pbkdf2_hash_needs_rehash():
     from passlib.context import CryptContext
+
     pbkdf2_hash = CryptContext(schemes=["pbkdf2_sha256"]).hash("testpassword123")
     assert needs_rehash(pbkdf2_hash) is True
 
@@ -37,6 +48,7 @@ def test_verify_bcrypt_hash():
 
 def test_verify_legacy_pbkdf2_hash():
     from passlib.context import CryptContext
+
     password = "testpassword123"
     pbkdf2_hash = CryptContext(schemes=["pbkdf2_sha256"]).hash(password)
     assert verify_password(password, pbkdf2_hash) is True
@@ -46,3 +58,123 @@ def test_verify_legacy_pbkdf2_hash():
 def test_verify_invalid_hash_returns_false():
     assert verify_password("password", "not-a-valid-hash") is False
     assert verify_password("password", "") is False
+
+
+def _legacy_hash(password):
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["pbkdf2_sha256"]).hash(password)
+
+
+def test_wrapped_legacy_hash_verifies_and_needs_rehash(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 10, raising=False)
+    legacy = _legacy_hash("testpassword123")
+    wrapped = wrap_legacy_hash(legacy)
+
+    assert wrapped.startswith("$bcrypt-pbkdf2-sha256$")
+    assert "$2b$10$" in wrapped
+    assert is_bare_legacy_hash(legacy) is True
+    assert is_bare_legacy_hash(wrapped) is False
+    assert verify_password("testpassword123", wrapped) is True
+    assert verify_password("wrongpassword", wrapped) is False
+    assert needs_rehash(wrapped) is True
+
+
+def test_bcrypt_cost_change_needs_rehash(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 10, raising=False)
+    h = get_password_hash("testpassword123")
+    assert h.startswith("$2b$10$")
+    assert needs_rehash(h) is False
+
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 11, raising=False)
+    assert needs_rehash(h) is True
+
+
+def test_background_migration_wraps_remaining_legacy_hashes(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from backend.models import Base, User
+    from backend.services.password_hash_migration import migrate_legacy_password_hashes
+
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 10, raising=False)
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    Session = sessionmaker(bind=engine)
+    bcrypt_hash = get_password_hash("modern123")
+    with Session() as db:
+        db.add_all(
+            [User(email=f"legacy{i}@example.com", hashed_password=_legacy_hash(f"pw{i}")) for i in range(3)]
+            + [User(email="modern@example.com", hashed_password=bcrypt_hash)]
+        )
+        db.commit()
+
+    assert migrate_legacy_password_hashes(Session, batch_size=2) == 3
+    assert migrate_legacy_password_hashes(Session, batch_size=2) == 0
+
+    with Session() as db:
+        users = {u.email: u.hashed_password for u in db.query(User)}
+    assert users["modern@example.com"] == bcrypt_hash
+    for i in range(3):
+        stored = users[f"legacy{i}@example.com"]
+        assert stored.startswith("$bcrypt-pbkdf2-sha256$")
+        assert verify_password(f"pw{i}", stored) is True
+    engine.dispose()
+
+
+def test_hashing_pool_rejects_when_queue_is_full():
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run("verify", release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHashingBusy):
+            await pool.run("verify", release.wait)
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        # Slots are returned once the queued work finishes
+        assert await pool.run("hash", lambda: "done") == "done"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_login_returns_503_when_hashing_pool_is_busy(client, monkeypatch):
+    from backend.routers import routers_auth
+
+    payload = {"email": "busy@example.com", "password": "GoodPass123!"}
+    assert client.post("/api/v1/auth/register", json=payload).status_code == 200
+
+    async def busy(*args):
+        raise PasswordHashingBusy("full")
+
+    monkeypatch.setattr(routers_auth, "verify_password_async", busy)
+    response = client.post("/api/v1/auth/login", json=payload)
+
+    assert response.status_code == 503
+    assert response.headers.get("Retry-After") == "1"
+
+
+def test_throttled_login_does_no_hashing_work(client, monkeypatch):
+    from backend.routers import routers_auth
+    from backend.security.login_throttle import login_throttle
+
+    payload = {"email": "throttled@example.com", "password": "GoodPass123!"}
+    assert client.post("/api/v1/auth/register", json=payload).status_code == 200
+
+    monkeypatch.setattr(settings, "AUTH_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "AUTH_MODE", "strict", raising=False)
+    monkeypatch.setattr(settings, "AUTH_LOGIN_MAX_ATTEMPTS", 1, raising=False)
+    login_throttle.register_failure("email:throttled@example.com")
+
+    async def unexpected(*args):
+        raise AssertionError("password hashed while throttled")
+
+    monkeypatch.setattr(routers_auth, "verify_password_async", unexpected)
+    response = client.post("/api/v1/auth/login", json=payload)
+
+    assert response.status_code == 429
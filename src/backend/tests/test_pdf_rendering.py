@@ -0,0 +1,135 @@
+"""
+Tests for the shared PDF table renderer.
+"""
+
+import glob
+import io
+import os
+import tempfile
+
+from pypdf import PdfReader
+from reportlab.platypus import Paragraph
+
+from backend import pdf_rendering as pdf_module
+from backend.config import settings
+from backend.pdf_rendering import (
+    CUSTOM_REPORT_LAYOUT,
+    EXPORT_TABLE_LAYOUT,
+    PdfRenderingService,
+    PdfTableDocument,
+    render_table_pdf,
+    table_cell,
+)
+
+
+def _document(row_count: int, **kwargs) -> PdfTableDocument:
+    rows = [[str(idx), f"Μαθητής {idx}", "Present" if idx % 2 else "Absent"] for idx in range(row_count)]
+    return PdfTableDocument(title="Παρουσίες", headers=["ID", "Name", "Status"], rows=rows, **kwargs)
+
+
+def _pdf_text(data: bytes) -> str:
+    return "\n".join(page.extract_text() or "" for page in PdfReader(io.BytesIO(data)).pages)
+
+
+def test_table_cell_uses_plain_strings_when_text_fits():
+    font, _ = pdf_module.register_report_fonts()
+    style = pdf_module.paragraph_style("Cell", "BodyText", font, 9)
+
+    assert table_cell("Short", 100, font, 9, style, 12) == "Short"
+    assert table_cell(None, 100, font, 9, style, 12) == ""
+    wrapped = table_cell("word " * 40, 100, font, 9, style, 12)
+    assert isinstance(wrapped, Paragraph)
+    assert isinstance(table_cell("a <b> & c\nsecond line", 400, font, 9, style, 12), Paragraph)
+
+
+def test_styles_and_fonts_are_built_once(monkeypatch):
+    pdf_module.register_report_fonts()
+
+    def fail_ttfont(*_args, **_kwargs):
+        raise AssertionError("fonts must not be re-parsed")
+
+    monkeypatch.setattr(pdf_module, "TTFont", fail_ttfont)
+    buffer = io.BytesIO()
+    render_table_pdf(_document(3, layout=EXPORT_TABLE_LAYOUT), buffer)
+
+    assert buffer.getvalue().startswith(b"%PDF")
+    first = pdf_module.paragraph_style("Cell", "BodyText", "DejaVuSans", 9)
+    assert pdf_module.paragraph_style("Cell", "BodyText", "DejaVuSans", 9) is first
+
+
+def test_long_tables_are_split_into_page_sized_chunks():
+    document = _document(500, layout=CUSTOM_REPORT_LAYOUT, group_by_col_index=2)
+    builder = pdf_module._TableChunkBuilder(document, frame_width=540, frame_height=700)
+
+    chunks = list(builder.chunks())
+
+    assert len(chunks) > 5
+    assert all(len(chunk._cellvalues) <= builder.rows_per_chunk + 1 for chunk in chunks)
+    assert all(chunk._colWidths == chunks[0]._colWidths for chunk in chunks)
+    # Header row repeated on every chunk; 500 data rows plus one group row per status change
+    assert all(chunk._cellvalues[0][0] == "ID" for chunk in chunks)
+    assert sum(len(chunk._cellvalues) - 1 for chunk in chunks) == 1000
+
+
+def test_render_table_pdf_keeps_unicode_text_and_groups(tmp_path):
+    path = tmp_path / "report.pdf"
+    document = PdfTableDocument(
+        title="Αναφορά",
+        headers=["Course", "Student"],
+        rows=[["MAT101", "Ελένη"], ["MAT101", "Νίκος"], ["PHY101", "Άννα"]],
+        layout=CUSTOM_REPORT_LAYOUT,
+        group_by_col_index=0,
+    )
+
+    render_table_pdf(document, str(path))
+    text = _pdf_text(path.read_bytes())
+
+    assert "Αναφορά" in text
+    assert "Course: MAT101" in text and "Course: PHY101" in text
+    assert "Ελένη" in text and "Άννα" in text
+
+
+def test_renderer_runs_in_worker_process(tmp_path):
+    renderer = PdfRenderingService(max_workers=1)
+    path = tmp_path / "pooled.pdf"
+    try:
+        assert renderer.uses_processes
+        renderer.render_table_to_file(_document(50), str(path))
+        assert os.getpid() not in renderer._executor._processes  # type: ignore[union-attr]
+    finally:
+        renderer.shutdown()
+
+    text = _pdf_text(path.read_bytes())
+    assert "Μαθητής" in text and "49" in text
+
+
+def test_renderer_defaults_to_configured_worker_count():
+    assert PdfRenderingService().max_workers == settings.PDF_RENDER_WORKERS
+
+
+def test_renderer_without_workers_renders_in_process(tmp_path):
+    renderer = PdfRenderingService(max_workers=0)
+    path = tmp_path / "inline.pdf"
+
+    renderer.render_table_to_file(_document(5), str(path))
+
+    assert renderer._executor is None
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_pdf_export_endpoint_streams_and_removes_temp_file(client):
+    response = client.post(
+        "/api/v1/students/",
+        json={"student_id": "PDF001", "email": "pdf001@test.com", "first_name": "Ζωή", "last_name": "Tester"},
+    )
+    assert response.status_code == 201
+
+    pattern = os.path.join(tempfile.gettempdir(), "sms_export_*.pdf")
+    before = set(glob.glob(pattern))
+    export_response = client.get("/api/v1/export/students/pdf")
+
+    assert export_response.status_code == 200, export_response.text
+    assert export_response.headers["content-type"] == "application/pdf"
+    text = _pdf_text(export_response.content)
+    assert "Ζωή" in text and "PDF001" in text
+    assert set(glob.glob(pattern)) == before
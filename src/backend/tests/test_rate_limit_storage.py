@@ -0,0 +1,186 @@
+"""
+Tests for the shared SQLite rate limit and login throttle storage.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+from backend import config
+from backend.config import settings
+from backend.rate_limit_storage import (
+    SQLiteDatabase,
+    SQLiteRateLimitStorage,
+    SQLiteThrottleStore,
+    default_storage_uri,
+    resolve_storage_uri,
+    sqlite_path_from_uri,
+)
+from backend.security.login_throttle import LoginThrottle, MemoryThrottleStore
+
+SRC_DIR = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def storage_uri(tmp_path):
+    return f"sqlite:///{(tmp_path / 'limits.sqlite3').as_posix()}"
+
+
+@pytest.fixture
+def auth_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "AUTH_MODE", "strict", raising=False)
+    monkeypatch.setattr(settings, "AUTH_LOGIN_MAX_ATTEMPTS", 3, raising=False)
+    monkeypatch.setattr(settings, "AUTH_LOGIN_TRACKING_WINDOW_SECONDS", 60, raising=False)
+    monkeypatch.setattr(settings, "AUTH_LOGIN_LOCKOUT_SECONDS", 60, raising=False)
+
+
+def test_storage_uri_resolution(monkeypatch, tmp_path):
+    monkeypatch.delenv("RATE_LIMIT_STORAGE_URI", raising=False)
+    assert resolve_storage_uri() == "memory://"
+    monkeypatch.setenv("RATE_LIMIT_STORAGE_URI", "redis://localhost:6379/1")
+    assert resolve_storage_uri() == "redis://localhost:6379/1"
+
+    assert sqlite_path_from_uri("redis://localhost:6379/1") is None
+    assert sqlite_path_from_uri(f"sqlite:///{tmp_path.as_posix()}/x.db") == f"{tmp_path.as_posix()}/x.db"
+    assert sqlite_path_from_uri(default_storage_uri()).endswith("sms_rate_limits.sqlite3")
+
+
+def test_default_storage_is_private_to_the_install(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DATA_DIR", tmp_path.as_posix())
+    path = sqlite_path_from_uri(default_storage_uri())
+    assert Path(path).parent == tmp_path / "rate_limits"
+
+    SQLiteDatabase(path).connection().execute("SELECT 1")
+    if os.name == "posix":
+        assert Path(path).stat().st_mode & 0o777 == 0o600
+        assert Path(path).parent.stat().st_mode & 0o077 == 0
+
+
+def test_sqlite_storage_counts_and_expires(storage_uri):
+    storage = storage_from_string(storage_uri)
+    assert isinstance(storage, SQLiteRateLimitStorage)
+    assert storage.check() is True
+
+    assert storage.incr("k", expiry=1) == 1
+    assert storage.incr("k", expiry=1, amount=2) == 3
+    assert storage.get("k") == 3
+    assert storage.get_expiry("k") > time.time()
+
+    time.sleep(1.1)
+    assert storage.get("k") == 0
+    assert storage.incr("k", expiry=60) == 1
+
+    storage.clear("k")
+    assert storage.get("k") == 0
+
+
+def test_counters_are_shared_between_storage_instances(storage_uri):
+    limit = parse("5/minute")
+    first = FixedWindowRateLimiter(storage_from_string(storage_uri))
+    second = FixedWindowRateLimiter(storage_from_string(storage_uri))
+
+    results = [(first if i % 2 else second).hit(limit, "10.0.0.1") for i in range(7)]
+
+    assert results == [True] * 5 + [False] * 2
+
+
+def test_counters_are_shared_across_processes(storage_uri):
+    script = (
+        "from limits import parse\n"
+        "from limits.storage import storage_from_string\n"
+        "from limits.strategies import SlidingWindowCounterRateLimiter\n"
+        "import backend.rate_limit_storage\n"
+        f"limiter = SlidingWindowCounterRateLimiter(storage_from_string({storage_uri!r}))\n"
+        "print(sum(limiter.hit(parse('4/minute'), 'shared') for _ in range(3)))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    admitted = [
+        int(subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True).stdout)
+        for _ in range(2)
+    ]
+
+    assert admitted == [3, 1]
+
+
+def test_sliding_window_counter_enforces_limit(storage_uri):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(storage_uri))
+    limit = parse("3/minute")
+
+    assert [limiter.hit(limit, "client") for _ in range(4)] == [True, True, True, False]
+    assert limiter.get_window_stats(limit, "client").remaining == 0
+    limiter.clear(limit, "client")
+    assert limiter.hit(limit, "client") is True
+
+
+def test_slowapi_limiter_uses_sqlite_storage(storage_uri):
+    limiter = Limiter(key_func=get_remote_address, storage_uri=storage_uri, strategy="sliding-window-counter")
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore
+
+    @app.get("/limited")
+    @limiter.limit("2/minute")
+    async def limited(request: Request):
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert [client.get("/limited").status_code for _ in range(3)] == [200, 200, 429]
+
+
+def test_memory_throttle_store_is_bounded_and_expiring():
+    store = MemoryThrottleStore(max_entries=3)
+    now = time.time()
+    store.set("expired", (1, now - 10, None), now - 1)
+    for key in ("a", "b", "c"):
+        store.set(key, (1, now, None), now + 60)
+
+    assert len(store) == 3
+    assert store.get("expired", now) is None
+    assert store.get("a", now) == (1, now, None)
+
+    # "b" is now the least recently used live key
+    store.set("d", (1, now, None), now + 60)
+    assert len(store) == 3
+    assert store.get("b", now) is None
+    assert store.get("a", now) is not None
+
+
+def test_login_throttle_lockout_is_shared(tmp_path, auth_enabled):
+    path = str(tmp_path / "throttle.sqlite3")
+    worker_a = LoginThrottle(SQLiteThrottleStore(path))
+    worker_b = LoginThrottle(SQLiteThrottleStore(path))
+
+    assert worker_a.register_failure("1.2.3.4|user@example.com") is None
+    assert worker_b.register_failure("1.2.3.4|user@example.com") is None
+    lockout = worker_a.register_failure("1.2.3.4|user@example.com")
+
+    assert lockout is not None
+    assert worker_b.get_lockout_until("1.2.3.4|user@example.com") == lockout
+
+    worker_b.reset("1.2.3.4|user@example.com")
+    assert worker_a.get_lockout_until("1.2.3.4|user@example.com") is None
+
+
+def test_login_throttle_drops_entries_after_window(auth_enabled, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_LOGIN_TRACKING_WINDOW_SECONDS", 1, raising=False)
+    store = MemoryThrottleStore(max_entries=10)
+    throttle = LoginThrottle(store)
+
+    throttle.register_failure("key")
+    assert len(store) == 1
+    time.sleep(1.1)
+    assert throttle.get_lockout_until("key") is None
+    assert len(store) == 0
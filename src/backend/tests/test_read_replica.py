@@ -0,0 +1,120 @@
+"""
+Tests for read-replica routing of heavy read endpoints.
+
+Primary and replica are two local SQLite files; the replica is "caught up"
+or "lagging" depending on the newest ``data_versions.updated_at`` it holds.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.db import connection
+from backend.db.read_replica import ReadReplicaRouter
+from backend.models import Base, DataVersion, Student, init_db
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = init_db(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = init_db(f"sqlite:///{tmp_path / 'replica.db'}", pool_name="replica")
+    for engine in (primary, replica):
+        Base.metadata.create_all(bind=engine)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _write(engine, *rows):
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add_all(rows)
+        session.commit()
+    finally:
+        session.close()
+
+
+def _stamp(engine, updated_at):
+    _write(engine, DataVersion(table_name="students", version=1, updated_at=updated_at))
+
+
+def test_fresh_replica_serves_reads(engines):
+    primary, replica = engines
+    _stamp(primary, NOW)
+    _stamp(replica, NOW)
+    router = ReadReplicaRouter(primary, replica, max_staleness_seconds=5)
+
+    assert router.replica_lag_seconds() == 0.0
+    assert router.bind() is replica
+    assert router.status()["replica_reads"] == 1
+
+
+def test_lagging_replica_falls_back_to_primary(engines):
+    primary, replica = engines
+    now = datetime.now(timezone.utc)
+    _stamp(primary, now)
+    _stamp(replica, now - timedelta(seconds=30))
+    router = ReadReplicaRouter(primary, replica, max_staleness_seconds=5, check_interval_seconds=0)
+
+    assert 30.0 <= router.replica_lag_seconds() < 60.0
+    assert router.bind() is primary
+
+    router.max_staleness_seconds = 60
+    assert router.bind() is replica
+
+
+def test_stalled_replica_keeps_falling_behind(engines):
+    primary, replica = engines
+    # The writes are seconds apart, but the replica has applied nothing since long before now
+    _stamp(primary, NOW)
+    _stamp(replica, NOW - timedelta(seconds=2))
+    router = ReadReplicaRouter(primary, replica, max_staleness_seconds=5, check_interval_seconds=0)
+
+    assert router.replica_lag_seconds() >= (datetime.now(timezone.utc) - NOW).total_seconds()
+    assert router.bind() is primary
+
+
+def test_unreachable_replica_falls_back_to_primary(engines, tmp_path):
+    primary, _ = engines
+    missing = init_db(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}", pool_name="replica")
+    router = ReadReplicaRouter(primary, missing)
+
+    assert router.replica_lag_seconds() is None
+    assert router.bind() is primary
+    assert ReadReplicaRouter(primary).bind() is primary
+
+
+def test_read_sessions_reject_writes(engines, monkeypatch):
+    primary, replica = engines
+    monkeypatch.setattr(connection, "read_router", ReadReplicaRouter(primary, replica))
+
+    with connection.read_session_scope() as db:
+        assert db.info["read_replica"] is True
+        db.add(Student(student_id="RO1", first_name="Read", last_name="Only", email="ro1@example.com"))
+        with pytest.raises(RuntimeError, match="read-only"):
+            db.flush()
+
+
+def test_search_endpoint_reads_from_replica(client, engines, monkeypatch):
+    from backend.db import get_read_session
+    from backend.main import app
+
+    primary, replica = engines
+    _write(replica, Student(student_id="REP1", first_name="Replica", last_name="Reader", email="rep1@example.com"))
+    router = ReadReplicaRouter(primary, replica, check_interval_seconds=0)
+    monkeypatch.setattr(connection, "read_router", router)
+    monkeypatch.delitem(app.dependency_overrides, get_read_session)
+
+    response = client.get("/api/v1/search/students", params={"q": "Replica"})
+    assert response.status_code == 200, response.text
+    assert [s["student_id"] for s in response.json()["data"]] == ["REP1"]
+
+    # Once the replica is further behind than the budget, the same request is served by the primary
+    _stamp(primary, datetime.now(timezone.utc) + timedelta(minutes=1))
+    response = client.get("/api/v1/search/students", params={"q": "Replica"})
+    assert response.json()["data"] == []
+    assert (router.replica_reads, router.primary_reads) == (1, 1)
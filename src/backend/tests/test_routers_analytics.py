@@ -90,6 +90,39 @@ class TestAnalyticsRouter:
         # Check actual response structure (no success wrapper)
         assert isinstance(data, dict)
 
+    def test_calculate_course_final_grades(self, client, admin_headers, clean_db):
+        """Test GET /analytics/course/{id}/final-grades"""
+        course = Course(
+            course_code="MATH102",
+            course_name="Math",
+            semester="Fall 2024",
+            credits=3,
+            evaluation_rules=[{"category": "Midterm", "weight": 50}, {"category": "Final", "weight": 50}],
+        )
+        student = Student(student_id="TEST004", first_name="Test", last_name="Student", email="test4@test.com")
+        clean_db.add_all([student, course])
+        clean_db.commit()
+        clean_db.add(CourseEnrollment(student_id=student.id, course_id=course.id))
+        clean_db.add(
+            Grade(
+                student_id=student.id,
+                course_id=course.id,
+                grade=80.0,
+                assignment_name="Midterm Exam",
+                category="midterm",
+                max_grade=100.0,
+            )
+        )
+        clean_db.commit()
+
+        response = client.get(f"/api/v1/analytics/course/{course.id}/final-grades", headers=admin_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["student_count"] == 1
+        assert data["students"][0]["student_id"] == student.id
+        assert data["students"][0]["final_grade"] == 80.0
+        assert data["students"][0]["letter_grade"] == "B-"
+
     @pytest.mark.skip(
         reason="Endpoint /analytics/course/{id} does not exist - use /analytics/course/{id}/grade-distribution instead"
     )
@@ -472,6 +472,43 @@ class TestAdvancedSearchEndpoint:
         assert data["data"]["limit"] == 20  # default limit or from query_string
 
 
+class TestStudentFullTextEndpoints:
+    """Tests for POST /api/v1/search/students/full-text and /students/advanced"""
+
+    def test_full_text_returns_normalized_scores(self, client, admin_headers, test_data):
+        """Should return students with 0-1 relevance scores, best match first"""
+        response = client.post("/api/v1/search/students/full-text", json={"query": "john"}, headers=admin_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True, data
+        results = data["data"]["results"]
+        assert data["data"]["total"] == 2
+        assert [r["first_name"] for r in results] == ["John", "Bob"]
+        assert results[0]["relevance_score"] == 1.0
+        assert 0 < results[1]["relevance_score"] < 1
+        assert results[0]["status"] == "active"
+
+    def test_advanced_filters_status_and_sorts(self, client, admin_headers, db, test_data):
+        """Should filter on the active flag and return bounded scores"""
+        test_data["students"][1].is_active = False
+        db.commit()
+
+        response = client.post(
+            "/api/v1/search/students/advanced",
+            json={"query": "j", "filters": {"status": "active"}, "sort": {"field": "created_at", "direction": "asc"}},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True, data
+        results = data["data"]["results"]
+        assert {r["first_name"] for r in results} == {"John", "Bob"}
+        assert all(r["status"] == "active" for r in results)
+        assert all(0 <= r["relevance_score"] <= 1 for r in results)
+
+
 class TestSuggestionsEndpoint:
     """Tests for GET /api/v1/search/suggestions"""
 
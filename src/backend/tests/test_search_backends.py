@@ -0,0 +1,133 @@
+"""
+Tests for the search index backends used by SearchService.
+
+The regular test schema is built with ``create_all`` and therefore uses the
+LIKE fallback; these tests create the SQLite FTS5 index explicitly.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.models import Course, Student
+from backend.services.search_backends import (
+    LikeSearchBackend,
+    SearchBackend,
+    SqliteFtsSearchBackend,
+    ensure_search_index,
+    get_search_backend,
+    reset_search_backend_cache,
+)
+from backend.services.search_service import SearchService
+
+_FTS_OBJECTS = [
+    "DROP TRIGGER IF EXISTS students_fts_ai",
+    "DROP TRIGGER IF EXISTS students_fts_ad",
+    "DROP TRIGGER IF EXISTS students_fts_au",
+    "DROP TRIGGER IF EXISTS courses_fts_ai",
+    "DROP TRIGGER IF EXISTS courses_fts_ad",
+    "DROP TRIGGER IF EXISTS courses_fts_au",
+    "DROP TABLE IF EXISTS students_fts",
+    "DROP TABLE IF EXISTS courses_fts",
+]
+
+
+@pytest.fixture
+def fts_db(db: Session):
+    """Session with the SQLite FTS5 search index created."""
+    assert ensure_search_index(db.connection())
+    yield db
+    for statement in _FTS_OBJECTS:
+        db.execute(text(statement))
+    reset_search_backend_cache()
+
+
+@pytest.fixture
+def roster(fts_db: Session):
+    students = [
+        Student(first_name="Maria", last_name="Papadopoulou", email="maria.p@example.com", student_id="S100"),
+        Student(first_name="Mariana", last_name="Georgiou", email="mg@example.com", student_id="S101"),
+        Student(first_name="Nikos", last_name="Marias", email="nikos@example.com", student_id="S102"),
+        Student(first_name="Eleni", last_name="Ioannou", email="eleni@example.com", student_id="S103"),
+    ]
+    fts_db.add_all(students)
+    fts_db.add(Course(course_code="MAT101", course_name="Mathematics I", semester="Fall", credits=3))
+    fts_db.commit()
+    return students
+
+
+def test_default_schema_uses_like_backend(db: Session):
+    reset_search_backend_cache()
+    assert isinstance(get_search_backend(db), LikeSearchBackend)
+
+
+def test_fts_backend_detected_after_index_creation(fts_db: Session):
+    assert isinstance(get_search_backend(fts_db), SqliteFtsSearchBackend)
+
+
+def test_fts_search_matches_substrings_and_ranks_in_sql(roster):
+    service = SearchService(_session_of(roster[0]))
+    results = service.search_students("maria")
+
+    names = [(r["first_name"], r["last_name"]) for r in results]
+    assert ("Maria", "Papadopoulou") in names
+    assert ("Mariana", "Georgiou") in names
+    assert ("Nikos", "Marias") in names
+    assert ("Eleni", "Ioannou") not in names
+
+
+def test_fts_index_follows_updates_and_soft_deletes(roster):
+    session = _session_of(roster[0])
+    service = SearchService(session)
+
+    roster[3].last_name = "Mariakou"
+    roster[0].deleted_at = datetime.now(timezone.utc)
+    session.commit()
+
+    ids = {r["id"] for r in service.search_students("maria")}
+    assert roster[3].id in ids
+    assert roster[0].id not in ids
+
+
+def test_short_queries_fall_back_to_like(roster):
+    service = SearchService(_session_of(roster[0]))
+    results = service.search_students("ni")
+    assert {r["first_name"] for r in results} >= {"Nikos", "Eleni"}
+
+
+def test_course_search_and_suggestions_use_index(roster):
+    service = SearchService(_session_of(roster[0]))
+    assert [c["course_code"] for c in service.search_courses("mat1")] == ["MAT101"]
+
+    suggestions = service.get_search_suggestions("mat", limit=6)
+    assert {s["type"] for s in suggestions} == {"course"}
+
+
+def test_advanced_search_returns_relevance_scores(roster):
+    service = SearchService(_session_of(roster[0]))
+    results, total, _ = service.advanced_student_search("maria")
+
+    assert total == 3
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] == 1.0
+    assert all(0 <= score <= 1 for score in scores)
+
+
+def test_search_backend_requires_match_methods():
+    class Incomplete(SearchBackend):
+        def match_students(self, query):
+            return LikeSearchBackend().match_students(query)
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def _session_of(instance) -> Session:
+    from sqlalchemy.orm import object_session
+
+    session = object_session(instance)
+    assert session is not None
+    return session
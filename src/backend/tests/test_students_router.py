@@ -249,3 +249,82 @@ def test_create_student_handles_internal_error(client, monkeypatch):
         assert payload.get("error_id") == "ERR_INTERNAL"
     else:
         assert "error" in payload.lower() or "internal" in payload.lower()
+
+
+def _enroll(client, course_code: str, student_ids) -> int:
+    r = client.post(
+        "/api/v1/courses/",
+        json={"course_code": course_code, "course_name": course_code, "semester": "Fall 2025", "credits": 3},
+    )
+    course_id = r.json()["id"]
+    client.post(f"/api/v1/enrollments/course/{course_id}", json={"student_ids": list(student_ids)})
+    return course_id
+
+
+def _roster(client, course_id: int):
+    return sorted(e["student_id"] for e in client.get(f"/api/v1/enrollments/course/{course_id}").json())
+
+
+def test_update_student_deactivation_cascades_to_enrollments(client):
+    sid = client.post("/api/v1/students/", json=make_student_payload(1)).json()["id"]
+    courses = [_enroll(client, code, [sid]) for code in ("CAS101", "CAS102")]
+
+    r = client.put(f"/api/v1/students/{sid}", json={"is_active": False})
+    assert r.status_code == 200, r.text
+    assert [_roster(client, c) for c in courses] == [[], []]
+
+    r = client.put(f"/api/v1/students/{sid}", json={"is_active": True, "re_enroll_previous": True})
+    assert r.status_code == 200, r.text
+    assert [_roster(client, c) for c in courses] == [[sid], [sid]]
+
+
+def test_bulk_status_deactivates_year_and_restores_enrollments(client):
+    year1 = [client.post("/api/v1/students/", json=make_student_payload(i)).json()["id"] for i in (1, 2, 3)]
+    year2 = client.post("/api/v1/students/", json=make_student_payload(4, study_year=2)).json()["id"]
+    course_id = _enroll(client, "GRAD101", year1 + [year2])
+
+    r = client.post("/api/v1/students/bulk/status", json={"is_active": False, "study_year": 1})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"updated": 3, "student_ids": year1, "enrollments_changed": 3}
+    assert _roster(client, course_id) == [year2]
+    assert client.get(f"/api/v1/students/{year1[0]}").json()["is_active"] is False
+
+    # Already inactive students are skipped
+    again = client.post("/api/v1/students/bulk/status", json={"is_active": False, "student_ids": year1})
+    assert again.json()["updated"] == 0
+
+    r = client.post(
+        "/api/v1/students/bulk/status",
+        json={"is_active": True, "student_ids": year1[:2], "re_enroll_previous": True},
+    )
+    assert r.json() == {"updated": 2, "student_ids": year1[:2], "enrollments_changed": 2}
+    assert _roster(client, course_id) == sorted(year1[:2] + [year2])
+
+
+def test_bulk_status_requires_a_selection(client):
+    r = client.post("/api/v1/students/bulk/status", json={"is_active": False})
+    assert r.status_code == 422
+
+
+def test_status_changes_invalidate_versions_and_facets(client, db):
+    from backend.db.data_version import get_data_version
+    from backend.services.facet_service import FacetService
+
+    ids = [client.post("/api/v1/students/", json=make_student_payload(i)).json()["id"] for i in (1, 2, 3)]
+    _enroll(client, "VER101", ids)
+    tables = ["course_enrollments", "students"]
+
+    def snapshot():
+        facets = FacetService(db).get_student_facets().model_dump()["facets"]
+        return get_data_version(db, tables), facets
+
+    before = snapshot()
+    r = client.put(f"/api/v1/students/{ids[0]}", json={"is_active": False})
+    assert r.status_code == 200, r.text
+    single = snapshot()
+    assert single[0] != before[0] and single[1] != before[1]
+
+    r = client.post("/api/v1/students/bulk/status", json={"is_active": False, "student_ids": ids[1:]})
+    assert r.json()["updated"] == 2
+    bulk = snapshot()
+    assert bulk[0] != single[0] and bulk[1] != single[1]
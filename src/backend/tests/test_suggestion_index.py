@@ -0,0 +1,131 @@
+"""
+Tests for the in-memory search suggestion index.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.models import Course, Student
+from backend.services import suggestion_index as suggestion_module
+from backend.services.search_service import SearchService
+from backend.services.suggestion_index import SuggestionIndex, fold_text
+
+
+@pytest.fixture
+def live_index(db: Session):
+    """Built module-level index with ORM hooks attached."""
+    index = suggestion_module.get_suggestion_index()
+    suggestion_module.register_orm_hooks()
+    index.build(db)
+    yield index
+    suggestion_module.unregister_orm_hooks()
+    index.clear()
+
+
+@pytest.fixture
+def roster(db: Session):
+    db.add_all(
+        [
+            Student(first_name="Μαρία", last_name="Παπαδοπούλου", email="maria@example.com", student_id="G100"),
+            Student(first_name="Maria", last_name="Smith", email="ms@example.com", student_id="G101"),
+            Student(first_name="Marianne", last_name="Lee", email="ml@example.com", student_id="G102"),
+            Student(first_name="Nikos", last_name="Marinos", email="nm@example.com", student_id="G103"),
+        ]
+    )
+    db.add(Course(course_code="MAT101", course_name="Mathematics I", semester="Fall", credits=3))
+    db.commit()
+
+
+def test_fold_text_strips_greek_accents_and_case():
+    assert fold_text("Μαρία") == fold_text("ΜΑΡΙΑ") == "μαρια"
+    assert fold_text("Ελένη Ϊωάννου") == "ελενη ιωαννου"
+    assert fold_text("Café") == "cafe"
+
+
+def test_suggest_matches_accent_insensitive_prefixes(db: Session, roster):
+    index = SuggestionIndex()
+    index.build(db)
+
+    assert [s["text"] for s in index.suggest("μαρι")] == ["Μαρία Παπαδοπούλου"]
+    assert [s["text"] for s in index.suggest("ΠΑΠΑΔ")] == ["Μαρία Παπαδοπούλου"]
+    assert [s["text"] for s in index.suggest("mat101")] == ["Mathematics I"]
+
+
+def test_suggest_ranks_and_limits_results(db: Session, roster):
+    index = SuggestionIndex()
+    index.build(db)
+
+    texts = [s["text"] for s in index.suggest("mari", limit=3)]
+    # Name prefix matches first (shorter text wins), then word-prefix matches.
+    assert texts == ["Maria Smith", "Marianne Lee", "Nikos Marinos"]
+    assert [s["text"] for s in index.suggest("maria smi")] == ["Maria Smith"]
+    assert index.suggest("zzz") == []
+
+    stats = index.stats()
+    assert stats["ready"] is True
+    assert stats["students"] == 4 and stats["courses"] == 1
+    assert stats["memory_bytes"] > 0
+    assert stats["lookups"] == 3
+
+
+def test_index_tracks_committed_writes(db: Session, roster, live_index):
+    student = Student(first_name="Zoe", last_name="Kallis", email="zk@example.com", student_id="G104")
+    db.add(student)
+    db.commit()
+    assert [s["id"] for s in live_index.suggest("zoe")] == [student.id]
+
+    student.first_name = "Zoi"
+    db.commit()
+    assert live_index.suggest("zoe") == []
+    assert [s["text"] for s in live_index.suggest("zoi")] == ["Zoi Kallis"]
+
+    course = db.query(Course).filter(Course.course_code == "MAT101").one()
+    db.delete(course)
+    db.commit()
+    assert live_index.suggest("math") == []
+
+
+def test_incremental_counters_match_rebuild(db: Session, roster, live_index):
+    student = Student(first_name="Zoe", last_name="Kallis", email="zk@example.com", student_id="G104")
+    db.add(student)
+    db.commit()
+    student.last_name = "Kallistrati"
+    db.delete(db.query(Course).filter(Course.course_code == "MAT101").one())
+    db.commit()
+
+    incremental = live_index.stats()
+    rebuilt = SuggestionIndex()
+    rebuilt.build(db)
+    expected = rebuilt.stats()
+    for key in ("students", "courses", "entries", "postings"):
+        assert incremental[key] == expected[key]
+    assert abs(incremental["memory_bytes"] - expected["memory_bytes"]) < 512
+
+
+def test_rolled_back_writes_are_not_indexed(db: Session, roster, live_index):
+    db.add(Student(first_name="Ghost", last_name="Writer", email="gw@example.com", student_id="G105"))
+    db.flush()
+    db.rollback()
+
+    assert live_index.suggest("ghost") == []
+
+
+def test_search_service_uses_ready_index(db: Session, roster, live_index):
+    suggestions = SearchService(db).get_search_suggestions("μαρια", limit=5)
+
+    assert suggestions[0]["text"] == "Μαρία Παπαδοπούλου"
+    assert live_index.stats()["lookups"] >= 1
+
+
+def test_rebuild_and_stats_endpoints(client, db: Session):
+    index = suggestion_module.get_suggestion_index()
+    try:
+        resp = client.post("/api/v1/search/suggestions/index/rebuild")
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["data"]["ready"] is True
+
+        resp = client.get("/api/v1/search/suggestions/index/stats")
+        assert resp.status_code == 200, resp.text
+        assert "memory_bytes" in resp.json()["data"]
+    finally:
+        index.clear()
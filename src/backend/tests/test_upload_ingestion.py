@@ -0,0 +1,140 @@
+"""
+Tests for streaming upload ingestion used by the imports router.
+"""
+
+import asyncio
+import io
+import json
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.routers.routers_imports import _iter_csv_students
+from backend.services.upload_ingestion import (
+    IMPORT_BATCH_SIZE,
+    SpooledUpload,
+    UploadTooLargeError,
+    iter_json_batches,
+    iter_json_records,
+    sniff_encoding,
+    spool_upload,
+)
+
+
+class _CountingUpload(UploadFile):
+    """UploadFile that records how many bytes were read from it."""
+
+    bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = await super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _spooled(data: bytes, filename: str) -> SpooledUpload:
+    return SpooledUpload(filename=filename, size=len(data), file=BytesIO(data), prefix=data[:4096])
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64])
+def test_json_array_is_decoded_across_chunk_boundaries(read_size):
+    records = [{"id": i, "name": f"Στοιχείο {i}", "tags": ["a", {"b": None}]} for i in range(25)]
+    records += [12345, -0.5e3, True, None, "x,]"]
+    text = " \n" + json.dumps(records, ensure_ascii=False, indent=1) + "\n"
+
+    assert list(iter_json_records(io.StringIO(text), read_size=read_size)) == records
+
+
+def test_json_batches_respect_batch_size():
+    text = json.dumps([{"id": i} for i in range(7)])
+
+    batches = list(iter_json_batches(io.StringIO(text), batch_size=3, read_size=5))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert batches[-1] == [{"id": 6}]
+
+
+def test_single_json_object_is_one_record():
+    assert list(iter_json_records(io.StringIO('{"course_code": "C1"}'))) == [{"course_code": "C1"}]
+    assert list(iter_json_records(io.StringIO("[]"), read_size=1)) == []
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "[1 2]", "[1,]", "[1] 2", "[{]", "{invalid json}"])
+def test_malformed_json_raises_decode_error(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(io.StringIO(text), read_size=2))
+
+
+def test_sniff_encoding_uses_prefix():
+    greek = "Επώνυμο;Όνομα".encode("utf-8")
+
+    assert sniff_encoding(b"\xef\xbb\xbf" + greek) == "utf-8-sig"
+    # A multi-byte sequence cut off at the end of the prefix is still UTF-8
+    assert sniff_encoding((b"x" * 4095) + greek[:1]) == "utf-8"
+    assert sniff_encoding("café".encode("latin-1")) == "latin-1"
+    with pytest.raises(UnicodeDecodeError):
+        sniff_encoding(b"\xff\xfe\x00\x00", fallback=None)
+
+
+def test_spool_upload_stops_reading_once_limit_is_exceeded():
+    upload = _CountingUpload(BytesIO(b"x" * 10_000), filename="big.json")
+
+    with pytest.raises(UploadTooLargeError) as exc:
+        asyncio.run(spool_upload(upload, max_size=1000, chunk_size=256))
+
+    assert exc.value.size == 1024
+    assert upload.bytes_read == 1024
+
+
+def test_spool_upload_rolls_large_files_to_disk():
+    data = b"0123456789" * 1000
+    upload = UploadFile(BytesIO(data), filename="students.json")
+
+    with asyncio.run(spool_upload(upload, max_size=len(data), chunk_size=512, memory_limit=1024)) as spooled:
+        assert spooled.size == len(data)
+        assert spooled.prefix == data[:4096]
+        assert spooled.file._rolled  # type: ignore[attr-defined]
+        assert spooled.read_bytes() == data
+        with spooled.open_text("ascii") as stream:
+            assert stream.read(5) == "01234"
+        # The text wrapper is detached, not closed, so the spool stays usable
+        assert spooled.read_bytes() == data
+
+
+def test_csv_falls_back_to_latin1_after_utf8_prefix():
+    rows = [f"{1000 + i};First{i};Last{i};s{i}@example.com;1" for i in range(400)]
+    rows.append("9999;José;Müller;jose@example.com;2")
+    data = "\n".join(rows).encode("latin-1")
+    assert sniff_encoding(data[:4096]) == "utf-8"
+
+    errors: list = []
+    batches = list(_iter_csv_students(_spooled(data, "late.csv"), "late.csv", errors))
+    students = [s for batch in batches for s in batch]
+
+    assert errors == []
+    assert len(students) == 401
+    assert students[-1]["first_name"] == "José"
+    assert students[-1]["student_id"] == "S9999"
+    assert students[0]["student_id"] == "S1000"
+
+
+def test_csv_rows_are_yielded_in_batches():
+    data = "\n".join(f"{i};First{i};Last{i};s{i}@example.com;1" for i in range(1, 1201)).encode("utf-8")
+    errors: list = []
+
+    batches = _iter_csv_students(_spooled(data, "big.csv"), "big.csv", errors)
+
+    assert [len(batch) for batch in batches] == [IMPORT_BATCH_SIZE, IMPORT_BATCH_SIZE, 200]
+    assert errors == []
+
+
+def test_csv_headerless_first_row_is_kept():
+    data = "1;Ann;Alpha;ann@example.com;Β'\n".encode("utf-8-sig")
+
+    errors: list = []
+    students = [s for batch in _iter_csv_students(_spooled(data, "one.csv"), "one.csv", errors) for s in batch]
+
+    assert errors == []
+    assert [(s["student_id"], s["study_year"]) for s in students] == [("S1", 2)]
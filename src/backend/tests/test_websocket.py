@@ -9,11 +9,12 @@ Tests:
 
 import pytest
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from backend.websocket_config import ConnectionManager
 from backend.services.notification_service import NotificationService
-from backend.models import User
+from backend.models import Notification, User
 
 
 class TestConnectionManager:
@@ -234,6 +235,88 @@ class TestNotificationService:
         unread_count = notification_service.get_unread_count(user_id=test_user.id)
         assert unread_count == 1
 
+    def test_unread_counter_follows_writes_without_recounting(self, notification_service, test_user, db: Session):
+        """Cached unread counters are adjusted on commit instead of re-running the COUNT"""
+        assert notification_service.get_unread_count(user_id=test_user.id) == 0
+
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db.get_bind()
+        event.listen(bind, "before_cursor_execute", _record)
+        try:
+            created = [
+                notification_service.create_notification(
+                    user_id=test_user.id, title=f"Unread {i}", message="Body", notification_type="test"
+                )
+                for i in range(3)
+            ]
+            assert notification_service.get_unread_count(user_id=test_user.id) == 3
+            notification_service.mark_as_read(notification_id=created[0].id, user_id=test_user.id)
+            notification_service.mark_as_read(notification_id=created[0].id, user_id=test_user.id)
+            assert notification_service.get_unread_count(user_id=test_user.id) == 2
+            notification_service.delete_notification(notification_id=created[1].id, user_id=test_user.id)
+            assert notification_service.get_unread_count(user_id=test_user.id) == 1
+            assert notification_service.mark_all_as_read(user_id=test_user.id) == 1
+            assert notification_service.get_unread_count(user_id=test_user.id) == 0
+        finally:
+            event.remove(bind, "before_cursor_execute", _record)
+
+        assert not any("count(" in statement.lower() for statement in statements)
+
+    def test_unread_counter_is_reconciled(self, notification_service, test_user, db: Session):
+        """Stale counters are recounted; unattributed bulk writes drop them"""
+        from backend.services.cache_service import get_cache_manager
+        from backend.services.notification_unread_counter import RECONCILE_INTERVAL_SECONDS, unread_count_key
+
+        notification_service.create_notification(
+            user_id=test_user.id, title="Unread", message="Body", notification_type="test"
+        )
+        key = unread_count_key(test_user.id)
+        get_cache_manager().set(key, {"count": 7, "reconciled_at": 0.0}, ttl=RECONCILE_INTERVAL_SECONDS)
+        assert notification_service.get_unread_count(user_id=test_user.id) == 1
+
+        db.query(Notification).filter(Notification.user_id == test_user.id).update(
+            {Notification.is_read: True}, synchronize_session=False
+        )
+        db.commit()
+        assert get_cache_manager().get(key) is None
+        assert notification_service.get_unread_count(user_id=test_user.id) == 0
+
+    def test_get_notifications_page_uses_keyset_cursor(self, notification_service, test_user, db: Session):
+        """Keyset pages are stable on (created_at, id), including ties on created_at"""
+        created_at = datetime(2026, 1, 5, 9, 0, 0)
+        db.add_all(
+            Notification(
+                user_id=test_user.id,
+                notification_type="test",
+                title=f"N{i}",
+                message="Body",
+                created_at=created_at if i < 4 else created_at + timedelta(minutes=1),
+            )
+            for i in range(5)
+        )
+        db.commit()
+        expected = [
+            n.id
+            for n in db.query(Notification)
+            .filter(Notification.user_id == test_user.id)
+            .order_by(Notification.created_at.desc(), Notification.id.desc())
+        ]
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = notification_service.get_notifications_page(user_id=test_user.id, limit=2, cursor=cursor)
+            seen.extend(n.id for n in page)
+            if cursor is None:
+                break
+
+        assert seen == expected
+        with pytest.raises(ValueError):
+            notification_service.get_notifications_page(user_id=test_user.id, cursor="not-a-cursor")
+
 
 @pytest.fixture(scope="session")
 def pytest_configure(config):
@@ -0,0 +1,85 @@
+"""
+Tests for the streaming XLSX writer used by the Excel exports.
+"""
+
+from io import BytesIO
+
+import openpyxl
+
+from backend.config import settings  # noqa: F401 - load settings before tests run
+from backend.xlsx_writer import StreamingXlsxWriter, iter_spooled_file, solid_fill
+
+
+def _load(writer: StreamingXlsxWriter):
+    buffer = BytesIO()
+    writer.save(buffer)
+    buffer.seek(0)
+    return openpyxl.load_workbook(buffer)
+
+
+def test_table_sheet_writes_styled_header_and_rows():
+    writer = StreamingXlsxWriter()
+    writer.table_sheet("Students", ["ID", "Name"], ([i, f"Student {i}"] for i in range(3)))
+
+    ws = _load(writer)["Students"]
+    assert [c.value for c in ws[1]] == ["ID", "Name"]
+    assert ws["A1"].font.bold is True
+    assert ws["A1"].fill.start_color.rgb.endswith("4F46E5")
+    assert ws.max_row == 4
+    assert ws["B4"].value == "Student 2"
+
+
+def test_auto_widths_come_from_sample_and_are_clamped():
+    writer = StreamingXlsxWriter()
+    sheet = writer.add_sheet("Data", sample_rows=2)
+    sheet.append(["short", "x" * 100])
+    sheet.append(["a" * 20, "y"])
+    # Rows after the sample do not influence widths
+    sheet.append(["z" * 40, "w"])
+
+    ws = _load(writer)["Data"]
+    assert ws.column_dimensions["A"].width == 22
+    assert ws.column_dimensions["B"].width == 45
+    assert ws["A3"].value == "z" * 40
+
+
+def test_fixed_and_explicit_widths():
+    writer = StreamingXlsxWriter()
+    writer.table_sheet("Fixed", ["A", "B", "C"], [[1, 2, 3]], widths=18)
+    writer.table_sheet("Explicit", ["A", "B"], [[1, 2]], widths=[10, 30])
+
+    wb = _load(writer)
+    assert [wb["Fixed"].column_dimensions[col].width for col in "ABC"] == [18, 18, 18]
+    assert wb["Explicit"].column_dimensions["B"].width == 30
+
+
+def test_title_and_group_rows_are_merged():
+    writer = StreamingXlsxWriter()
+    sheet = writer.add_sheet("Report")
+    sheet.title_row("Grade Report", span=3)
+    sheet.header(["Course", "Grade", "Max"])
+    group_row = sheet.styled_row("Course: MAT101", span=3, fill=solid_fill("E0E7FF"))
+    sheet.append(["MAT101", 18, 20])
+
+    ws = _load(writer)["Report"]
+    merged = {str(rng) for rng in ws.merged_cells.ranges}
+    assert merged == {"A1:C1", f"A{group_row}:C{group_row}"}
+    assert ws["A1"].font.size == 16
+    assert ws[f"A{group_row}"].fill.start_color.rgb.endswith("E0E7FF")
+    assert ws["B4"].value == 18
+
+
+def test_large_export_streams_through_spooled_file():
+    writer = StreamingXlsxWriter()
+    sheet = writer.add_sheet("Big", sample_rows=50)
+    assert sheet.extend([i, f"row {i}", i * 0.5] for i in range(5000)) == 5000
+
+    payload = b"".join(iter_spooled_file(writer.to_spooled_file(), chunk_size=4096))
+    ws = openpyxl.load_workbook(BytesIO(payload))["Big"]
+    assert ws.max_row == 5000
+    assert ws["B5000"].value == "row 4999"
+
+
+def test_empty_writer_still_produces_workbook():
+    wb = _load(StreamingXlsxWriter())
+    assert wb.sheetnames == ["Sheet"]